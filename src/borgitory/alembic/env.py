@@ -74,6 +74,17 @@ def include_object(
     ):
         return False
 
+    # The job output FTS5 virtual table, its shadow tables and its chunk map
+    # are created by hand
+    if (
+        type_ in ("table", "index")
+        and name
+        and name.startswith(
+            ("job_task_output_fts", "job_task_output_chunks", "ix_job_task_output_")
+        )
+    ):
+        return False
+
     # Include all other objects
     return True
 
@@ -0,0 +1,73 @@
+"""Add FTS5 search index over job task output
+
+Revision ID: 5f0b8e3d1a47
+Revises: c41d7a9e2b58
+Create Date: 2026-10-16 14:03:27.561902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f0b8e3d1a47"
+down_revision: Union[str, Sequence[str], None] = "c41d7a9e2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with borgitory.services.jobs.job_output_search
+FTS_TABLE = "job_task_output_fts"
+CHUNK_BITS = 20
+BACKFILL_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    fts5_enabled = connection.execute(
+        sa.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    ).scalar()
+    if not fts5_enabled:
+        # Job output search stays disabled on SQLite builds without FTS5
+        return
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(content, tokenize = 'unicode61')"
+    )
+
+    # Index existing history, one chunk per task
+    from borgitory.utils.text_compression import decompress_text
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, output, output_compressed FROM job_tasks "
+                "WHERE id > :last_id "
+                "AND (output IS NOT NULL OR output_compressed IS NOT NULL) "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        for task_id, output, output_compressed in rows:
+            text = output if output is not None else decompress_text(output_compressed)
+            if text and text.strip():
+                connection.execute(
+                    sa.text(
+                        f"INSERT INTO {FTS_TABLE} (rowid, content) "
+                        "VALUES (:rowid, :content)"
+                    ),
+                    {"rowid": task_id << CHUNK_BITS, "content": text},
+                )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
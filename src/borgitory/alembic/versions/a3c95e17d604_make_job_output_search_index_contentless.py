@@ -0,0 +1,142 @@
+"""Make the job output FTS5 index contentless
+
+Revision ID: a3c95e17d604
+Revises: e6a1f4c27b90
+Create Date: 2026-10-16 23:12:48.307215
+
+"""
+
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c95e17d604"
+down_revision: Union[str, Sequence[str], None] = "e6a1f4c27b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with borgitory.services.jobs.job_output_search
+FTS_TABLE = "job_task_output_fts"
+CHUNKS_TABLE = "job_task_output_chunks"
+CHUNK_BITS = 20
+BATCH_SIZE = 500
+
+
+def _fts_table_exists(connection: sa.Connection) -> bool:
+    return (
+        connection.execute(
+            sa.text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+            ),
+            {"name": FTS_TABLE},
+        ).first()
+        is not None
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    if not _fts_table_exists(connection):
+        # Job output search is disabled on SQLite builds without FTS5
+        return
+
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {CHUNKS_TABLE} ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "task_id INTEGER NOT NULL, "
+        "job_id TEXT, "
+        "task_order INTEGER, "
+        "first_line INTEGER, "
+        "line_count INTEGER, "
+        "content TEXT, "
+        "checksum INTEGER NOT NULL)"
+    )
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_{CHUNKS_TABLE}_task_id "
+        f"ON {CHUNKS_TABLE} (task_id)"
+    )
+
+    # Indexed text has no log to read it back from, so chunks keep it
+    last_rowid = -1
+    while True:
+        rows = connection.execute(
+            sa.text(
+                f"SELECT rowid, content FROM {FTS_TABLE} WHERE rowid > :last_rowid "
+                "ORDER BY rowid LIMIT :limit"
+            ),
+            {"last_rowid": last_rowid, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            sa.text(
+                f"INSERT INTO {CHUNKS_TABLE} (task_id, content, checksum) "
+                "VALUES (:task_id, :content, :checksum)"
+            ),
+            [
+                {
+                    "task_id": rowid >> CHUNK_BITS,
+                    "content": content,
+                    "checksum": zlib.crc32(content.encode("utf-8")),
+                }
+                for rowid, content in rows
+                if content is not None
+            ],
+        )
+        last_rowid = rows[-1][0]
+
+    op.execute(f"DROP TABLE {FTS_TABLE}")
+    op.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+        "USING fts5(content, content = '', tokenize = 'unicode61')"
+    )
+    op.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, content) "
+        f"SELECT id, content FROM {CHUNKS_TABLE}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    if not _fts_table_exists(connection):
+        return
+
+    op.execute(f"DROP TABLE {FTS_TABLE}")
+    op.execute(f"DROP TABLE IF EXISTS {CHUNKS_TABLE}")
+    op.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(content, tokenize = 'unicode61')"
+    )
+
+    # Index the stored output again, one chunk per task
+    from borgitory.utils.text_compression import decompress_text
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, output, output_compressed FROM job_tasks "
+                "WHERE id > :last_id "
+                "AND (output IS NOT NULL OR output_compressed IS NOT NULL) "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        for task_id, output, output_compressed in rows:
+            text = output if output is not None else decompress_text(output_compressed)
+            if text and text.strip():
+                connection.execute(
+                    sa.text(
+                        f"INSERT INTO {FTS_TABLE} (rowid, content) "
+                        "VALUES (:rowid, :content)"
+                    ),
+                    {"rowid": task_id << CHUNK_BITS, "content": text},
+                )
+        last_id = rows[-1][0]
@@ -0,0 +1,51 @@
+"""Add job_queue table for the durable job queue
+
+Revision ID: a83d6f2c9b15
+Revises: 5f0b8e3d1a47
+Create Date: 2026-10-16 16:21:09.482215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a83d6f2c9b15"
+down_revision: Union[str, Sequence[str], None] = "5f0b8e3d1a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "job_queue",
+        sa.Column("job_id", sa.Uuid(native_uuid=False), nullable=False),
+        sa.Column("job_type", sa.String(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("repository_key", sa.String(), nullable=True),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=True),
+        sa.Column("queued_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["job_id"],
+            ["jobs.id"],
+        ),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    with op.batch_alter_table("job_queue", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_job_queue_state"), ["state"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_queue", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_job_queue_state"))
+
+    op.drop_table("job_queue")
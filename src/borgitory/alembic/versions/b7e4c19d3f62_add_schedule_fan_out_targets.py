@@ -0,0 +1,31 @@
+"""Add fan-out targets to schedules
+
+Revision ID: b7e4c19d3f62
+Revises: a83d6f2c9b15
+Create Date: 2026-10-16 21:08:37.514022
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c19d3f62"
+down_revision: Union[str, Sequence[str], None] = "a83d6f2c9b15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("schedules", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("fan_out_targets", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("schedules", schema=None) as batch_op:
+        batch_op.drop_column("fan_out_targets")
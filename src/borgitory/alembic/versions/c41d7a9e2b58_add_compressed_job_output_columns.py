@@ -0,0 +1,60 @@
+"""Add compressed output columns to jobs and job_tasks
+
+Revision ID: c41d7a9e2b58
+Revises: 78c9fff46e06
+Create Date: 2026-10-16 10:12:44.318205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7a9e2b58"
+down_revision: Union[str, Sequence[str], None] = "78c9fff46e06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("log_output_compressed", sa.LargeBinary(), nullable=True)
+        )
+
+    with op.batch_alter_table("job_tasks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("output_compressed", sa.LargeBinary(), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Restore plain text output before dropping the compressed columns
+    connection = op.get_bind()
+    from borgitory.utils.text_compression import decompress_text
+
+    for table, text_column, blob_column in (
+        ("jobs", "log_output", "log_output_compressed"),
+        ("job_tasks", "output", "output_compressed"),
+    ):
+        rows = connection.execute(
+            sa.text(
+                f"SELECT id, {blob_column} FROM {table} WHERE {blob_column} IS NOT NULL"
+            )
+        ).fetchall()
+        for row_id, blob in rows:
+            connection.execute(
+                sa.text(f"UPDATE {table} SET {text_column} = :text WHERE id = :id"),
+                {"text": decompress_text(blob), "id": row_id},
+            )
+
+    with op.batch_alter_table("job_tasks", schema=None) as batch_op:
+        batch_op.drop_column("output_compressed")
+
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.drop_column("log_output_compressed")
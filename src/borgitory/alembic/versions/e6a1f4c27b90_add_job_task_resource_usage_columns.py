@@ -0,0 +1,39 @@
+"""Add resource usage columns to job_tasks
+
+Revision ID: e6a1f4c27b90
+Revises: b7e4c19d3f62
+Create Date: 2026-10-16 21:34:12.604117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a1f4c27b90"
+down_revision: Union[str, Sequence[str], None] = "b7e4c19d3f62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("job_tasks", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("cpu_user_seconds", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("cpu_system_seconds", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("max_rss_bytes", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("io_read_bytes", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("io_write_bytes", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_tasks", schema=None) as batch_op:
+        batch_op.drop_column("io_write_bytes")
+        batch_op.drop_column("io_read_bytes")
+        batch_op.drop_column("max_rss_bytes")
+        batch_op.drop_column("cpu_system_seconds")
+        batch_op.drop_column("cpu_user_seconds")
@@ -1,11 +1,13 @@
 import logging
+from datetime import date, datetime, time, timedelta, timezone
 from typing import List, Dict, Optional
 import uuid
-from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
 from fastapi.responses import HTMLResponse
 from starlette.responses import StreamingResponse
 from pydantic import BaseModel
 from borgitory.models.schemas import BackupRequest, PruneRequest, CheckRequest
+from borgitory.models.database import Repository
 from borgitory.models.enums import JobType
 from borgitory.models.job_results import (
     JobCreationResult,
@@ -16,8 +18,11 @@ from borgitory.models.job_results import (
 )
 from borgitory.dependencies import JobServiceDep, get_browser_timezone_offset
 from borgitory.dependencies import JobStreamServiceDep, JobRenderServiceDep
-from borgitory.dependencies import TemplatesDep
+from borgitory.dependencies import TemplatesDep, JobOutputSearchServiceDep
 from borgitory.dependencies import get_db
+from borgitory.services.jobs.job_models import TaskTypeEnum
+from borgitory.utils.datetime_utils import parse_timezone_offset
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
@@ -72,6 +77,24 @@ class MessageResponse(BaseModel):
     message: str
 
 
+class CopyOutputResponse(BaseModel):
+    """Copy output response model"""
+
+    message: str
+    output: str
+
+
+class TaskOutputResponse(BaseModel):
+    """Task output line range response model"""
+
+    job_id: uuid.UUID
+    task_order: int
+    start: int
+    lines: List[str]
+    total_lines: int
+    has_more: bool
+
+
 class JobManagerStatsResponse(BaseModel):
     """Job manager statistics response model"""
 
@@ -233,6 +256,67 @@ async def stream_current_jobs_html(
     )
 
 
+def _parse_search_date(
+    value: str, browser_tz_offset: Optional[int], days: int = 0
+) -> Optional[datetime]:
+    """Browser-local midnight of a YYYY-MM-DD date (plus ``days``) in UTC"""
+    try:
+        day = date.fromisoformat(value) + timedelta(days=days)
+    except ValueError:
+        return None
+    local_midnight = datetime.combine(
+        day, time.min, tzinfo=parse_timezone_offset(browser_tz_offset)
+    )
+    return local_midnight.astimezone(timezone.utc)
+
+
+@router.get("/search/form", response_class=HTMLResponse)
+async def get_job_search_form(
+    request: Request,
+    templates: TemplatesDep,
+    db: AsyncSession = Depends(get_db),
+) -> HTMLResponse:
+    """Get the job output search form with filter dropdowns populated"""
+    result = await db.execute(select(Repository).order_by(Repository.name))
+    return templates.TemplateResponse(
+        request,
+        "partials/jobs/search_form.html",
+        {
+            "repositories": list(result.scalars().all()),
+            "task_types": [task_type.value for task_type in TaskTypeEnum],
+        },
+    )
+
+
+@router.get("/search", response_class=HTMLResponse)
+async def search_job_output(
+    request: Request,
+    templates: TemplatesDep,
+    search_svc: JobOutputSearchServiceDep,
+    q: str = "",
+    repository_id: str = "",
+    task_type: str = "",
+    date_from: str = "",
+    date_to: str = "",
+    db: AsyncSession = Depends(get_db),
+) -> HTMLResponse:
+    """Full-text search over task output, rendered as HTML results"""
+    browser_tz_offset = get_browser_timezone_offset(request)
+    result = await search_svc.search(
+        db,
+        q,
+        repository_id=int(repository_id) if repository_id.isdigit() else None,
+        task_type=task_type or None,
+        started_after=_parse_search_date(date_from, browser_tz_offset),
+        started_before=_parse_search_date(date_to, browser_tz_offset, days=1),
+    )
+    return templates.TemplateResponse(
+        request,
+        "partials/jobs/search_results.html",
+        {"result": result},
+    )
+
+
 @router.get("/{job_id}/status", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: uuid.UUID, job_svc: JobServiceDep
@@ -387,10 +471,15 @@ async def toggle_task_details(
     return templates.TemplateResponse(request, template_name, context)
 
 
-@router.post("/{job_id}/copy-output", response_model=MessageResponse)
-async def copy_job_output() -> MessageResponse:
-    """Copy job output to clipboard (returns success message)"""
-    return MessageResponse(message="Output copied to clipboard")
+@router.post("/{job_id}/copy-output", response_model=CopyOutputResponse)
+async def copy_job_output(
+    job_id: uuid.UUID,
+    job_svc: JobServiceDep,
+    db: AsyncSession = Depends(get_db),
+) -> CopyOutputResponse:
+    """Return the full job output for copying to the clipboard"""
+    output = await job_svc.get_job_output_text(db, job_id)
+    return CopyOutputResponse(message="Output copied to clipboard", output=output)
 
 
 @router.get("/{job_id}/tasks/{task_order}/stream")
@@ -403,7 +492,39 @@ async def stream_task_output(
     return await stream_svc.stream_task_output(job_id, task_order)
 
 
-@router.post("/{job_id}/tasks/{task_order}/copy-output", response_model=MessageResponse)
-async def copy_task_output() -> MessageResponse:
-    """Copy task output to clipboard (returns success message)"""
-    return MessageResponse(message="Task output copied to clipboard")
+@router.get("/{job_id}/tasks/{task_order}/output", response_model=TaskOutputResponse)
+async def get_task_output(
+    job_id: uuid.UUID,
+    task_order: int,
+    job_svc: JobServiceDep,
+    start: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+) -> TaskOutputResponse:
+    """Get a range of output lines for a specific task"""
+    task_output = await job_svc.get_task_output(db, job_id, task_order, start, limit)
+    return TaskOutputResponse(
+        job_id=task_output.job_id,
+        task_order=task_output.task_order,
+        start=task_output.start,
+        lines=task_output.lines,
+        total_lines=task_output.total_lines,
+        has_more=task_output.has_more,
+    )
+
+
+@router.post(
+    "/{job_id}/tasks/{task_order}/copy-output", response_model=CopyOutputResponse
+)
+async def copy_task_output(
+    job_id: uuid.UUID,
+    task_order: int,
+    job_svc: JobServiceDep,
+    db: AsyncSession = Depends(get_db),
+) -> CopyOutputResponse:
+    """Return the full task output for copying to the clipboard"""
+    task_output = await job_svc.get_task_output(db, job_id, task_order)
+    return CopyOutputResponse(
+        message="Task output copied to clipboard",
+        output="\n".join(task_output.lines),
+    )
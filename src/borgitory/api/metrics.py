@@ -0,0 +1,19 @@
+"""
+API endpoint exposing application metrics in the Prometheus text format.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from borgitory.dependencies import JobEventBroadcasterDep, get_job_manager_singleton
+from borgitory.services.metrics.app_metrics import REGISTRY, collect_job_runtime
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(broadcaster: JobEventBroadcasterDep) -> Response:
+    """Current metric values for Prometheus to scrape"""
+    queue_manager = getattr(get_job_manager_singleton(), "queue_manager", None)
+    collect_job_runtime(broadcaster, queue_manager)
+    return Response(content=REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
@@ -21,6 +21,7 @@ from borgitory.services.cron_description_service import CronDescriptionService
 from borgitory.models.patterns import BackupPattern, PatternType, PatternStyle
 from borgitory.services.scheduling.pattern_service import PatternService
 from borgitory.services.scheduling.hook_service import HookService
+from borgitory.services.scheduling.fan_out_config import FanOutConfigParser
 
 router = APIRouter()
 
@@ -32,6 +33,19 @@ def convert_hook_fields_to_json(
     return HookService.convert_hook_fields_to_json_from_dict(form_data, hook_type)
 
 
+def fan_out_form_values(fan_out_targets: Optional[str]) -> Dict[str, Any]:
+    """Form field values of stored fan-out targets."""
+    try:
+        targets = FanOutConfigParser.parse_targets_json(fan_out_targets)
+    except ValueError:
+        targets = []
+    return {
+        "repository_ids": [target.repository_id for target in targets],
+        "stagger_seconds": targets[0].start_delay if targets else None,
+        "upload_ratelimit": targets[0].upload_ratelimit if targets else None,
+    }
+
+
 @router.get("/form", response_class=HTMLResponse)
 async def get_schedules_form(
     request: Request,
@@ -96,6 +110,7 @@ async def create_schedule(
         pre_job_hooks=schedule.pre_job_hooks,
         post_job_hooks=schedule.post_job_hooks,
         patterns=schedule.patterns,
+        fan_out_targets=schedule.fan_out_targets,
     )
 
     if result.is_error or not result.schedule:
@@ -232,7 +247,12 @@ async def get_schedule_edit_form(
             raise HTTPException(status_code=404, detail="Schedule not found")
 
         form_data = await config_service.get_schedule_form_data(db)
-        context = {**form_data, "schedule": schedule, "is_edit_mode": True}
+        context = {
+            **form_data,
+            "schedule": schedule,
+            "is_edit_mode": True,
+            "fan_out": fan_out_form_values(schedule.fan_out_targets),
+        }
 
         return templates.TemplateResponse(
             request, "partials/schedules/edit_form.html", context
@@ -253,6 +273,12 @@ async def update_schedule(
     try:
         json_data = await request.json()
 
+        if "fan_out_repository_ids" in json_data:
+            repository_id = json_data.get("repository_id")
+            json_data["fan_out_targets"] = schedule_service.fan_out_targets_from_form(
+                json_data, int(repository_id) if repository_id else None
+            )
+
         schedule_update = ScheduleUpdate(**json_data)
         update_data = schedule_update.model_dump(exclude_unset=True)
 
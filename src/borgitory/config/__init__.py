@@ -3,10 +3,12 @@
 # Re-export everything from the main config module to maintain compatibility
 from borgitory.config_module import DATABASE_URL, get_secret_key, DATA_DIR
 from .command_runner_config import CommandRunnerConfig
+from .job_history_config import JobHistoryRetentionConfig
 from .job_manager_config import JobManagerEnvironmentConfig
 
 __all__ = [
     "CommandRunnerConfig",
+    "JobHistoryRetentionConfig",
     "JobManagerEnvironmentConfig",
     "DATABASE_URL",
     "get_secret_key",
@@ -0,0 +1,45 @@
+"""Job history retention environment configuration."""
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class JobHistoryRetentionConfig:
+    """Environment-based configuration for the job history retention service."""
+
+    # Compress output of jobs finished longer ago than this
+    compress_after_hours: float = 24.0
+    # Delete finished jobs older than this (0 keeps them forever)
+    max_age_days: int = 0
+    # Keep at most this many finished jobs per repository (0 means unlimited)
+    max_jobs_per_repository: int = 0
+    # Seconds between retention runs (0 disables the background loop)
+    run_interval: float = 3600.0
+    # Rows compressed or deleted per transaction
+    batch_size: int = 200
+    # Free pages released per incremental vacuum (0 releases all)
+    vacuum_max_pages: int = 0
+    # Switch the database to incremental auto-vacuum with one full VACUUM,
+    # which locks the database while it rewrites the file
+    convert_to_incremental_vacuum: bool = False
+
+    @classmethod
+    def from_env(cls) -> "JobHistoryRetentionConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            compress_after_hours=float(
+                os.getenv("BORG_JOB_HISTORY_COMPRESS_AFTER_HOURS", "24")
+            ),
+            max_age_days=int(os.getenv("BORG_JOB_HISTORY_MAX_AGE_DAYS", "0")),
+            max_jobs_per_repository=int(
+                os.getenv("BORG_JOB_HISTORY_MAX_JOBS_PER_REPOSITORY", "0")
+            ),
+            run_interval=float(os.getenv("BORG_JOB_HISTORY_RUN_INTERVAL", "3600")),
+            batch_size=int(os.getenv("BORG_JOB_HISTORY_BATCH_SIZE", "200")),
+            vacuum_max_pages=int(os.getenv("BORG_JOB_HISTORY_VACUUM_MAX_PAGES", "0")),
+            convert_to_incremental_vacuum=os.getenv(
+                "BORG_JOB_HISTORY_CONVERT_VACUUM", "false"
+            ).lower()
+            == "true",
+        )
@@ -3,6 +3,8 @@
 import os
 from dataclasses import dataclass
 
+from borgitory.config_module import DATA_DIR
+
 
 @dataclass(frozen=True)
 class JobManagerEnvironmentConfig:
@@ -12,9 +14,30 @@ class JobManagerEnvironmentConfig:
     max_output_lines_per_job: int = 1000
     max_concurrent_operations: int = 10
     queue_poll_interval: float = 0.1
+    queue_priority_aging_interval: float = 300.0
+    queue_persist_interval: float = 0.5
+    queue_max_attempts: int = 2
+    queue_restore_max_age: float = 86400.0
+    max_parallel_tasks: int = 4
+    admission_enabled: bool = True
+    admission_max_load_per_cpu: float = 2.0
+    admission_max_io_pressure: float = 40.0
+    admission_max_cpu_pressure: float = 60.0
+    admission_min_free_memory_mb: int = 256
+    admission_hysteresis: float = 0.2
+    admission_sample_interval: float = 2.0
     sse_keepalive_timeout: float = 30.0
     sse_max_queue_size: int = 100
+    sse_overflow_policy: str = "drop_oldest"
     max_concurrent_cloud_uploads: int = 3
+    job_log_dir: str = ""
+    job_log_segment_max_bytes: int = 8 * 1024 * 1024
+    output_batch_max_lines: int = 200
+    output_batch_max_latency: float = 0.1
+    task_persist_interval: float = 0.5
+    finished_job_ttl: float = 3600.0
+    max_job_memory_bytes: int = 64 * 1024 * 1024
+    job_eviction_interval: float = 60.0
 
     @classmethod
     def from_env(cls) -> "JobManagerEnvironmentConfig":
@@ -26,11 +49,56 @@ class JobManagerEnvironmentConfig:
                 os.getenv("BORG_MAX_CONCURRENT_OPERATIONS", "10")
             ),
             queue_poll_interval=float(os.getenv("BORG_QUEUE_POLL_INTERVAL", "0.1")),
+            queue_priority_aging_interval=float(
+                os.getenv("BORG_QUEUE_PRIORITY_AGING_INTERVAL", "300")
+            ),
+            queue_persist_interval=float(
+                os.getenv("BORG_QUEUE_PERSIST_INTERVAL", "0.5")
+            ),
+            queue_max_attempts=int(os.getenv("BORG_QUEUE_MAX_ATTEMPTS", "2")),
+            queue_restore_max_age=float(
+                os.getenv("BORG_QUEUE_RESTORE_MAX_AGE", "86400")
+            ),
+            max_parallel_tasks=int(os.getenv("BORG_MAX_PARALLEL_TASKS", "4")),
+            admission_enabled=os.getenv("BORG_ADMISSION_ENABLED", "true").lower()
+            == "true",
+            admission_max_load_per_cpu=float(
+                os.getenv("BORG_ADMISSION_MAX_LOAD_PER_CPU", "2.0")
+            ),
+            admission_max_io_pressure=float(
+                os.getenv("BORG_ADMISSION_MAX_IO_PRESSURE", "40")
+            ),
+            admission_max_cpu_pressure=float(
+                os.getenv("BORG_ADMISSION_MAX_CPU_PRESSURE", "60")
+            ),
+            admission_min_free_memory_mb=int(
+                os.getenv("BORG_ADMISSION_MIN_FREE_MEMORY_MB", "256")
+            ),
+            admission_hysteresis=float(os.getenv("BORG_ADMISSION_HYSTERESIS", "0.2")),
+            admission_sample_interval=float(
+                os.getenv("BORG_ADMISSION_SAMPLE_INTERVAL", "2.0")
+            ),
             sse_keepalive_timeout=float(
                 os.getenv("BORG_SSE_KEEPALIVE_TIMEOUT", "30.0")
             ),
             sse_max_queue_size=int(os.getenv("BORG_SSE_MAX_QUEUE_SIZE", "100")),
+            sse_overflow_policy=os.getenv("BORG_SSE_OVERFLOW_POLICY", "drop_oldest"),
             max_concurrent_cloud_uploads=int(
                 os.getenv("BORG_MAX_CONCURRENT_CLOUD_UPLOADS", "3")
             ),
+            job_log_dir=os.getenv("BORG_JOB_LOG_DIR")
+            or os.path.join(DATA_DIR, "job_logs"),
+            job_log_segment_max_bytes=int(
+                os.getenv("BORG_JOB_LOG_SEGMENT_MAX_BYTES", str(8 * 1024 * 1024))
+            ),
+            output_batch_max_lines=int(os.getenv("BORG_OUTPUT_BATCH_MAX_LINES", "200")),
+            output_batch_max_latency=float(
+                os.getenv("BORG_OUTPUT_BATCH_MAX_LATENCY", "0.1")
+            ),
+            task_persist_interval=float(os.getenv("BORG_TASK_PERSIST_INTERVAL", "0.5")),
+            finished_job_ttl=float(os.getenv("BORG_FINISHED_JOB_TTL", "3600")),
+            max_job_memory_bytes=int(
+                os.getenv("BORG_MAX_JOB_MEMORY_BYTES", str(64 * 1024 * 1024))
+            ),
+            job_eviction_interval=float(os.getenv("BORG_JOB_EVICTION_INTERVAL", "60")),
         )
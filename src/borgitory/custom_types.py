@@ -9,4 +9,6 @@ from typing import Dict, Union, List, Any
 
 # Common type alias for configuration dictionaries
 # Used across all services for consistent type handling
-ConfigDict = Dict[str, Union[str, int, float, bool, None, List[str], List[Any]]]
+ConfigDict = Dict[
+    str, Union[str, int, float, bool, None, List[str], List[Any], Dict[str, Any]]
+]
@@ -34,7 +34,17 @@ if TYPE_CHECKING:
     from borgitory.services.notifications.providers.discord_provider import HttpClient
     from borgitory.config.command_runner_config import CommandRunnerConfig
     from borgitory.config.job_manager_config import JobManagerEnvironmentConfig
+    from borgitory.config.job_history_config import JobHistoryRetentionConfig
+    from borgitory.services.jobs.job_history_retention import (
+        JobHistoryRetentionService,
+    )
+    from borgitory.services.jobs.job_output_search import (
+        JobOutputIndex,
+        JobOutputSearchService,
+    )
     from borgitory.services.jobs.job_models import JobManagerConfig
+    from borgitory.services.jobs.job_log_store import JobLogStore
+    from borgitory.services.metrics.event_loop_monitor import EventLoopLagMonitor
     from borgitory.services.cloud_providers.registry_factory import RegistryFactory
     from borgitory.services.volumes.file_system_interface import FileSystemInterface
     from borgitory.protocols.repository_protocols import ArchiveServiceProtocol
@@ -50,6 +60,7 @@ from borgitory.utils.template_paths import get_template_directory
 from borgitory.services.simple_command_runner import SimpleCommandRunner
 from borgitory.services.borg_service import BorgService
 from borgitory.protocols.archive_manager_protocol import ArchiveManagerProtocol
+from borgitory.services.archives.archive_index_store import ArchiveIndexStore
 from borgitory.services.archives.archive_manager import ArchiveManager
 from borgitory.services.jobs.job_service import JobService
 from borgitory.services.jobs.job_manager import JobManager
@@ -89,7 +100,12 @@ from borgitory.services.cron_description_service import CronDescriptionService
 from borgitory.services.upcoming_backups_service import UpcomingBackupsService
 from borgitory.services.jobs.job_executor import JobExecutor
 from borgitory.services.jobs.job_output_manager import JobOutputManager
+from borgitory.services.jobs.job_admission import AdmissionController
 from borgitory.services.jobs.job_queue_manager import JobQueueManager
+from borgitory.services.jobs.job_queue_store import (
+    JobQueueRecoveryPolicy,
+    JobQueueStore,
+)
 from borgitory.services.jobs.job_database_manager import JobDatabaseManager
 from fastapi.templating import Jinja2Templates
 from starlette.templating import _TemplateResponse
@@ -220,6 +236,23 @@ def get_job_executor(
     return JobExecutor(command_executor)
 
 
+@lru_cache()
+def get_job_log_store() -> "JobLogStore":
+    """
+    Provide the on-disk job log store singleton.
+
+    Location and segment size come from JobManagerEnvironmentConfig
+    (BORG_JOB_LOG_DIR, BORG_JOB_LOG_SEGMENT_MAX_BYTES).
+    """
+    from borgitory.services.jobs.job_log_store import JobLogStore
+
+    env_config = get_job_manager_env_config()
+    return JobLogStore(
+        base_dir=env_config.job_log_dir,
+        segment_max_bytes=env_config.job_log_segment_max_bytes,
+    )
+
+
 def get_job_output_manager() -> JobOutputManager:
     """
     Provide a JobOutputManager instance.
@@ -230,7 +263,7 @@ def get_job_output_manager() -> JobOutputManager:
     import os
 
     max_lines = int(os.getenv("BORG_MAX_OUTPUT_LINES", "1000"))
-    return JobOutputManager(max_lines_per_job=max_lines)
+    return JobOutputManager(max_lines_per_job=max_lines, log_store=get_job_log_store())
 
 
 def get_job_queue_manager() -> JobQueueManager:
@@ -248,6 +281,59 @@ def get_job_queue_manager() -> JobQueueManager:
             os.getenv("BORG_MAX_CONCURRENT_OPERATIONS", "10")
         ),
         queue_poll_interval=float(os.getenv("BORG_QUEUE_POLL_INTERVAL", "0.1")),
+        priority_aging_interval=float(
+            os.getenv("BORG_QUEUE_PRIORITY_AGING_INTERVAL", "300")
+        ),
+        store=get_job_queue_store(),
+        admission=get_job_admission_controller(),
+    )
+
+
+@lru_cache()
+def get_job_admission_controller() -> Optional[AdmissionController]:
+    """
+    Create the load-aware admission controller singleton.
+
+    Shared by every queue manager so the host is sampled once per interval.
+
+    Returns:
+        Optional[AdmissionController]: Cached instance, None when disabled
+    """
+    from borgitory.services.jobs.job_manager_factory import JobManagerFactory
+
+    return JobManagerFactory.create_admission_controller(
+        get_job_manager_config(get_job_manager_env_config())
+    )
+
+
+@lru_cache()
+def get_job_queue_store() -> JobQueueStore:
+    """
+    Create JobQueueStore singleton for application-scoped use.
+
+    Shared by every queue manager so queue state transitions are written
+    by a single write-behind buffer.
+
+    Returns:
+        JobQueueStore: Cached singleton instance
+    """
+    return JobQueueStore(
+        async_session_maker,
+        flush_interval=get_job_manager_env_config().queue_persist_interval,
+    )
+
+
+def get_job_queue_recovery_policy() -> JobQueueRecoveryPolicy:
+    """
+    Provide the policy deciding which interrupted queued jobs are resumed.
+
+    Returns:
+        JobQueueRecoveryPolicy: Policy configured from the environment
+    """
+    env_config = get_job_manager_env_config()
+    return JobQueueRecoveryPolicy(
+        max_attempts=env_config.queue_max_attempts,
+        max_age=env_config.queue_restore_max_age,
     )
 
 
@@ -259,7 +345,11 @@ def get_job_database_manager() -> JobDatabaseManager:
     Uses default db_session_factory if none provided.
     """
 
-    return JobDatabaseManager(async_session_maker)
+    return JobDatabaseManager(
+        async_session_maker,
+        output_index=get_job_output_index(),
+        log_store=get_job_log_store(),
+    )
 
 
 def get_command_runner_config() -> "CommandRunnerConfig":
@@ -716,9 +806,30 @@ def get_job_manager_config(
         max_output_lines_per_job=env_config.max_output_lines_per_job,
         max_concurrent_operations=env_config.max_concurrent_operations,
         queue_poll_interval=env_config.queue_poll_interval,
+        queue_priority_aging_interval=env_config.queue_priority_aging_interval,
+        queue_persist_interval=env_config.queue_persist_interval,
+        queue_max_attempts=env_config.queue_max_attempts,
+        queue_restore_max_age=env_config.queue_restore_max_age,
+        max_parallel_tasks=env_config.max_parallel_tasks,
+        admission_enabled=env_config.admission_enabled,
+        admission_max_load_per_cpu=env_config.admission_max_load_per_cpu,
+        admission_max_io_pressure=env_config.admission_max_io_pressure,
+        admission_max_cpu_pressure=env_config.admission_max_cpu_pressure,
+        admission_min_free_memory_mb=env_config.admission_min_free_memory_mb,
+        admission_hysteresis=env_config.admission_hysteresis,
+        admission_sample_interval=env_config.admission_sample_interval,
         sse_keepalive_timeout=env_config.sse_keepalive_timeout,
         sse_max_queue_size=env_config.sse_max_queue_size,
+        sse_overflow_policy=env_config.sse_overflow_policy,
         max_concurrent_cloud_uploads=env_config.max_concurrent_cloud_uploads,
+        job_log_dir=env_config.job_log_dir or None,
+        job_log_segment_max_bytes=env_config.job_log_segment_max_bytes,
+        output_batch_max_lines=env_config.output_batch_max_lines,
+        output_batch_max_latency=env_config.output_batch_max_latency,
+        task_persist_interval=env_config.task_persist_interval,
+        finished_job_ttl=env_config.finished_job_ttl,
+        max_job_memory_bytes=env_config.max_job_memory_bytes,
+        job_eviction_interval=env_config.job_eviction_interval,
     )
 
 
@@ -1090,6 +1201,34 @@ PathServiceDep = Annotated["PathServiceInterface", Depends(get_path_service)]
 PlatformServiceDep = Annotated[PlatformServiceProtocol, Depends(get_platform_service)]
 
 
+def get_archive_cache_max_bytes() -> int:
+    """
+    Memory budget of the in-memory archive tree cache.
+
+    Read from BORG_ARCHIVE_CACHE_MAX_BYTES, 512 MiB by default.
+    """
+    import os
+
+    return int(os.getenv("BORG_ARCHIVE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+@lru_cache()
+def get_archive_index_store() -> ArchiveIndexStore:
+    """
+    Provide the on-disk archive index store singleton.
+
+    Stored under BORG_ARCHIVE_INDEX_DIR, by default "archive_index" in the
+    data directory. Index files are only opened when an archive is browsed.
+    """
+    import os
+
+    from borgitory.config_module import DATA_DIR
+
+    return ArchiveIndexStore(
+        os.getenv("BORG_ARCHIVE_INDEX_DIR") or os.path.join(DATA_DIR, "archive_index")
+    )
+
+
 @lru_cache()
 def get_archive_manager_singleton() -> ArchiveManagerProtocol:
     """
@@ -1116,6 +1255,8 @@ def get_archive_manager_singleton() -> ArchiveManagerProtocol:
         job_executor=job_executor,
         command_executor=command_executor,
         cache_ttl=timedelta(minutes=30),
+        index_store=get_archive_index_store(),
+        cache_max_bytes=get_archive_cache_max_bytes(),
     )
 
 
@@ -1203,9 +1344,94 @@ def get_archive_manager(
         job_executor=job_executor,
         command_executor=command_executor,
         cache_ttl=timedelta(minutes=30),
+        index_store=get_archive_index_store(),
+        cache_max_bytes=get_archive_cache_max_bytes(),
+    )
+
+
+def get_job_history_retention_config() -> "JobHistoryRetentionConfig":
+    """
+    Provide JobHistoryRetentionConfig from environment variables.
+
+    Returns:
+        JobHistoryRetentionConfig: Configuration loaded from environment
+    """
+    from borgitory.config.job_history_config import JobHistoryRetentionConfig
+
+    return JobHistoryRetentionConfig.from_env()
+
+
+@lru_cache()
+def get_job_history_retention_service_singleton() -> "JobHistoryRetentionService":
+    """
+    Create JobHistoryRetentionService singleton for application-scoped use.
+
+    The service compresses and prunes finished job history and compacts the
+    database on a fixed interval; it is started and stopped with the app.
+
+    Returns:
+        JobHistoryRetentionService: Cached singleton instance
+    """
+    from borgitory.services.jobs.job_history_retention import (
+        JobHistoryRetentionService,
+    )
+
+    return JobHistoryRetentionService(
+        session_maker=async_session_maker,
+        config=get_job_history_retention_config(),
+        output_index=get_job_output_index(),
+        log_store=get_job_log_store(),
     )
 
 
+@lru_cache()
+def get_event_loop_monitor() -> "EventLoopLagMonitor":
+    """
+    Create the EventLoopLagMonitor singleton, started and stopped with the app.
+
+    Returns:
+        EventLoopLagMonitor: Cached singleton instance
+    """
+    from borgitory.services.metrics.app_metrics import EVENT_LOOP_LAG
+    from borgitory.services.metrics.event_loop_monitor import EventLoopLagMonitor
+
+    return EventLoopLagMonitor(EVENT_LOOP_LAG)
+
+
+@lru_cache()
+def get_job_output_index() -> "JobOutputIndex":
+    """
+    Create JobOutputIndex singleton for application-scoped use.
+
+    Shared by everything writing or deleting task output so the FTS5
+    availability check runs once per process. Indexed output is read back
+    from the shared job log store.
+
+    Returns:
+        JobOutputIndex: Cached singleton instance
+    """
+    from borgitory.services.jobs.job_output_search import JobOutputIndex
+
+    return JobOutputIndex(log_store=get_job_log_store())
+
+
+def get_job_output_search_service() -> "JobOutputSearchService":
+    """
+    Provide a JobOutputSearchService backed by the shared output index.
+
+    Returns:
+        JobOutputSearchService: Search service instance
+    """
+    from borgitory.services.jobs.job_output_search import JobOutputSearchService
+
+    return JobOutputSearchService(get_job_output_index())
+
+
+JobOutputSearchServiceDep = Annotated[
+    "JobOutputSearchService", Depends(get_job_output_search_service)
+]
+
+
 def get_recovery_service(
     command_executor: "CommandExecutorProtocol" = Depends(get_command_executor),
 ) -> RecoveryService:
@@ -1220,7 +1446,9 @@ def get_recovery_service(
         RecoveryService: New RecoveryService instance for each request
     """
     return RecoveryService(
-        command_executor=command_executor, session_maker=async_session_maker
+        command_executor=command_executor,
+        session_maker=async_session_maker,
+        queue_recovery_policy=get_job_queue_recovery_policy(),
     )
 
 
@@ -29,9 +29,14 @@ from borgitory.api import (
     shared,
     tabs,
     packages,
+    metrics,
 )
 from borgitory.dependencies import (
     get_db,
+    get_event_loop_monitor,
+    get_job_history_retention_service_singleton,
+    get_job_manager_singleton,
+    get_job_queue_store,
     get_recovery_service,
     get_package_restoration_service_for_startup,
     get_scheduler_service_singleton,
@@ -69,15 +74,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         recovery_service = get_recovery_service()
         await recovery_service.recover_stale_jobs()
 
+        try:
+            await get_job_manager_singleton().restore_queued_jobs()
+        except Exception as e:
+            logger.error(f"Restoring queued jobs failed during startup: {e}")
+
         scheduler_service = get_scheduler_service_singleton()
         await scheduler_service.start()
         logger.info("Scheduler started")
 
+        retention_service = get_job_history_retention_service_singleton()
+        await retention_service.start()
+
+        event_loop_monitor = get_event_loop_monitor()
+        await event_loop_monitor.start()
+
         yield
 
         logger.info("Shutting down...")
 
+        await event_loop_monitor.stop()
+        await retention_service.stop()
         await scheduler_service.stop()
+        # Interrupts running jobs, leaving them to be resumed on the next
+        # start, and writes the task saves still buffered by the task writer
+        await get_job_manager_singleton().shutdown()
+        # Queue transitions still buffered would otherwise be lost
+        await get_job_queue_store().flush()
     except Exception as e:
         logger.error(f"Lifespan error: {e}")
         import traceback
@@ -183,6 +206,8 @@ app.include_router(
 
 app.include_router(debug.router)
 
+app.include_router(metrics.router, tags=["metrics"])
+
 
 # Valid tab pages and their corresponding API endpoints
 VALID_TABS = {
@@ -14,19 +14,25 @@ from borgitory.config_module import (
 from borgitory.services.migrations.migration_factory import (
     create_migration_service_for_startup,
 )
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
+from borgitory.services.metrics.app_metrics import instrument_engine
 from borgitory.utils.datetime_utils import now_utc
+from borgitory.utils.text_compression import decompress_text
 from borgitory.models.enums import EncryptionType
 from typing import List, Any
 
 from cryptography.fernet import Fernet
 from passlib.context import CryptContext
 from sqlalchemy import (
+    BigInteger,
+    Float,
     Integer,
     String,
     DateTime,
     Boolean,
     Text,
     ForeignKey,
+    LargeBinary,
     Uuid,
 )
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -64,6 +70,7 @@ logger = logging.getLogger(__name__)
 engine = create_async_engine(
     ASYNC_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+instrument_engine(engine)
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -164,6 +171,10 @@ class Job(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     log_output: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # log_output of finished jobs, zlib-compressed by the retention service
+    log_output_compressed: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True
+    )
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
     container_id: Mapped[str | None] = mapped_column(String, nullable=True)
     cloud_sync_config_id: Mapped[int | None] = mapped_column(
@@ -193,6 +204,14 @@ class Job(Base):
     tasks: Mapped[List["JobTask"]] = relationship(
         "JobTask", back_populates="job", cascade="all, delete-orphan"
     )
+    queue_entry: Mapped["JobQueueEntry | None"] = relationship(
+        "JobQueueEntry", back_populates="job", cascade="all, delete-orphan"
+    )
+
+    def get_log_output(self) -> str | None:
+        if self.log_output is not None:
+            return self.log_output
+        return decompress_text(self.log_output_compressed)
 
 
 class JobTask(Base):
@@ -212,14 +231,64 @@ class JobTask(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     output: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # output of finished jobs, zlib-compressed by the retention service
+    output_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
     return_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
     task_order: Mapped[int] = mapped_column(
         Integer, nullable=False
     )  # Order of execution within the job
+    # Resources used by the task's process, where they could be sampled
+    cpu_user_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cpu_system_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    max_rss_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    io_read_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    io_write_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
     job: Mapped["Job"] = relationship("Job", back_populates="tasks")
 
+    def get_output(self) -> str | None:
+        if self.output is not None:
+            return self.output
+        return decompress_text(self.output_compressed)
+
+    def get_resource_usage(self) -> ProcessResourceUsage | None:
+        usage = ProcessResourceUsage(
+            cpu_user_seconds=self.cpu_user_seconds,
+            cpu_system_seconds=self.cpu_system_seconds,
+            max_rss_bytes=self.max_rss_bytes,
+            read_bytes=self.io_read_bytes,
+            write_bytes=self.io_write_bytes,
+        )
+        if all(value is None for value in usage.to_dict().values()):
+            return None
+        return usage
+
+
+class JobQueueEntry(Base):
+    """Durable state of a job in the job queue, used to resume it after a restart"""
+
+    __tablename__ = "job_queue"
+
+    job_id: Mapped[StringUUID] = mapped_column(
+        StringUuidType(native_uuid=False), ForeignKey("jobs.id"), primary_key=True
+    )
+    job_type: Mapped[str] = mapped_column(String, nullable=False)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=2)
+    repository_key: Mapped[str | None] = mapped_column(String, nullable=True)
+    state: Mapped[str] = mapped_column(
+        String, nullable=False, default="queued", index=True
+    )  # 'queued', 'running', 'completed', 'failed', 'cancelled'
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payload: Mapped[str | None] = mapped_column(
+        Text, nullable=True
+    )  # JSON: what is needed to rebuild the job
+    queued_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    job: Mapped["Job"] = relationship("Job", back_populates="queue_entry")
+
 
 class Schedule(Base):
     __tablename__ = "schedules"
@@ -250,6 +319,8 @@ class Schedule(Base):
     pre_job_hooks: Mapped[str | None] = mapped_column(Text, nullable=True)
     post_job_hooks: Mapped[str | None] = mapped_column(Text, nullable=True)
     patterns: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # JSON array of further repositories backed up from the same source
+    fan_out_targets: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     repository: Mapped["Repository"] = relationship(
         "Repository", back_populates="schedules"
@@ -19,6 +19,7 @@ class JobType(StrEnum):
 
     MANUAL_BACKUP = "Manual Backup"
     SCHEDULED_BACKUP = "Scheduled Backup"
+    FAN_OUT_BACKUP = "Fan-out Backup"
     PRUNE = "Prune"
     CHECK = "Check"
     BACKUP = "Backup"
@@ -49,6 +50,7 @@ class JobType(StrEnum):
         type_mapping = {
             "manual_backup": cls.MANUAL_BACKUP,
             "scheduled_backup": cls.SCHEDULED_BACKUP,
+            "fan_out_backup": cls.FAN_OUT_BACKUP,
             "prune": cls.PRUNE,
             "check": cls.CHECK,
             "backup": cls.BACKUP,
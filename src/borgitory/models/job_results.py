@@ -109,6 +109,21 @@ class RegularJobOutput:
 JobOutputResponse = Union[CompositeJobOutput, RegularJobOutput]
 
 
+@dataclass
+class TaskOutputRange:
+    """A range of stored output lines for a single task"""
+
+    job_id: uuid.UUID
+    task_order: int
+    start: int
+    lines: List[str]
+    total_lines: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.start + len(self.lines) < self.total_lines
+
+
 @dataclass
 class ManagerStats:
     """Job manager statistics"""
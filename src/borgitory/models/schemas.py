@@ -7,6 +7,9 @@ import json
 
 from borgitory.custom_types import ConfigDict
 from borgitory.services.hooks.hook_config import validate_hooks_json
+from borgitory.services.scheduling.fan_out_config import (
+    validate_fan_out_targets_json,
+)
 from borgitory.models.enums import EncryptionType
 
 
@@ -293,6 +296,7 @@ class ScheduleCreate(ScheduleBase):
     pre_job_hooks: Optional[str] = None
     post_job_hooks: Optional[str] = None
     patterns: Optional[str] = None
+    fan_out_targets: Optional[str] = None
 
     @field_validator("cloud_sync_config_id", mode="before")
     @classmethod
@@ -363,6 +367,17 @@ class ScheduleCreate(ScheduleBase):
             raise ValueError(f"Invalid patterns configuration: {error_msg}")
         return v.strip()
 
+    @field_validator("fan_out_targets", mode="before")
+    @classmethod
+    def validate_fan_out_targets(cls, v: Union[str, None]) -> Optional[str]:
+        if not v or v.strip() == "":
+            return None
+
+        is_valid, error_msg = validate_fan_out_targets_json(v)
+        if not is_valid:
+            raise ValueError(f"Invalid fan-out targets: {error_msg}")
+        return v.strip()
+
 
 class ScheduleUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=128)
@@ -377,6 +392,7 @@ class ScheduleUpdate(BaseModel):
     pre_job_hooks: Optional[str] = None
     post_job_hooks: Optional[str] = None
     patterns: Optional[str] = None
+    fan_out_targets: Optional[str] = None
 
     @field_validator("pre_job_hooks", mode="before")
     @classmethod
@@ -411,6 +427,17 @@ class ScheduleUpdate(BaseModel):
             raise ValueError(f"Invalid patterns configuration: {error_msg}")
         return v.strip()
 
+    @field_validator("fan_out_targets", mode="before")
+    @classmethod
+    def validate_fan_out_targets_update(cls, v: Optional[str]) -> Optional[str]:
+        if v is None or v.strip() == "":
+            return None
+
+        is_valid, error_msg = validate_fan_out_targets_json(v)
+        if not is_valid:
+            raise ValueError(f"Invalid fan-out targets: {error_msg}")
+        return v.strip()
+
     @field_validator("cron_expression")
     @classmethod
     def validate_cron_expression(cls, v: Optional[str]) -> Optional[str]:
@@ -599,6 +626,7 @@ class BackupRequest(BaseModel):
     pre_job_hooks: Optional[str] = None
     post_job_hooks: Optional[str] = None
     patterns: Optional[str] = None
+    fan_out_targets: Optional[str] = None
 
     @field_validator("dry_run", mode="before")
     @classmethod
@@ -654,6 +682,17 @@ class BackupRequest(BaseModel):
             raise ValueError(f"Invalid patterns configuration: {error_msg}")
         return v.strip()
 
+    @field_validator("fan_out_targets", mode="before")
+    @classmethod
+    def validate_fan_out_targets(cls, v: Union[str, None]) -> Optional[str]:
+        if not v or v.strip() == "":
+            return None
+
+        is_valid, error_msg = validate_fan_out_targets_json(v)
+        if not is_valid:
+            raise ValueError(f"Invalid fan-out targets: {error_msg}")
+        return v.strip()
+
 
 class CloudSyncConfigBase(BaseModel):
     name: str = Field(
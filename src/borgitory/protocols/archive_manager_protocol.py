@@ -38,6 +38,16 @@ class ArchiveManagerProtocol(Protocol):
         """
         ...
 
+    async def forget_archive(self, repository: "Repository", archive_name: str) -> None:
+        """
+        Drop every cached index of an archive after it has been deleted.
+
+        Args:
+            repository: The repository that contained the archive
+            archive_name: Name of the deleted archive
+        """
+        ...
+
     async def extract_file_stream(
         self, repository: "Repository", archive_name: str, file_path: str
     ) -> "StreamingResponse":
@@ -8,6 +8,7 @@ from typing import (
     Optional,
     List,
     Callable,
+    Iterator,
     TYPE_CHECKING,
     runtime_checkable,
 )
@@ -16,6 +17,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 if TYPE_CHECKING:
     from borgitory.services.cloud_providers.cloud_sync_service import CloudSyncService
+    from borgitory.services.jobs.process_output_capture import ProcessOutputCapture
+    from borgitory.services.jobs.process_resources import ProcessResourceUsage
 
 
 class CommandResult:
@@ -39,7 +42,13 @@ class CommandResult:
 
 
 class ProcessResult:
-    """Result of a process execution."""
+    """Result of a process execution.
+
+    When the output was captured in bounded mode ``stdout`` only holds its
+    tail and ``output`` gives streaming access to the complete output.
+    ``resource_usage`` holds what the process consumed, where it could be
+    sampled.
+    """
 
     def __init__(
         self,
@@ -47,11 +56,38 @@ class ProcessResult:
         stdout: bytes,
         stderr: bytes,
         error: Optional[str] = None,
+        output: Optional["ProcessOutputCapture"] = None,
+        resource_usage: Optional["ProcessResourceUsage"] = None,
     ):
         self.return_code = return_code
         self.stdout = stdout
         self.stderr = stderr
         self.error = error
+        self.output = output
+        self.resource_usage = resource_usage
+
+    def iter_stdout_lines(self) -> Iterator[str]:
+        """Stream non-empty output lines, reading spooled output lazily"""
+        if self.output is not None:
+            lines: Iterator[str] = self.output.iter_lines()
+        else:
+            lines = iter(self.stdout.decode("utf-8", errors="replace").split("\n"))
+        for line in lines:
+            if line.strip():
+                yield line
+
+    def stdout_tail_lines(self, count: int) -> List[str]:
+        """Last ``count`` non-empty output lines"""
+        if self.output is not None:
+            return self.output.tail_lines(count)
+        text = self.stdout.decode("utf-8", errors="replace").strip()
+        lines = [line for line in text.split("\n") if line.strip()]
+        return lines[-count:] if count > 0 else []
+
+    def close(self) -> None:
+        """Release any spooled output"""
+        if self.output is not None:
+            self.output.close()
 
 
 @runtime_checkable
@@ -85,6 +121,9 @@ class ProcessExecutorProtocol(Protocol):
         process: asyncio.subprocess.Process,
         output_callback: Optional[Callable[[str], None]] = None,
         progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+        log_json: bool = False,
+        bounded_output: bool = False,
+        resource_callback: Optional[Callable[["ProcessResourceUsage"], None]] = None,
     ) -> "ProcessResult":
         """Monitor a process and return the result when complete."""
         ...
@@ -117,6 +156,7 @@ class ProcessExecutorProtocol(Protocol):
         repository_path: str,
         passphrase: str,
         output_callback: Optional[Callable[[str], None]] = None,
+        progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
     ) -> "ProcessResult":
         """Execute a borg compact task."""
         ...
@@ -63,6 +63,16 @@ class JobDatabaseManagerProtocol(Protocol):
         """Save task data for a job to the database"""
         ...
 
+    async def save_job_tasks_batch(
+        self, jobs: Dict[uuid.UUID, List["BorgJobTask"]]
+    ) -> Dict[uuid.UUID, bool]:
+        """Save task data for several jobs in a single transaction"""
+        ...
+
+    async def clear_job_output(self, job_id: uuid.UUID) -> bool:
+        """Drop the stored output of a job's tasks and its search index entries"""
+        ...
+
     async def get_job_statistics(self) -> Dict[str, object]:
         """Get job statistics"""
         ...
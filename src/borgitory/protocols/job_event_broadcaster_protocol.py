@@ -3,12 +3,13 @@ Protocol for JobEventBroadcaster - defines the interface for event broadcasting
 """
 
 import asyncio
-from typing import Dict, List, AsyncGenerator, Optional, Protocol
+from typing import Dict, Iterable, List, AsyncGenerator, Optional, Protocol
 import uuid
 
 from borgitory.custom_types import ConfigDict
 from borgitory.services.jobs.broadcaster.event_type import EventType
 from borgitory.services.jobs.broadcaster.job_event import JobEvent
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
 
 
 class JobEventBroadcasterProtocol(Protocol):
@@ -20,13 +21,19 @@ class JobEventBroadcasterProtocol(Protocol):
         job_id: Optional[uuid.UUID] = None,
         data: Optional[ConfigDict] = None,
     ) -> None:
-        """Broadcast an event to all connected clients"""
+        """Broadcast an event to the clients subscribed to its topic"""
         ...
 
     def subscribe_client(
-        self, client_id: Optional[str] = None, send_recent_events: bool = True
+        self,
+        client_id: Optional[str] = None,
+        send_recent_events: bool = True,
+        job_id: Optional[uuid.UUID] = None,
+        task_index: Optional[int] = None,
+        event_types: Optional[Iterable[EventType]] = None,
+        overflow_policy: Optional[OverflowPolicy] = None,
     ) -> asyncio.Queue[JobEvent]:
-        """Subscribe a new client to events"""
+        """Subscribe a new client to events, optionally scoped to a job/task topic"""
         ...
 
     def unsubscribe_client(self, queue: asyncio.Queue[JobEvent]) -> bool:
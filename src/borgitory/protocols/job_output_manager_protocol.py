@@ -30,10 +30,50 @@ class JobOutputManagerProtocol(Protocol):
         text: str,
         line_type: str = "stdout",
         progress_info: Optional[Dict[str, object]] = None,
+        task_index: Optional[int] = None,
     ) -> None:
         """Add an output line for a specific job"""
         ...
 
+    async def add_output_lines(
+        self,
+        job_id: uuid.UUID,
+        lines: List[str],
+        line_type: str = "stdout",
+        progress_info: Optional[Dict[str, object]] = None,
+        task_index: Optional[int] = None,
+    ) -> None:
+        """Add a batch of output lines for a specific job"""
+        ...
+
+    async def has_task_output(self, job_id: uuid.UUID, task_index: int) -> bool:
+        """Check whether the log store holds output for a task"""
+        ...
+
+    async def get_task_line_count(self, job_id: uuid.UUID, task_index: int) -> int:
+        """Get the number of stored output lines for a task"""
+        ...
+
+    async def get_task_output_lines(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> List[str]:
+        """Read a range of stored output lines for a task"""
+        ...
+
+    async def get_task_output_tail(
+        self, job_id: uuid.UUID, task_index: int, count: int
+    ) -> List[str]:
+        """Read the last lines of stored output for a task"""
+        ...
+
+    async def get_task_output_text(self, job_id: uuid.UUID, task_index: int) -> str:
+        """Read the full stored output of a task as text"""
+        ...
+
     def get_job_output(self, job_id: uuid.UUID) -> Optional["JobOutput"]:
         """Get output container for a job"""
         ...
@@ -44,10 +84,14 @@ class JobOutputManagerProtocol(Protocol):
         """Get formatted output data for API responses"""
         ...
 
+    def close_job_output(self, job_id: uuid.UUID) -> None:
+        """Mark a job's output as finished so followers drain and stop"""
+        ...
+
     def stream_job_output(
-        self, job_id: uuid.UUID, follow: bool = True
+        self, job_id: uuid.UUID, follow: bool = True, since: int = 0
     ) -> AsyncGenerator[Dict[str, object], None]:
-        """Stream job output in real-time"""
+        """Stream job output in real-time, starting at absolute line ``since``"""
         ...
 
     def get_output_summary(self, job_id: uuid.UUID) -> Dict[str, object]:
@@ -58,6 +102,14 @@ class JobOutputManagerProtocol(Protocol):
         """Clear output data for a job"""
         ...
 
+    def delete_job_output(self, job_id: uuid.UUID) -> bool:
+        """Clear output data for a job and queue the deletion of its on-disk log"""
+        ...
+
+    async def wait_for_log_writes(self) -> None:
+        """Wait until every log write and deletion queued so far is done"""
+        ...
+
     def get_all_job_outputs(self) -> Dict[uuid.UUID, Dict[str, object]]:
         """Get summary of all job outputs"""
         ...
@@ -2,7 +2,17 @@
 Protocol interfaces for job management services.
 """
 
-from typing import Protocol, Dict, List, Optional, AsyncGenerator, TYPE_CHECKING, Any
+from typing import (
+    Protocol,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    AsyncGenerator,
+    Sequence,
+    TYPE_CHECKING,
+    Any,
+)
 from datetime import datetime
 from dataclasses import dataclass, field
 import asyncio
@@ -12,6 +22,7 @@ from borgitory.services.jobs.job_models import BorgJob, TaskTypeEnum
 
 if TYPE_CHECKING:
     from borgitory.models.job_results import JobStatus
+    from borgitory.services.jobs.job_memory_eviction import JobMemoryUsage
 
 
 @dataclass
@@ -29,9 +40,16 @@ class TaskDefinition:
     timeout: Optional[int] = None
     retry_count: Optional[int] = None
 
+    # Names of earlier tasks that must finish before this one starts. None
+    # means the task directly before it, so undeclared tasks run in order;
+    # tasks whose dependencies have finished may run in parallel.
+    depends_on: Optional[List[str]] = None
+
 
 if TYPE_CHECKING:
+    from borgitory.services.jobs.broadcaster.event_type import EventType
     from borgitory.services.jobs.broadcaster.job_event import JobEvent
+    from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
     from borgitory.models.database import Repository, Schedule
     from borgitory.services.debug_service import DebugInfo, SystemInfo, JobManagerInfo
     from sqlalchemy.orm import Session
@@ -77,8 +95,14 @@ class JobManagerProtocol(Protocol):
         ...
 
     # Event and streaming methods
-    def subscribe_to_events(self) -> Optional[asyncio.Queue["JobEvent"]]:
-        """Subscribe to job events."""
+    def subscribe_to_events(
+        self,
+        job_id: Optional[uuid.UUID] = None,
+        task_index: Optional[int] = None,
+        event_types: Optional[Iterable["EventType"]] = None,
+        overflow_policy: Optional["OverflowPolicy"] = None,
+    ) -> Optional[asyncio.Queue["JobEvent"]]:
+        """Subscribe to job events, optionally only for one job or job task."""
         ...
 
     def unsubscribe_from_events(self, client_queue: asyncio.Queue["JobEvent"]) -> bool:
@@ -86,7 +110,7 @@ class JobManagerProtocol(Protocol):
         ...
 
     def stream_job_output(
-        self, job_id: uuid.UUID
+        self, job_id: uuid.UUID, since: int = 0
     ) -> AsyncGenerator[Dict[str, object], None]:
         """Stream output for a specific job."""
         ...
@@ -101,6 +125,24 @@ class JobManagerProtocol(Protocol):
         """Get job output stream."""
         ...
 
+    async def get_task_line_count(self, job_id: uuid.UUID, task_index: int) -> int:
+        """Get the number of stored output lines for a task."""
+        ...
+
+    def get_memory_usage(self) -> "JobMemoryUsage":
+        """Estimate memory held by in-memory jobs and their output."""
+        ...
+
+    async def get_task_output_lines(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> List[str]:
+        """Read a range of stored output lines for a task."""
+        ...
+
     async def start_borg_command(
         self,
         command: List[str],
@@ -121,10 +163,19 @@ class JobManagerProtocol(Protocol):
         repository: "Repository",
         schedule: Optional["Schedule"] = None,
         cloud_sync_config_id: Optional[int] = None,
+        additional_repositories: Sequence["Repository"] = (),
     ) -> uuid.UUID:
         """Create a composite job with multiple tasks."""
         ...
 
+    async def restore_queued_jobs(self) -> int:
+        """Re-enqueue durable jobs left queued or running by a restart."""
+        ...
+
+    async def shutdown(self) -> None:
+        """Stop running jobs and persist buffered state before exit."""
+        ...
+
     def get_queue_stats(self) -> Dict[str, int]:
         """Get queue statistics."""
         ...
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
         QueuedJob,
         QueueStats,
     )
+    from borgitory.services.jobs.job_queue_store import JobQueueStore
 
 
 class JobQueueManagerProtocol(Protocol):
@@ -21,6 +22,8 @@ class JobQueueManagerProtocol(Protocol):
     max_concurrent_backups: int
     max_concurrent_operations: int
     queue_poll_interval: float
+    priority_aging_interval: float
+    store: Optional["JobQueueStore"]
 
     async def enqueue_job(
         self,
@@ -28,10 +31,25 @@ class JobQueueManagerProtocol(Protocol):
         job_type: str,
         priority: "JobPriority" = ...,
         metadata: Optional[Dict[str, object]] = None,
+        repository_key: Optional[str] = None,
+        durable: bool = False,
+        additional_repository_keys: Optional[List[str]] = None,
     ) -> bool:
         """Add a job to the appropriate queue"""
         ...
 
+    async def submit(self, queued_job: "QueuedJob") -> bool:
+        """Add a prepared job, such as one restored after a restart"""
+        ...
+
+    def mark_job_completed(self, job_id: uuid.UUID, success: bool) -> None:
+        """Release the slot and repository held by a started job"""
+        ...
+
+    def remove_job(self, job_id: uuid.UUID) -> bool:
+        """Drop a job that has not been started yet from its queue"""
+        ...
+
     def set_callbacks(
         self,
         job_start_callback: Optional[Callable[[uuid.UUID, "QueuedJob"], None]] = None,
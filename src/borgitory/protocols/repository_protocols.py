@@ -97,6 +97,14 @@ class ArchiveServiceProtocol(Protocol):
         """Stream file content from an archive."""
         ...
 
+    async def forget_archive(
+        self,
+        repository: "Repository",  # Repository model
+        archive_name: str,
+    ) -> None:
+        """Drop cached indexes of an archive that was deleted."""
+        ...
+
 
 class RepositoryServiceProtocol(Protocol):
     """Protocol for repository management operations."""
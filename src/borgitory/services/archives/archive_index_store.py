@@ -0,0 +1,305 @@
+"""
+Archive Index Store - Persistent on-disk index of archive directory trees
+
+Borg archives are immutable: an archive ID always refers to the same
+contents. Once an archive has been listed, its tree is written to a SQLite
+file of its repository (one file per repository under ``base_dir``), keyed
+by the archive ID. Later browses of the archive, including after a
+restart, are answered from the file with one indexed query per directory
+instead of a new ``borg list``.
+
+Files are opened lazily on first use. An archive's rows are only removed
+when the archive is deleted or no longer exists in the repository (pruned);
+there is no expiry. The files are a cache: a file with an older schema is
+dropped and rebuilt.
+
+Calls are blocking; callers on the event loop run them in a thread.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import (
+    ArchiveTree,
+    normalize_archive_path,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    entry_count INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_archives_name ON archives (name);
+CREATE TABLE IF NOT EXISTS directories (
+    archive_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    children_count INTEGER NOT NULL,
+    PRIMARY KEY (archive_id, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entries (
+    archive_id TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime TEXT,
+    mode TEXT,
+    uid INTEGER,
+    gid INTEGER,
+    healthy INTEGER,
+    PRIMARY KEY (archive_id, parent, name)
+) WITHOUT ROWID;
+"""
+
+_LIST_DIRECTORY = """
+SELECT e.name, e.type, e.size, e.mtime, e.mode, e.uid, e.gid, e.healthy,
+       d.size, d.children_count
+FROM entries e
+LEFT JOIN directories d
+    ON e.type = 'd'
+    AND d.archive_id = e.archive_id
+    AND d.path = CASE WHEN e.parent = '' THEN e.name
+                      ELSE e.parent || '/' || e.name END
+WHERE e.archive_id = ? AND e.parent = ?
+"""
+
+
+class ArchiveIndexStore:
+    """Per-repository SQLite files of archive trees, keyed by archive ID"""
+
+    def __init__(self, base_dir: str) -> None:
+        self.base_dir = base_dir
+        self._connections: Dict[str, Tuple[sqlite3.Connection, threading.Lock]] = {}
+        self._connections_lock = threading.Lock()
+
+    def index_path(self, repository_path: str) -> str:
+        """File holding the index of a repository"""
+        digest = hashlib.sha256(repository_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.base_dir, f"{digest[:32]}.sqlite")
+
+    def has_archive(self, repository_path: str, archive_id: str) -> bool:
+        with self._open(repository_path, create=False) as connection:
+            if connection is None:
+                return False
+            row = connection.execute(
+                "SELECT 1 FROM archives WHERE id = ?", (archive_id,)
+            ).fetchone()
+            return row is not None
+
+    def list_directory(
+        self, repository_path: str, archive_id: str, path: str = ""
+    ) -> Optional[List[ArchiveEntry]]:
+        """Immediate children of a directory, or None if the archive is not indexed
+
+        Ordered and shaped like ``ArchiveTree.list_directory``.
+        """
+        path = normalize_archive_path(path)
+        with self._open(repository_path, create=False) as connection:
+            if connection is None:
+                return None
+            if (
+                connection.execute(
+                    "SELECT 1 FROM archives WHERE id = ?", (archive_id,)
+                ).fetchone()
+                is None
+            ):
+                return None
+            rows = connection.execute(_LIST_DIRECTORY, (archive_id, path)).fetchall()
+
+        entries = []
+        for (
+            name,
+            type_char,
+            size,
+            mtime,
+            mode,
+            uid,
+            gid,
+            healthy,
+            total_size,
+            children_count,
+        ) in rows:
+            isdir = type_char == "d"
+            entries.append(
+                ArchiveEntry(
+                    path=f"{path}/{name}" if path else name,
+                    name=name,
+                    type=type_char,
+                    size=(total_size or 0) if isdir else size,
+                    isdir=isdir,
+                    mtime=mtime,
+                    mode=mode,
+                    uid=uid,
+                    gid=gid,
+                    healthy=None if healthy is None else bool(healthy),
+                    children_count=(children_count or 0) if isdir else None,
+                )
+            )
+        entries.sort(key=lambda entry: (not entry.isdir, entry.name.lower()))
+        return entries
+
+    def store_tree(
+        self,
+        repository_path: str,
+        archive_id: str,
+        archive_name: str,
+        tree: ArchiveTree,
+    ) -> None:
+        """Write the complete tree of an archive, replacing any earlier index"""
+        with self._open(repository_path, create=True) as connection:
+            assert connection is not None
+            with connection:
+                self._delete_rows(connection, [archive_id])
+                connection.executemany(
+                    "INSERT INTO directories VALUES (?, ?, ?, ?)",
+                    (
+                        (archive_id, path, size, len(children))
+                        for path, size, children in tree.directories()
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._entry_rows(archive_id, tree.directories()),
+                )
+                connection.execute(
+                    "INSERT INTO archives VALUES (?, ?, ?, ?)",
+                    (archive_id, archive_name, len(tree), datetime.now().isoformat()),
+                )
+        logger.info(
+            f"Indexed {len(tree)} items of archive {archive_name} ({archive_id[:12]}) on disk"
+        )
+
+    def forget_archive(self, repository_path: str, archive_name: str) -> int:
+        """Remove the index of an archive by name; returns archives removed"""
+        with self._open(repository_path, create=False) as connection:
+            if connection is None:
+                return 0
+            with connection:
+                ids = [
+                    row[0]
+                    for row in connection.execute(
+                        "SELECT id FROM archives WHERE name = ?", (archive_name,)
+                    )
+                ]
+                self._delete_rows(connection, ids)
+        return len(ids)
+
+    def retain_archives(self, repository_path: str, archive_ids: Iterable[str]) -> int:
+        """Remove the index of every archive not in ``archive_ids``
+
+        Called with the repository's current archives, this drops archives
+        that were pruned or deleted outside of this application.
+        """
+        keep = set(archive_ids)
+        with self._open(repository_path, create=False) as connection:
+            if connection is None:
+                return 0
+            with connection:
+                stale = [
+                    row[0]
+                    for row in connection.execute("SELECT id FROM archives")
+                    if row[0] not in keep
+                ]
+                self._delete_rows(connection, stale)
+        if stale:
+            logger.info(
+                f"Removed on-disk index of {len(stale)} archives no longer in {repository_path}"
+            )
+        return len(stale)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection, lock in self._connections.values():
+                with lock:
+                    connection.close()
+            self._connections.clear()
+
+    def _open(self, repository_path: str, create: bool) -> "_LockedConnection":
+        with self._connections_lock:
+            opened = self._connections.get(repository_path)
+            if opened is None:
+                index_path = self.index_path(repository_path)
+                if not create and not os.path.exists(index_path):
+                    return _LockedConnection(None, None)
+                opened = (self._connect(index_path), threading.Lock())
+                self._connections[repository_path] = opened
+        return _LockedConnection(*opened)
+
+    def _connect(self, index_path: str) -> sqlite3.Connection:
+        os.makedirs(self.base_dir, exist_ok=True)
+        connection = sqlite3.connect(index_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with connection:
+                for table in ("archives", "directories", "entries"):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    @staticmethod
+    def _delete_rows(connection: sqlite3.Connection, archive_ids: List[str]) -> None:
+        for archive_id in archive_ids:
+            for table, column in (
+                ("entries", "archive_id"),
+                ("directories", "archive_id"),
+                ("archives", "id"),
+            ):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE {column} = ?", (archive_id,)
+                )
+
+    @staticmethod
+    def _entry_rows(
+        archive_id: str, directories: Iterable[Tuple[str, int, List[ArchiveEntry]]]
+    ) -> Iterator[Tuple[object, ...]]:
+        for path, _, children in directories:
+            for entry in children:
+                yield (
+                    archive_id,
+                    path,
+                    entry.name,
+                    entry.type,
+                    entry.size,
+                    entry.mtime,
+                    entry.mode,
+                    entry.uid,
+                    entry.gid,
+                    None if entry.healthy is None else int(entry.healthy),
+                )
+
+
+class _LockedConnection:
+    """Holds a connection's lock for the duration of a ``with`` block"""
+
+    def __init__(
+        self,
+        connection: Optional[sqlite3.Connection],
+        lock: Optional[threading.Lock],
+    ) -> None:
+        self._connection = connection
+        self._lock = lock
+
+    def __enter__(self) -> Optional[sqlite3.Connection]:
+        if self._lock is not None:
+            self._lock.acquire()
+        return self._connection
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._lock is not None:
+            self._lock.release()
@@ -0,0 +1,205 @@
+"""
+Archive Listing - Streaming ``borg list --json-lines`` into an archive tree
+
+The listing reads borg's output line by line as it arrives, parses each
+line into an ``ArchiveEntry`` and adds it to an ``ArchiveTree`` straight
+away, so neither the raw output nor a list of all entries is held in
+memory. Requests for a directory wait only until that directory is
+complete in the tree, not for the whole listing.
+
+There is no overall timeout: the listing runs as long as borg keeps
+producing output and is only stopped when no line arrives for
+``stall_timeout`` seconds.
+"""
+
+import asyncio
+import json
+import logging
+from pathlib import PurePath
+from typing import Dict, Optional
+
+from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import (
+    ArchiveTree,
+    normalize_archive_path,
+)
+
+logger = logging.getLogger(__name__)
+
+# Most stderr kept for the error message of a failed listing
+STDERR_TAIL_BYTES = 64 * 1024
+
+
+def parse_borg_list_line(line: str) -> Optional[ArchiveEntry]:
+    """Parse one line of ``borg list --json-lines`` output
+
+    Returns None for blank lines. Raises ValueError (or json.JSONDecodeError)
+    for lines that are not a borg item.
+    """
+    if not line.strip():
+        return None
+
+    data = json.loads(line)
+
+    # Parse item type
+    type_char = data.get("type", "-")
+    if type_char == "d":
+        item_type = "d"  # directory
+    elif type_char == "-":
+        item_type = "f"  # file
+    elif type_char == "l":
+        item_type = "l"  # symlink
+    else:
+        item_type = "f"  # default to file for other types
+
+    # Extract name from path
+    path = data.get("path", "")
+    name = PurePath(path).name if path else ""
+
+    # Parse size from default JSON output
+    try:
+        size = int(data.get("size", 0))
+    except (ValueError, TypeError):
+        size = 0
+
+    # Extract mode (permissions)
+    mode = data.get("mode", "")
+    if mode and len(mode) >= 4:
+        # Extract user permissions (e.g., "rwx" from "drwxr-xr-x")
+        user_mode = mode[1:4] if mode.startswith(("d", "-", "l")) else mode[:3]
+    else:
+        user_mode = None
+
+    return ArchiveEntry(
+        path=path,
+        name=name,
+        type=item_type,
+        size=size,
+        isdir=item_type == "d",
+        mtime=data.get("mtime"),
+        mode=user_mode,
+        uid=int(data.get("uid", 0)) if data.get("uid") is not None else None,
+        gid=int(data.get("gid", 0)) if data.get("gid") is not None else None,
+        healthy=data.get("healthy", True),  # Use actual healthy status from JSON
+    )
+
+
+class ArchiveListing:
+    """One running ``borg list`` of an archive, feeding an ArchiveTree"""
+
+    def __init__(self, name: str, stall_timeout: float = 300.0) -> None:
+        self.name = name
+        self.stall_timeout = stall_timeout
+        self.tree = ArchiveTree()
+        self.tree.on_sealed = self._directory_sealed
+        self.error: Optional[str] = None
+        self._done = asyncio.Event()
+        # Directory path -> event set once the directory is complete
+        self._waiters: Dict[str, asyncio.Event] = {}
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    async def wait_for_directory(self, path: str) -> None:
+        """Wait until a directory can be listed; raises if the listing failed"""
+        path = normalize_archive_path(path)
+        if not self.tree.is_complete(path) and not self.done:
+            event = self._waiters.get(path)
+            if event is None:
+                event = self._waiters[path] = asyncio.Event()
+            await event.wait()
+        if self.error is not None and not self.tree.is_complete(path):
+            raise Exception(f"Borg list failed: {self.error}")
+
+    async def wait(self) -> None:
+        """Wait for the whole listing; raises if it failed"""
+        await self._done.wait()
+        if self.error is not None:
+            raise Exception(f"Borg list failed: {self.error}")
+
+    async def run(self, process: asyncio.subprocess.Process) -> None:
+        """Read the process's output into the tree until it exits"""
+        stderr_tail = bytearray()
+        stderr_reader = asyncio.create_task(self._read_stderr(process, stderr_tail))
+        skipped = 0
+        try:
+            if process.stdout is None:
+                raise Exception("borg list has no output stream")
+            while True:
+                try:
+                    line = await asyncio.wait_for(
+                        process.stdout.readline(), timeout=self.stall_timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise Exception(
+                        f"no output from borg list for {self.stall_timeout:g}s"
+                    )
+                if not line:
+                    break
+                text = line.decode("utf-8", errors="replace")
+                try:
+                    entry = parse_borg_list_line(text)
+                except (ValueError, KeyError) as e:
+                    skipped += 1
+                    logger.warning(
+                        f"Failed to parse borg list line: {text[:100]}... Error: {e}"
+                    )
+                    continue
+                if entry is not None:
+                    self.tree.add(entry)
+
+            return_code = await process.wait()
+            await stderr_reader
+            if return_code != 0:
+                stderr_text = stderr_tail.decode("utf-8", errors="replace").strip()
+                raise Exception(stderr_text or f"exit code {return_code}")
+
+            self.tree.finish()
+            logger.info(
+                f"Listed {len(self.tree)} items of archive {self.name}"
+                + (f" ({skipped} unparseable lines skipped)" if skipped else "")
+            )
+        except BaseException as e:
+            self.error = str(e) or type(e).__name__
+            logger.error(f"Listing archive {self.name} failed: {self.error}")
+            await self._stop(process)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            stderr_reader.cancel()
+            self._done.set()
+            for event in self._waiters.values():
+                event.set()
+            self._waiters.clear()
+            self.tree.on_sealed = None
+
+    def _directory_sealed(self, path: str) -> None:
+        event = self._waiters.pop(path, None)
+        if event is not None:
+            event.set()
+
+    async def _read_stderr(
+        self, process: asyncio.subprocess.Process, tail: bytearray
+    ) -> None:
+        if process.stderr is None:
+            return
+        while True:
+            chunk = await process.stderr.read(65536)
+            if not chunk:
+                return
+            tail.extend(chunk)
+            if len(tail) > STDERR_TAIL_BYTES:
+                del tail[:-STDERR_TAIL_BYTES]
+
+    async def _stop(self, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
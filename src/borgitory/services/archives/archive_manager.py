@@ -6,15 +6,29 @@ import asyncio
 import json
 import logging
 import os
-from pathlib import PurePath
-from typing import List, AsyncGenerator, Dict, Optional, TYPE_CHECKING
+from collections import OrderedDict
+from typing import List, AsyncGenerator, Dict, Optional, Set, TYPE_CHECKING
 from datetime import datetime, timedelta
 
 from starlette.responses import StreamingResponse
 
 from borgitory.models.database import Repository
+from borgitory.services.archives.archive_index_store import ArchiveIndexStore
+from borgitory.services.archives.archive_listing import (
+    ArchiveListing,
+    parse_borg_list_line,
+)
 from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import (
+    ArchiveTree,
+    normalize_archive_path,
+)
 from borgitory.protocols.command_executor_protocol import CommandExecutorProtocol
+from borgitory.services.metrics.app_metrics import (
+    CACHE_EVICTIONS,
+    CACHE_REQUESTS,
+    CACHE_RESIDENT_BYTES,
+)
 from borgitory.utils.security import (
     create_borg_command,
     validate_archive_name,
@@ -35,7 +49,12 @@ class ArchiveManager:
     - Works reliably across different platforms
     - Uses direct borg commands for better performance
     - Provides the same interface as the mount-based manager
-    - Caches archive contents in memory for improved performance
+    - Caches a directory tree index of archive contents in memory, so each
+      directory listing only touches that directory's children. The cache
+      is bounded by an estimated memory budget and evicts the least
+      recently used trees first
+    - Optionally persists the trees on disk by archive ID, so archives
+      listed once are browsed without borg even after a restart
     """
 
     def __init__(
@@ -43,14 +62,44 @@ class ArchiveManager:
         job_executor: "ProcessExecutorProtocol",
         command_executor: CommandExecutorProtocol,
         cache_ttl: timedelta = timedelta(minutes=30),
+        list_stall_timeout: float = 300.0,
+        index_store: Optional[ArchiveIndexStore] = None,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        cache_sweep_interval: float = 60.0,
     ) -> None:
         self.job_executor = job_executor
         self.command_executor = command_executor
         self.cache_ttl = cache_ttl
-
-        # In-memory cache for archive contents
-        # Key: "repository_path::archive_name", Value: (items, cached_at)
-        self._archive_cache: Dict[str, tuple[List[ArchiveEntry], datetime]] = {}
+        # Estimated memory the cached trees may hold in total
+        self.cache_max_bytes = cache_max_bytes
+        # Seconds between background removals of expired trees
+        self.cache_sweep_interval = cache_sweep_interval
+        # Seconds without output after which a borg list is abandoned
+        self.list_stall_timeout = list_stall_timeout
+
+        # In-memory cache of archive directory trees, least recently used first
+        # Key: "repository_path::archive_name", Value: (tree, cached_at)
+        self._archive_cache: OrderedDict[str, tuple[ArchiveTree, datetime]] = (
+            OrderedDict()
+        )
+        # Estimated bytes of each cached tree, fixed when it was cached
+        self._cache_sizes: Dict[str, int] = {}
+        self._cache_bytes = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._cache_expirations = 0
+        self._sweep_task: Optional["asyncio.Task[None]"] = None
+
+        # Running borg list processes by cache key
+        self._listings: Dict[str, ArchiveListing] = {}
+        self._listing_tasks: Set["asyncio.Task[None]"] = set()
+
+        # On-disk archive trees keyed by archive ID, and the IDs of archive
+        # names as last resolved from the repository
+        # Key: "repository_path::archive_name", Value: (archive_id, resolved_at)
+        self.index_store = index_store
+        self._archive_ids: Dict[str, tuple[str, datetime]] = {}
 
     def _get_cache_key(self, repository: Repository, archive_name: str) -> str:
         """Generate cache key for repository and archive combination"""
@@ -60,31 +109,113 @@ class ArchiveManager:
         """Check if cached data is still valid based on TTL"""
         return datetime.now() - cached_at < self.cache_ttl
 
-    def _get_cached_items(
+    def _get_cached_tree(
         self, repository: Repository, archive_name: str
-    ) -> Optional[List[ArchiveEntry]]:
-        """Get cached archive items if available and valid"""
+    ) -> Optional[ArchiveTree]:
+        """Get the cached archive tree if available and valid"""
         cache_key = self._get_cache_key(repository, archive_name)
 
         if cache_key in self._archive_cache:
-            items, cached_at = self._archive_cache[cache_key]
+            tree, cached_at = self._archive_cache[cache_key]
             if self._is_cache_valid(cached_at):
                 logger.info(f"Cache hit for {cache_key}")
-                return items
+                CACHE_REQUESTS.labels("archive", "hit").inc()
+                self._cache_hits += 1
+                self._archive_cache.move_to_end(cache_key)
+                return tree
             else:
                 logger.info(f"Cache expired for {cache_key}")
+                CACHE_REQUESTS.labels("archive", "expired").inc()
                 # Remove expired entry
-                del self._archive_cache[cache_key]
-
+                self._remove_cached(cache_key)
+                self._cache_expirations += 1
+                CACHE_EVICTIONS.labels("archive", "expired").inc()
+                self._cache_misses += 1
+                return None
+
+        CACHE_REQUESTS.labels("archive", "miss").inc()
+        self._cache_misses += 1
         return None
 
-    def _cache_items(
-        self, repository: Repository, archive_name: str, items: List[ArchiveEntry]
+    def _cache_tree(
+        self, repository: Repository, archive_name: str, tree: ArchiveTree
     ) -> None:
-        """Cache archive items with current timestamp"""
+        """Cache an archive tree with current timestamp
+
+        Least recently used trees are evicted until the cache fits its
+        memory budget again; a tree larger than the whole budget is not kept.
+        """
         cache_key = self._get_cache_key(repository, archive_name)
-        self._archive_cache[cache_key] = (items, datetime.now())
-        logger.info(f"Cached {len(items)} items for {cache_key}")
+        self._remove_cached(cache_key)
+        size = tree.estimated_bytes
+        self._archive_cache[cache_key] = (tree, datetime.now())
+        self._cache_sizes[cache_key] = size
+        self._cache_bytes += size
+        CACHE_RESIDENT_BYTES.labels("archive").inc(size)
+        logger.info(
+            f"Cached {len(tree)} items in {tree.directory_count} directories for {cache_key} (~{size} bytes)"
+        )
+
+        while self._cache_bytes > self.cache_max_bytes and self._archive_cache:
+            evicted_key = next(iter(self._archive_cache))
+            self._remove_cached(evicted_key)
+            self._cache_evictions += 1
+            CACHE_EVICTIONS.labels("archive", "size").inc()
+            logger.info(f"Evicted {evicted_key} from archive cache to fit the budget")
+
+        self._start_cache_sweeper()
+
+    def _remove_cached(self, cache_key: str) -> None:
+        if self._archive_cache.pop(cache_key, None) is None:
+            return
+        size = self._cache_sizes.pop(cache_key)
+        self._cache_bytes -= size
+        CACHE_RESIDENT_BYTES.labels("archive").dec(size)
+
+    def _sweep_expired_cache(self) -> int:
+        """Remove every expired tree; returns how many were removed"""
+        expired = [
+            key
+            for key, (_, cached_at) in self._archive_cache.items()
+            if not self._is_cache_valid(cached_at)
+        ]
+        for key in expired:
+            self._remove_cached(key)
+        if expired:
+            self._cache_expirations += len(expired)
+            CACHE_EVICTIONS.labels("archive", "expired").inc(len(expired))
+            logger.info(f"Removed {len(expired)} expired archives from cache")
+        return len(expired)
+
+    def _start_cache_sweeper(self) -> None:
+        """Sweep expired trees in the background while anything is cached"""
+        if self._sweep_task is not None or self.cache_sweep_interval <= 0:
+            return
+        try:
+            self._sweep_task = asyncio.get_running_loop().create_task(
+                self._run_cache_sweeper()
+            )
+        except RuntimeError:
+            # Not on an event loop; expired trees are removed on access
+            pass
+
+    async def _run_cache_sweeper(self) -> None:
+        try:
+            while self._archive_cache:
+                await asyncio.sleep(self.cache_sweep_interval)
+                self._sweep_expired_cache()
+        finally:
+            self._sweep_task = None
+
+    async def close(self) -> None:
+        """Stop the background cache sweeper"""
+        task = self._sweep_task
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
     def clear_cache(
         self,
@@ -100,7 +231,8 @@ class ArchiveManager:
         """
         if repository is None:
             # Clear all cache
-            self._archive_cache.clear()
+            for key in list(self._archive_cache):
+                self._remove_cached(key)
             logger.info("Cleared all archive cache")
         elif archive_name is None:
             # Clear cache for all archives in this repository
@@ -111,7 +243,7 @@ class ArchiveManager:
                 if key.startswith(f"{repo_path}::")
             ]
             for key in keys_to_remove:
-                del self._archive_cache[key]
+                self._remove_cached(key)
             logger.info(
                 f"Cleared cache for repository {repo_path} ({len(keys_to_remove)} entries)"
             )
@@ -119,7 +251,7 @@ class ArchiveManager:
             # Clear cache for specific repository and archive
             cache_key = self._get_cache_key(repository, archive_name)
             if cache_key in self._archive_cache:
-                del self._archive_cache[cache_key]
+                self._remove_cached(cache_key)
                 logger.info(f"Cleared cache for {cache_key}")
 
     def get_cache_stats(self) -> Dict[str, int]:
@@ -137,6 +269,12 @@ class ArchiveManager:
             "valid_entries": valid_entries,
             "expired_entries": expired_entries,
             "cache_ttl_minutes": int(self.cache_ttl.total_seconds() / 60),
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "evictions": self._cache_evictions,
+            "expirations": self._cache_expirations,
+            "resident_bytes": self._cache_bytes,
+            "max_bytes": self.cache_max_bytes,
         }
 
     async def list_archive_directory_contents(
@@ -146,47 +284,50 @@ class ArchiveManager:
         List contents of a specific directory within an archive using borg list command.
 
         This implementation:
-        1. Checks cache first for the complete archive contents
-        2. Uses borg list with JSON output to get all items if not cached
-        3. Filters items to show only immediate children of the target path
-        4. Groups items by their immediate parent directory
-        5. Returns the same ArchiveEntry format as the mount-based implementation
+        1. Checks the cache for a directory tree of the archive
+        2. Otherwise streams all items from borg list (JSON lines) into the
+           tree index, waiting only until the target directory is complete
+        3. Returns the immediate children of the target path from the tree
         """
         logger.info(
             f"Listing directory '{path}' in archive '{archive_name}' of repository '{repository.name}' using borg list"
         )
 
-        # Clean and normalize the path
-        clean_path = path.strip().strip("/")
+        clean_path = normalize_archive_path(path)
 
         try:
-            # Try to get cached items first
-            all_items = self._get_cached_items(repository, archive_name)
+            tree = self._get_cached_tree(repository, archive_name)
 
-            if all_items is None:
-                # Cache miss - get all items from the archive using borg list
-                logger.info(
-                    f"Cache miss for {repository.path}::{archive_name}, fetching from borg"
-                )
-                all_items = await self._get_archive_items(repository, archive_name)
-
-                # Cache the results
-                self._cache_items(repository, archive_name, all_items)
+            if tree is not None:
+                items = tree.list_directory(clean_path)
             else:
-                logger.info(f"Cache hit for {repository.path}::{archive_name}")
-
-            # Filter to show only immediate children of the target path
-            filtered_items = self._filter_directory_contents(all_items, clean_path)
+                items = await self._list_uncached_directory(
+                    repository, archive_name, clean_path
+                )
 
             logger.info(
-                f"Listed {len(filtered_items)} items from archive {archive_name} path '{path}'"
+                f"Listed {len(items)} items from archive {archive_name} path '{path}'"
             )
-            return filtered_items
+            return items
 
         except Exception as e:
             logger.error(f"Error listing directory {path}: {e}")
             raise Exception(f"Failed to list directory: {str(e)}")
 
+    async def forget_archive(self, repository: Repository, archive_name: str) -> None:
+        """Drop every cached and on-disk index of an archive that was deleted"""
+        self.clear_cache(repository, archive_name)
+        self._archive_ids.pop(self._get_cache_key(repository, archive_name), None)
+        if self.index_store is not None:
+            try:
+                await asyncio.to_thread(
+                    self.index_store.forget_archive, repository.path, archive_name
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Could not remove on-disk index of archive {archive_name}: {e}"
+                )
+
     async def extract_file_stream(
         self, repository: Repository, archive_name: str, file_path: str
     ) -> StreamingResponse:
@@ -287,48 +428,173 @@ class ArchiveManager:
             logger.error(f"Failed to extract file {file_path}: {str(e)}")
             raise Exception(f"Failed to extract file: {str(e)}")
 
-    async def _get_archive_items(
-        self, repository: Repository, archive_name: str
+    async def _list_uncached_directory(
+        self, repository: Repository, archive_name: str, path: str
     ) -> List[ArchiveEntry]:
-        """
-        Get all items from an archive using borg list command with JSON output.
+        """List a directory of an archive whose tree is not cached in memory"""
+        cache_key = self._get_cache_key(repository, archive_name)
+        listing = self._listings.get(cache_key)
 
-        Returns a flat list of all ArchiveEntry objects in the archive.
-        """
-        # Build the borg list command with JSON output
-        base_command = "borg list"
-        additional_args = [
-            "--json-lines",
-            f"{repository.path}::{archive_name}",
-        ]
+        archive_id = None
+        if listing is None and self.index_store is not None:
+            archive_id = await self._resolve_archive_id(repository, archive_name)
+            if archive_id is not None:
+                try:
+                    items = await asyncio.to_thread(
+                        self.index_store.list_directory,
+                        repository.path,
+                        archive_id,
+                        path,
+                    )
+                except Exception as e:
+                    logger.warning(f"Reading on-disk index of {cache_key} failed: {e}")
+                    items = None
+                if items is not None:
+                    CACHE_REQUESTS.labels("archive_index", "hit").inc()
+                    return items
+                CACHE_REQUESTS.labels("archive_index", "miss").inc()
+
+        # Stream the archive's items from borg list and answer as soon as
+        # the requested directory is complete
+        logger.info(f"Cache miss for {cache_key}, fetching from borg")
+        if listing is None:
+            listing = await self._get_archive_listing(
+                repository, archive_name, archive_id
+            )
+        await listing.wait_for_directory(path)
+        return listing.tree.list_directory(path)
 
-        borg_command = create_borg_command(
-            base_command=base_command,
-            repository_path="",
-            passphrase=repository.get_passphrase(),
-            additional_args=additional_args,
-        )
+    async def _resolve_archive_id(
+        self, repository: Repository, archive_name: str
+    ) -> Optional[str]:
+        """ID of a named archive, from ``borg list --json`` of the repository
+
+        The IDs of all archives of the repository are remembered for the
+        cache TTL. Each resolution also drops the on-disk index of archives
+        that no longer exist, e.g. after a prune. Returns None if borg
+        cannot be asked; the archive is then listed without the disk index.
+        """
+        cache_key = self._get_cache_key(repository, archive_name)
+        resolved = self._archive_ids.get(cache_key)
+        if resolved is not None and self._is_cache_valid(resolved[1]):
+            return resolved[0]
 
         try:
-            cmd_result = await self.command_executor.execute_command(
+            borg_command = create_borg_command(
+                base_command="borg list",
+                repository_path=repository.path,
+                passphrase=repository.get_passphrase(),
+                additional_args=["--json"],
+            )
+            result = await self.command_executor.execute_command(
                 command=borg_command.command,
                 env=borg_command.environment,
-                timeout=60.0,
+                timeout=60,
             )
+            if not result.success:
+                raise Exception(result.stderr.strip() or "borg list failed")
+            archives = json.loads(result.stdout).get("archives", [])
+        except Exception as e:
+            logger.warning(f"Could not resolve archive IDs of {repository.path}: {e}")
+            return None
+
+        resolved_at = datetime.now()
+        archive_ids = []
+        for archive in archives:
+            if archive.get("name") and archive.get("id"):
+                archive_ids.append(archive["id"])
+                self._archive_ids[self._get_cache_key(repository, archive["name"])] = (
+                    archive["id"],
+                    resolved_at,
+                )
 
-            if not cmd_result.success:
-                error_text = cmd_result.stderr or cmd_result.error or "Unknown error"
-                raise Exception(f"Borg list failed: {error_text}")
+        if self.index_store is not None:
+            try:
+                await asyncio.to_thread(
+                    self.index_store.retain_archives, repository.path, archive_ids
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Pruning on-disk index of {repository.path} failed: {e}"
+                )
 
-            # Parse the JSON lines output
-            items = self._parse_borg_list_output(cmd_result.stdout)
+        resolved = self._archive_ids.get(cache_key)
+        return resolved[0] if resolved is not None else None
 
-            logger.info(f"Retrieved {len(items)} items from archive {archive_name}")
-            return items
+    async def _get_archive_listing(
+        self,
+        repository: Repository,
+        archive_name: str,
+        archive_id: Optional[str] = None,
+    ) -> ArchiveListing:
+        """Get the running borg list of an archive, starting one if needed
+
+        Concurrent requests for the same archive share one listing. The
+        listing runs in the background, so it completes and is cached even
+        if the request that started it goes away.
+        """
+        cache_key = self._get_cache_key(repository, archive_name)
+        listing = self._listings.get(cache_key)
+        if listing is not None:
+            return listing
 
-        except Exception as e:
-            logger.error(f"Error getting archive items: {e}")
-            raise
+        borg_command = create_borg_command(
+            base_command="borg list",
+            repository_path="",
+            passphrase=repository.get_passphrase(),
+            additional_args=[
+                "--json-lines",
+                f"{repository.path}::{archive_name}",
+            ],
+        )
+        process = await self.command_executor.create_subprocess(
+            command=borg_command.command,
+            env=borg_command.environment,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        listing = ArchiveListing(cache_key, stall_timeout=self.list_stall_timeout)
+        self._listings[cache_key] = listing
+        task = asyncio.create_task(
+            self._run_archive_listing(
+                repository, archive_name, archive_id, listing, process
+            )
+        )
+        self._listing_tasks.add(task)
+        task.add_done_callback(self._listing_tasks.discard)
+        return listing
+
+    async def _run_archive_listing(
+        self,
+        repository: Repository,
+        archive_name: str,
+        archive_id: Optional[str],
+        listing: ArchiveListing,
+        process: asyncio.subprocess.Process,
+    ) -> None:
+        try:
+            await listing.run(process)
+        finally:
+            if self._listings.get(listing.name) is listing:
+                del self._listings[listing.name]
+            if listing.error is None and listing.tree.complete:
+                self._cache_tree(repository, archive_name, listing.tree)
+        if (
+            listing.error is None
+            and archive_id is not None
+            and self.index_store is not None
+        ):
+            try:
+                await asyncio.to_thread(
+                    self.index_store.store_tree,
+                    repository.path,
+                    archive_id,
+                    archive_name,
+                    listing.tree,
+                )
+            except Exception as e:
+                logger.warning(f"Could not index archive {archive_name} on disk: {e}")
 
     def _parse_borg_list_output(self, output_text: str) -> List[ArchiveEntry]:
         """
@@ -337,166 +603,15 @@ class ArchiveManager:
         Converts the JSON output into ArchiveEntry objects.
         """
         items = []
-        lines = output_text.strip().split("\n")
-
-        for line in lines:
-            if not line.strip():
-                continue
-
+        for line in output_text.strip().split("\n"):
             try:
-                data = json.loads(line)
-
-                # Parse item type
-                type_char = data.get("type", "-")
-                if type_char == "d":
-                    item_type = "d"  # directory
-                elif type_char == "-":
-                    item_type = "f"  # file
-                elif type_char == "l":
-                    item_type = "l"  # symlink
-                else:
-                    item_type = "f"  # default to file for other types
-
-                # Extract name from path
-                path = data.get("path", "")
-                name = PurePath(path).name if path else ""
-
-                # Parse size from default JSON output
-                try:
-                    size = int(data.get("size", 0))
-                except (ValueError, TypeError):
-                    size = 0
-
-                # Parse mtime from default JSON output
-                mtime = data.get("mtime")
-
-                # Determine if it's a directory
-                is_directory = item_type == "d"
-
-                # Extract mode (permissions)
-                mode = data.get("mode", "")
-                if mode and len(mode) >= 4:
-                    # Extract user permissions (e.g., "rwx" from "drwxr-xr-x")
-                    user_mode = (
-                        mode[1:4] if mode.startswith(("d", "-", "l")) else mode[:3]
-                    )
-                else:
-                    user_mode = None
-
-                entry = ArchiveEntry(
-                    path=path,
-                    name=name,
-                    type=item_type,
-                    size=size,
-                    isdir=is_directory,
-                    mtime=mtime,
-                    mode=user_mode,
-                    uid=int(data.get("uid", 0))
-                    if data.get("uid") is not None
-                    else None,
-                    gid=int(data.get("gid", 0))
-                    if data.get("gid") is not None
-                    else None,
-                    healthy=data.get(
-                        "healthy", True
-                    ),  # Use actual healthy status from JSON
-                )
-
-                items.append(entry)
-
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                entry = parse_borg_list_line(line)
+            except (ValueError, KeyError) as e:
                 logger.warning(
                     f"Failed to parse borg list line: {line[:100]}... Error: {e}"
                 )
                 continue
+            if entry is not None:
+                items.append(entry)
 
         return items
-
-    def _filter_directory_contents(
-        self, all_entries: List[ArchiveEntry], target_path: str = ""
-    ) -> List[ArchiveEntry]:
-        """
-        Filter entries to show only immediate children of target_path.
-
-        This is the same logic as the original ArchiveManager but adapted
-        for the borg list output format.
-        """
-        target_path = target_path.strip().strip("/")
-
-        logger.info(
-            f"Filtering {len(all_entries)} entries for target_path: '{target_path}'"
-        )
-
-        # Group entries by their immediate parent under target_path
-        children: Dict[str, ArchiveEntry] = {}
-
-        for entry in all_entries:
-            entry_path = entry.path.lstrip("/")
-
-            logger.debug(f"Processing entry path: '{entry_path}'")
-
-            # Determine if this entry is a direct child of target_path
-            if target_path:
-                # For subdirectory like "data", we want entries like:
-                # "data/file.txt" -> include as "file.txt"
-                # "data/subdir/file.txt" -> include as "subdir" (directory)
-                if not entry_path.startswith(target_path + "/"):
-                    continue
-
-                # Remove the target path prefix
-                relative_path = entry_path[len(target_path) + 1 :]
-
-            else:
-                # For root directory, we want entries like:
-                # "file.txt" -> include as "file.txt"
-                # "data/file.txt" -> include as "data" (directory)
-                relative_path = entry_path
-
-            if not relative_path:
-                continue
-
-            # Get the first component (immediate child)
-            path_parts = relative_path.split("/")
-            immediate_child = path_parts[0]
-
-            # Build full path for this item
-            full_path = (
-                f"{target_path}/{immediate_child}" if target_path else immediate_child
-            )
-
-            if immediate_child not in children:
-                # Determine if this is a directory or file
-                # Use the actual Borg entry type - 'd' means directory
-                is_directory = len(path_parts) > 1 or entry.type == "d"
-
-                archive_entry: ArchiveEntry = ArchiveEntry(
-                    path=full_path,
-                    name=immediate_child,
-                    type="d" if is_directory else entry.type,
-                    size=0 if is_directory else entry.size,
-                    isdir=is_directory,
-                    mtime=entry.mtime,
-                    mode=entry.mode,
-                    uid=entry.uid,
-                    gid=entry.gid,
-                    healthy=entry.healthy,
-                    children_count=None if not is_directory else 0,
-                )
-
-                children[immediate_child] = archive_entry
-            else:
-                # This is another item in the same directory, possibly update info
-                existing = children[immediate_child]
-                if existing.type == "d":
-                    # It's a directory, we might want to count children
-                    current_count = existing.children_count
-                    if isinstance(current_count, int):
-                        existing.children_count = current_count + 1
-
-        result = list(children.values())
-
-        # Sort results: directories first, then files, both alphabetically
-        result.sort(key=lambda x: (x.type != "d", x.name.lower()))
-
-        logger.info(f"Filtered to {len(result)} immediate children")
-        return result
@@ -0,0 +1,483 @@
+"""
+Archive Tree - Directory index over the entries of an archive
+
+``borg list`` returns every item of an archive as a flat list. The tree is
+built from it once per archive: a map from each directory to its immediate
+children, plus the total size of the files below every directory. Listing a
+directory then costs O(children) instead of a scan over the whole archive.
+
+Directories that only appear as a prefix of deeper paths (borg lists them
+too, but filtered listings may not) are created implicitly.
+
+The tree can be fed while ``borg list`` is still running. Borg lists items
+in the depth-first order they were archived, so once an entry outside a
+directory arrives that directory is complete (sealed), and it can be listed
+before the whole archive has been read. The root is only complete after
+``finish``.
+
+Archives can hold millions of items, so entries are not kept as
+``ArchiveEntry`` objects. Every entry is a row of ``array`` columns (parent
+row, name, size, mtime, uid, gid and packed flags) and names are interned in
+a string table shared by all rows. ``ArchiveEntry`` objects are only built
+for the rows a listing returns.
+"""
+
+import sys
+from array import array
+from datetime import datetime, timedelta
+from itertools import product
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from borgitory.services.archives.archive_models import ArchiveEntry
+
+# Row of the archive root
+_ROOT = 0
+
+# Missing value of the integer columns
+_NO_VALUE = -(2**63)
+# mtime kept as a string in the fallback map
+_MTIME_OTHER = _NO_VALUE + 1
+
+# Flags column: entry type in the low two bits ...
+_TYPE_CHARS = "fdl"
+_TYPE_CODES = {char: code for code, char in enumerate(_TYPE_CHARS)}
+_TYPE_MASK = 0b11
+_TYPE_OTHER = 0b11  # type kept as a string in the fallback map
+# ... the user permission bits (rwx) and whether there is a mode at all ...
+_MODE_SHIFT = 2
+_MODE_PRESENT = 1 << 5
+_MODE_OTHER = 1 << 6  # mode kept as a string in the fallback map
+# ... the healthy state (0 unknown, 1 healthy, 2 broken) ...
+_HEALTHY_SHIFT = 7
+_HEALTHY_MASK = 0b11 << _HEALTHY_SHIFT
+# ... whether the mtime has no fractional seconds ...
+_MTIME_SECONDS = 1 << 9
+# ... and for directories whether they are sealed and their children sorted
+_SEALED = 1 << 10
+_SORTED = 1 << 11
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Approximate memory of one interned string beyond its own size (list slot,
+# table entry, id object) and of one directory beyond its rows (children
+# array, path and lookup entries), measured with tracemalloc on CPython 3.13
+STRING_OVERHEAD_BYTES = 120
+DIRECTORY_OVERHEAD_BYTES = 240
+# Approximate memory of one value kept in a fallback map
+FALLBACK_OVERHEAD_BYTES = 160
+
+
+def normalize_archive_path(path: str) -> str:
+    """Archive path without surrounding whitespace and slashes ("" is the root)"""
+    return path.strip().strip("/")
+
+
+# Flag bits of every user permission string that packs ("rwx", "r-x" ...)
+_MODE_BITS = {
+    "".join(chars): _MODE_PRESENT
+    | sum(
+        1 << (_MODE_SHIFT + position)
+        for position, char in enumerate(chars)
+        if char != "-"
+    )
+    for chars in product("r-", "w-", "x-")
+}
+
+
+def _decode_mode(flags: int) -> str:
+    return "".join(
+        allowed if flags & (1 << (_MODE_SHIFT + position)) else "-"
+        for position, allowed in enumerate("rwx")
+    )
+
+
+def _encode_mtime(mtime: str) -> Tuple[int, int]:
+    """Microseconds since the epoch and flag bits of a naive ISO timestamp
+
+    Returns ``_MTIME_OTHER`` for timestamps that would not format back to
+    the same string (other separators, time zones, fractions).
+    """
+    length = len(mtime)
+    if length == 26 and mtime[19] == ".":
+        flags = 0
+    elif length == 19:
+        flags = _MTIME_SECONDS
+    else:
+        return _MTIME_OTHER, 0
+    if mtime[10] != "T" or mtime[13] != ":" or mtime[16] != ":":
+        return _MTIME_OTHER, 0
+    try:
+        moment = datetime.fromisoformat(mtime)
+    except ValueError:
+        return _MTIME_OTHER, 0
+    delta = moment - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds, flags
+
+
+def _decode_mtime(value: int, flags: int) -> str:
+    moment = _EPOCH + timedelta(microseconds=value)
+    return moment.isoformat(
+        timespec="seconds" if flags & _MTIME_SECONDS else "microseconds"
+    )
+
+
+class ArchiveTree:
+    """Parent-to-children index of archive entries with aggregated sizes"""
+
+    def __init__(self) -> None:
+        # Interned entry names; the name column holds indexes into it
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        # Bytes of the interned names and directory paths
+        self._string_bytes = 0
+
+        # One row per entry, the root being row 0. Directories hold the
+        # total size of the files below them in the size column.
+        self._parent = array("i", [-1])
+        self._name = array("i", [self._intern("")])
+        self._size = array("q", [0])
+        self._mtime = array("q", [_NO_VALUE])
+        self._uid = array("q", [_NO_VALUE])
+        self._gid = array("q", [_NO_VALUE])
+        self._flags = array("H", [_TYPE_CODES["d"]])
+
+        # Directory path -> row, and directory row -> child rows
+        self._dir_rows: Dict[str, int] = {"": _ROOT}
+        self._children: Dict[int, "array[int]"] = {_ROOT: array("i")}
+        # Directory row -> child name id -> row, for directories being fed
+        self._name_index: Dict[int, Dict[int, int]] = {}
+        # Row -> value of entries whose value does not pack into the columns
+        self._other_types: Dict[int, str] = {}
+        self._other_modes: Dict[int, str] = {}
+        self._other_mtimes: Dict[int, str] = {}
+
+        self.entry_count = 0
+
+        # Directories on the path of the last added entry, outermost first
+        self._open: List[str] = []
+        self.complete = False
+        # Called with each directory path as it becomes complete
+        self.on_sealed: Optional[Callable[[str], None]] = None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[ArchiveEntry]) -> "ArchiveTree":
+        tree = cls()
+        for entry in entries:
+            tree.add(entry)
+        tree.finish()
+        return tree
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    @property
+    def directory_count(self) -> int:
+        """Number of directories, including the root"""
+        return len(self._dir_rows)
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Approximate memory held by the tree"""
+        columns = (
+            self._parent,
+            self._name,
+            self._size,
+            self._mtime,
+            self._uid,
+            self._gid,
+            self._flags,
+        )
+        fallbacks = (
+            len(self._other_types) + len(self._other_modes) + len(self._other_mtimes)
+        )
+        return (
+            sum(len(column) * column.itemsize for column in columns)
+            # Child row lists of the directories
+            + (len(self._parent) - 1) * self._parent.itemsize
+            + len(self._strings) * STRING_OVERHEAD_BYTES
+            + self.directory_count * DIRECTORY_OVERHEAD_BYTES
+            + fallbacks * FALLBACK_OVERHEAD_BYTES
+            + self._string_bytes
+        )
+
+    @property
+    def total_size(self) -> int:
+        return self._size[_ROOT]
+
+    def add(self, entry: ArchiveEntry) -> None:
+        """Index one archive entry"""
+        path = normalize_archive_path(entry.path)
+        if not path:
+            return
+        parent_path, _, name = path.rpartition("/")
+        if not self.complete:
+            self._advance_walk(path, entry.type == "d")
+        parent = self._ensure_directory(parent_path)
+
+        flags, mtime = self._pack(entry)
+        uid = _NO_VALUE if entry.uid is None else entry.uid
+        gid = _NO_VALUE if entry.gid is None else entry.gid
+        if entry.type == "d":
+            row = self._dir_rows.get(path)
+            if row is None:
+                row = self._new_directory(parent, name, path, flags, mtime, uid, gid)
+            else:
+                self._update_row(row, flags, mtime, uid, gid)
+        else:
+            name_id = self._intern(name)
+            existing = self._child_row(parent, name_id)
+            if existing is None or self._is_directory_row(existing):
+                row = self._new_row(parent, name_id, entry.size, flags, mtime, uid, gid)
+            else:
+                row = existing
+                self._add_size(parent, -self._size[row])
+                self._size[row] = entry.size
+                self._update_row(row, flags, mtime, uid, gid)
+            self._add_size(parent, entry.size)
+
+        # Values that do not pack are kept aside
+        if flags & _TYPE_MASK == _TYPE_OTHER:
+            self._other_types[row] = entry.type
+        if flags & _MODE_OTHER:
+            self._other_modes[row] = entry.mode or ""
+        if mtime == _MTIME_OTHER:
+            self._other_mtimes[row] = entry.mtime or ""
+        self.entry_count += 1
+
+    def finish(self) -> None:
+        """Mark the tree as complete once all entries have been added"""
+        if self.complete:
+            return
+        self.complete = True
+        self._open.clear()
+        self._name_index.clear()
+
+    def is_complete(self, path: str) -> bool:
+        """Whether a directory's listing can no longer change"""
+        if self.complete:
+            return True
+        row = self._dir_rows.get(normalize_archive_path(path))
+        return row is not None and bool(self._flags[row] & _SEALED)
+
+    def is_directory(self, path: str) -> bool:
+        return normalize_archive_path(path) in self._dir_rows
+
+    def directory_size(self, path: str) -> Optional[int]:
+        """Total size of the files below a directory, or None if it is unknown"""
+        row = self._dir_rows.get(normalize_archive_path(path))
+        return None if row is None else self._size[row]
+
+    def list_directory(self, path: str = "") -> List[ArchiveEntry]:
+        """Immediate children of a directory, directories first then by name
+
+        Directory entries carry their number of immediate children and the
+        total size of the files below them. Unknown paths list as empty.
+        """
+        path = normalize_archive_path(path)
+        row = self._dir_rows.get(path)
+        if row is None:
+            return []
+
+        children = self._children[row]
+        if not self._flags[row] & _SORTED:
+            strings = self._strings
+            children = array(
+                "i",
+                sorted(
+                    children,
+                    key=lambda child: (
+                        not self._is_directory_row(child),
+                        strings[self._name[child]].lower(),
+                    ),
+                ),
+            )
+            self._children[row] = children
+            self._flags[row] |= _SORTED
+
+        return [self._materialize(child, path) for child in children]
+
+    def directories(self) -> Iterator[Tuple[str, int, List[ArchiveEntry]]]:
+        """Every directory with the total size below it and its children, unordered"""
+        for path, row in self._dir_rows.items():
+            yield (
+                path,
+                self._size[row],
+                [self._materialize(child, path) for child in self._children[row]],
+            )
+
+    def _materialize(self, row: int, parent_path: str) -> ArchiveEntry:
+        """Build the ArchiveEntry of one row"""
+        name = self._strings[self._name[row]]
+        flags = self._flags[row]
+
+        type_code = flags & _TYPE_MASK
+        type_char = (
+            self._other_types[row]
+            if type_code == _TYPE_OTHER
+            else _TYPE_CHARS[type_code]
+        )
+        isdir = type_code == _TYPE_CODES["d"]
+
+        mode: Optional[str] = None
+        if flags & _MODE_OTHER:
+            mode = self._other_modes[row]
+        elif flags & _MODE_PRESENT:
+            mode = _decode_mode(flags)
+
+        mtime: Optional[str] = None
+        mtime_value = self._mtime[row]
+        if mtime_value == _MTIME_OTHER:
+            mtime = self._other_mtimes[row]
+        elif mtime_value != _NO_VALUE:
+            mtime = _decode_mtime(mtime_value, flags)
+
+        healthy_code = (flags & _HEALTHY_MASK) >> _HEALTHY_SHIFT
+        uid = self._uid[row]
+        gid = self._gid[row]
+        return ArchiveEntry(
+            path=f"{parent_path}/{name}" if parent_path else name,
+            name=name,
+            type=type_char,
+            size=self._size[row],
+            isdir=isdir,
+            mtime=mtime,
+            mode=mode,
+            uid=None if uid == _NO_VALUE else uid,
+            gid=None if gid == _NO_VALUE else gid,
+            healthy=None if healthy_code == 0 else healthy_code == 1,
+            children_count=len(self._children[row]) if isdir else None,
+        )
+
+    @staticmethod
+    def _pack(entry: ArchiveEntry) -> Tuple[int, int]:
+        """Flags and mtime column values of an entry"""
+        flags = _TYPE_CODES.get(entry.type, _TYPE_OTHER)
+
+        if entry.mode is not None:
+            flags |= _MODE_BITS.get(entry.mode, _MODE_OTHER)
+
+        if entry.mtime is None:
+            mtime = _NO_VALUE
+        else:
+            mtime, mtime_flags = _encode_mtime(entry.mtime)
+            flags |= mtime_flags
+
+        if entry.healthy is not None:
+            flags |= (1 if entry.healthy else 2) << _HEALTHY_SHIFT
+        return flags, mtime
+
+    def _update_row(self, row: int, flags: int, mtime: int, uid: int, gid: int) -> None:
+        """Replace the attributes of an entry listed again"""
+        self._other_types.pop(row, None)
+        self._other_modes.pop(row, None)
+        self._other_mtimes.pop(row, None)
+        # Sealing and ordering belong to the directory, not to the entry
+        self._flags[row] = (self._flags[row] & (_SEALED | _SORTED)) | flags
+        self._mtime[row] = mtime
+        self._uid[row] = uid
+        self._gid[row] = gid
+
+    def _is_directory_row(self, row: int) -> bool:
+        return (self._flags[row] & _TYPE_MASK) == _TYPE_CODES["d"]
+
+    def _intern(self, name: str) -> int:
+        string_id = self._string_ids.get(name)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(name)
+            self._string_ids[name] = string_id
+            self._string_bytes += sys.getsizeof(name)
+        return string_id
+
+    def _child_row(self, parent: int, name_id: int) -> Optional[int]:
+        """Row of a directory's child by name, indexing the directory if needed"""
+        index = self._name_index.get(parent)
+        if index is None:
+            index = {self._name[child]: child for child in self._children[parent]}
+            self._name_index[parent] = index
+        return index.get(name_id)
+
+    def _new_row(
+        self,
+        parent: int,
+        name_id: int,
+        size: int,
+        flags: int,
+        mtime: int = _NO_VALUE,
+        uid: int = _NO_VALUE,
+        gid: int = _NO_VALUE,
+    ) -> int:
+        row = len(self._parent)
+        self._parent.append(parent)
+        self._name.append(name_id)
+        self._size.append(size)
+        self._mtime.append(mtime)
+        self._uid.append(uid)
+        self._gid.append(gid)
+        self._flags.append(flags)
+
+        self._children[parent].append(row)
+        self._flags[parent] &= ~_SORTED
+        index = self._name_index.get(parent)
+        if index is not None:
+            index[name_id] = row
+        return row
+
+    def _new_directory(
+        self,
+        parent: int,
+        name: str,
+        path: str,
+        flags: int = _TYPE_CODES["d"],
+        mtime: int = _NO_VALUE,
+        uid: int = _NO_VALUE,
+        gid: int = _NO_VALUE,
+    ) -> int:
+        row = self._new_row(parent, self._intern(name), 0, flags, mtime, uid, gid)
+        self._dir_rows[path] = row
+        self._children[row] = array("i")
+        self._string_bytes += sys.getsizeof(path)
+        return row
+
+    def _advance_walk(self, path: str, is_directory: bool) -> None:
+        """Seal the open directories the depth-first walk has left"""
+        while self._open and not (
+            path == self._open[-1] or path.startswith(self._open[-1] + "/")
+        ):
+            left = self._open.pop()
+            row = self._dir_rows.get(left)
+            if row is not None:
+                self._flags[row] |= _SEALED
+                self._name_index.pop(row, None)
+            if self.on_sealed is not None:
+                self.on_sealed(left)
+
+        # Open the directories between the innermost open one and the entry
+        innermost = self._open[-1] if self._open else ""
+        if path != innermost:
+            start = len(innermost) + 1 if innermost else 0
+            components = path[start:].split("/")
+            if not is_directory:
+                components.pop()
+            for component in components:
+                innermost = f"{innermost}/{component}" if innermost else component
+                self._open.append(innermost)
+
+    def _ensure_directory(self, path: str) -> int:
+        """Row of a directory, creating it and any missing parents"""
+        missing = []
+        row = self._dir_rows.get(path)
+        while row is None:
+            missing.append(path)
+            path = path.rpartition("/")[0]
+            row = self._dir_rows.get(path)
+        for path in reversed(missing):
+            row = self._new_directory(row, path.rpartition("/")[2], path)
+        return row
+
+    def _add_size(self, directory: int, size: int) -> None:
+        if not size:
+            return
+        while directory >= 0:
+            self._size[directory] += size
+            directory = self._parent[directory]
@@ -165,6 +165,7 @@ class BorgService:
                 logger.info(
                     f"Successfully deleted archive {archive_name} from repository {repository.name}"
                 )
+                await self.archive_service.forget_archive(repository, archive_name)
                 return True
             else:
                 error_msg = (
@@ -14,6 +14,7 @@ from borgitory.protocols.command_executor_protocol import (
     CommandExecutorProtocol,
     CommandResult,
 )
+from borgitory.services.metrics.app_metrics import track_subprocess
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,7 @@ class LinuxCommandExecutor(CommandExecutorProtocol):
                 env=env,
                 cwd=cwd,
             )
+            track_subprocess(command, process)
 
             try:
                 stdout_bytes, stderr_bytes = await asyncio.wait_for(
@@ -138,6 +140,7 @@ class LinuxCommandExecutor(CommandExecutorProtocol):
                 env=env,
                 cwd=cwd,
             )
+            track_subprocess(command, process)
 
             logger.debug(f"Linux subprocess created successfully (PID: {process.pid})")
             return process
@@ -14,6 +14,7 @@ from borgitory.protocols.command_executor_protocol import (
     CommandExecutorProtocol,
     CommandResult,
 )
+from borgitory.services.metrics.app_metrics import track_subprocess
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +76,7 @@ class WSLCommandExecutor(CommandExecutorProtocol):
                 stderr=asyncio.subprocess.PIPE,
                 stdin=asyncio.subprocess.PIPE if input_data else None,
             )
+            track_subprocess(cmd_list, process)
 
             try:
                 stdout_bytes, stderr_bytes = await asyncio.wait_for(
@@ -300,6 +302,7 @@ class WSLCommandExecutor(CommandExecutorProtocol):
                     if stdin != asyncio.subprocess.PIPE
                     else asyncio.subprocess.DEVNULL,
                 )
+                track_subprocess(command, process)
                 logger.info(
                     f"WSL streaming subprocess created successfully (PID: {process.pid})"
                 )
@@ -322,6 +325,7 @@ class WSLCommandExecutor(CommandExecutorProtocol):
                     env=env,
                     cwd=cwd,
                 )
+                track_subprocess(command, process)
                 logger.info(f"WSL subprocess created successfully (PID: {process.pid})")
                 return process
             except Exception as e:
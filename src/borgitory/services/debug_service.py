@@ -11,6 +11,8 @@ from borgitory.models.database import Repository, Job
 from borgitory.protocols import JobManagerProtocol
 from borgitory.protocols.environment_protocol import EnvironmentProtocol
 from borgitory.protocols.command_executor_protocol import CommandExecutorProtocol
+from borgitory.services.jobs.job_memory_eviction import JobMemoryUsage
+from borgitory.services.jobs.job_queue_manager import QueueStats
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +85,10 @@ class JobManagerInfo:
         self.active_jobs: int = 0
         self.total_jobs: int = 0
         self.job_manager_running: bool = False
+        # Estimated memory held by in-memory jobs, None if not reported
+        self.memory_usage: Optional[JobMemoryUsage] = None
+        # Queue state including load-aware admission, None if not reported
+        self.queue_stats: Optional[QueueStats] = None
         # Error/unavailable fields
         self.error: str = ""
         self.status: str = ""
@@ -439,6 +445,17 @@ class DebugService:
             job_info.active_jobs = active_jobs_count
             job_info.total_jobs = total_jobs
             job_info.job_manager_running = True
+
+            if hasattr(self.job_manager, "get_memory_usage"):
+                memory_usage = self.job_manager.get_memory_usage()
+                if isinstance(memory_usage, JobMemoryUsage):
+                    job_info.memory_usage = memory_usage
+
+            queue_manager = getattr(self.job_manager, "queue_manager", None)
+            if queue_manager is not None:
+                queue_stats = queue_manager.get_queue_stats()
+                if isinstance(queue_stats, QueueStats):
+                    job_info.queue_stats = queue_stats
             return job_info
         except Exception as e:
             job_info = JobManagerInfo()
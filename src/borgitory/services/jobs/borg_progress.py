@@ -0,0 +1,278 @@
+"""
+Borg Progress - Decodes borg ``--log-json`` output into typed progress events
+
+With ``--log-json`` borg writes one JSON object per line. Log messages and
+``--list`` file statuses are turned back into display text, while
+``archive_progress``, ``progress_percent`` and ``file_status`` records are
+decoded into :class:`BorgProgress` events. A :class:`BorgProgressTracker`
+derives throughput, dedup ratio and ETA and throttles events to a fixed UI
+update rate so consumers never see more than one update per interval.
+"""
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress events forwarded to the UI
+PROGRESS_UPDATE_INTERVAL = 0.5
+
+# Arguments that make borg emit machine readable progress
+BORG_JSON_PROGRESS_ARGS = ["--log-json", "--progress"]
+
+ARCHIVE_PROGRESS = "archive_progress"
+PROGRESS_PERCENT = "progress_percent"
+PROGRESS_MESSAGE = "progress_message"
+FILE_STATUS = "file_status"
+LOG_MESSAGE = "log_message"
+
+_BORG_RECORD_TYPES = frozenset(
+    {ARCHIVE_PROGRESS, PROGRESS_PERCENT, PROGRESS_MESSAGE, FILE_STATUS, LOG_MESSAGE}
+)
+
+
+@dataclass
+class BorgProgress:
+    """A single progress update decoded from borg's JSON log"""
+
+    type: str
+    timestamp: float
+    finished: bool = False
+    # archive_progress
+    original_size: Optional[int] = None
+    compressed_size: Optional[int] = None
+    deduplicated_size: Optional[int] = None
+    nfiles: Optional[int] = None
+    path: Optional[str] = None
+    # progress_percent / progress_message
+    operation: Optional[str] = None
+    msgid: Optional[str] = None
+    message: Optional[str] = None
+    current: Optional[int] = None
+    total: Optional[int] = None
+    # file_status
+    status: Optional[str] = None
+    # Derived by BorgProgressTracker
+    percent: Optional[float] = None
+    bytes_per_second: Optional[float] = None
+    files_per_second: Optional[float] = None
+    dedup_ratio: Optional[float] = None
+    eta_seconds: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        """Convert to a dictionary, leaving out fields that are not set"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+    def summary(self) -> str:
+        """Short human readable description for progress displays"""
+        parts = []
+        if self.percent is not None:
+            parts.append(f"{self.percent:.0f}%")
+        if self.original_size is not None:
+            parts.append(format_bytes(self.original_size))
+        if self.nfiles is not None:
+            parts.append(f"{self.nfiles} files")
+        if self.bytes_per_second:
+            parts.append(f"{format_bytes(int(self.bytes_per_second))}/s")
+        if self.eta_seconds is not None:
+            parts.append(f"ETA {format_duration(self.eta_seconds)}")
+        if not parts and self.message:
+            parts.append(self.message)
+        return ", ".join(parts)
+
+
+def progress_summary(progress: Dict[str, object]) -> str:
+    """Summarise a progress dictionary as produced by ``BorgProgress.to_dict``"""
+    known = {f.name for f in fields(BorgProgress)}
+    values = {key: value for key, value in progress.items() if key in known}
+    if "type" not in values or "timestamp" not in values:
+        return ""
+    return BorgProgress(**values).summary()  # type: ignore[arg-type]
+
+
+@dataclass
+class BorgLogRecord:
+    """A decoded ``--log-json`` line: display text and/or a progress update"""
+
+    text: Optional[str] = None
+    progress: Optional[BorgProgress] = None
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count using binary units"""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(value) < 1024 or unit == "TiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as e.g. ``1h02m``, ``3m05s`` or ``42s``"""
+    total = int(round(seconds))
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def _optional_int(value: object) -> Optional[int]:
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def decode_borg_json_line(line: str) -> Optional[BorgLogRecord]:
+    """Decode one line of ``--log-json`` output
+
+    Returns None for lines that are not borg JSON log records, which callers
+    should treat as plain text.
+    """
+    if not line.startswith("{"):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or record.get("type") not in _BORG_RECORD_TYPES:
+        return None
+
+    record_type = str(record["type"])
+    raw_time = record.get("time")
+    timestamp = float(raw_time) if isinstance(raw_time, (int, float)) else time.time()
+    finished = bool(record.get("finished", False))
+
+    if record_type == LOG_MESSAGE:
+        message = record.get("message")
+        return BorgLogRecord(text=str(message) if message is not None else None)
+
+    if record_type == FILE_STATUS:
+        status = str(record.get("status", ""))
+        path = str(record.get("path", ""))
+        return BorgLogRecord(
+            text=f"{status} {path}",
+            progress=BorgProgress(
+                type=FILE_STATUS, timestamp=timestamp, status=status, path=path
+            ),
+        )
+
+    if record_type == ARCHIVE_PROGRESS:
+        return BorgLogRecord(
+            progress=BorgProgress(
+                type=ARCHIVE_PROGRESS,
+                timestamp=timestamp,
+                finished=finished,
+                original_size=_optional_int(record.get("original_size")),
+                compressed_size=_optional_int(record.get("compressed_size")),
+                deduplicated_size=_optional_int(record.get("deduplicated_size")),
+                nfiles=_optional_int(record.get("nfiles")),
+                path=record.get("path") or None,
+            )
+        )
+
+    message = record.get("message")
+    return BorgLogRecord(
+        progress=BorgProgress(
+            type=record_type,
+            timestamp=timestamp,
+            finished=finished,
+            operation=str(record["operation"]) if "operation" in record else None,
+            msgid=record.get("msgid") or None,
+            message=str(message) if message else None,
+            current=_optional_int(record.get("current")),
+            total=_optional_int(record.get("total")),
+        )
+    )
+
+
+class BorgProgressTracker:
+    """Derives rates and ETA from successive progress events and throttles them"""
+
+    def __init__(
+        self,
+        min_interval: float = PROGRESS_UPDATE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_interval = min_interval
+        self._clock = clock
+        self._last_emitted_at: Optional[float] = None
+        self._files_seen = 0
+        # Previous emitted sample per progress stream: (timestamp, bytes or items, files)
+        self._samples: Dict[str, Tuple[float, int, int]] = {}
+
+    def update(self, progress: BorgProgress) -> Optional[BorgProgress]:
+        """Feed a decoded event; returns it enriched if an update is due"""
+        if progress.type == FILE_STATUS:
+            self._files_seen += 1
+            progress.nfiles = self._files_seen
+
+        self._derive(progress)
+
+        now = self._clock()
+        if (
+            not progress.finished
+            and self._last_emitted_at is not None
+            and now - self._last_emitted_at < self.min_interval
+        ):
+            return None
+
+        self._last_emitted_at = now
+        self._remember(progress)
+        return progress
+
+    def _derive(self, progress: BorgProgress) -> None:
+        if progress.original_size and progress.deduplicated_size:
+            progress.dedup_ratio = round(
+                progress.original_size / progress.deduplicated_size, 2
+            )
+
+        if progress.current is not None and progress.total:
+            progress.percent = round(progress.current / progress.total * 100, 1)
+
+        previous = self._samples.get(self._stream_key(progress))
+        if previous is None:
+            return
+        elapsed = progress.timestamp - previous[0]
+        if elapsed <= 0:
+            return
+
+        amount = self._amount(progress)
+        if progress.type == ARCHIVE_PROGRESS and amount is not None:
+            progress.bytes_per_second = round((amount - previous[1]) / elapsed, 1)
+        if progress.nfiles is not None:
+            progress.files_per_second = round(
+                (progress.nfiles - previous[2]) / elapsed, 1
+            )
+
+        if progress.current is not None and progress.total:
+            items_per_second = (progress.current - previous[1]) / elapsed
+            if items_per_second > 0:
+                progress.eta_seconds = round(
+                    (progress.total - progress.current) / items_per_second, 1
+                )
+
+    def _remember(self, progress: BorgProgress) -> None:
+        amount = self._amount(progress)
+        if amount is None and progress.nfiles is None:
+            return
+        self._samples[self._stream_key(progress)] = (
+            progress.timestamp,
+            amount or 0,
+            progress.nfiles or 0,
+        )
+
+    @staticmethod
+    def _stream_key(progress: BorgProgress) -> str:
+        # progress_percent events of different operations are tracked separately
+        return f"{progress.type}:{progress.msgid or ''}"
+
+    @staticmethod
+    def _amount(progress: BorgProgress) -> Optional[int]:
+        if progress.type == ARCHIVE_PROGRESS:
+            return progress.original_size
+        return progress.current
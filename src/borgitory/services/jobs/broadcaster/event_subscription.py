@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+import uuid
+
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.jobs.broadcaster.job_event import JobEvent
+
+
+@dataclass(frozen=True)
+class EventSubscription:
+    """Topic filter for a client queue: job, task index and event types"""
+
+    job_id: Optional[uuid.UUID] = None
+    task_index: Optional[int] = None
+    event_types: Optional[FrozenSet[EventType]] = None
+
+    @property
+    def is_wildcard(self) -> bool:
+        """Whether the subscription receives events for every job"""
+        return self.job_id is None
+
+    def accepts_type(self, event_type: EventType) -> bool:
+        """Check the event type filter (keepalives always pass)"""
+        if event_type == EventType.KEEPALIVE or self.event_types is None:
+            return True
+        return event_type in self.event_types
+
+    def matches(self, event: JobEvent) -> bool:
+        """Check whether an event belongs to this subscription's topic"""
+        if not self.accepts_type(event.event_type):
+            return False
+
+        # Events that are not tied to a job (keepalives, queue updates) reach everyone
+        if self.job_id is None or event.job_id is None:
+            return True
+        if event.job_id != self.job_id:
+            return False
+
+        if self.task_index is None:
+            return True
+        event_task_index = event.data.get("task_index") if event.data else None
+        # Job-level events carry no task index and are delivered to task subscribers
+        return not isinstance(event_task_index, int) or (
+            event_task_index == self.task_index
+        )
+
+    def describe(self) -> str:
+        """Short human readable topic description for client stats"""
+        if self.job_id is None:
+            topic = "*"
+        elif self.task_index is None:
+            topic = str(self.job_id)
+        else:
+            topic = f"{self.job_id}/task-{self.task_index}"
+        if self.event_types is not None:
+            types = ",".join(
+                sorted(event_type.value for event_type in self.event_types)
+            )
+            topic = f"{topic}[{types}]"
+        return topic
@@ -11,6 +11,8 @@ class EventType(Enum):
     JOB_CANCELLED = "job_cancelled"
     JOB_STATUS_CHANGED = "job_status_changed"
     JOB_OUTPUT = "job_output"
+    JOB_OUTPUT_BATCH = "job_output_batch"
+    JOB_OUTPUT_SKIPPED = "job_output_skipped"
     TASK_STARTED = "task_started"
     TASK_PROGRESS = "task_progress"
     TASK_COMPLETED = "task_completed"
@@ -4,14 +4,25 @@ Job Event Broadcaster - Handles SSE streaming and event distribution
 
 import asyncio
 import logging
-from typing import Dict, List, AsyncGenerator, Optional, Union
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    AsyncGenerator,
+    Optional,
+    Set,
+    Union,
+)
 from datetime import datetime
 import uuid
 from borgitory.custom_types import ConfigDict
 from borgitory.utils.datetime_utils import now_utc
 
+from borgitory.services.jobs.broadcaster.event_subscription import EventSubscription
 from borgitory.services.jobs.broadcaster.event_type import EventType
 from borgitory.services.jobs.broadcaster.job_event import JobEvent
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
+from borgitory.services.jobs.broadcaster.subscriber_queue import SubscriberQueue
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
 )
@@ -27,10 +38,15 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
         max_queue_size: int = 100,
         keepalive_timeout: float = 30.0,
         cleanup_interval: float = 60.0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        stale_client_timeout: float = 300.0,
     ) -> None:
         self.max_queue_size = max_queue_size
         self.keepalive_timeout = keepalive_timeout
         self.cleanup_interval = cleanup_interval
+        self.overflow_policy = overflow_policy
+        # Lag-tolerant clients are only dropped after staying full this long
+        self.stale_client_timeout = stale_client_timeout
 
         # Client event queues for SSE streaming
         self._client_queues: List[asyncio.Queue[JobEvent]] = []
@@ -38,6 +54,14 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
             asyncio.Queue[JobEvent], Dict[str, Union[str, int, datetime]]
         ] = {}
 
+        # Topic subscriptions: job_id (None = all jobs) -> task_index (None = all
+        # tasks) -> subscribed queues, so events only reach interested clients
+        self._subscriptions: Dict[asyncio.Queue[JobEvent], EventSubscription] = {}
+        self._overflow_policies: Dict[asyncio.Queue[JobEvent], OverflowPolicy] = {}
+        self._topic_index: Dict[
+            Optional[uuid.UUID], Dict[Optional[int], Set[asyncio.Queue[JobEvent]]]
+        ] = {}
+
         # Event history for new clients
         self._recent_events: List[JobEvent] = []
         self._max_recent_events = 50
@@ -63,7 +87,7 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
         job_id: Optional[uuid.UUID] = None,
         data: Optional[ConfigDict] = None,
     ) -> None:
-        """Broadcast an event to all connected clients"""
+        """Broadcast an event to the clients subscribed to its topic"""
         event = JobEvent(event_type=event_type, job_id=job_id, data=data or {})
 
         # Add to recent events
@@ -71,14 +95,13 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
         if len(self._recent_events) > self._max_recent_events:
             self._recent_events.pop(0)
 
-        # Send to all client queues
+        # Send to subscribed client queues
         failed_queues = []
         sent_count = 0
 
-        for queue in self._client_queues:
+        for queue in self._get_subscribers(event):
             try:
-                if not queue.full():
-                    queue.put_nowait(event)
+                if self._deliver(queue, event):
                     sent_count += 1
                 else:
                     logger.warning("Client queue is full, marking for cleanup")
@@ -96,29 +119,100 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
                 f"Broadcasted {event_type.value} event to {sent_count} clients"
             )
 
+    def _deliver(self, queue: asyncio.Queue[JobEvent], event: JobEvent) -> bool:
+        """Put an event on a client queue, applying its overflow policy when full
+
+        Returns False if the client should be disconnected.
+        """
+        metadata = self._client_queue_metadata.get(queue, {})
+        if not queue.full():
+            queue.put_nowait(event)
+            metadata.pop("full_since", None)
+            self._record_lag(queue, metadata)
+            return True
+
+        policy = self._overflow_policies.get(queue, self.overflow_policy)
+        if policy == OverflowPolicy.DISCONNECT or not isinstance(
+            queue, SubscriberQueue
+        ):
+            return False
+
+        result = queue.put_overflowing(event)
+        self._increment(metadata, "events_dropped", result.events_dropped)
+        self._increment(metadata, "events_coalesced", result.events_coalesced)
+        self._increment(metadata, "lines_skipped", result.lines_skipped)
+        self._increment(metadata, "overflows")
+        metadata.setdefault("full_since", now_utc())
+        self._record_lag(queue, metadata)
+        return True
+
+    @staticmethod
+    def _increment(
+        metadata: Dict[str, Union[str, int, datetime]], key: str, amount: int = 1
+    ) -> None:
+        current = metadata.get(key, 0)
+        metadata[key] = (current if isinstance(current, int) else 0) + amount
+
+    @staticmethod
+    def _record_lag(
+        queue: asyncio.Queue[JobEvent],
+        metadata: Dict[str, Union[str, int, datetime]],
+    ) -> None:
+        max_lag = metadata.get("max_lag", 0)
+        if not isinstance(max_lag, int) or queue.qsize() > max_lag:
+            metadata["max_lag"] = queue.qsize()
+
     def subscribe_client(
-        self, client_id: Optional[str] = None, send_recent_events: bool = True
+        self,
+        client_id: Optional[str] = None,
+        send_recent_events: bool = True,
+        job_id: Optional[uuid.UUID] = None,
+        task_index: Optional[int] = None,
+        event_types: Optional[Iterable[EventType]] = None,
+        overflow_policy: Optional[OverflowPolicy] = None,
     ) -> asyncio.Queue[JobEvent]:
-        """Subscribe a new client to events"""
-        queue: asyncio.Queue[JobEvent] = asyncio.Queue(maxsize=self.max_queue_size)
+        """Subscribe a new client to events, optionally scoped to a job/task topic"""
+        queue = SubscriberQueue(
+            self.max_queue_size, overflow_policy or self.overflow_policy
+        )
+        subscription = EventSubscription(
+            job_id=job_id,
+            task_index=task_index,
+            event_types=frozenset(event_types) if event_types is not None else None,
+        )
 
         # Store client metadata
         self._client_queue_metadata[queue] = {
             "client_id": client_id or f"client_{len(self._client_queues)}",
             "connected_at": now_utc(),
             "events_sent": 0,
+            "topic": subscription.describe(),
+            "overflow_policy": (overflow_policy or self.overflow_policy).value,
+            "max_lag": 0,
+            "overflows": 0,
+            "events_dropped": 0,
+            "events_coalesced": 0,
+            "lines_skipped": 0,
         }
 
         self._client_queues.append(queue)
+        self._subscriptions[queue] = subscription
+        self._overflow_policies[queue] = overflow_policy or self.overflow_policy
+        self._topic_index.setdefault(job_id, {}).setdefault(task_index, set()).add(
+            queue
+        )
 
         logger.info(
             f"New client subscribed: {self._client_queue_metadata[queue]['client_id']} "
-            f"(total clients: {len(self._client_queues)})"
+            f"to {subscription.describe()} (total clients: {len(self._client_queues)})"
         )
 
         # Send recent events to new client
         if send_recent_events:
-            for event in self._recent_events[-10:]:  # Send last 10 events
+            recent_events = [
+                event for event in self._recent_events if subscription.matches(event)
+            ]
+            for event in recent_events[-10:]:  # Send last 10 events
                 try:
                     queue.put_nowait(event)
                 except asyncio.QueueFull:
@@ -137,6 +231,11 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
             if queue in self._client_queues:
                 self._client_queues.remove(queue)
 
+            self._overflow_policies.pop(queue, None)
+            subscription = self._subscriptions.pop(queue, None)
+            if subscription is not None:
+                self._unindex_queue(queue, subscription)
+
             if queue in self._client_queue_metadata:
                 client_info = self._client_queue_metadata[queue]
                 logger.info(f"Client disconnected: {client_info['client_id']}")
@@ -146,6 +245,57 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
         except (ValueError, KeyError):
             return False
 
+    def _unindex_queue(
+        self, queue: asyncio.Queue[JobEvent], subscription: EventSubscription
+    ) -> None:
+        """Remove a queue from the topic index, dropping empty topics"""
+        job_topics = self._topic_index.get(subscription.job_id)
+        if job_topics is None:
+            return
+        task_queues = job_topics.get(subscription.task_index)
+        if task_queues is not None:
+            task_queues.discard(queue)
+            if not task_queues:
+                del job_topics[subscription.task_index]
+        if not job_topics:
+            del self._topic_index[subscription.job_id]
+
+    def _get_subscribers(self, event: JobEvent) -> List[asyncio.Queue[JobEvent]]:
+        """Resolve the client queues subscribed to an event's topic"""
+        if event.job_id is None:
+            # Events without a job (keepalives, queue updates) go to every client
+            candidates: Iterable[asyncio.Queue[JobEvent]] = list(self._client_queues)
+        else:
+            candidate_set: Set[asyncio.Queue[JobEvent]] = set()
+            for queues in self._topic_index.get(None, {}).values():
+                candidate_set.update(queues)
+
+            job_topics = self._topic_index.get(event.job_id, {})
+            task_index = event.data.get("task_index") if event.data else None
+            if isinstance(task_index, int):
+                candidate_set.update(job_topics.get(None, ()))
+                candidate_set.update(job_topics.get(task_index, ()))
+            else:
+                for queues in job_topics.values():
+                    candidate_set.update(queues)
+            candidates = candidate_set
+
+        return [
+            queue
+            for queue in candidates
+            if queue in self._subscriptions
+            and self._subscriptions[queue].matches(event)
+        ]
+
+    def get_subscriber_count(
+        self, job_id: Optional[uuid.UUID] = None, task_index: Optional[int] = None
+    ) -> int:
+        """Number of clients subscribed specifically to a job or job task topic"""
+        job_topics = self._topic_index.get(job_id, {})
+        if task_index is None:
+            return sum(len(queues) for queues in job_topics.values())
+        return len(job_topics.get(task_index, ()))
+
     async def stream_events_for_client(
         self, client_queue: asyncio.Queue[JobEvent]
     ) -> AsyncGenerator[JobEvent, None]:
@@ -182,7 +332,9 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
 
     async def stream_all_events(self) -> AsyncGenerator[JobEvent, None]:
         """Stream all events for a new client connection"""
-        client_queue = self.subscribe_client()
+        client_queue = self.subscribe_client(
+            overflow_policy=OverflowPolicy.LATEST_STATUS
+        )
 
         try:
             async for event in self.stream_events_for_client(client_queue):
@@ -197,15 +349,28 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
                 queues_to_remove = []
 
                 for queue in self._client_queues:
+                    metadata = self._client_queue_metadata.get(queue, {})
+                    policy = self._overflow_policies.get(queue, self.overflow_policy)
+
                     # Check if queue is still responsive
-                    if queue.full():
+                    if policy == OverflowPolicy.DISCONNECT and queue.full():
                         # Queue is full, likely disconnected
                         queues_to_remove.append(queue)
                         continue
 
+                    # Lag-tolerant clients are only dropped once they stay full
+                    full_since = metadata.get("full_since")
+                    if (
+                        queue.full()
+                        and isinstance(full_since, datetime)
+                        and (now_utc() - full_since).total_seconds()
+                        > self.stale_client_timeout
+                    ):
+                        queues_to_remove.append(queue)
+                        continue
+
                     # Check connection age and activity
                     if queue in self._client_queue_metadata:
-                        metadata = self._client_queue_metadata[queue]
                         connected_at = metadata.get("connected_at")
                         if isinstance(connected_at, datetime):
                             connected_duration = (
@@ -268,12 +433,37 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
                     else str(metadata["connected_at"]),
                     "events_sent": metadata["events_sent"],
                     "queue_size": queue.qsize(),
+                    "topic": metadata.get("topic", "*"),
+                    "overflow_policy": metadata.get(
+                        "overflow_policy", self.overflow_policy.value
+                    ),
+                    "lag": queue.qsize(),
+                    "max_lag": metadata.get("max_lag", 0),
+                    "overflows": metadata.get("overflows", 0),
+                    "events_dropped": metadata.get("events_dropped", 0),
+                    "events_coalesced": metadata.get("events_coalesced", 0),
+                    "lines_skipped": metadata.get("lines_skipped", 0),
                 }
                 for queue, metadata in self._client_queue_metadata.items()
             ],
+            "topic_count": sum(
+                len(job_topics) for job_topics in self._topic_index.values()
+            ),
+            "total_events_dropped": sum(
+                dropped
+                for dropped in (
+                    metadata.get("events_dropped", 0)
+                    for metadata in self._client_queue_metadata.values()
+                )
+                if isinstance(dropped, int)
+            ),
             "recent_events_count": len(self._recent_events),
         }
 
+    def get_queue_depths(self) -> List[int]:
+        """Number of events waiting in each client queue"""
+        return [queue.qsize() for queue in self._client_queues]
+
     def get_event_history(self, limit: int = 20) -> List[Dict[str, object]]:
         """Get recent event history"""
         return [event.to_dict() for event in self._recent_events[-limit:]]
@@ -301,6 +491,9 @@ class JobEventBroadcaster(JobEventBroadcasterProtocol):
         # Clear all client queues
         self._client_queues.clear()
         self._client_queue_metadata.clear()
+        self._subscriptions.clear()
+        self._overflow_policies.clear()
+        self._topic_index.clear()
         self._recent_events.clear()
 
         logger.info("Job event broadcaster shutdown complete")
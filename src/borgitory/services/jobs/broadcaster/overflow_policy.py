@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class OverflowPolicy(Enum):
+    """What to do when a client's event queue is full"""
+
+    # Remove the client (legacy behaviour)
+    DISCONNECT = "disconnect"
+    # Discard the oldest queued events to make room
+    DROP_OLDEST = "drop_oldest"
+    # Replace queued output lines with a "N lines skipped" marker per task
+    COALESCE_OUTPUT = "coalesce_output"
+    # Keep only the latest queued status event per job/task and type
+    LATEST_STATUS = "latest_status"
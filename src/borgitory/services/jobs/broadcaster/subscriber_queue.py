@@ -0,0 +1,215 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+import uuid
+
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.jobs.broadcaster.job_event import JobEvent
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
+
+OUTPUT_EVENT_TYPES = frozenset(
+    {EventType.JOB_OUTPUT, EventType.JOB_OUTPUT_BATCH, EventType.JOB_OUTPUT_SKIPPED}
+)
+
+# Events that only describe current state, so older copies are safe to drop
+STATUS_EVENT_TYPES = frozenset(
+    {
+        EventType.JOB_PROGRESS,
+        EventType.JOB_STATUS_CHANGED,
+        EventType.TASK_PROGRESS,
+        EventType.JOBS_UPDATE,
+        EventType.QUEUE_UPDATE,
+        EventType.KEEPALIVE,
+    }
+)
+
+OutputKey = Tuple[Optional[uuid.UUID], Optional[int]]
+StatusKey = Tuple[EventType, Optional[uuid.UUID], Optional[int]]
+
+
+def _count_output_lines(event: JobEvent) -> int:
+    """Number of output lines carried by an event (0 for non-output events)"""
+    if event.event_type not in OUTPUT_EVENT_TYPES:
+        return 0
+    data = event.data or {}
+    if event.event_type == EventType.JOB_OUTPUT_SKIPPED:
+        skipped = data.get("skipped", 0)
+        return skipped if isinstance(skipped, int) else 0
+    if event.event_type == EventType.JOB_OUTPUT_BATCH:
+        lines = data.get("lines")
+        return len(lines) if isinstance(lines, list) else 0
+    return 1
+
+
+def _event_task_index(event: JobEvent) -> Optional[int]:
+    task_index = event.data.get("task_index") if event.data else None
+    return task_index if isinstance(task_index, int) else None
+
+
+def _skip_marker(key: OutputKey, skipped: int) -> JobEvent:
+    return JobEvent(
+        event_type=EventType.JOB_OUTPUT_SKIPPED,
+        job_id=key[0],
+        data={"task_index": key[1], "skipped": skipped},
+    )
+
+
+@dataclass
+class _Slot:
+    """A queued event; cleared slots stay in place until read past"""
+
+    event: JobEvent
+    live: bool = True
+
+
+@dataclass
+class OverflowResult:
+    """What making room in a full queue cost its client"""
+
+    events_dropped: int = 0
+    events_coalesced: int = 0
+    lines_skipped: int = 0
+
+
+class SubscriberQueue(asyncio.Queue[JobEvent]):
+    """Bounded client event queue that makes room for new events cheaply
+
+    Events are kept in a deque of slots. Overflow handling clears slots in
+    place instead of draining and refilling the queue, and cleared slots
+    are compacted away once they outnumber the queue size. Output events
+    and superseded status events are noted as they arrive, so coalescing
+    visits each event once and a full queue costs O(1) per event.
+    """
+
+    def __init__(self, maxsize: int, overflow_policy: OverflowPolicy) -> None:
+        self.overflow_policy = overflow_policy
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: Deque[_Slot] = deque()
+        self._live = 0
+        self._cleared = 0
+        # Queued output events, oldest first, for COALESCE_OUTPUT
+        self._outputs: Deque[_Slot] = deque()
+        # Queued skipped-lines marker of each job task
+        self._markers: Dict[OutputKey, _Slot] = {}
+        # Newest queued status event per key and the older ones it replaced,
+        # for LATEST_STATUS
+        self._latest_status: Dict[StatusKey, _Slot] = {}
+        self._superseded: Deque[_Slot] = deque()
+
+    def qsize(self) -> int:
+        return self._live
+
+    def empty(self) -> bool:
+        return self._live == 0
+
+    def _put(self, event: JobEvent) -> None:
+        slot = _Slot(event)
+        self._queue.append(slot)
+        self._live += 1
+        if self.overflow_policy == OverflowPolicy.COALESCE_OUTPUT:
+            if event.event_type in OUTPUT_EVENT_TYPES:
+                self._track(self._outputs, slot)
+        elif self.overflow_policy == OverflowPolicy.LATEST_STATUS:
+            if event.event_type in STATUS_EVENT_TYPES:
+                key = (event.event_type, event.job_id, _event_task_index(event))
+                superseded = self._latest_status.get(key)
+                self._latest_status[key] = slot
+                if superseded is not None:
+                    self._track(self._superseded, superseded)
+
+    def _get(self) -> JobEvent:
+        slot = self._queue.popleft()
+        while not slot.live:
+            self._cleared -= 1
+            slot = self._queue.popleft()
+        slot.live = False
+        self._live -= 1
+        self._forget(slot)
+        for side in (self._outputs, self._superseded):
+            while side and not side[0].live:
+                side.popleft()
+        return slot.event
+
+    def put_overflowing(self, event: JobEvent) -> OverflowResult:
+        """Queue an event into a full queue, making room per the overflow policy
+
+        Queued output is folded into one skipped-lines marker per task, or
+        superseded status events are removed; whatever still does not fit
+        is dropped from the front.
+        """
+        result = OverflowResult()
+        if self.overflow_policy == OverflowPolicy.COALESCE_OUTPUT:
+            self._coalesce_output(result)
+            self._put(event)
+        else:
+            self._put(event)
+            if self.overflow_policy == OverflowPolicy.LATEST_STATUS:
+                self._collapse_status(result)
+
+        while self._live > self.maxsize > 0:
+            dropped = self._get()
+            result.events_dropped += 1
+            result.lines_skipped += _count_output_lines(dropped)
+        return result
+
+    def _coalesce_output(self, result: OverflowResult) -> None:
+        while self._outputs:
+            slot = self._outputs.popleft()
+            if not slot.live:
+                continue
+            event = slot.event
+            key = (event.job_id, _event_task_index(event))
+            lines = _count_output_lines(event)
+            if event.event_type != EventType.JOB_OUTPUT_SKIPPED:
+                result.lines_skipped += lines
+
+            marker = self._markers.get(key)
+            if marker is None:
+                # The marker takes the place of the task's oldest queued output
+                slot.event = _skip_marker(key, lines)
+                self._markers[key] = slot
+            else:
+                marker.event = _skip_marker(
+                    key, _count_output_lines(marker.event) + lines
+                )
+                result.events_coalesced += 1
+                self._clear(slot)
+
+    def _collapse_status(self, result: OverflowResult) -> None:
+        while self._superseded:
+            slot = self._superseded.popleft()
+            if slot.live:
+                result.events_coalesced += 1
+                self._clear(slot)
+
+    def _clear(self, slot: _Slot) -> None:
+        slot.live = False
+        self._live -= 1
+        self._cleared += 1
+        self._forget(slot)
+        if self._cleared > self.maxsize:
+            self._queue = deque(queued for queued in self._queue if queued.live)
+            self._cleared = 0
+
+    def _forget(self, slot: _Slot) -> None:
+        """Drop references to a slot that is no longer queued"""
+        event = slot.event
+        if event.event_type == EventType.JOB_OUTPUT_SKIPPED:
+            output_key = (event.job_id, _event_task_index(event))
+            if self._markers.get(output_key) is slot:
+                del self._markers[output_key]
+        elif event.event_type in STATUS_EVENT_TYPES:
+            status_key = (event.event_type, event.job_id, _event_task_index(event))
+            if self._latest_status.get(status_key) is slot:
+                del self._latest_status[status_key]
+
+    def _track(self, side: Deque[_Slot], slot: _Slot) -> None:
+        """Note a slot in a side deque, compacting it when mostly cleared"""
+        side.append(slot)
+        if len(side) > 2 * max(self.maxsize, 1):
+            live = [queued for queued in side if queued.live]
+            side.clear()
+            side.extend(live)
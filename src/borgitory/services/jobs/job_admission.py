@@ -0,0 +1,213 @@
+"""
+Job Admission - Load-aware admission of queued jobs
+
+The queue's concurrency limits are upper bounds. Below them, new borg
+processes are only started while the host has headroom, judged from live
+Linux signals: the 1 minute load average per CPU, the ``some avg10``
+pressure stall information (PSI) of I/O and CPU, and available memory.
+While any signal is over its threshold further jobs stay queued, so the
+number of concurrent jobs settles at the level the host can sustain
+rather than a fixed count. Each signal has hysteresis: once it holds jobs,
+it keeps holding until it has dropped ``hysteresis`` (a fraction) below
+its threshold, so admission does not flap around the limit.
+
+Signals that cannot be read (other platforms, kernels without PSI) never
+hold jobs.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostLoadSample:
+    """Host load signals at one point in time; None where unavailable"""
+
+    load_1m: Optional[float] = None
+    cpu_count: int = 1
+    io_pressure: Optional[float] = None
+    cpu_pressure: Optional[float] = None
+    memory_available_bytes: Optional[int] = None
+
+    @property
+    def load_per_cpu(self) -> Optional[float]:
+        if self.load_1m is None:
+            return None
+        return self.load_1m / max(1, self.cpu_count)
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="ascii") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _parse_pressure(text: Optional[str]) -> Optional[float]:
+    """The ``some avg10`` value of a /proc/pressure file"""
+    if text is None:
+        return None
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields or fields[0] != "some":
+            continue
+        for field in fields[1:]:
+            key, _, value = field.partition("=")
+            if key == "avg10":
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+    return None
+
+
+def _parse_memory_available(text: Optional[str]) -> Optional[int]:
+    """MemAvailable of /proc/meminfo in bytes"""
+    if text is None:
+        return None
+    for line in text.splitlines():
+        if line.startswith("MemAvailable:"):
+            try:
+                return int(line.split()[1]) * 1024
+            except (IndexError, ValueError):
+                return None
+    return None
+
+
+def read_host_load(proc_root: str = "/proc") -> HostLoadSample:
+    """Sample the host load signals from procfs"""
+    sample = HostLoadSample(cpu_count=os.cpu_count() or 1)
+    loadavg = _read_text(os.path.join(proc_root, "loadavg"))
+    if loadavg:
+        try:
+            sample.load_1m = float(loadavg.split()[0])
+        except (IndexError, ValueError):
+            pass
+    sample.io_pressure = _parse_pressure(
+        _read_text(os.path.join(proc_root, "pressure", "io"))
+    )
+    sample.cpu_pressure = _parse_pressure(
+        _read_text(os.path.join(proc_root, "pressure", "cpu"))
+    )
+    sample.memory_available_bytes = _parse_memory_available(
+        _read_text(os.path.join(proc_root, "meminfo"))
+    )
+    return sample
+
+
+@dataclass(frozen=True)
+class AdmissionThresholds:
+    """Limits above which queued jobs are held (0 disables a limit)"""
+
+    max_load_per_cpu: float = 2.0
+    # Percent of time some task stalled on I/O / CPU over the last 10s
+    max_io_pressure: float = 40.0
+    max_cpu_pressure: float = 60.0
+    min_available_memory_bytes: int = 256 * 1024 * 1024
+    # Fraction a signal must recover past its limit before jobs are admitted
+    hysteresis: float = 0.2
+
+
+class AdmissionController:
+    """Decides from host load whether another job may start"""
+
+    def __init__(
+        self,
+        thresholds: Optional[AdmissionThresholds] = None,
+        sample_interval: float = 2.0,
+        sampler: Callable[[], HostLoadSample] = read_host_load,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.thresholds = thresholds or AdmissionThresholds()
+        # Seconds a sample is reused; also how often held jobs are retried
+        self.sample_interval = sample_interval
+        self._sampler = sampler
+        self._clock = clock
+        self.last_sample: Optional[HostLoadSample] = None
+        self._sampled_at: Optional[float] = None
+        # Signals currently over their limit, with the reason they give
+        self._tripped: Dict[str, str] = {}
+
+    def hold_reason(self) -> Optional[str]:
+        """Why no further job may start right now, or None to admit one"""
+        now = self._clock()
+        if self._sampled_at is None or now - self._sampled_at >= self.sample_interval:
+            try:
+                self.last_sample = self._sampler()
+            except Exception as e:
+                logger.warning(f"Reading host load failed: {e}")
+                self.last_sample = HostLoadSample()
+            self._sampled_at = now
+            self._evaluate(self.last_sample)
+
+        return self.current_reason
+
+    @property
+    def current_reason(self) -> Optional[str]:
+        """Reason from the last evaluation, without sampling again"""
+        return "; ".join(self._tripped.values()) or None
+
+    def _evaluate(self, sample: HostLoadSample) -> None:
+        limits = self.thresholds
+        self._check_upper(
+            "load",
+            sample.load_per_cpu,
+            limits.max_load_per_cpu,
+            "load {value:.2f} per CPU (limit {limit:.2f})",
+        )
+        self._check_upper(
+            "io",
+            sample.io_pressure,
+            limits.max_io_pressure,
+            "I/O pressure {value:.1f}% (limit {limit:.1f}%)",
+        )
+        self._check_upper(
+            "cpu",
+            sample.cpu_pressure,
+            limits.max_cpu_pressure,
+            "CPU pressure {value:.1f}% (limit {limit:.1f}%)",
+        )
+
+        available = sample.memory_available_bytes
+        minimum = limits.min_available_memory_bytes
+        if available is None or minimum <= 0:
+            self._tripped.pop("memory", None)
+        else:
+            release = minimum * (1 + limits.hysteresis)
+            if available < minimum or (
+                "memory" in self._tripped and available < release
+            ):
+                self._trip(
+                    "memory",
+                    f"{available // (1024 * 1024)} MiB memory available "
+                    f"(minimum {minimum // (1024 * 1024)} MiB)",
+                )
+            else:
+                self._release("memory")
+
+    def _check_upper(
+        self, name: str, value: Optional[float], limit: float, message: str
+    ) -> None:
+        if value is None or limit <= 0:
+            self._tripped.pop(name, None)
+            return
+        release = limit * (1 - self.thresholds.hysteresis)
+        if value > limit or (name in self._tripped and value > release):
+            self._trip(name, message.format(value=value, limit=limit))
+        else:
+            self._release(name)
+
+    def _trip(self, name: str, reason: str) -> None:
+        if name not in self._tripped:
+            logger.info(f"Holding queued jobs: {reason}")
+        self._tripped[name] = reason
+
+    def _release(self, name: str) -> None:
+        if self._tripped.pop(name, None) is not None and not self._tripped:
+            logger.info("Host load recovered, admitting queued jobs")
@@ -2,24 +2,75 @@
 Job Database Manager - Handles database operations with dependency injection
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
 from datetime import datetime
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select, delete
+from sqlalchemy import select
+from sqlalchemy.orm import defer
 from borgitory.protocols.job_database_manager_protocol import JobDatabaseManagerProtocol
+from borgitory.services.jobs.job_log_store import LogLineRange
 from borgitory.services.jobs.job_models import TaskStatusEnum
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
 from borgitory.models.job_results import JobStatusEnum
 from borgitory.utils.datetime_utils import now_utc
 from dataclasses import dataclass
 
 if TYPE_CHECKING:
+    from borgitory.models.database import Job, JobTask
+    from borgitory.services.jobs.job_log_store import JobLogStore
+    from borgitory.services.jobs.job_output_search import JobOutputIndex
     from borgitory.services.jobs.job_models import BorgJobTask
 
 logger = logging.getLogger(__name__)
 
+OutputCursorKey = Tuple[uuid.UUID, int]
+
+# Tasks in these states no longer produce output
+FINISHED_TASK_STATUSES = frozenset(
+    {
+        TaskStatusEnum.COMPLETED,
+        TaskStatusEnum.FAILED,
+        TaskStatusEnum.SKIPPED,
+        TaskStatusEnum.STOPPED,
+    }
+)
+
+
+def _join_output_lines(lines: Iterable[Union[str, Dict[str, str]]]) -> str:
+    return "\n".join(
+        (line.get("text", "") or "") if isinstance(line, dict) else str(line)
+        for line in lines
+    )
+
+
+def _resource_usage_columns(usage: object) -> Dict[str, object]:
+    """JobTask resource columns of a task's sampled resource usage"""
+    if not isinstance(usage, ProcessResourceUsage):
+        return {}
+    return {
+        "cpu_user_seconds": usage.cpu_user_seconds,
+        "cpu_system_seconds": usage.cpu_system_seconds,
+        "max_rss_bytes": usage.max_rss_bytes,
+        "io_read_bytes": usage.read_bytes,
+        "io_write_bytes": usage.write_bytes,
+    }
+
+
+@dataclass
+class _OutputIndexWrite:
+    """Task output to add to the search index once the task row has an id"""
+
+    task: "JobTask"
+    text: str
+    # Log lines ``text`` was read from; None keeps the text in the index
+    source: Optional[LogLineRange] = None
+    # Add to the indexed output instead of replacing it
+    append: bool = False
+
 
 @dataclass
 class DatabaseJobData:
@@ -43,8 +94,14 @@ class JobDatabaseManager(JobDatabaseManagerProtocol):
     def __init__(
         self,
         async_session_maker: async_sessionmaker[AsyncSession],
+        output_index: Optional["JobOutputIndex"] = None,
+        log_store: Optional["JobLogStore"] = None,
     ) -> None:
         self.async_session_maker = async_session_maker
+        self.output_index = output_index
+        self.log_store = log_store
+        # Number of log store lines already indexed per (job, task_order)
+        self._output_cursors: Dict[OutputCursorKey, int] = {}
 
     async def create_database_job(
         self, job_data: DatabaseJobData
@@ -146,7 +203,7 @@ class JobDatabaseManager(JobDatabaseManagerProtocol):
                     "finished_at": db_job.finished_at.isoformat()
                     if db_job.finished_at
                     else None,
-                    "output": db_job.log_output,
+                    "output": db_job.get_log_output(),
                     "error_message": db_job.error,
                     "cloud_sync_config_id": db_job.cloud_sync_config_id,
                 }
@@ -231,61 +288,259 @@ class JobDatabaseManager(JobDatabaseManagerProtocol):
         self, job_id: uuid.UUID, tasks: List["BorgJobTask"]
     ) -> bool:
         """Save task data for a job to the database"""
+        results = await self.save_job_tasks_batch({job_id: tasks})
+        return results.get(job_id, False)
+
+    async def save_job_tasks_batch(
+        self, jobs: Dict[uuid.UUID, List["BorgJobTask"]]
+    ) -> Dict[uuid.UUID, bool]:
+        """Upsert task rows for several jobs in a single transaction
+
+        Rows are matched on ``task_order``; only columns whose value changed
+        are written. A task's output tail is stored when its row is created
+        and once it finishes; the complete output lives in the log store.
+        With an output index, lines added to the log store since the last
+        save are indexed for full-text search in the same transaction.
+        """
+        results: Dict[uuid.UUID, bool] = {job_id: False for job_id in jobs}
+        if not jobs:
+            return results
+
         try:
-            from borgitory.models.database import Job, JobTask
+            from borgitory.models.database import Job
 
             async with self.async_session_maker() as db:
-                # Find the job by UUID
-                result = await db.execute(select(Job).where(Job.id == job_id))
-                db_job = result.scalar_one_or_none()
-                if not db_job:
-                    logger.warning(f"Job not found for UUID {job_id}")
-                    return False
+                cursor_updates: Dict[OutputCursorKey, int] = {}
+                index_writes: List[_OutputIndexWrite] = []
+                for job_id, tasks in jobs.items():
+                    result = await db.execute(select(Job).where(Job.id == job_id))
+                    db_job = result.scalar_one_or_none()
+                    if not db_job:
+                        logger.warning(f"Job not found for UUID {job_id}")
+                        continue
+
+                    await self._upsert_job_tasks(
+                        db, db_job, job_id, tasks, cursor_updates, index_writes
+                    )
+                    results[job_id] = True
+
+                await self._index_output(db, index_writes)
+                await db.commit()
+
+            self._output_cursors.update(cursor_updates)
+            for job_id, tasks in jobs.items():
+                if results[job_id] and all(
+                    task.status in FINISHED_TASK_STATUSES for task in tasks
+                ):
+                    self._forget_output_cursors(job_id)
 
-                # Clear existing tasks for this job
-                await db.execute(delete(JobTask).where(JobTask.job_id == db_job.id))
-
-                # Save each task
-                for i, task in enumerate(tasks):
-                    # Convert task output lines to string if needed
-                    task_output = ""
-                    if hasattr(task, "output_lines") and task.output_lines:
-                        task_output = "\n".join(
-                            [
-                                (line.get("text", "") or "")
-                                if isinstance(line, dict)
-                                else str(line)
-                                for line in task.output_lines
-                            ]
-                        )
-
-                    db_task = JobTask()
-                    db_task.job_id = db_job.id
-                    db_task.task_type = task.task_type
-                    db_task.task_name = task.task_name
-                    db_task.status = task.status
-                    db_task.started_at = getattr(task, "started_at", None)
-                    db_task.completed_at = getattr(task, "completed_at", None)
-                    db_task.output = task_output
-                    db_task.error = getattr(task, "error", None)
-                    db_task.return_code = getattr(task, "return_code", None)
-                    db_task.task_order = i
-                    db.add(db_task)
-
-                # Update job task counts
-                db_job.total_tasks = len(tasks)
-                db_job.completed_tasks = sum(
-                    (1 for task in tasks if task.status == TaskStatusEnum.COMPLETED), 0
+            saved = [job_id for job_id, saved in results.items() if saved]
+            if saved:
+                logger.info(
+                    f"Saved tasks for {len(saved)} job(s): "
+                    + ", ".join(str(job_id) for job_id in saved)
                 )
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to save job tasks for {list(jobs)}: {e}")
+            return {job_id: False for job_id in jobs}
 
+    async def clear_job_output(self, job_id: uuid.UUID) -> bool:
+        """Drop the stored output of a job's tasks and its search index entries
+
+        Called before a job runs again so the new run starts without output.
+        Indexed chunks are removed using their text in the log store, so
+        this must run before the job's log is deleted.
+        """
+        try:
+            from borgitory.models.database import JobTask
+
+            async with self.async_session_maker() as db:
+                result = await db.execute(
+                    select(JobTask)
+                    .where(JobTask.job_id == job_id)
+                    .options(defer(JobTask.output))
+                )
+                db_tasks = result.scalars().all()
+                if (
+                    self.output_index is not None
+                    and db_tasks
+                    and await self.output_index.ensure(db)
+                ):
+                    await self.output_index.remove_tasks(
+                        db, [db_task.id for db_task in db_tasks]
+                    )
+                for db_task in db_tasks:
+                    db_task.output = None
+                    db_task.output_compressed = None
                 await db.commit()
-                logger.info(f"Saved {len(tasks)} tasks for job {job_id}")
-                return True
+
+            self._forget_output_cursors(job_id)
+            return True
 
         except Exception as e:
-            logger.error(f"Failed to save job tasks for {job_id}: {e}")
+            logger.error(f"Failed to clear output of job {job_id}: {e}")
             return False
 
+    async def _upsert_job_tasks(
+        self,
+        db: AsyncSession,
+        db_job: "Job",
+        job_id: uuid.UUID,
+        tasks: List["BorgJobTask"],
+        cursor_updates: Dict[OutputCursorKey, int],
+        index_writes: List[_OutputIndexWrite],
+    ) -> None:
+        from borgitory.models.database import JobTask
+
+        # Output text is never read back, only replaced
+        result = await db.execute(
+            select(JobTask)
+            .where(JobTask.job_id == db_job.id)
+            .options(defer(JobTask.output))
+        )
+        existing = {row.task_order: row for row in result.scalars().all()}
+
+        for i, task in enumerate(tasks):
+            values: Dict[str, object] = {
+                "task_type": task.task_type,
+                "task_name": task.task_name,
+                "status": task.status,
+                "started_at": getattr(task, "started_at", None),
+                "completed_at": getattr(task, "completed_at", None),
+                "error": getattr(task, "error", None),
+                "return_code": getattr(task, "return_code", None),
+            }
+            values.update(
+                _resource_usage_columns(getattr(task, "resource_usage", None))
+            )
+
+            db_task = existing.pop(i, None)
+            if db_task is None:
+                db_task = JobTask()
+                db_task.job_id = db_job.id
+                db_task.task_order = i
+                db.add(db_task)
+                store_tail = True
+            else:
+                store_tail = (
+                    task.status in FINISHED_TASK_STATUSES
+                    and db_task.status != task.status
+                )
+
+            for column, value in values.items():
+                if getattr(db_task, column) != value:
+                    setattr(db_task, column, value)
+
+            lines = getattr(task, "output_lines", ())
+            if store_tail:
+                db_task.output = _join_output_lines(lines)
+                db_task.output_compressed = None
+            await self._queue_index_write(
+                job_id, i, db_task, lines, store_tail, cursor_updates, index_writes
+            )
+
+        # Tasks removed from the job
+        for db_task in existing.values():
+            await db.delete(db_task)
+            index_writes.append(_OutputIndexWrite(db_task, ""))
+            cursor_updates.pop((job_id, db_task.task_order), None)
+            self._output_cursors.pop((job_id, db_task.task_order), None)
+
+        db_job.total_tasks = len(tasks)
+        db_job.completed_tasks = sum(
+            (1 for task in tasks if task.status == TaskStatusEnum.COMPLETED), 0
+        )
+
+    async def _queue_index_write(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        db_task: "JobTask",
+        lines: Iterable[Union[str, Dict[str, str]]],
+        store_tail: bool,
+        cursor_updates: Dict[OutputCursorKey, int],
+        index_writes: List[_OutputIndexWrite],
+    ) -> None:
+        """Queue the output of a task not yet in the search index
+
+        Output in the log store is indexed as it grows, past the last
+        indexed line. Tasks without a log, like hooks and notifications,
+        only have their in-memory tail, indexed whenever it is stored.
+        """
+        if self.output_index is None:
+            return
+        key = (job_id, task_index)
+        cursor = self._output_cursors.get(key)
+        unindexed = (
+            None
+            if self.log_store is None
+            else await asyncio.to_thread(
+                self._read_unindexed_output, job_id, task_index, cursor
+            )
+        )
+        if unindexed is None:
+            if store_tail:
+                index_writes.append(
+                    _OutputIndexWrite(db_task, _join_output_lines(lines))
+                )
+            return
+
+        total_lines, source, text = unindexed
+        # Unknown or rewound output is indexed in full once
+        append = cursor is not None and cursor <= total_lines
+        if source is not None:
+            if text is not None:
+                index_writes.append(
+                    _OutputIndexWrite(db_task, text, source=source, append=append)
+                )
+        elif not append:
+            index_writes.append(_OutputIndexWrite(db_task, ""))
+        cursor_updates[key] = total_lines
+
+    def _read_unindexed_output(
+        self, job_id: uuid.UUID, task_index: int, cursor: Optional[int]
+    ) -> Optional[Tuple[int, Optional[LogLineRange], Optional[str]]]:
+        """Read a task's logged output from ``cursor`` on; blocking
+
+        Returns the log's line count and the range read with its text, or
+        None when the task has no log.
+        """
+        if self.log_store is None or not self.log_store.has_log(job_id, task_index):
+            return None
+        total_lines = self.log_store.line_count(job_id, task_index)
+        start = 0 if cursor is None or cursor > total_lines else cursor
+        if start >= total_lines:
+            return total_lines, None, None
+        source = LogLineRange(job_id, task_index, start, total_lines - start)
+        return total_lines, source, self.log_store.read_range(source)
+
+    async def _index_output(
+        self, db: AsyncSession, index_writes: List[_OutputIndexWrite]
+    ) -> None:
+        if (
+            self.output_index is None
+            or not index_writes
+            or not await self.output_index.ensure(db)
+        ):
+            return
+        # Assigns ids to newly added task rows
+        await db.flush()
+        for write in index_writes:
+            if write.append:
+                await self.output_index.append_task_output(
+                    db, write.task.id, write.text, write.source
+                )
+            else:
+                await self.output_index.replace_task_output(
+                    db, write.task.id, write.text, write.source
+                )
+
+    def _forget_output_cursors(self, job_id: uuid.UUID) -> None:
+        for key in [key for key in self._output_cursors if key[0] == job_id]:
+            del self._output_cursors[key]
+
     async def get_job_statistics(self) -> Dict[str, object]:
         """Get job statistics"""
         try:
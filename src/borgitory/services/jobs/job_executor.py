@@ -16,6 +16,16 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from borgitory.utils.datetime_utils import now_utc
 from borgitory.protocols.command_protocols import ProcessResult
+from borgitory.services.jobs.process_output_capture import ProcessOutputCapture
+from borgitory.services.jobs.process_resources import (
+    ProcessResourceMonitor,
+    ProcessResourceUsage,
+)
+from borgitory.services.jobs.borg_progress import (
+    BORG_JSON_PROGRESS_ARGS,
+    BorgProgressTracker,
+    decode_borg_json_line,
+)
 from borgitory.services.cloud_providers.cloud_sync_service import CloudSyncService
 from borgitory.utils.security import create_borg_command
 
@@ -28,8 +38,11 @@ class JobExecutor:
     def __init__(
         self,
         command_executor: CommandExecutorProtocol,
+        resource_sample_interval: float = 5.0,
     ) -> None:
         self.command_executor = command_executor
+        # Seconds between resource samples of running processes (0 disables)
+        self.resource_sample_interval = resource_sample_interval
         self.progress_pattern = re.compile(
             r"(?P<original_size>\d+)\s+(?P<compressed_size>\d+)\s+(?P<deduplicated_size>\d+)\s+"
             r"(?P<nfiles>\d+)\s+(?P<path>.*)"
@@ -66,20 +79,63 @@ class JobExecutor:
         process: asyncio.subprocess.Process,
         output_callback: Optional[Callable[[str], None]] = None,
         progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+        log_json: bool = False,
+        bounded_output: bool = False,
+        resource_callback: Optional[Callable[[ProcessResourceUsage], None]] = None,
     ) -> ProcessResult:
-        """Monitor process output and return final result"""
-        stdout_data = b""
+        """Monitor process output and return final result
+
+        With ``log_json`` the process is expected to run with borg's
+        ``--log-json``: records are decoded into display text for
+        ``output_callback`` and throttled progress events for
+        ``progress_callback`` instead of scraping text lines.
+
+        With ``bounded_output`` the result's ``stdout`` only holds the tail of
+        the output; the complete output is spooled to a temporary file and
+        exposed through ``ProcessResult.output`` for streaming reads.
+
+        The process's resource usage is sampled while it runs, passed to
+        ``resource_callback`` after each sample and returned as
+        ``ProcessResult.resource_usage``.
+        """
+        capture = ProcessOutputCapture()
         stderr_data = b""
+        tracker = BorgProgressTracker() if log_json else None
+        resources = ProcessResourceMonitor(
+            getattr(process, "pid", None),
+            self.resource_sample_interval,
+            resource_callback,
+        )
+        resources.start()
 
         try:
             if process.stdout:
                 async for line in process.stdout:
-                    line_text = line.decode("utf-8", errors="replace").rstrip()
-                    stdout_data += line
-
-                    progress_info = self.parse_progress_line(line_text)
+                    line_text: Optional[str] = line.decode(
+                        "utf-8", errors="replace"
+                    ).rstrip()
+                    progress_info: Dict[str, object] = {}
+
+                    record = (
+                        decode_borg_json_line(line_text)
+                        if tracker and line_text
+                        else None
+                    )
+                    if record is not None and tracker is not None:
+                        line_text = record.text
+                        if record.text is not None:
+                            capture.write(record.text.encode("utf-8") + b"\n")
+                        progress = (
+                            tracker.update(record.progress) if record.progress else None
+                        )
+                        if progress is not None:
+                            progress_info = progress.to_dict()
+                    else:
+                        capture.write(line)
+                        if progress_callback and not tracker:
+                            progress_info = self.parse_progress_line(line_text or "")
 
-                    if output_callback:
+                    if output_callback and line_text is not None:
                         if inspect.iscoroutinefunction(output_callback):
                             await output_callback(line_text)
                         else:
@@ -91,18 +147,68 @@ class JobExecutor:
                         else:
                             progress_callback(progress_info)
 
+            # Last sample while the process can still be read, before it is reaped
+            resource_usage = await resources.stop()
             return_code = await process.wait()
 
-            return ProcessResult(
-                return_code=return_code, stdout=stdout_data, stderr=stderr_data
+            return self._build_result(
+                capture,
+                return_code,
+                stderr_data,
+                bounded_output=bounded_output,
+                resource_usage=resource_usage,
             )
 
+        except asyncio.CancelledError:
+            # The task was stopped; do not leave its process running
+            await self.terminate_process(process)
+            await resources.stop()
+            capture.close()
+            raise
+
         except Exception as e:
             error_msg = f"Process monitoring error: {e}"
             logger.error(error_msg)
+            return self._build_result(
+                capture,
+                -1,
+                stderr_data,
+                bounded_output=bounded_output,
+                error=error_msg,
+                resource_usage=await resources.stop(),
+            )
+
+    def _build_result(
+        self,
+        capture: ProcessOutputCapture,
+        return_code: int,
+        stderr: bytes,
+        bounded_output: bool,
+        error: Optional[str] = None,
+        resource_usage: Optional[ProcessResourceUsage] = None,
+    ) -> ProcessResult:
+        if bounded_output:
+            if capture.spooled:
+                logger.debug(
+                    f"Process output spooled to disk ({capture.total_bytes} bytes)"
+                )
             return ProcessResult(
-                return_code=-1, stdout=stdout_data, stderr=stderr_data, error=error_msg
+                return_code=return_code,
+                stdout=capture.tail(),
+                stderr=stderr,
+                error=error,
+                output=capture,
+                resource_usage=resource_usage,
             )
+        stdout = capture.read()
+        capture.close()
+        return ProcessResult(
+            return_code=return_code,
+            stdout=stdout,
+            stderr=stderr,
+            error=error,
+            resource_usage=resource_usage,
+        )
 
     def parse_progress_line(self, line: str) -> Dict[str, object]:
         """Parse Borg output line for progress information"""
@@ -298,6 +404,7 @@ class JobExecutor:
         repository_path: str,
         passphrase: str,
         output_callback: Optional[Callable[[str], None]] = None,
+        progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
     ) -> ProcessResult:
         """
         Execute a borg compact task
@@ -307,12 +414,13 @@ class JobExecutor:
             passphrase: Repository passphrase
             keyfile_content: Optional keyfile content
             output_callback: Callback for streaming output
+            progress_callback: Callback for structured progress updates
 
         Returns:
             ProcessResult with execution details
         """
         try:
-            additional_args = ["--progress", repository_path]
+            additional_args = [*BORG_JSON_PROGRESS_ARGS, repository_path]
 
             logger.info(f"Starting borg compact - Repository: {repository_path}")
 
@@ -326,7 +434,9 @@ class JobExecutor:
                 borg_command.command, borg_command.environment
             )
 
-            result = await self.monitor_process_output(process, output_callback)
+            result = await self.monitor_process_output(
+                process, output_callback, progress_callback, log_json=True
+            )
 
             if result.return_code == 0:
                 logger.info("Compact task completed successfully")
@@ -0,0 +1,333 @@
+"""
+Job History Retention - Compresses, prunes and compacts stored job history
+
+Finished jobs keep their output in plain ``Text`` columns while they are
+recent. Once a job has been finished for ``compress_after_hours`` its job and
+task output is zlib-compressed into the ``*_compressed`` BLOB columns, which
+the models read back transparently. Pruning is opt-in: jobs past
+``max_age_days`` or beyond the newest ``max_jobs_per_repository`` of their
+repository are only deleted when those limits are set, together with their
+search index entries and on-disk logs. Freed SQLite pages are returned to the
+filesystem with an incremental vacuum and WAL checkpoint; converting a
+database to incremental auto-vacuum takes a full VACUUM, so it only happens
+when ``convert_to_incremental_vacuum`` is set and no job is active. Every run
+produces a :class:`RetentionReport`.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from borgitory.config.job_history_config import JobHistoryRetentionConfig
+from borgitory.models.database import Job, JobQueueEntry, JobTask, StringUUID
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.services.jobs.job_log_store import JobLogStore
+from borgitory.services.jobs.job_output_search import JobOutputIndex
+from borgitory.utils.datetime_utils import now_utc
+from borgitory.utils.text_compression import compress_text
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states may still be written to and are never touched
+ACTIVE_JOB_STATUSES = (
+    JobStatusEnum.PENDING,
+    JobStatusEnum.QUEUED,
+    JobStatusEnum.RUNNING,
+)
+
+# SQLite's PRAGMA auto_vacuum value for INCREMENTAL mode
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class RetentionReport:
+    """Outcome of a retention run"""
+
+    started_at: datetime
+    duration_seconds: float = 0.0
+    compressed_jobs: int = 0
+    compressed_tasks: int = 0
+    uncompressed_bytes: int = 0
+    compressed_bytes: int = 0
+    pruned_jobs: int = 0
+    pruned_tasks: int = 0
+    database_bytes_before: int = 0
+    database_bytes_after: int = 0
+    vacuum_mode_converted: bool = False
+
+    @property
+    def compression_saved_bytes(self) -> int:
+        return self.uncompressed_bytes - self.compressed_bytes
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """Bytes the database file shrank by"""
+        return max(0, self.database_bytes_before - self.database_bytes_after)
+
+    def to_dict(self) -> dict[str, object]:
+        data = asdict(self)
+        data["started_at"] = self.started_at.isoformat()
+        data["compression_saved_bytes"] = self.compression_saved_bytes
+        data["reclaimed_bytes"] = self.reclaimed_bytes
+        return data
+
+
+class JobHistoryRetentionService:
+    """Keeps the job history tables and the database file bounded"""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: Optional[JobHistoryRetentionConfig] = None,
+        clock: Callable[[], datetime] = now_utc,
+        output_index: Optional[JobOutputIndex] = None,
+        log_store: Optional[JobLogStore] = None,
+    ) -> None:
+        self.session_maker = session_maker
+        self.output_index = output_index
+        self.log_store = log_store
+        self.config = config or JobHistoryRetentionConfig()
+        self._clock = clock
+        self._run_lock = asyncio.Lock()
+        self._loop_task: Optional["asyncio.Task[None]"] = None
+        self.last_report: Optional[RetentionReport] = None
+
+    async def start(self) -> None:
+        """Start periodic retention runs in the background"""
+        if self._loop_task is not None or self.config.run_interval <= 0:
+            return
+        self._loop_task = asyncio.create_task(self._run_periodically())
+        logger.info(
+            f"Job history retention scheduled every {self.config.run_interval:.0f}s"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background loop, waiting for a run in progress"""
+        if self._loop_task is None:
+            return
+        self._loop_task.cancel()
+        try:
+            await self._loop_task
+        except asyncio.CancelledError:
+            pass
+        self._loop_task = None
+
+    async def run(self) -> RetentionReport:
+        """Compress, prune and compact the job history once"""
+        async with self._run_lock:
+            report = RetentionReport(started_at=self._clock())
+            started = time.monotonic()
+
+            report.database_bytes_before = await self._database_size()
+            await self.compress_finished_jobs(report)
+            await self.prune_history(report)
+            await self.reclaim_space(report)
+            report.database_bytes_after = await self._database_size()
+
+            report.duration_seconds = round(time.monotonic() - started, 3)
+            self.last_report = report
+            logger.info(
+                f"Job history retention: compressed {report.compressed_tasks} task "
+                f"outputs and {report.compressed_jobs} job logs "
+                f"(saved {report.compression_saved_bytes} bytes), pruned "
+                f"{report.pruned_jobs} jobs, reclaimed {report.reclaimed_bytes} bytes "
+                f"in {report.duration_seconds}s"
+            )
+            return report
+
+    async def compress_finished_jobs(self, report: RetentionReport) -> None:
+        """Move output of long-finished jobs into compressed BLOB columns"""
+        cutoff = self._clock() - timedelta(hours=self.config.compress_after_hours)
+        finished_before_cutoff = (
+            Job.finished_at.is_not(None),
+            Job.finished_at < cutoff,
+            Job.status.not_in(ACTIVE_JOB_STATUSES),
+        )
+
+        while True:
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    select(JobTask)
+                    .join(Job, JobTask.job_id == Job.id)
+                    .where(JobTask.output.is_not(None), *finished_before_cutoff)
+                    .limit(self.config.batch_size)
+                )
+                tasks = list(result.scalars().all())
+                for task in tasks:
+                    task.output_compressed = self._compress(task.output, report)
+                    task.output = None
+                await db.commit()
+            report.compressed_tasks += len(tasks)
+            if len(tasks) < self.config.batch_size:
+                break
+            await asyncio.sleep(0)
+
+        while True:
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    select(Job)
+                    .where(Job.log_output.is_not(None), *finished_before_cutoff)
+                    .limit(self.config.batch_size)
+                )
+                jobs = list(result.scalars().all())
+                for job in jobs:
+                    job.log_output_compressed = self._compress(job.log_output, report)
+                    job.log_output = None
+                await db.commit()
+            report.compressed_jobs += len(jobs)
+            if len(jobs) < self.config.batch_size:
+                break
+            await asyncio.sleep(0)
+
+    async def prune_history(self, report: RetentionReport) -> None:
+        """Delete finished jobs past the age limit or the per-repository count"""
+        if self.config.max_age_days > 0:
+            cutoff = self._clock() - timedelta(days=self.config.max_age_days)
+            await self._delete_in_batches(
+                select(Job.id).where(
+                    Job.status.not_in(ACTIVE_JOB_STATUSES),
+                    Job.finished_at.is_not(None),
+                    Job.finished_at < cutoff,
+                ),
+                report,
+            )
+
+        if self.config.max_jobs_per_repository > 0:
+            async with self.session_maker() as db:
+                result = await db.execute(select(Job.repository_id).distinct())
+                repository_ids = list(result.scalars().all())
+            for repository_id in repository_ids:
+                await self._delete_in_batches(
+                    select(Job.id)
+                    .where(
+                        Job.repository_id == repository_id,
+                        Job.status.not_in(ACTIVE_JOB_STATUSES),
+                    )
+                    .order_by(Job.started_at.desc(), Job.id.desc())
+                    .offset(self.config.max_jobs_per_repository),
+                    report,
+                )
+
+    async def reclaim_space(self, report: RetentionReport) -> None:
+        """Release free pages with an incremental vacuum and checkpoint the WAL"""
+        convert = (
+            self.config.convert_to_incremental_vacuum
+            and not await self._has_active_jobs()
+        )
+        async with self.session_maker() as db:
+            # VACUUM and its pragmas cannot run inside a transaction
+            conn = await db.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            if conn.dialect.name != "sqlite":
+                return
+
+            auto_vacuum = await self._pragma(conn, "auto_vacuum")
+            if auto_vacuum != _AUTO_VACUUM_INCREMENTAL:
+                if convert:
+                    # Switching the vacuum mode only takes effect after one
+                    # full VACUUM
+                    logger.info("Converting database to incremental auto-vacuum")
+                    await conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+                    await conn.exec_driver_sql("VACUUM")
+                    report.vacuum_mode_converted = True
+            else:
+                pages = self.config.vacuum_max_pages
+                statement = (
+                    f"PRAGMA incremental_vacuum({pages})"
+                    if pages > 0
+                    else "PRAGMA incremental_vacuum"
+                )
+                # The pragma frees one page per step; the sqlite3 module only
+                # steps statements to completion when run as a script
+                raw_connection = await conn.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                if driver_connection is not None:
+                    await driver_connection.executescript(statement)
+
+            result = await conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            if result.returns_rows:
+                result.fetchall()
+
+    async def _delete_in_batches(
+        self, id_query: "Select[Any]", report: RetentionReport
+    ) -> None:
+        while True:
+            async with self.session_maker() as db:
+                result = await db.execute(id_query.limit(self.config.batch_size))
+                job_ids: Sequence[StringUUID] = result.scalars().all()
+                if not job_ids:
+                    return
+                if self.output_index is not None and await self.output_index.ensure(db):
+                    task_ids = await db.execute(
+                        select(JobTask.id).where(JobTask.job_id.in_(job_ids))
+                    )
+                    await self.output_index.remove_tasks(db, task_ids.scalars().all())
+                task_result = await db.execute(
+                    delete(JobTask).where(JobTask.job_id.in_(job_ids))
+                )
+                await db.execute(
+                    delete(JobQueueEntry).where(JobQueueEntry.job_id.in_(job_ids))
+                )
+                await db.execute(delete(Job).where(Job.id.in_(job_ids)))
+                await db.commit()
+            if self.log_store is not None:
+                for job_id in job_ids:
+                    await asyncio.to_thread(self.log_store.delete_job, job_id)
+            report.pruned_jobs += len(job_ids)
+            report.pruned_tasks += _rowcount(task_result)
+            if len(job_ids) < self.config.batch_size:
+                return
+            await asyncio.sleep(0)
+
+    async def _has_active_jobs(self) -> bool:
+        async with self.session_maker() as db:
+            active = await db.scalar(
+                select(func.count())
+                .select_from(Job)
+                .where(Job.status.in_(ACTIVE_JOB_STATUSES))
+            )
+        return bool(active)
+
+    async def _database_size(self) -> int:
+        async with self.session_maker() as db:
+            conn = await db.connection()
+            if conn.dialect.name != "sqlite":
+                return 0
+            page_count = await self._pragma(conn, "page_count")
+            page_size = await self._pragma(conn, "page_size")
+            return page_count * page_size
+
+    async def _run_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.run_interval)
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error(f"Job history retention run failed: {e}")
+
+    @staticmethod
+    async def _pragma(conn: AsyncConnection, name: str) -> int:
+        result = await conn.exec_driver_sql(f"PRAGMA {name}")
+        value = result.scalar()
+        return int(value) if value is not None else 0
+
+    @staticmethod
+    def _compress(text: Optional[str], report: RetentionReport) -> Optional[bytes]:
+        if not text:
+            return None
+        blob = compress_text(text)
+        report.uncompressed_bytes += len(text.encode("utf-8"))
+        report.compressed_bytes += len(blob)
+        return blob
+
+
+def _rowcount(result: object) -> int:
+    count = getattr(result, "rowcount", 0)
+    return count if isinstance(count, int) and count > 0 else 0
@@ -0,0 +1,364 @@
+"""
+Job Log Store - Append-only, segmented on-disk storage for job task output
+
+Each task of a job gets its own directory of segment files. Segments are
+named after the absolute line number of their first line and are rolled
+once they grow past ``segment_max_bytes``. Every segment has a sparse
+``.idx`` sidecar holding the byte offset of every ``index_interval``-th line,
+so any line range can be located with one seek and a bounded forward scan.
+
+Calls are blocking; callers on the event loop run them in a thread. Segment
+metadata of logs read without a writer is cached until the job is closed.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import uuid
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log"
+INDEX_SUFFIX = ".idx"
+
+# Lines are stored one per record, so embedded newlines are swapped for a
+# control character that borg/rclone never emit and restored on read.
+_NEWLINE_ESCAPE = "\x1f"
+
+
+def _encode_line(text: str) -> bytes:
+    return (text.replace("\n", _NEWLINE_ESCAPE) + "\n").encode(
+        "utf-8", errors="replace"
+    )
+
+
+def _decode_line(raw: bytes) -> str:
+    return (
+        raw.rstrip(b"\n")
+        .decode("utf-8", errors="replace")
+        .replace(_NEWLINE_ESCAPE, "\n")
+    )
+
+
+@dataclass
+class LogSegment:
+    """A single segment file and its sparse line offset index"""
+
+    path: str
+    start_line: int
+    line_count: int = 0
+    size_bytes: int = 0
+    offsets: "array[int]" = field(default_factory=lambda: array("Q"))
+
+    @property
+    def index_path(self) -> str:
+        return self.path[: -len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+
+    @property
+    def end_line(self) -> int:
+        return self.start_line + self.line_count
+
+
+@dataclass
+class TaskLog:
+    """All segments belonging to one task of one job"""
+
+    directory: str
+    segments: List[LogSegment] = field(default_factory=list)
+
+    @property
+    def total_lines(self) -> int:
+        return self.segments[-1].end_line if self.segments else 0
+
+
+@dataclass(frozen=True)
+class LogLineRange:
+    """A range of lines of one task log"""
+
+    job_id: uuid.UUID
+    task_index: int
+    start: int
+    count: int
+
+
+class JobLogStore:
+    """Disk-backed, offset-indexed line store for job and task output"""
+
+    def __init__(
+        self,
+        base_dir: str,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        index_interval: int = 256,
+        max_cached_readers: int = 256,
+    ) -> None:
+        self.base_dir = base_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval = index_interval
+        self.max_cached_readers = max_cached_readers
+        self._writers: Dict[Tuple[uuid.UUID, int], TaskLog] = {}
+        # Logs loaded for reading, least recently used first
+        self._readers: "OrderedDict[Tuple[uuid.UUID, int], TaskLog]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def job_dir(self, job_id: uuid.UUID) -> str:
+        """Directory holding all task logs for a job"""
+        return os.path.join(self.base_dir, str(job_id))
+
+    def task_dir(self, job_id: uuid.UUID, task_index: int) -> str:
+        """Directory holding the segments of a single task"""
+        return os.path.join(self.job_dir(job_id), f"task-{task_index}")
+
+    def append_lines(self, job_id: uuid.UUID, task_index: int, lines: List[str]) -> int:
+        """Append lines to a task log and return the new total line count"""
+        task_log = self._get_writer(job_id, task_index)
+        if not lines:
+            return task_log.total_lines
+
+        segment = task_log.segments[-1]
+        if segment.size_bytes >= self.segment_max_bytes:
+            segment = self._roll_segment(task_log)
+
+        new_offsets = array("Q")
+        chunks: List[bytes] = []
+        offset = segment.size_bytes
+        line_number = segment.line_count
+        for text in lines:
+            if line_number % self.index_interval == 0:
+                new_offsets.append(offset)
+            encoded = _encode_line(text)
+            chunks.append(encoded)
+            offset += len(encoded)
+            line_number += 1
+
+        with open(segment.path, "ab") as segment_file:
+            segment_file.write(b"".join(chunks))
+        if new_offsets:
+            with open(segment.index_path, "ab") as index_file:
+                new_offsets.tofile(index_file)
+            segment.offsets.extend(new_offsets)
+
+        segment.size_bytes = offset
+        segment.line_count = line_number
+        return task_log.total_lines
+
+    def line_count(self, job_id: uuid.UUID, task_index: int) -> int:
+        """Total number of lines stored for a task"""
+        task_log = self._get_task_log(job_id, task_index)
+        return task_log.total_lines if task_log else 0
+
+    def has_log(self, job_id: uuid.UUID, task_index: Optional[int] = None) -> bool:
+        """Check whether any output has been stored for a job or task"""
+        if task_index is None:
+            return os.path.isdir(self.job_dir(job_id))
+        return os.path.isdir(self.task_dir(job_id, task_index))
+
+    def list_tasks(self, job_id: uuid.UUID) -> List[int]:
+        """Task indexes that have a log for the given job"""
+        job_dir = self.job_dir(job_id)
+        if not os.path.isdir(job_dir):
+            return []
+        task_indexes = []
+        for name in os.listdir(job_dir):
+            if name.startswith("task-") and name[5:].isdigit():
+                task_indexes.append(int(name[5:]))
+        return sorted(task_indexes)
+
+    def read_lines(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> List[str]:
+        """Read ``count`` lines starting at line ``start`` (all remaining if None)"""
+        return list(self.iter_lines(job_id, task_index, start, count))
+
+    def tail_lines(self, job_id: uuid.UUID, task_index: int, count: int) -> List[str]:
+        """Read the last ``count`` lines of a task log"""
+        total = self.line_count(job_id, task_index)
+        return self.read_lines(job_id, task_index, max(0, total - count), count)
+
+    def read_text(self, job_id: uuid.UUID, task_index: int) -> str:
+        """Read a whole task log as newline-joined text"""
+        return "\n".join(self.iter_lines(job_id, task_index))
+
+    def read_range(self, line_range: LogLineRange) -> Optional[str]:
+        """Read a line range as newline-joined text, or None if it is not stored"""
+        lines = self.read_lines(
+            line_range.job_id, line_range.task_index, line_range.start, line_range.count
+        )
+        if len(lines) != line_range.count:
+            return None
+        return "\n".join(lines)
+
+    def iter_lines(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Lazily yield lines from a task log without loading it into memory"""
+        task_log = self._get_task_log(job_id, task_index)
+        if not task_log or not task_log.segments:
+            return
+
+        start = max(0, start)
+        end = task_log.total_lines if count is None else start + max(0, count)
+        end = min(end, task_log.total_lines)
+        if start >= end:
+            return
+
+        starts = [segment.start_line for segment in task_log.segments]
+        segment_position = max(0, bisect_right(starts, start) - 1)
+        line_number = start
+
+        for segment in task_log.segments[segment_position:]:
+            if line_number >= end:
+                break
+            relative = line_number - segment.start_line
+            anchor = relative // self.index_interval
+            if anchor >= len(segment.offsets):
+                anchor = len(segment.offsets) - 1
+            seek_to = segment.offsets[anchor] if anchor >= 0 else 0
+            skip = relative - max(anchor, 0) * self.index_interval
+
+            with open(segment.path, "rb") as segment_file:
+                segment_file.seek(seek_to)
+                for _ in range(skip):
+                    segment_file.readline()
+                while line_number < min(end, segment.end_line):
+                    raw = segment_file.readline()
+                    if not raw:
+                        break
+                    yield _decode_line(raw)
+                    line_number += 1
+
+    def close_job(self, job_id: uuid.UUID) -> None:
+        """Drop cached writer and reader state for a job; its logs remain on disk"""
+        with self._lock:
+            for key in [key for key in self._writers if key[0] == job_id]:
+                del self._writers[key]
+            for key in [key for key in self._readers if key[0] == job_id]:
+                del self._readers[key]
+
+    def delete_job(self, job_id: uuid.UUID) -> bool:
+        """Remove all stored output for a job"""
+        self.close_job(job_id)
+        job_dir = self.job_dir(job_id)
+        if not os.path.isdir(job_dir):
+            return False
+        shutil.rmtree(job_dir, ignore_errors=True)
+        logger.debug(f"Deleted job log directory {job_dir}")
+        return True
+
+    def _get_writer(self, job_id: uuid.UUID, task_index: int) -> TaskLog:
+        key = (job_id, task_index)
+        with self._lock:
+            task_log = self._writers.get(key)
+            if task_log is None:
+                # A log loaded for reading is current until it is written to
+                task_log = self._readers.pop(key, None)
+                if task_log is None:
+                    directory = self.task_dir(job_id, task_index)
+                    os.makedirs(directory, exist_ok=True)
+                    task_log = self._load_task_log(directory)
+                if not task_log.segments:
+                    self._roll_segment(task_log)
+                self._writers[key] = task_log
+            return task_log
+
+    def _get_task_log(self, job_id: uuid.UUID, task_index: int) -> Optional[TaskLog]:
+        key = (job_id, task_index)
+        with self._lock:
+            task_log = self._writers.get(key)
+            if task_log is not None:
+                return task_log
+            task_log = self._readers.get(key)
+            if task_log is not None:
+                self._readers.move_to_end(key)
+                return task_log
+            directory = self.task_dir(job_id, task_index)
+            if not os.path.isdir(directory):
+                return None
+            task_log = self._load_task_log(directory)
+            self._readers[key] = task_log
+            if len(self._readers) > self.max_cached_readers:
+                self._readers.popitem(last=False)
+            return task_log
+
+    def _roll_segment(self, task_log: TaskLog) -> LogSegment:
+        start_line = task_log.total_lines
+        path = os.path.join(task_log.directory, f"{start_line:012d}{SEGMENT_SUFFIX}")
+        open(path, "ab").close()
+        segment = LogSegment(path=path, start_line=start_line)
+        task_log.segments.append(segment)
+        return segment
+
+    def _load_task_log(self, directory: str) -> TaskLog:
+        """Rebuild segment metadata from disk for a task directory"""
+        task_log = TaskLog(directory=directory)
+        names = sorted(
+            name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX)
+        )
+        for name in names:
+            stem = name[: -len(SEGMENT_SUFFIX)]
+            if not stem.isdigit():
+                continue
+            segment = LogSegment(
+                path=os.path.join(directory, name), start_line=int(stem)
+            )
+            self._load_segment(segment)
+            task_log.segments.append(segment)
+        return task_log
+
+    def _load_segment(self, segment: LogSegment) -> None:
+        segment.size_bytes = os.path.getsize(segment.path)
+        if os.path.exists(segment.index_path):
+            with open(segment.index_path, "rb") as index_file:
+                data = index_file.read()
+            usable = len(data) - len(data) % segment.offsets.itemsize
+            segment.offsets.frombytes(data[:usable])
+
+        # Drop index entries pointing past the end of a truncated segment
+        while segment.offsets and segment.offsets[-1] >= segment.size_bytes:
+            segment.offsets.pop()
+
+        # Count the lines after the last index entry to recover the total
+        anchor = len(segment.offsets) - 1
+        seek_to = segment.offsets[anchor] if anchor >= 0 else 0
+        tail_lines = 0
+        with open(segment.path, "rb") as segment_file:
+            segment_file.seek(seek_to)
+            for _ in segment_file:
+                tail_lines += 1
+
+        if anchor < 0 and tail_lines > 0 or tail_lines > self.index_interval:
+            self._rebuild_index(segment)
+            return
+        # Without an index entry the segment is empty; the tail is the total
+        segment.line_count = max(anchor, 0) * self.index_interval + tail_lines
+
+    def _rebuild_index(self, segment: LogSegment) -> None:
+        """Recreate a missing or incomplete sidecar index by scanning the segment"""
+        offsets = array("Q")
+        offset = 0
+        line_count = 0
+        with open(segment.path, "rb") as segment_file:
+            for raw in segment_file:
+                if line_count % self.index_interval == 0:
+                    offsets.append(offset)
+                offset += len(raw)
+                line_count += 1
+        with open(segment.index_path, "wb") as index_file:
+            offsets.tofile(index_file)
+        segment.offsets = offsets
+        segment.line_count = line_count
+        logger.debug(f"Rebuilt log index for {segment.path}")
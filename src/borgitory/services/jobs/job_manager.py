@@ -8,12 +8,18 @@ clean architecture following the same pattern as other services in the applicati
 import asyncio
 import logging
 import uuid
+from dataclasses import asdict
 from typing import (
+    Any,
     Dict,
+    Iterable,
     Optional,
     List,
     AsyncGenerator,
+    Sequence,
+    Set,
     TYPE_CHECKING,
+    cast,
 )
 
 from borgitory.models.job_results import JobStatusEnum, JobStatus, JobTypeEnum
@@ -28,10 +34,19 @@ from borgitory.services.jobs.job_models import (
     TaskStatusEnum,
 )
 from borgitory.services.jobs.job_output_manager import JobOutputStreamResponse
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
+from borgitory.services.jobs.job_task_writer import JobTaskWriter
+from borgitory.services.jobs.job_memory_eviction import (
+    JobMemoryEvictor,
+    JobMemoryUsage,
+)
 from borgitory.services.jobs.job_manager_factory import JobManagerFactory
 from borgitory.services.jobs.job_queue_manager import QueuedJob, JobPriority
+from borgitory.services.jobs.job_queue_store import QueueEntryState
 from borgitory.services.jobs.broadcaster.event_type import EventType
 from borgitory.services.jobs.broadcaster.job_event import JobEvent
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
+from borgitory.services.metrics.app_metrics import JOBS_FINISHED, TASK_DURATION
 from borgitory.services.jobs.task_executors import (
     BackupTaskExecutor,
     PruneTaskExecutor,
@@ -46,6 +61,9 @@ if TYPE_CHECKING:
     from borgitory.models.database import Repository, Schedule
 logger = logging.getLogger(__name__)
 
+# Final job statuses set from outside the job's own execution
+_HALTED_JOB_STATUSES = (JobStatusEnum.STOPPED, JobStatusEnum.CANCELLED)
+
 
 class JobManager:
     """
@@ -73,10 +91,32 @@ class JobManager:
 
         self.jobs: Dict[uuid.UUID, BorgJob] = {}
         self._processes: Dict[uuid.UUID, asyncio.subprocess.Process] = {}
+        # Running tasks of each composite job's task graph
+        self._task_runners: Dict[uuid.UUID, Dict["asyncio.Task[None]", int]] = {}
+        # Executions of jobs started by the queue
+        self._job_runs: Set["asyncio.Task[None]"] = set()
 
         self._initialized = False
         self._shutdown_requested = False
 
+        self.output_ingestor = JobOutputIngestor(
+            self.output_manager,
+            self.event_broadcaster,
+            max_batch_lines=self.config.output_batch_max_lines,
+            max_batch_latency=self.config.output_batch_max_latency,
+        )
+        self.task_writer = JobTaskWriter(
+            self.database_manager,
+            flush_interval=self.config.task_persist_interval,
+        )
+        self.evictor = JobMemoryEvictor(
+            lambda: self.jobs,
+            self.output_manager,
+            finished_job_ttl=self.config.finished_job_ttl,
+            max_memory_bytes=self.config.max_job_memory_bytes,
+            interval=self.config.job_eviction_interval,
+        )
+
         # Initialize task executors
         self._init_task_executors()
 
@@ -89,24 +129,28 @@ class JobManager:
             self.output_manager,
             self.event_broadcaster,
             self.database_manager,
+            self.output_ingestor,
         )
         self.prune_executor = PruneTaskExecutor(
             self.executor,
             self.output_manager,
             self.event_broadcaster,
             self.database_manager,
+            self.output_ingestor,
         )
         self.compact_executor = CompactTaskExecutor(
             self.executor,
             self.output_manager,
             self.event_broadcaster,
             self.database_manager,
+            self.output_ingestor,
         )
         self.check_executor = CheckTaskExecutor(
             self.executor,
             self.output_manager,
             self.event_broadcaster,
             self.database_manager,
+            self.output_ingestor,
         )
         self.cloud_sync_executor = CloudSyncTaskExecutor(
             self.executor,
@@ -115,6 +159,7 @@ class JobManager:
             self.dependencies.async_session_maker,
             self.dependencies.cloud_sync_service,
             self.database_manager,
+            self.output_ingestor,
         )
         self.notification_executor = NotificationTaskExecutor(
             self.executor,
@@ -149,6 +194,8 @@ class JobManager:
         if self.event_broadcaster:
             await self.event_broadcaster.initialize()
 
+        self.evictor.start()
+
         self._initialized = True
         logger.info("Job manager initialized successfully")
 
@@ -216,21 +263,9 @@ class JobManager:
             self._processes[job.id] = process
 
             def output_callback(line: str) -> None:
-                # Provide default progress since callback now only receives line
-                progress: Dict[str, object] = {}
-                # Add output to both the task and the output manager
+                # Add output to both the task and the batched output pipeline
                 task.output_lines.append(line)
-                asyncio.create_task(
-                    self.output_manager.add_output_line(
-                        job.id, line, "stdout", progress
-                    )
-                )
-
-                self.event_broadcaster.broadcast_event(
-                    EventType.JOB_OUTPUT,
-                    job_id=job.id,
-                    data={"line": line, "progress": None},  # No progress data
-                )
+                self.output_ingestor.submit(job.id, job.current_task_index, line)
 
             result = await self.executor.monitor_process_output(
                 process, output_callback=output_callback
@@ -239,6 +274,7 @@ class JobManager:
             # Update task and job based on process result
             task.completed_at = now_utc()
             task.return_code = result.return_code
+            task.resource_usage = result.resource_usage
 
             if result.return_code == 0:
                 task.status = TaskStatusEnum.COMPLETED
@@ -287,12 +323,26 @@ class JobManager:
         finally:
             if job.id in self._processes:
                 del self._processes[job.id]
+            await self.output_ingestor.flush(job.id)
+            self.output_manager.close_job_output(job.id)
+            # Ad-hoc command jobs are never persisted; they expire by TTL
+            self._release_finished_job(job.id)
 
     def _on_job_start(self, job_id: uuid.UUID, queued_job: QueuedJob) -> None:
         """Callback when queue manager starts a job"""
         job = self.jobs.get(job_id)
-        if job and job.command:
-            asyncio.create_task(self._execute_simple_job(job, job.command))
+        if not job or job.status not in [JobStatusEnum.PENDING, JobStatusEnum.QUEUED]:
+            # Stopped or removed while waiting in the queue
+            self.queue_manager.mark_job_completed(job_id, False)
+            return
+
+        job.queue_wait_seconds = queued_job.wait_seconds
+        if job.command:
+            run = asyncio.create_task(self._execute_simple_job(job, job.command))
+        else:
+            run = asyncio.create_task(self._execute_composite_job(job))
+        self._job_runs.add(run)
+        run.add_done_callback(self._job_runs.discard)
 
     def _on_job_complete(self, job_id: uuid.UUID, success: bool) -> None:
         """Callback when queue manager completes a job"""
@@ -307,33 +357,20 @@ class JobManager:
         repository: "Repository",
         schedule: Optional["Schedule"] = None,
         cloud_sync_config_id: Optional[int] = None,
+        additional_repositories: Sequence["Repository"] = (),
     ) -> uuid.UUID:
-        """Create a composite job with multiple tasks"""
+        """Create a composite job with multiple tasks
+
+        ``additional_repositories`` are further repositories the tasks write
+        to, such as the targets of a fan-out backup. The job is recorded
+        against ``repository``, but waits in the queue until every one of
+        its repositories is idle.
+        """
         await self.initialize()
 
         job_id = uuid.uuid4()
 
-        tasks = []
-        for task_def in task_definitions:
-            # Create parameters dict from the TaskDefinition
-            parameters: Dict[str, object] = {
-                "type": task_def.type,
-                "name": task_def.name,
-                **task_def.parameters,
-            }
-            if task_def.priority is not None:
-                parameters["priority"] = task_def.priority
-            if task_def.timeout is not None:
-                parameters["timeout"] = task_def.timeout
-            if task_def.retry_count is not None:
-                parameters["retry_count"] = task_def.retry_count
-
-            task = BorgJobTask(
-                task_type=TaskTypeEnum(task_def.type),
-                task_name=task_def.name,
-                parameters=parameters,
-            )
-            tasks.append(task)
+        tasks = self._build_tasks(task_definitions)
 
         job = BorgJob(
             id=job_id,
@@ -369,7 +406,26 @@ class JobManager:
 
         self.output_manager.create_job_output(job_id)
 
-        asyncio.create_task(self._execute_composite_job(job))
+        # Jobs of the same repository are serialized by the queue, as borg
+        # holds an exclusive repository lock while it runs. The metadata lets
+        # the durable queue rebuild the job after a restart.
+        additional_repository_keys = [
+            other.path for other in additional_repositories if other.id != repository.id
+        ]
+        await self.queue_manager.enqueue_job(
+            job_id=job_id,
+            job_type=job_type,
+            priority=JobPriority.NORMAL,
+            metadata={
+                "repository_id": repository.id,
+                "cloud_sync_config_id": cloud_sync_config_id,
+                "tasks": [asdict(task_def) for task_def in task_definitions],
+                "additional_repository_keys": additional_repository_keys,
+            },
+            repository_key=repository.path,
+            durable=True,
+            additional_repository_keys=additional_repository_keys,
+        )
 
         self.event_broadcaster.broadcast_event(
             EventType.JOB_STARTED,
@@ -379,9 +435,161 @@ class JobManager:
 
         return job_id
 
+    @staticmethod
+    def _build_tasks(task_definitions: Iterable["TaskDefinition"]) -> List[BorgJobTask]:
+        """Create the tasks of a composite job from their definitions
+
+        Raises ValueError if a task depends on a task that is not listed
+        before it, or on a name shared by several earlier tasks.
+        """
+        tasks: List[BorgJobTask] = []
+        earlier: Dict[str, int] = {}
+        ambiguous: Set[str] = set()
+        for task_def in task_definitions:
+            # Create parameters dict from the TaskDefinition
+            parameters: Dict[str, object] = {
+                "type": task_def.type,
+                "name": task_def.name,
+                **task_def.parameters,
+            }
+            if task_def.priority is not None:
+                parameters["priority"] = task_def.priority
+            if task_def.timeout is not None:
+                parameters["timeout"] = task_def.timeout
+            if task_def.retry_count is not None:
+                parameters["retry_count"] = task_def.retry_count
+
+            depends_on: Optional[List[int]] = None
+            if task_def.depends_on is not None:
+                depends_on = []
+                for name in task_def.depends_on:
+                    if name in ambiguous:
+                        raise ValueError(
+                            f"Task '{task_def.name}' depends on '{name}', "
+                            "which names several tasks"
+                        )
+                    if name not in earlier:
+                        raise ValueError(
+                            f"Task '{task_def.name}' depends on '{name}', "
+                            "which is not an earlier task of the job"
+                        )
+                    depends_on.append(earlier[name])
+
+            task = BorgJobTask(
+                task_type=TaskTypeEnum(task_def.type),
+                task_name=task_def.name,
+                parameters=parameters,
+                depends_on=depends_on,
+            )
+            if task_def.name in earlier:
+                ambiguous.add(task_def.name)
+            earlier[task_def.name] = len(tasks)
+            tasks.append(task)
+        return tasks
+
+    async def restore_queued_jobs(self) -> int:
+        """Re-enqueue durable jobs that were queued or running at shutdown
+
+        Must run after stale job recovery, which fails the interrupted jobs
+        the recovery policy does not allow to resume. Returns the number of
+        jobs put back into the queue.
+        """
+        store = getattr(self.queue_manager, "store", None)
+        if store is None or not self.database_manager:
+            return 0
+        await self.initialize()
+
+        restored = 0
+        for entry in await store.load_unfinished():
+            if entry.job_id in self.jobs:
+                continue
+
+            db_job = await self.database_manager.get_job_by_uuid(entry.job_id)
+            db_status = db_job.get("status") if db_job else None
+            if db_status not in (JobStatusEnum.PENDING, JobStatusEnum.RUNNING):
+                # Finished before its last queue transition was written, or
+                # failed by stale job recovery
+                store.record_finished(
+                    entry.job_id,
+                    QueueEntryState.COMPLETED
+                    if db_status == JobStatusEnum.COMPLETED
+                    else QueueEntryState.FAILED,
+                )
+                continue
+
+            try:
+                metadata = entry.metadata
+                task_definitions = [
+                    TaskDefinition(**definition)
+                    for definition in cast(List[Dict[str, Any]], metadata["tasks"])
+                ]
+                repository_id = cast(Optional[int], metadata.get("repository_id"))
+                cloud_sync_config_id = cast(
+                    Optional[int], metadata.get("cloud_sync_config_id")
+                )
+                additional_repository_keys = [
+                    str(key)
+                    for key in cast(
+                        List[object], metadata.get("additional_repository_keys") or []
+                    )
+                ]
+                tasks = self._build_tasks(task_definitions)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Cannot restore queued job {entry.job_id}: {e}")
+                store.record_finished(entry.job_id, QueueEntryState.FAILED)
+                await self.database_manager.update_job_status(
+                    entry.job_id,
+                    JobStatusEnum.FAILED,
+                    finished_at=now_utc(),
+                    error_message="Job could not be restored from the job queue",
+                )
+                continue
+
+            job = BorgJob(
+                id=entry.job_id,
+                job_type="composite",
+                status=JobStatusEnum.PENDING,
+                started_at=now_utc(),
+                tasks=tasks,
+                repository_id=repository_id,
+                cloud_sync_config_id=cloud_sync_config_id,
+            )
+            self.jobs[job.id] = job
+
+            # Output of an interrupted run is replaced by the new run's; its
+            # index entries are removed while the log still holds their text
+            await self.database_manager.clear_job_output(job.id)
+            self.output_manager.delete_job_output(job.id)
+            await self.database_manager.update_job_status(job.id, JobStatusEnum.PENDING)
+            await self.database_manager.save_job_tasks(job.id, job.tasks)
+            self.output_manager.create_job_output(job.id)
+
+            await self.queue_manager.submit(
+                QueuedJob(
+                    job_id=job.id,
+                    job_type=entry.job_type,
+                    priority=JobPriority(entry.priority),
+                    queued_at=entry.queued_at,
+                    metadata=entry.metadata,
+                    repository_key=entry.repository_key,
+                    additional_repository_keys=additional_repository_keys,
+                    attempts=entry.attempts,
+                    durable=True,
+                )
+            )
+            restored += 1
+            logger.info(
+                f"Restored queued job {job.id} ({entry.job_type}, {entry.state.value})"
+            )
+
+        if restored:
+            logger.info(f"Restored {restored} job(s) from the durable job queue")
+        return restored
+
     async def _execute_composite_job(self, job: BorgJob) -> None:
-        """Execute a composite job with multiple sequential tasks"""
+        """Execute a composite job, running its tasks as a dependency graph"""
         job.status = JobStatusEnum.RUNNING
+        persisted = False
 
         # Update job status in database
         if self.database_manager:
@@ -397,183 +605,22 @@ class JobManager:
         )
 
         try:
-            for task_index, task in enumerate(job.tasks):
-                job.current_task_index = task_index
-
-                # Skip tasks that were already marked as skipped due to earlier failures
-                if task.status == TaskStatusEnum.SKIPPED:
-                    logger.info(
-                        f"Skipping task {task.task_type} at index {task_index} - already marked as skipped"
-                    )
-                    continue
-
-                task.status = TaskStatusEnum.RUNNING
-                task.started_at = now_utc()
-
-                self.event_broadcaster.broadcast_event(
-                    EventType.TASK_STARTED,
-                    job_id=job.id,
-                    data={
-                        "task_index": task_index,
-                        "task_type": task.task_type,
-                        "task_name": task.task_name,
-                    },
-                )
-
-                # Execute the task based on its type using the appropriate executor
-                try:
-                    await self._execute_task_with_executor(job, task, task_index)
-
-                    # Task status, return_code, and completed_at are already set by the individual task methods
-                    # Just ensure completed_at is set if not already
-                    if not task.completed_at:
-                        task.completed_at = now_utc()
-
-                    self.event_broadcaster.broadcast_event(
-                        EventType.TASK_COMPLETED
-                        if task.status == TaskStatusEnum.COMPLETED
-                        else EventType.TASK_FAILED,
-                        job_id=job.id,
-                        data={
-                            "task_index": task_index,
-                            "status": task.status,
-                            "return_code": task.return_code,
-                        },
-                    )
-
-                    # Update task in database BEFORE checking if we should break
-                    if self.database_manager:
-                        try:
-                            logger.info(
-                                f"Saving task {task.task_type} to database - Status: {task.status}, Return Code: {task.return_code}, Output Lines: {len(task.output_lines)}"
-                            )
-                            await self.database_manager.save_job_tasks(
-                                job.id, job.tasks
-                            )
-                            logger.info(
-                                f"Successfully saved task {task.task_type} to database"
-                            )
-                        except Exception as e:
-                            logger.error(f"Failed to update tasks in database: {e}")
-
-                    if task.status == TaskStatusEnum.FAILED:
-                        is_critical_hook_failure = (
-                            task.task_type == TaskTypeEnum.HOOK
-                            and task.parameters.get("critical_failure", False)
-                        )
-                        is_critical_task = task.task_type == TaskTypeEnum.BACKUP
-
-                        if is_critical_hook_failure or is_critical_task:
-                            failed_hook_name = task.parameters.get(
-                                "failed_critical_hook_name", "unknown"
-                            )
-                            logger.error(
-                                f"Critical {'hook' if is_critical_hook_failure else 'task'} "
-                                f"{'(' + str(failed_hook_name) + ') ' if is_critical_hook_failure else ''}"
-                                f"{task.task_type} failed, stopping job"
-                            )
-
-                            remaining_tasks = job.tasks[task_index + 1 :]
-                            for remaining_task in remaining_tasks:
-                                # Allow notification tasks to run even after critical failure
-                                if (
-                                    remaining_task.task_type
-                                    == TaskTypeEnum.NOTIFICATION
-                                ):
-                                    logger.info(
-                                        f"Keeping notification task {remaining_task.task_name} to report failure"
-                                    )
-                                    continue
-
-                                if remaining_task.status == TaskStatusEnum.PENDING:
-                                    remaining_task.status = TaskStatusEnum.SKIPPED
-                                    remaining_task.completed_at = now_utc()
-                                    remaining_task.output_lines.append(
-                                        f"Task skipped due to critical {'hook' if is_critical_hook_failure else 'task'} failure"
-                                    )
-                                    logger.info(
-                                        f"Marked task {remaining_task.task_type} as skipped due to critical failure"
-                                    )
-
-                            # Save all tasks to database after marking remaining as skipped
-                            if self.database_manager:
-                                try:
-                                    logger.info(
-                                        f"Saving all tasks to database after critical failure - Job: {job.id}"
-                                    )
-                                    await self.database_manager.save_job_tasks(
-                                        job.id, job.tasks
-                                    )
-                                    logger.info(
-                                        "Successfully saved all tasks to database after critical failure"
-                                    )
-                                except Exception as e:
-                                    logger.error(
-                                        f"Failed to update tasks in database after critical failure: {e}"
-                                    )
-
-                except Exception as e:
-                    task.status = TaskStatusEnum.FAILED
-                    task.error = str(e)
-                    task.completed_at = now_utc()
-                    logger.error(f"Task {task.task_type} in job {job.id} failed: {e}")
-
-                    self.event_broadcaster.broadcast_event(
-                        EventType.TASK_FAILED,
-                        job_id=job.id,
-                        data={"task_index": task_index, "error": str(e)},
+            await self._run_task_graph(job)
+
+            if self._shutdown_requested and job.status not in _HALTED_JOB_STATUSES:
+                # Interrupted by shutdown; the job stays queued in the durable
+                # queue and is resumed on the next start
+                logger.info(f"Job {job.id} interrupted by shutdown")
+                return
+
+            if job.status in _HALTED_JOB_STATUSES:
+                # stop_job or cancel_job already recorded the final status
+                if self.database_manager:
+                    await self.task_writer.flush()
+                    persisted = await self.database_manager.update_job_status(
+                        job.id, job.status, job.completed_at
                     )
-
-                    if self.database_manager:
-                        try:
-                            logger.info(
-                                f"Saving exception task {task.task_type} to database - Status: {task.status}, Return Code: {task.return_code}, Output Lines: {len(task.output_lines)}"
-                            )
-                            await self.database_manager.save_job_tasks(
-                                job.id, job.tasks
-                            )
-                            logger.info(
-                                f"Successfully saved exception task {task.task_type} to database"
-                            )
-                        except Exception as db_e:
-                            logger.error(f"Failed to update tasks in database: {db_e}")
-
-                    if task.task_type == TaskTypeEnum.BACKUP:
-                        remaining_tasks = job.tasks[task_index + 1 :]
-                        for remaining_task in remaining_tasks:
-                            # Allow notification tasks to run even after critical exception
-                            if remaining_task.task_type == TaskTypeEnum.NOTIFICATION:
-                                logger.info(
-                                    f"Keeping notification task {remaining_task.task_name} to report failure"
-                                )
-                                continue
-
-                            if remaining_task.status == TaskStatusEnum.PENDING:
-                                remaining_task.status = TaskStatusEnum.SKIPPED
-                            remaining_task.completed_at = now_utc()
-                            remaining_task.output_lines.append(
-                                "Task skipped due to critical task exception"
-                            )
-                            logger.info(
-                                f"Marked task {remaining_task.task_type} as skipped due to critical task exception"
-                            )
-
-                        # Save all tasks to database after marking remaining as skipped
-                        if self.database_manager:
-                            try:
-                                logger.info(
-                                    f"Saving all tasks to database after critical exception - Job: {job.id}"
-                                )
-                                await self.database_manager.save_job_tasks(
-                                    job.id, job.tasks
-                                )
-                                logger.info(
-                                    "Successfully saved all tasks to database after critical exception"
-                                )
-                            except Exception as db_e:
-                                logger.error(
-                                    f"Failed to update tasks in database after critical exception: {db_e}"
-                                )
+                return
 
             failed_tasks = [t for t in job.tasks if t.status == TaskStatusEnum.FAILED]
             completed_tasks = [
@@ -606,7 +653,8 @@ class JobManager:
 
             # Update final job status
             if self.database_manager:
-                await self.database_manager.update_job_status(
+                await self.task_writer.flush()
+                persisted = await self.database_manager.update_job_status(
                     job.id, job.status, job.completed_at
                 )
 
@@ -628,7 +676,8 @@ class JobManager:
             logger.error(f"Composite job {job.id} execution failed: {e}")
 
             if self.database_manager:
-                await self.database_manager.update_job_status(
+                await self.task_writer.flush()
+                persisted = await self.database_manager.update_job_status(
                     job.id, JobStatusEnum.FAILED, job.completed_at, None, str(e)
                 )
 
@@ -636,6 +685,227 @@ class JobManager:
                 EventType.JOB_FAILED, job_id=job.id, data={"error": str(e)}
             )
 
+        finally:
+            JOBS_FINISHED.labels(job.status).inc()
+            self._release_queue_slot(job)
+            await self.output_ingestor.flush(job.id)
+            self.output_manager.close_job_output(job.id)
+            # Only jobs whose final state reached the database may be evicted
+            if persisted:
+                self._release_finished_job(job.id)
+
+    async def _run_task_graph(self, job: BorgJob) -> None:
+        """Run the tasks of a composite job in dependency order
+
+        A task starts once every task it depends on has finished, with at
+        most ``max_parallel_tasks`` tasks running at a time. Tasks are
+        started in list order among those that are ready. No task is
+        started once the job is stopped or cancelled.
+        """
+        limit = max(1, self.config.max_parallel_tasks)
+        waiting = list(range(len(job.tasks)))
+        finished: Set[int] = set()
+        running: Dict["asyncio.Task[None]", int] = {}
+        self._task_runners[job.id] = running
+
+        try:
+            while waiting or running:
+                if job.status in _HALTED_JOB_STATUSES or self._shutdown_requested:
+                    break
+                for task_index in list(waiting):
+                    if len(running) >= limit:
+                        break
+                    task = job.tasks[task_index]
+                    if not all(
+                        dependency in finished
+                        for dependency in task.dependencies(task_index)
+                    ):
+                        continue
+                    waiting.remove(task_index)
+
+                    # Skip tasks that were already marked as skipped due to earlier failures
+                    if task.status == TaskStatusEnum.SKIPPED:
+                        logger.info(
+                            f"Skipping task {task.task_type} at index {task_index} - already marked as skipped"
+                        )
+                        finished.add(task_index)
+                        continue
+
+                    job.current_task_index = task_index
+                    running[
+                        asyncio.create_task(self._run_composite_task(job, task_index))
+                    ] = task_index
+
+                if not running:
+                    # Only reachable with dependencies the builder rejects
+                    break
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for runner in done:
+                    finished.add(running.pop(runner))
+                    if not runner.cancelled():
+                        runner.result()
+        finally:
+            self._task_runners.pop(job.id, None)
+            for runner in running:
+                runner.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _run_composite_task(self, job: BorgJob, task_index: int) -> None:
+        """Run one task of a composite job and apply its failure semantics"""
+        task = job.tasks[task_index]
+        task.status = TaskStatusEnum.RUNNING
+        task.started_at = now_utc()
+
+        self.event_broadcaster.broadcast_event(
+            EventType.TASK_STARTED,
+            job_id=job.id,
+            data={
+                "task_index": task_index,
+                "task_type": task.task_type,
+                "task_name": task.task_name,
+            },
+        )
+
+        # Execute the task based on its type using the appropriate executor
+        try:
+            await self._execute_task_with_executor(job, task, task_index)
+            await self.output_ingestor.flush(job.id)
+
+            # Task status, return_code, and completed_at are already set by the individual task methods
+            # Just ensure completed_at is set if not already
+            if not task.completed_at:
+                task.completed_at = now_utc()
+
+            self.event_broadcaster.broadcast_event(
+                EventType.TASK_COMPLETED
+                if task.status == TaskStatusEnum.COMPLETED
+                else EventType.TASK_FAILED,
+                job_id=job.id,
+                data={
+                    "task_index": task_index,
+                    "status": task.status,
+                    "return_code": task.return_code,
+                },
+            )
+
+            # Queue the task update BEFORE checking if we should break
+            if self.database_manager:
+                self.task_writer.schedule(job.id, job.tasks)
+
+            if task.status == TaskStatusEnum.FAILED:
+                is_critical_hook_failure = (
+                    task.task_type == TaskTypeEnum.HOOK
+                    and task.parameters.get("critical_failure", False)
+                )
+                is_critical_task = task.task_type == TaskTypeEnum.BACKUP
+
+                if is_critical_hook_failure or is_critical_task:
+                    failed_hook_name = task.parameters.get(
+                        "failed_critical_hook_name", "unknown"
+                    )
+                    logger.error(
+                        f"Critical {'hook' if is_critical_hook_failure else 'task'} "
+                        f"{'(' + str(failed_hook_name) + ') ' if is_critical_hook_failure else ''}"
+                        f"{task.task_type} failed, stopping job"
+                    )
+                    self._skip_pending_tasks(
+                        job,
+                        f"Task skipped due to critical {'hook' if is_critical_hook_failure else 'task'} failure",
+                        self._dependent_tasks(job, task_index),
+                    )
+
+        except Exception as e:
+            task.status = TaskStatusEnum.FAILED
+            task.error = str(e)
+            task.completed_at = now_utc()
+            logger.error(f"Task {task.task_type} in job {job.id} failed: {e}")
+
+            self.event_broadcaster.broadcast_event(
+                EventType.TASK_FAILED,
+                job_id=job.id,
+                data={"task_index": task_index, "error": str(e)},
+            )
+
+            if self.database_manager:
+                self.task_writer.schedule(job.id, job.tasks)
+
+            if task.task_type == TaskTypeEnum.BACKUP:
+                self._skip_pending_tasks(
+                    job,
+                    "Task skipped due to critical task exception",
+                    self._dependent_tasks(job, task_index),
+                )
+
+        finally:
+            if task.started_at and task.completed_at:
+                TASK_DURATION.labels(task.task_type, task.status).observe(
+                    (task.completed_at - task.started_at).total_seconds()
+                )
+
+    @staticmethod
+    def _dependent_tasks(job: BorgJob, task_index: int) -> Set[int]:
+        """Indexes of the tasks that depend on a task, directly or not"""
+        dependents: Set[int] = set()
+        for index in range(task_index + 1, len(job.tasks)):
+            if any(
+                dependency == task_index or dependency in dependents
+                for dependency in job.tasks[index].dependencies(index)
+            ):
+                dependents.add(index)
+        return dependents
+
+    def _skip_pending_tasks(
+        self, job: BorgJob, reason: str, task_indexes: Optional[Set[int]] = None
+    ) -> None:
+        """Skip tasks not yet started after a critical failure
+
+        Only the tasks in ``task_indexes`` are skipped when given, so
+        independent branches of the job, like the other targets of a
+        fan-out backup, keep running.
+        """
+        for index, pending_task in enumerate(job.tasks):
+            if task_indexes is not None and index not in task_indexes:
+                continue
+
+            # Allow notification tasks to run even after critical failure
+            if pending_task.task_type == TaskTypeEnum.NOTIFICATION:
+                if pending_task.status == TaskStatusEnum.PENDING:
+                    logger.info(
+                        f"Keeping notification task {pending_task.task_name} to report failure"
+                    )
+                continue
+
+            if pending_task.status == TaskStatusEnum.PENDING:
+                pending_task.status = TaskStatusEnum.SKIPPED
+                pending_task.completed_at = now_utc()
+                pending_task.output_lines.append(reason)
+                logger.info(
+                    f"Marked task {pending_task.task_type} as skipped due to critical failure"
+                )
+
+        # Queue all tasks for saving after marking remaining as skipped
+        if self.database_manager:
+            self.task_writer.schedule(job.id, job.tasks)
+
+    def _release_queue_slot(self, job: BorgJob) -> None:
+        """Let the queue start the next job waiting for the slot or repository"""
+        if self.queue_manager:
+            self.queue_manager.mark_job_completed(
+                job.id, job.status == JobStatusEnum.COMPLETED
+            )
+
+    def _release_finished_job(self, job_id: uuid.UUID) -> None:
+        """Hand a finished job to the evictor and enforce the memory budget"""
+        try:
+            self.evictor.job_finished(job_id)
+            self.evictor.evict()
+        except Exception as e:
+            logger.error(f"Failed to release finished job {job_id}: {e}")
+
     async def _execute_task_with_executor(
         self, job: BorgJob, task: BorgJobTask, task_index: int
     ) -> bool:
@@ -645,8 +915,11 @@ class JobManager:
         if task.task_type == TaskTypeEnum.HOOK:
             hook_type = task.parameters.get("hook_type", "unknown")
             if hook_type == "post":
-                # Check if any previous tasks have failed
-                previous_tasks = job.tasks[:task_index]
+                # Check if any task the hook waited for has failed; under
+                # parallel execution earlier tasks in the list may not be
+                previous_tasks = [
+                    job.tasks[index] for index in job.upstream_task_indexes(task_index)
+                ]
                 job_has_failed = any(
                     t.status == TaskStatusEnum.FAILED
                     and (
@@ -661,7 +934,7 @@ class JobManager:
 
         # Route to appropriate executor
         if task.task_type == TaskTypeEnum.BACKUP:
-            return await self.backup_executor.execute_backup_task(job, task)
+            return await self.backup_executor.execute_backup_task(job, task, task_index)
         elif task.task_type == TaskTypeEnum.PRUNE:
             return await self.prune_executor.execute_prune_task(job, task, task_index)
         elif task.task_type == TaskTypeEnum.COMPACT:
@@ -700,19 +973,7 @@ class JobManager:
             self._processes[job.id] = process
 
             def output_callback(line: str) -> None:
-                # Provide default progress since callback now only receives line
-                progress: Dict[str, object] = {}
-                asyncio.create_task(
-                    self.output_manager.add_output_line(
-                        job.id, line, "stdout", progress
-                    )
-                )
-
-                self.event_broadcaster.broadcast_event(
-                    EventType.JOB_OUTPUT,
-                    job_id=job.id,
-                    data={"line": line, "progress": None},  # No progress data
-                )
+                self.output_ingestor.submit(job.id, 0, line)
 
             result = await self.executor.monitor_process_output(
                 process, output_callback=output_callback
@@ -750,12 +1011,27 @@ class JobManager:
         finally:
             if job.id in self._processes:
                 del self._processes[job.id]
+            self._release_queue_slot(job)
+            await self.output_ingestor.flush(job.id)
+            self.output_manager.close_job_output(job.id)
+            self._release_finished_job(job.id)
 
     # Public API methods
-    def subscribe_to_events(self) -> Optional[asyncio.Queue[JobEvent]]:
-        """Subscribe to job events"""
+    def subscribe_to_events(
+        self,
+        job_id: Optional[uuid.UUID] = None,
+        task_index: Optional[int] = None,
+        event_types: Optional[Iterable[EventType]] = None,
+        overflow_policy: Optional[OverflowPolicy] = None,
+    ) -> Optional[asyncio.Queue[JobEvent]]:
+        """Subscribe to job events, optionally only for one job or job task"""
         if self.dependencies.event_broadcaster:
-            return self.dependencies.event_broadcaster.subscribe_client()
+            return self.dependencies.event_broadcaster.subscribe_client(
+                job_id=job_id,
+                task_index=task_index,
+                event_types=event_types,
+                overflow_policy=overflow_policy,
+            )
         return None
 
     def unsubscribe_from_events(self, client_queue: asyncio.Queue[JobEvent]) -> bool:
@@ -765,17 +1041,20 @@ class JobManager:
         return False
 
     async def stream_job_output(
-        self, job_id: uuid.UUID
+        self, job_id: uuid.UUID, since: int = 0
     ) -> AsyncGenerator[Dict[str, object], None]:
         """Stream job output"""
         if self.output_manager:
-            async for output in self.output_manager.stream_job_output(job_id):
+            async for output in self.output_manager.stream_job_output(
+                job_id, since=since
+            ):
                 yield output
         else:
             return
 
     def get_job(self, job_id: uuid.UUID) -> Optional[BorgJob]:
         """Get job by ID"""
+        self.evictor.touch(job_id)
         return self.jobs.get(job_id)
 
     def list_jobs(self) -> Dict[uuid.UUID, BorgJob]:
@@ -798,15 +1077,20 @@ class JobManager:
         if not job:
             return False
 
-        if job.status not in ["running", "queued"]:
+        if job.status not in ["running", "queued", "pending"]:
             return False
 
+        if self.queue_manager:
+            self.queue_manager.remove_job(job_id)
+
         if job_id in self._processes:
             process = self._processes[job_id]
             success = await self.executor.terminate_process(process)
             if success:
                 del self._processes[job_id]
 
+        self._cancel_task_runners(job_id)
+
         job.status = JobStatusEnum.CANCELLED
         job.completed_at = now_utc()
 
@@ -833,13 +1117,17 @@ class JobManager:
                 "error_code": "JOB_NOT_FOUND",
             }
 
-        if job.status not in ["running", "queued"]:
+        if job.status not in ["running", "queued", "pending"]:
             return {
                 "success": False,
                 "error": f"Cannot stop job in status: {job.status}",
                 "error_code": "INVALID_STATUS",
             }
 
+        # Jobs still waiting in the queue are never started
+        if self.queue_manager:
+            self.queue_manager.remove_job(job_id)
+
         current_task_killed = False
         tasks_skipped = 0
 
@@ -851,27 +1139,28 @@ class JobManager:
                 del self._processes[job_id]
                 current_task_killed = True
 
-        # For composite jobs, mark remaining tasks as skipped
+        # For composite jobs, stop every running task and skip the rest; tasks
+        # of a dependency graph may be running at any index
         if job.job_type == "composite" and job.tasks:
-            current_index = job.current_task_index
-
-            # Mark current task as stopped if it was running
-            if current_index < len(job.tasks):
-                current_task = job.tasks[current_index]
-                if current_task.status == TaskStatusEnum.RUNNING:
-                    current_task.status = TaskStatusEnum.STOPPED
-                    current_task.completed_at = now_utc()
-                    current_task.error = "Manually stopped by user"
-
-            # Skip all remaining tasks (even critical/always_run ones since this is manual)
-            for i in range(current_index + 1, len(job.tasks)):
-                task = job.tasks[i]
-                if task.status in [TaskStatusEnum.PENDING, TaskStatusEnum.QUEUED]:
+            stopped_at = now_utc()
+            for task in job.tasks:
+                if task.status == TaskStatusEnum.RUNNING:
+                    task.status = TaskStatusEnum.STOPPED
+                    task.completed_at = stopped_at
+                    task.error = "Manually stopped by user"
+                elif task.status in [TaskStatusEnum.PENDING, TaskStatusEnum.QUEUED]:
+                    # Skip even critical/always_run tasks since this is manual
                     task.status = TaskStatusEnum.SKIPPED
-                    task.completed_at = now_utc()
+                    task.completed_at = stopped_at
                     task.error = "Skipped due to manual job stop"
                     tasks_skipped += 1
 
+            if self._cancel_task_runners(job_id):
+                current_task_killed = True
+
+            if self.database_manager:
+                self.task_writer.schedule(job_id, job.tasks)
+
         # Mark job as stopped
         job.status = JobStatusEnum.STOPPED
         job.completed_at = now_utc()
@@ -902,6 +1191,19 @@ class JobManager:
             "current_task_killed": current_task_killed,
         }
 
+    def _cancel_task_runners(self, job_id: uuid.UUID) -> bool:
+        """Cancel the running tasks of a job's task graph
+
+        Cancelling a task terminates its process. Returns whether any task
+        was running.
+        """
+        runners = self._task_runners.get(job_id)
+        if not runners:
+            return False
+        for runner in runners:
+            runner.cancel()
+        return True
+
     def cleanup_job(self, job_id: uuid.UUID) -> bool:
         """Clean up job resources"""
         if job_id in self.jobs:
@@ -909,8 +1211,13 @@ class JobManager:
             logger.debug(f"Cleaning up job {job_id} (status: {job.status})")
 
             del self.jobs[job_id]
+            self.evictor.forget(job_id)
 
-            self.output_manager.clear_job_output(job_id)
+            # Persisted jobs keep their log for the job history
+            if job.is_ad_hoc:
+                self.output_manager.delete_job_output(job_id)
+            else:
+                self.output_manager.clear_job_output(job_id)
 
             if job_id in self._processes:
                 del self._processes[job_id]
@@ -943,6 +1250,7 @@ class JobManager:
         job = self.jobs.get(job_id)
         if not job:
             return None
+        self.evictor.touch(job_id)
 
         # Convert job_type string to JobTypeEnum
         try:
@@ -993,6 +1301,26 @@ class JobManager:
             total_lines=0,
         )
 
+    async def get_task_line_count(self, job_id: uuid.UUID, task_index: int) -> int:
+        """Get the number of output lines stored on disk for a task"""
+        return await self.output_manager.get_task_line_count(job_id, task_index)
+
+    async def get_task_output_lines(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> List[str]:
+        """Read a range of output lines stored on disk for a task"""
+        return await self.output_manager.get_task_output_lines(
+            job_id, task_index, start, count
+        )
+
+    def get_memory_usage(self) -> JobMemoryUsage:
+        """Estimate memory held by in-memory jobs and their buffered output"""
+        return self.evictor.usage()
+
     def get_queue_stats(self) -> Dict[str, int]:
         """Get queue statistics (alias for get_queue_status)"""
         return self.get_queue_status()
@@ -1003,18 +1331,39 @@ class JobManager:
             yield event
 
     async def shutdown(self) -> None:
-        """Shutdown the job manager"""
+        """Shutdown the job manager
+
+        Composite jobs of a repository are interrupted rather than cancelled:
+        their processes are terminated but their queue and database state is
+        left as it is, so the durable queue resumes them on the next start.
+        The queue is shut down first so it records no transitions for them.
+        Other jobs are cancelled.
+        """
         self._shutdown_requested = True
         logger.info("Shutting down job manager...")
 
-        # Cancel all running jobs
+        if self.queue_manager:
+            await self.queue_manager.shutdown()
+
         for job_id, job in list(self.jobs.items()):
-            if job.status in ["running", "queued"]:
+            if job.status not in [
+                JobStatusEnum.RUNNING,
+                JobStatusEnum.QUEUED,
+                JobStatusEnum.PENDING,
+            ]:
+                continue
+            if job.command or job.is_ad_hoc:
                 await self.cancel_job(job_id)
+            else:
+                self._cancel_task_runners(job_id)
+        if self._job_runs:
+            await asyncio.gather(*list(self._job_runs), return_exceptions=True)
 
-        # Shutdown modules
-        if self.queue_manager:
-            await self.queue_manager.shutdown()
+        # Persist any output and task updates still waiting for their writers
+        await self.output_manager.wait_for_log_writes()
+        await self.task_writer.flush()
+
+        await self.evictor.stop()
 
         if self.event_broadcaster:
             await self.event_broadcaster.shutdown()
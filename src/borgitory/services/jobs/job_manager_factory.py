@@ -2,6 +2,7 @@
 Job Manager Factory - Factory pattern for creating job manager instances with proper dependency injection
 """
 
+import os
 from typing import Optional, Callable, Any
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
@@ -9,6 +10,12 @@ from borgitory.models.database import async_session_maker
 from borgitory.services.jobs.broadcaster.job_event_broadcaster import (
     get_job_event_broadcaster,
 )
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
+from borgitory.services.jobs.job_admission import (
+    AdmissionController,
+    AdmissionThresholds,
+)
+from borgitory.services.jobs.job_log_store import JobLogStore
 from borgitory.services.jobs.job_models import JobManagerConfig, JobManagerDependencies
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
@@ -24,6 +31,59 @@ from borgitory.services.rclone_service import RcloneService
 class JobManagerFactory:
     """Factory for creating job manager instances with proper dependency injection"""
 
+    @staticmethod
+    def _create_log_store(config: JobManagerConfig) -> Optional[JobLogStore]:
+        """Get the on-disk output log store if a log directory is configured
+
+        The application's log store singleton is shared when it uses the same
+        directory, so every reader and writer sees the same segment state.
+        """
+        if not config.job_log_dir:
+            return None
+
+        from borgitory.dependencies import (
+            get_job_log_store,
+            get_job_manager_env_config,
+        )
+
+        shared_dir = get_job_manager_env_config().job_log_dir
+        if shared_dir and os.path.abspath(shared_dir) == os.path.abspath(
+            config.job_log_dir
+        ):
+            return get_job_log_store()
+        return JobLogStore(
+            base_dir=config.job_log_dir,
+            segment_max_bytes=config.job_log_segment_max_bytes,
+        )
+
+    @staticmethod
+    def create_admission_controller(
+        config: JobManagerConfig,
+    ) -> Optional[AdmissionController]:
+        """Create the load-aware admission controller unless disabled"""
+        if not config.admission_enabled:
+            return None
+        return AdmissionController(
+            AdmissionThresholds(
+                max_load_per_cpu=config.admission_max_load_per_cpu,
+                max_io_pressure=config.admission_max_io_pressure,
+                max_cpu_pressure=config.admission_max_cpu_pressure,
+                min_available_memory_bytes=config.admission_min_free_memory_mb
+                * 1024
+                * 1024,
+                hysteresis=config.admission_hysteresis,
+            ),
+            sample_interval=config.admission_sample_interval,
+        )
+
+    @staticmethod
+    def _resolve_overflow_policy(config: JobManagerConfig) -> OverflowPolicy:
+        """Map the configured SSE overflow policy name to an OverflowPolicy"""
+        try:
+            return OverflowPolicy(config.sse_overflow_policy)
+        except ValueError:
+            return OverflowPolicy.DROP_OLDEST
+
     @classmethod
     def create_dependencies(
         cls,
@@ -46,30 +106,41 @@ class JobManagerFactory:
             from borgitory.services.jobs.job_executor import JobExecutor
             from borgitory.services.jobs.job_output_manager import JobOutputManager
             from borgitory.services.jobs.job_queue_manager import JobQueueManager
+            from borgitory.services.jobs.job_queue_store import JobQueueStore
             from borgitory.services.jobs.job_database_manager import JobDatabaseManager
 
             # Create all required core services
             event_broadcaster = JobEventBroadcaster(
                 max_queue_size=config.sse_max_queue_size,
                 keepalive_timeout=config.sse_keepalive_timeout,
+                overflow_policy=cls._resolve_overflow_policy(config),
             )
 
             platform_service = PlatformService()
             command_executor = create_command_executor(platform_service)
             job_executor = JobExecutor(command_executor)
 
+            log_store = cls._create_log_store(config)
             output_manager = JobOutputManager(
-                max_lines_per_job=config.max_output_lines_per_job
+                max_lines_per_job=config.max_output_lines_per_job,
+                log_store=log_store,
             )
 
             queue_manager = JobQueueManager(
                 max_concurrent_backups=config.max_concurrent_backups,
                 max_concurrent_operations=config.max_concurrent_operations,
                 queue_poll_interval=config.queue_poll_interval,
+                priority_aging_interval=config.queue_priority_aging_interval,
+                store=JobQueueStore(async_session_maker, config.queue_persist_interval),
+                admission=cls.create_admission_controller(config),
             )
 
+            from borgitory.dependencies import get_job_output_index
+
             database_manager = JobDatabaseManager(
                 async_session_maker=async_session_maker,
+                output_index=get_job_output_index(),
+                log_store=log_store,
             )
 
             # For basic dependencies, we need to provide all required services
@@ -171,7 +242,10 @@ class JobManagerFactory:
 
         # Create complete dependencies with all cloud sync and notification services
         # Import singleton dependency functions
-        from borgitory.dependencies import get_notification_service_singleton
+        from borgitory.dependencies import (
+            get_job_output_index,
+            get_notification_service_singleton,
+        )
 
         # Create required core services for complete dependencies
         from borgitory.services.command_execution.command_executor_factory import (
@@ -180,24 +254,32 @@ class JobManagerFactory:
         from borgitory.services.jobs.job_executor import JobExecutor
         from borgitory.services.jobs.job_output_manager import JobOutputManager
         from borgitory.services.jobs.job_queue_manager import JobQueueManager
+        from borgitory.services.jobs.job_queue_store import JobQueueStore
         from borgitory.services.jobs.job_database_manager import JobDatabaseManager
 
         platform_service = PlatformService()
         command_executor = create_command_executor(platform_service)
         job_executor = JobExecutor(command_executor)
 
+        log_store = cls._create_log_store(config)
         output_manager = JobOutputManager(
-            max_lines_per_job=config.max_output_lines_per_job
+            max_lines_per_job=config.max_output_lines_per_job,
+            log_store=log_store,
         )
 
         queue_manager = JobQueueManager(
             max_concurrent_backups=config.max_concurrent_backups,
             max_concurrent_operations=config.max_concurrent_operations,
             queue_poll_interval=config.queue_poll_interval,
+            priority_aging_interval=config.queue_priority_aging_interval,
+            store=JobQueueStore(async_session_maker, config.queue_persist_interval),
+            admission=cls.create_admission_controller(config),
         )
 
         database_manager = JobDatabaseManager(
             async_session_maker=async_session_maker,
+            output_index=get_job_output_index(),
+            log_store=log_store,
         )
 
         from borgitory.services.notifications.providers.discord_provider import (
@@ -0,0 +1,247 @@
+"""
+Job Memory Eviction - Keeps finished jobs from accumulating in memory
+
+``JobManager.jobs`` and the output containers of ``JobOutputManager`` only
+need to hold a job while it runs; once its final state is in the database
+(or, for ad-hoc command jobs that are never persisted, once it has finished)
+the history views read it from there. The evictor keeps an approximate byte
+count of every job, its tasks and its buffered output lines and drops
+finished jobs after ``finished_job_ttl`` seconds, or earlier in least
+recently used order whenever the total exceeds ``max_memory_bytes``.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProtocol
+from borgitory.services.jobs.job_models import BorgJob, BorgJobTask
+from borgitory.services.jobs.job_output_manager import JobOutput
+from borgitory.utils.datetime_utils import now_utc
+
+logger = logging.getLogger(__name__)
+
+# Rough CPython sizes of the objects around the measured strings: an
+# instance, its attribute dict and (for lines and tasks) the nested dicts
+_OUTPUT_LINE_OVERHEAD = 56 + 104 + 64
+_TASK_OVERHEAD = 56 + 360 + 2 * 64
+_JOB_OVERHEAD = 56 + 360
+
+
+def _text_bytes(value: object) -> int:
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(item) for item in value.values() if isinstance(item, str)
+        )
+    return sys.getsizeof(value)
+
+
+def estimate_task_bytes(task: BorgJobTask) -> int:
+    """Approximate memory held by a task and its output lines"""
+    lines = task.output_lines
+    return (
+        _TASK_OVERHEAD
+        + sys.getsizeof(lines)
+        + sum(_text_bytes(line) for line in lines)
+        + sum(_text_bytes(value) for value in task.parameters.values())
+        + _text_bytes(task.error or "")
+    )
+
+
+def estimate_job_bytes(job: BorgJob) -> int:
+    """Approximate memory held by a job and all of its tasks"""
+    return (
+        _JOB_OVERHEAD
+        + sum(_text_bytes(part) for part in job.command or [])
+        + _text_bytes(job.error or "")
+        + sum(estimate_task_bytes(task) for task in job.tasks)
+    )
+
+
+def estimate_output_bytes(job_output: Optional[JobOutput]) -> int:
+    """Approximate memory held by a job's buffered output lines"""
+    if job_output is None:
+        return 0
+    lines = job_output.lines
+    return sys.getsizeof(lines) + sum(
+        _OUTPUT_LINE_OVERHEAD + sys.getsizeof(line.text) for line in lines
+    )
+
+
+@dataclass
+class JobMemoryUsage:
+    """Snapshot of the memory held by in-memory jobs"""
+
+    tracked_jobs: int = 0
+    active_jobs: int = 0
+    finished_jobs: int = 0
+    output_containers: int = 0
+    job_bytes: int = 0
+    output_bytes: int = 0
+    max_memory_bytes: int = 0
+    finished_job_ttl: float = 0.0
+    evicted_jobs: int = 0
+    last_eviction_at: Optional[datetime] = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self.job_bytes + self.output_bytes
+
+
+@dataclass
+class _FinishedJob:
+    finished_at: float
+    job_bytes: int
+    output_bytes: int
+
+
+class JobMemoryEvictor:
+    """Evicts finished jobs by TTL and, over the memory budget, by LRU"""
+
+    def __init__(
+        self,
+        get_jobs: Callable[[], Dict[uuid.UUID, BorgJob]],
+        output_manager: JobOutputManagerProtocol,
+        finished_job_ttl: float = 3600.0,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._get_jobs = get_jobs
+        self.output_manager = output_manager
+        self.finished_job_ttl = finished_job_ttl
+        self.max_memory_bytes = max_memory_bytes
+        self.interval = interval
+        self._clock = clock
+        # Evictable jobs, least recently used first
+        self._finished: "OrderedDict[uuid.UUID, _FinishedJob]" = OrderedDict()
+        self._loop_task: Optional["asyncio.Task[None]"] = None
+        self.evicted_jobs = 0
+        self.last_eviction_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        """Run eviction periodically in the background"""
+        if self._loop_task is not None or self.interval <= 0:
+            return
+        self._loop_task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background loop"""
+        if self._loop_task is None:
+            return
+        self._loop_task.cancel()
+        try:
+            await self._loop_task
+        except asyncio.CancelledError:
+            pass
+        self._loop_task = None
+
+    def job_finished(self, job_id: uuid.UUID) -> None:
+        """Mark a job whose final state is stored as safe to evict"""
+        job = self._get_jobs().get(job_id)
+        if job is None:
+            return
+        # Finished jobs no longer change, so their size is measured once
+        self._finished[job_id] = _FinishedJob(
+            finished_at=self._clock(),
+            job_bytes=estimate_job_bytes(job),
+            output_bytes=estimate_output_bytes(
+                self.output_manager.get_job_output(job_id)
+            ),
+        )
+        self._finished.move_to_end(job_id)
+
+    def touch(self, job_id: uuid.UUID) -> None:
+        """Record a read of a finished job for LRU ordering"""
+        if job_id in self._finished:
+            self._finished.move_to_end(job_id)
+
+    def forget(self, job_id: uuid.UUID) -> None:
+        """Stop tracking a job removed by other means"""
+        self._finished.pop(job_id, None)
+
+    def evict(self) -> List[uuid.UUID]:
+        """Evict expired jobs, then LRU jobs while over the memory budget"""
+        now = self._clock()
+        evicted = [
+            job_id
+            for job_id, entry in self._finished.items()
+            if now - entry.finished_at >= self.finished_job_ttl
+        ]
+        for job_id in evicted:
+            self._evict(job_id)
+
+        if self.max_memory_bytes > 0 and self._finished:
+            usage = self.usage()
+            over_budget = usage.total_bytes - self.max_memory_bytes
+            while over_budget > 0 and self._finished:
+                job_id, entry = next(iter(self._finished.items()))
+                self._evict(job_id)
+                evicted.append(job_id)
+                over_budget -= entry.job_bytes + entry.output_bytes
+
+        self._clear_orphaned_outputs()
+
+        if evicted:
+            self.evicted_jobs += len(evicted)
+            self.last_eviction_at = now_utc()
+            logger.info(f"Evicted {len(evicted)} finished job(s) from memory")
+        return evicted
+
+    def usage(self) -> JobMemoryUsage:
+        """Estimate the memory currently held by jobs and their output"""
+        jobs = self._get_jobs()
+        usage = JobMemoryUsage(
+            tracked_jobs=len(jobs),
+            finished_jobs=len(self._finished),
+            output_containers=len(self.output_manager.get_all_job_outputs()),
+            max_memory_bytes=self.max_memory_bytes,
+            finished_job_ttl=self.finished_job_ttl,
+            evicted_jobs=self.evicted_jobs,
+            last_eviction_at=self.last_eviction_at,
+        )
+        for job_id, job in list(jobs.items()):
+            entry = self._finished.get(job_id)
+            if entry is not None:
+                usage.job_bytes += entry.job_bytes
+                usage.output_bytes += entry.output_bytes
+                continue
+            usage.active_jobs += 1
+            usage.job_bytes += estimate_job_bytes(job)
+            usage.output_bytes += estimate_output_bytes(
+                self.output_manager.get_job_output(job_id)
+            )
+        return usage
+
+    def _evict(self, job_id: uuid.UUID) -> None:
+        self._finished.pop(job_id, None)
+        job = self._get_jobs().pop(job_id, None)
+        # Nothing reads the log of an ad-hoc job once it leaves memory
+        if job is not None and job.is_ad_hoc:
+            self.output_manager.delete_job_output(job_id)
+        else:
+            self.output_manager.clear_job_output(job_id)
+
+    def _clear_orphaned_outputs(self) -> None:
+        """Drop finished output containers whose job is no longer tracked"""
+        jobs = self._get_jobs()
+        for job_id in list(self.output_manager.get_all_job_outputs()):
+            job_output = self.output_manager.get_job_output(job_id)
+            if job_id not in jobs and job_output is not None and job_output.closed:
+                self.output_manager.clear_job_output(job_id)
+
+    async def _run_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.evict()
+            except Exception as e:
+                logger.error(f"Job memory eviction failed: {e}")
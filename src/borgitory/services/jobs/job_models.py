@@ -3,6 +3,7 @@ Job Manager Models - Data structures and configuration for job management
 """
 
 import asyncio
+from collections import deque
 from datetime import datetime
 from enum import Enum
 from typing import (
@@ -12,6 +13,9 @@ from typing import (
     List,
     Callable,
     Coroutine,
+    Deque,
+    Iterable,
+    Set,
     TYPE_CHECKING,
 )
 from dataclasses import dataclass, field
@@ -27,6 +31,17 @@ from borgitory.protocols.command_protocols import ProcessExecutorProtocol
 from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProtocol
 from borgitory.protocols.job_queue_manager_protocol import JobQueueManagerProtocol
 from borgitory.protocols.job_database_manager_protocol import JobDatabaseManagerProtocol
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
+
+# Latest output lines kept on a task; the complete output is in the job log
+# store (see job_log_store)
+MAX_TASK_OUTPUT_LINES = 100
+
+TaskOutputLine = Union[str, Dict[str, str]]
+
+
+def _output_tail(lines: Iterable[TaskOutputLine] = ()) -> Deque[TaskOutputLine]:
+    return deque(lines, maxlen=MAX_TASK_OUTPUT_LINES)
 
 
 if TYPE_CHECKING:
@@ -93,13 +108,46 @@ class JobManagerConfig:
 
     # Output and storage settings
     max_output_lines_per_job: int = 1000
+    job_log_dir: Optional[str] = None  # None keeps output in memory only
+    job_log_segment_max_bytes: int = 8 * 1024 * 1024
+
+    # Output batching settings
+    output_batch_max_lines: int = 200
+    output_batch_max_latency: float = 0.1
+
+    # Task persistence settings
+    task_persist_interval: float = 0.5
+
+    # Memory eviction of finished jobs
+    finished_job_ttl: float = 3600.0
+    max_job_memory_bytes: int = 64 * 1024 * 1024
+    job_eviction_interval: float = 60.0
 
     # Queue settings
     queue_poll_interval: float = 0.1
+    queue_priority_aging_interval: float = 300.0
+
+    # Durable queue settings
+    queue_persist_interval: float = 0.5
+    queue_max_attempts: int = 2
+    queue_restore_max_age: float = 86400.0
+
+    # Tasks of one composite job that may run at the same time
+    max_parallel_tasks: int = 4
+
+    # Load-aware admission of queued jobs (see job_admission)
+    admission_enabled: bool = True
+    admission_max_load_per_cpu: float = 2.0
+    admission_max_io_pressure: float = 40.0
+    admission_max_cpu_pressure: float = 60.0
+    admission_min_free_memory_mb: int = 256
+    admission_hysteresis: float = 0.2
+    admission_sample_interval: float = 2.0
 
     # SSE settings
     sse_keepalive_timeout: float = 30.0
     sse_max_queue_size: int = 100
+    sse_overflow_policy: str = "drop_oldest"  # see OverflowPolicy
 
     # Cloud backup settings
     max_concurrent_cloud_uploads: int = 3
@@ -143,9 +191,26 @@ class BorgJobTask:
     return_code: Optional[int] = None
     error: Optional[str] = None
     parameters: Dict[str, object] = field(default_factory=dict)
-    output_lines: List[Union[str, Dict[str, str]]] = field(
-        default_factory=list
-    )  # Store task output
+    output_lines: Deque[TaskOutputLine] = field(
+        default_factory=_output_tail
+    )  # Tail of the task output
+    progress: Dict[str, object] = field(
+        default_factory=dict
+    )  # Latest structured progress update (see borg_progress.BorgProgress)
+    # Resources used by the task's process (see process_resources)
+    resource_usage: Optional[ProcessResourceUsage] = None
+    # Indexes of tasks that must finish first; None means the previous task
+    depends_on: Optional[List[int]] = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.output_lines, deque):
+            self.output_lines = _output_tail(self.output_lines)
+
+    def dependencies(self, task_index: int) -> List[int]:
+        """Indexes of the tasks this task waits for"""
+        if self.depends_on is not None:
+            return self.depends_on
+        return [task_index - 1] if task_index > 0 else []
 
 
 @dataclass
@@ -170,6 +235,14 @@ class BorgJob:
 
     cloud_sync_config_id: Optional[int] = None
 
+    # Seconds spent waiting in the job queue before the job was started
+    queue_wait_seconds: Optional[float] = None
+
+    @property
+    def is_ad_hoc(self) -> bool:
+        """Ad-hoc command jobs have no repository and are never persisted"""
+        return self.repository_id is None
+
     def get_current_task(self) -> Optional[BorgJobTask]:
         """Get the currently executing task (for composite jobs)"""
         if self.job_type == "composite" and 0 <= self.current_task_index < len(
@@ -177,3 +250,26 @@ class BorgJob:
         ):
             return self.tasks[self.current_task_index]
         return None
+
+    def upstream_task_indexes(self, task_index: int) -> Set[int]:
+        """Indexes of the tasks a task waits for, directly or through others"""
+        upstream: Set[int] = set()
+        pending = list(self.tasks[task_index].dependencies(task_index))
+        while pending:
+            index = pending.pop()
+            if index in upstream or not 0 <= index < len(self.tasks):
+                continue
+            upstream.add(index)
+            pending.extend(self.tasks[index].dependencies(index))
+        return upstream
+
+    def task_repository_id(self, task: BorgJobTask) -> Optional[int]:
+        """Repository a task operates on
+
+        Tasks of a fan-out backup name their own repository in their
+        parameters; all other tasks use the job's repository.
+        """
+        repository_id = task.parameters.get("repository_id")
+        if isinstance(repository_id, int) and not isinstance(repository_id, bool):
+            return repository_id
+        return self.repository_id
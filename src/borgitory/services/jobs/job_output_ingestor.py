@@ -0,0 +1,123 @@
+"""
+Job Output Ingestor - Buffers task output lines and flushes them in batches
+
+Executors hand every line to the ingestor instead of scheduling a storage
+task and broadcasting an event per line. Lines are grouped per job task and
+flushed when ``max_batch_lines`` is reached or ``max_batch_latency`` seconds
+after the first buffered line, whichever comes first. Each flush performs one
+output manager write and one ``JOB_OUTPUT_BATCH`` broadcast.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from borgitory.custom_types import ConfigDict
+from borgitory.protocols.job_event_broadcaster_protocol import (
+    JobEventBroadcasterProtocol,
+)
+from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProtocol
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.metrics.app_metrics import OUTPUT_LINES_INGESTED
+
+logger = logging.getLogger(__name__)
+
+BufferKey = Tuple[uuid.UUID, int]
+
+_lines_ingested = OUTPUT_LINES_INGESTED.labels()
+
+
+class JobOutputIngestor:
+    """Micro-batches output lines for storage and broadcast"""
+
+    def __init__(
+        self,
+        output_manager: JobOutputManagerProtocol,
+        event_broadcaster: JobEventBroadcasterProtocol,
+        max_batch_lines: int = 200,
+        max_batch_latency: float = 0.1,
+    ) -> None:
+        self.output_manager = output_manager
+        self.event_broadcaster = event_broadcaster
+        self.max_batch_lines = max(1, max_batch_lines)
+        self.max_batch_latency = max(0.0, max_batch_latency)
+        self._buffers: Dict[BufferKey, List[str]] = {}
+        self._timers: Dict[BufferKey, asyncio.TimerHandle] = {}
+        self._pending_writes: Dict[uuid.UUID, Set["asyncio.Task[None]"]] = {}
+
+    def submit(self, job_id: uuid.UUID, task_index: int, line: str) -> None:
+        """Buffer a single output line for a job task"""
+        key = (job_id, task_index)
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(line)
+        _lines_ingested.inc()
+
+        if len(buffer) >= self.max_batch_lines or self.max_batch_latency == 0:
+            self._flush_key(key)
+        elif key not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(
+                self.max_batch_latency, self._flush_key, key
+            )
+
+    def submit_progress(
+        self, job_id: uuid.UUID, task_index: int, progress: Dict[str, object]
+    ) -> None:
+        """Publish a structured progress update for a job task
+
+        Progress is already throttled at the source, so it is broadcast
+        immediately rather than batched with output lines.
+        """
+        data: ConfigDict = {"task_index": task_index, "progress": progress}
+        self.event_broadcaster.broadcast_event(
+            EventType.TASK_PROGRESS, job_id=job_id, data=data
+        )
+
+    async def flush(self, job_id: uuid.UUID) -> None:
+        """Flush all buffered lines for a job and wait for them to be stored"""
+        for key in [key for key in self._buffers if key[0] == job_id]:
+            self._flush_key(key)
+
+        pending = self._pending_writes.pop(job_id, set())
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def pending_line_count(self, job_id: Optional[uuid.UUID] = None) -> int:
+        """Number of lines buffered but not yet flushed"""
+        return sum(
+            len(lines)
+            for key, lines in self._buffers.items()
+            if job_id is None or key[0] == job_id
+        )
+
+    def _flush_key(self, key: BufferKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        lines = self._buffers.pop(key, None)
+        if not lines:
+            return
+
+        job_id, task_index = key
+        self.event_broadcaster.broadcast_event(
+            EventType.JOB_OUTPUT_BATCH,
+            job_id=job_id,
+            data={"lines": lines, "task_index": task_index, "progress": None},
+        )
+
+        write = asyncio.create_task(self._write_batch(job_id, task_index, lines))
+        pending = self._pending_writes.setdefault(job_id, set())
+        pending.add(write)
+        write.add_done_callback(pending.discard)
+
+    async def _write_batch(
+        self, job_id: uuid.UUID, task_index: int, lines: List[str]
+    ) -> None:
+        try:
+            await self.output_manager.add_output_lines(
+                job_id, lines, "stdout", task_index=task_index
+            )
+        except Exception as e:
+            logger.error(f"Failed to store output batch for job {job_id}: {e}")
@@ -4,13 +4,17 @@ Job Output Manager - Handles job output collection, storage, and streaming
 
 import asyncio
 import logging
+from bisect import bisect_right
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Dict, List, Optional, AsyncGenerator
 from datetime import datetime
 import uuid
 from borgitory.utils.datetime_utils import now_utc
 from dataclasses import dataclass, field
 from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProtocol
+from borgitory.services.jobs.job_log_store import JobLogStore
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +53,16 @@ class OutputLine:
 # Removed duplicate OutputLine definition - using the one above with dict-like interface
 
 
+@dataclass(frozen=True)
+class LogRun:
+    """Consecutive job output lines written to the same task log"""
+
+    first_line: int
+    task_index: int
+    first_task_line: int
+    line_type: str
+
+
 @dataclass
 class JobOutput:
     """Container for job output data"""
@@ -58,6 +72,10 @@ class JobOutput:
     current_progress: Dict[str, object] = field(default_factory=dict)
     total_lines: int = 0
     max_lines: int = 1000
+    closed: bool = False
+    # Where the job's lines are in the log store, to read back evicted lines
+    log_runs: List[LogRun] = field(default_factory=list)
+    task_line_counts: Dict[int, int] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         """Initialize deque with proper maxlen"""
@@ -85,10 +103,21 @@ class JobOutputStreamResponse:
 class JobOutputManager(JobOutputManagerProtocol):
     """Manages job output collection, storage, and streaming"""
 
-    def __init__(self, max_lines_per_job: int = 1000) -> None:
+    def __init__(
+        self,
+        max_lines_per_job: int = 1000,
+        log_store: Optional[JobLogStore] = None,
+    ) -> None:
         self.max_lines_per_job = max_lines_per_job
+        self.log_store = log_store
         self._job_outputs: Dict[uuid.UUID, JobOutput] = {}
         self._output_locks: Dict[uuid.UUID, asyncio.Lock] = {}
+        # One-shot events replaced on every notify so followers wake without polling
+        self._output_waiters: Dict[uuid.UUID, asyncio.Event] = {}
+        # A single thread keeps log writes off the event loop and in order
+        self._log_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="job-log-writer"
+        )
 
     def create_job_output(self, job_id: uuid.UUID) -> JobOutput:
         """Create output container for a new job"""
@@ -97,6 +126,7 @@ class JobOutputManager(JobOutputManagerProtocol):
 
         self._job_outputs[job_id] = job_output
         self._output_locks[job_id] = asyncio.Lock()
+        self._output_waiters[job_id] = asyncio.Event()
 
         logger.debug(f"Created output container for job {job_id}")
         return job_output
@@ -107,29 +137,204 @@ class JobOutputManager(JobOutputManagerProtocol):
         text: str,
         line_type: str = "stdout",
         progress_info: Optional[Dict[str, object]] = None,
+        task_index: Optional[int] = None,
     ) -> None:
         """Add a line of output to a job"""
+        await self.add_output_lines(
+            job_id, [text], line_type, progress_info, task_index=task_index
+        )
+
+    async def add_output_lines(
+        self,
+        job_id: uuid.UUID,
+        lines: List[str],
+        line_type: str = "stdout",
+        progress_info: Optional[Dict[str, object]] = None,
+        task_index: Optional[int] = None,
+    ) -> None:
+        """Add a batch of output lines to a job with a single notification"""
+        if not lines:
+            return
+
         if job_id not in self._job_outputs:
             self.create_job_output(job_id)
 
         job_output = self._job_outputs[job_id]
+        log_write: Optional["asyncio.Future[None]"] = None
 
         async with self._output_locks[job_id]:
-            output_line = OutputLine(
-                text=text,
-                timestamp=now_utc().isoformat(),
-                type=line_type,
-                metadata=progress_info or {},
-            )
-
-            job_output.lines.append(output_line)
-
-            job_output.total_lines += 1
+            timestamp = now_utc().isoformat()
+            # One copy per batch, so later progress updates don't leak in
+            metadata = dict(progress_info or {})
+            for text in lines:
+                job_output.lines.append(
+                    OutputLine(
+                        text=text,
+                        timestamp=timestamp,
+                        type=line_type,
+                        metadata=metadata,
+                    )
+                )
+
+            if self.log_store is not None:
+                self._record_log_run(job_output, task_index or 0, line_type, lines)
+            job_output.total_lines += len(lines)
+
+            if self.log_store is not None:
+                # Queued under the lock so batches reach the log in order
+                log_write = asyncio.get_running_loop().run_in_executor(
+                    self._log_writer,
+                    self._append_to_log_store,
+                    job_id,
+                    task_index or 0,
+                    lines,
+                )
 
             # Update current progress if provided
             if progress_info:
                 job_output.current_progress.update(progress_info)
 
+        if log_write is not None:
+            await log_write
+        self._notify_followers(job_id)
+
+    @staticmethod
+    def _record_log_run(
+        job_output: JobOutput, task_index: int, line_type: str, lines: List[str]
+    ) -> None:
+        """Note where a batch lands in the log store, extending the last run"""
+        first_task_line = job_output.task_line_counts.get(task_index, 0)
+        job_output.task_line_counts[task_index] = first_task_line + len(lines)
+        last_run = job_output.log_runs[-1] if job_output.log_runs else None
+        if (
+            last_run is None
+            or last_run.task_index != task_index
+            or last_run.line_type != line_type
+        ):
+            job_output.log_runs.append(
+                LogRun(
+                    first_line=job_output.total_lines,
+                    task_index=task_index,
+                    first_task_line=first_task_line,
+                    line_type=line_type,
+                )
+            )
+
+    def _read_logged_lines(
+        self, job_id: uuid.UUID, runs: List[LogRun], start: int, end: int
+    ) -> List[OutputLine]:
+        """Read job lines ``[start, end)`` back from the task logs; blocking
+
+        Stops early at lines the log store does not hold. Lines read back
+        carry no timestamp or progress.
+        """
+        if self.log_store is None:
+            return []
+        lines: List[OutputLine] = []
+        position = max(0, bisect_right(runs, start, key=lambda run: run.first_line) - 1)
+        line_number = start
+        while line_number < end and position < len(runs):
+            run = runs[position]
+            position += 1
+            run_end = end
+            if position < len(runs):
+                run_end = min(end, runs[position].first_line)
+            texts = self.log_store.read_lines(
+                job_id,
+                run.task_index,
+                run.first_task_line + line_number - run.first_line,
+                run_end - line_number,
+            )
+            lines.extend(
+                OutputLine(text=text, timestamp="", type=run.line_type)
+                for text in texts
+            )
+            line_number += len(texts)
+            if line_number < run_end:
+                break
+        return lines
+
+    def _notify_followers(self, job_id: uuid.UUID) -> None:
+        """Wake every stream waiting on new output for a job"""
+        waiter = self._output_waiters.get(job_id)
+        if waiter is not None:
+            self._output_waiters[job_id] = asyncio.Event()
+            waiter.set()
+
+    def close_job_output(self, job_id: uuid.UUID) -> None:
+        """Mark a job's output as finished so followers drain and stop"""
+        job_output = self._job_outputs.get(job_id)
+        if job_output is None:
+            return
+        job_output.closed = True
+        self._notify_followers(job_id)
+
+    def _append_to_log_store(
+        self, job_id: uuid.UUID, task_index: int, lines: List[str]
+    ) -> None:
+        """Persist lines to the on-disk log store without failing the job"""
+        if self.log_store is None:
+            return
+        try:
+            self.log_store.append_lines(job_id, task_index, lines)
+        except OSError as e:
+            logger.warning(f"Failed to write output log for job {job_id}: {e}")
+
+    async def wait_for_log_writes(self) -> None:
+        """Wait until every log write and deletion queued so far is done"""
+        await asyncio.get_running_loop().run_in_executor(self._log_writer, lambda: None)
+
+    def _delete_from_log_store(self, job_id: uuid.UUID) -> None:
+        """Remove a job's on-disk log without raising in the writer thread"""
+        if self.log_store is None:
+            return
+        try:
+            self.log_store.delete_job(job_id)
+        except OSError as e:
+            logger.warning(f"Failed to delete output log for job {job_id}: {e}")
+
+    async def has_task_output(self, job_id: uuid.UUID, task_index: int) -> bool:
+        """Check whether the log store holds output for a task"""
+        if self.log_store is None:
+            return False
+        return await asyncio.to_thread(self.log_store.has_log, job_id, task_index)
+
+    async def get_task_line_count(self, job_id: uuid.UUID, task_index: int) -> int:
+        """Get the number of stored output lines for a task"""
+        if self.log_store is None:
+            return 0
+        return await asyncio.to_thread(self.log_store.line_count, job_id, task_index)
+
+    async def get_task_output_lines(
+        self,
+        job_id: uuid.UUID,
+        task_index: int,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> List[str]:
+        """Read a range of stored output lines for a task"""
+        if self.log_store is None:
+            return []
+        return await asyncio.to_thread(
+            self.log_store.read_lines, job_id, task_index, start, count
+        )
+
+    async def get_task_output_tail(
+        self, job_id: uuid.UUID, task_index: int, count: int
+    ) -> List[str]:
+        """Read the last lines of stored output for a task"""
+        if self.log_store is None:
+            return []
+        return await asyncio.to_thread(
+            self.log_store.tail_lines, job_id, task_index, count
+        )
+
+    async def get_task_output_text(self, job_id: uuid.UUID, task_index: int) -> str:
+        """Read the full stored output of a task as text"""
+        if self.log_store is None:
+            return ""
+        return await asyncio.to_thread(self.log_store.read_text, job_id, task_index)
+
     def get_job_output(self, job_id: uuid.UUID) -> Optional[JobOutput]:
         """Get output container for a job"""
         return self._job_outputs.get(job_id)
@@ -148,32 +353,75 @@ class JobOutputManager(JobOutputManagerProtocol):
             )
 
     async def stream_job_output(
-        self, job_id: uuid.UUID, follow: bool = True
+        self, job_id: uuid.UUID, follow: bool = True, since: int = 0
     ) -> AsyncGenerator[Dict[str, object], None]:
-        """Stream job output in real-time"""
+        """Stream job output in real-time, starting at absolute line ``since``"""
         job_output = self.get_job_output(job_id)
         if not job_output:
             logger.warning(f"No output found for job {job_id}")
             return
 
-        last_sent = 0
+        cursor = max(0, since)
 
         while True:
-            async with self._output_locks[job_id]:
-                current_lines = list(job_output.lines)
-                current_progress = job_output.current_progress.copy()
-
-            # Send new lines since last check
-            if len(current_lines) > last_sent:
-                for line in current_lines[last_sent:]:
-                    yield {"type": "output", "data": line, "progress": current_progress}
-                last_sent = len(current_lines)
+            # Grab the waiter before reading so a line added in between still wakes us
+            waiter = self._output_waiters.get(job_id)
+            total_lines = job_output.total_lines
+            first_buffered = total_lines - len(job_output.lines)
+
+            if cursor < first_buffered:
+                # Follower fell behind the in-memory tail; the rest is on disk.
+                # Read on the log writer so lines queued for disk are there.
+                logged_lines = await asyncio.get_running_loop().run_in_executor(
+                    self._log_writer,
+                    self._read_logged_lines,
+                    job_id,
+                    job_output.log_runs,
+                    cursor,
+                    min(first_buffered, cursor + self.max_lines_per_job),
+                )
+                if logged_lines:
+                    progress = job_output.current_progress.copy()
+                    for line in logged_lines:
+                        yield {
+                            "type": "output",
+                            "data": line,
+                            "progress": progress,
+                            "line_number": cursor,
+                        }
+                        cursor += 1
+                    # The deque may have moved on while the page was read
+                    continue
+                yield {
+                    "type": "gap",
+                    "line_number": cursor,
+                    "skipped": first_buffered - cursor,
+                }
+                cursor = first_buffered
+
+            if cursor < total_lines:
+                # Only the unseen tail of the deque is copied
+                new_lines = list(
+                    islice(reversed(job_output.lines), total_lines - cursor)
+                )
+                progress = job_output.current_progress.copy()
+                for line in reversed(new_lines):
+                    yield {
+                        "type": "output",
+                        "data": line,
+                        "progress": progress,
+                        "line_number": cursor,
+                    }
+                    cursor += 1
 
             if not follow:
                 break
 
-            # Small delay to prevent busy waiting
-            await asyncio.sleep(0.1)
+            if cursor >= job_output.total_lines:
+                if job_output.closed or waiter is None:
+                    yield {"type": "complete", "total_lines": cursor}
+                    break
+                await waiter.wait()
 
     def get_output_summary(self, job_id: uuid.UUID) -> Dict[str, object]:
         """Get summary of job output"""
@@ -191,15 +439,33 @@ class JobOutputManager(JobOutputManagerProtocol):
 
     def clear_job_output(self, job_id: uuid.UUID) -> bool:
         """Clear output data for a job"""
-        if job_id in self._job_outputs:
-            del self._job_outputs[job_id]
-
         if job_id in self._output_locks:
             del self._output_locks[job_id]
 
+        job_output = self._job_outputs.pop(job_id, None)
+        if job_output is not None:
+            job_output.closed = True
+        self._notify_followers(job_id)
+        self._output_waiters.pop(job_id, None)
+
+        if self.log_store is not None:
+            self.log_store.close_job(job_id)
+
         logger.debug(f"Cleared output for job {job_id}")
         return True
 
+    def delete_job_output(self, job_id: uuid.UUID) -> bool:
+        """Clear output data for a job and queue the deletion of its on-disk log
+
+        The log is removed by the log writer thread, after any lines of the
+        job already queued for it and before any written later.
+        """
+        self.clear_job_output(job_id)
+        if self.log_store is None:
+            return False
+        self._log_writer.submit(self._delete_from_log_store, job_id)
+        return True
+
     def get_all_job_outputs(self) -> Dict[uuid.UUID, Dict[str, object]]:
         """Get summary of all job outputs"""
         return {job_id: self.get_output_summary(job_id) for job_id in self._job_outputs}
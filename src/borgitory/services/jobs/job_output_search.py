@@ -0,0 +1,459 @@
+"""
+Job Output Search - SQLite FTS5 full-text index over task output
+
+Task output is indexed in the contentless ``job_task_output_fts`` virtual
+table, which holds the inverted index but no copy of the text. Every
+write-behind flush indexes the lines newly added to a task's log as one
+chunk, so indexing costs are proportional to new output rather than to the
+size of the task log.
+
+``job_task_output_chunks`` maps each chunk, by rowid, to its task and to
+where its text lives: a line range of the job log store, or the text itself
+for output without a log (hooks, notifications and history indexed before
+the log store existed). The text is read back from there to remove a chunk
+from the index and to build search snippets. A contentless index must be
+given exactly the indexed text to remove a chunk, so chunks keep a checksum
+of it; chunk ids are never reused, so a chunk whose text is gone leaves only
+unreachable tokens behind.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import uuid
+import weakref
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from markupsafe import Markup, escape
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Row,
+    Table,
+    Text,
+    delete,
+    insert,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.elements import ColumnClause
+
+from borgitory.models.database import Job, JobTask, Repository, StringUUID
+from borgitory.services.jobs.job_log_store import JobLogStore, LogLineRange
+
+logger = logging.getLogger(__name__)
+
+JOB_OUTPUT_FTS_TABLE = "job_task_output_fts"
+JOB_OUTPUT_CHUNKS_TABLE = "job_task_output_chunks"
+
+CREATE_JOB_OUTPUT_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {JOB_OUTPUT_FTS_TABLE} "
+    "USING fts5(content, content = '', tokenize = 'unicode61')"
+)
+
+CREATE_JOB_OUTPUT_CHUNKS_SQL = (
+    f"CREATE TABLE IF NOT EXISTS {JOB_OUTPUT_CHUNKS_TABLE} ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "task_id INTEGER NOT NULL, "
+    "job_id TEXT, "
+    "task_order INTEGER, "
+    "first_line INTEGER, "
+    "line_count INTEGER, "
+    "content TEXT, "
+    "checksum INTEGER NOT NULL)"
+)
+
+CREATE_JOB_OUTPUT_CHUNKS_INDEX_SQL = (
+    f"CREATE INDEX IF NOT EXISTS ix_{JOB_OUTPUT_CHUNKS_TABLE}_task_id "
+    f"ON {JOB_OUTPUT_CHUNKS_TABLE} (task_id)"
+)
+
+# Markers put around matches; replaced with <mark> after escaping
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+# Tokens surrounding a match in a snippet
+SNIPPET_TOKENS = 24
+
+DEFAULT_SEARCH_LIMIT = 50
+
+_metadata = MetaData()
+
+job_output_fts = Table(
+    JOB_OUTPUT_FTS_TABLE,
+    _metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("content", Text),
+)
+
+job_output_chunks = Table(
+    JOB_OUTPUT_CHUNKS_TABLE,
+    _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_id", Integer, nullable=False),
+    # Log lines holding the chunk's text
+    Column("job_id", Text),
+    Column("task_order", Integer),
+    Column("first_line", Integer),
+    Column("line_count", Integer),
+    # The text itself when it is not in the log store
+    Column("content", Text),
+    Column("checksum", Integer, nullable=False),
+)
+
+_DELETE_CHUNK = text(
+    f"INSERT INTO {JOB_OUTPUT_FTS_TABLE} ({JOB_OUTPUT_FTS_TABLE}, rowid, content) "
+    "VALUES ('delete', :rowid, :content)"
+)
+
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+# A token as split by the unicode61 tokenizer
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Characters searched before a match for the tokens leading a snippet
+_SNIPPET_LOOKBEHIND = 512
+
+
+def chunk_checksum(chunk_text: str) -> int:
+    """Checksum identifying the exact text a chunk was indexed with"""
+    return zlib.crc32(chunk_text.encode("utf-8"))
+
+
+def _query_terms(query: str) -> List[Tuple[str, bool]]:
+    """Phrases of a search and whether each is a prefix search"""
+    terms = []
+    for match in _QUERY_TERM.finditer(query):
+        phrase, word = match.group(1), match.group(2)
+        prefix = False
+        if word is not None:
+            prefix = word.endswith("*")
+            phrase = word.rstrip("*")
+        if not phrase or not phrase.strip():
+            continue
+        terms.append((phrase, prefix))
+    return terms
+
+
+def build_match_query(text: str) -> str:
+    """Turn user input into a safe FTS5 query
+
+    Words and ``"quoted phrases"`` are matched as phrases and all of them must
+    occur; a trailing ``*`` on a word makes it a prefix search. FTS5 operators
+    in the input are treated as plain text.
+    """
+    terms = []
+    for phrase, prefix in _query_terms(text):
+        quoted = '"' + phrase.replace('"', '""') + '"'
+        terms.append(quoted + "*" if prefix else quoted)
+    return " ".join(terms)
+
+
+def _match_pattern(query: str) -> Optional["re.Pattern[str]"]:
+    """Regex finding the phrases of a search as whole tokens"""
+    patterns = []
+    for phrase, prefix in _query_terms(query):
+        words = _TOKEN.findall(phrase)
+        if not words:
+            continue
+        pattern = r"(?<![^\W_])" + r"[\W_]+".join(re.escape(word) for word in words)
+        patterns.append(pattern + (r"[^\W_]*" if prefix else r"(?![^\W_])"))
+    if not patterns:
+        return None
+    return re.compile("|".join(patterns), re.IGNORECASE)
+
+
+def build_snippet(text: str, query: str, max_tokens: int = SNIPPET_TOKENS) -> str:
+    """Excerpt of ``text`` around the first match of ``query``
+
+    Like FTS5's ``snippet()``: at most ``max_tokens`` tokens, matches wrapped
+    in the match markers and an ellipsis where the text was cut.
+    """
+    matcher = _match_pattern(query)
+    first = matcher.search(text) if matcher else None
+    anchor = first.start() if first else 0
+
+    # A quarter of the tokens lead up to the match
+    leading = max_tokens // 4
+    lookbehind = max(0, anchor - _SNIPPET_LOOKBEHIND)
+    starts = [token.start() for token in _TOKEN.finditer(text, lookbehind, anchor)]
+    if len(starts) > leading:
+        begin = starts[-leading] if leading else anchor
+    else:
+        begin = 0 if lookbehind == 0 else (starts[0] if starts else anchor)
+
+    end = len(text)
+    remaining = max_tokens - min(len(starts), leading)
+    ends: List[int] = []
+    for token in _TOKEN.finditer(text, anchor):
+        if len(ends) == remaining:
+            end = ends[-1]
+            break
+        ends.append(token.end())
+
+    excerpt = text[begin:end]
+    if matcher:
+        excerpt = matcher.sub(
+            lambda match: _MATCH_START + match.group() + _MATCH_END, excerpt
+        )
+    return ("…" if begin > 0 else "") + excerpt + ("…" if end < len(text) else "")
+
+
+def highlight_snippet(snippet: str) -> Markup:
+    """Escape a snippet and mark its matches with ``<mark>``"""
+    return Markup(
+        str(escape(snippet))
+        .replace(_MATCH_START, '<mark class="bg-yellow-200 dark:bg-yellow-700">')
+        .replace(_MATCH_END, "</mark>")
+    )
+
+
+class JobOutputIndex:
+    """Maintains the FTS5 index of job task output"""
+
+    def __init__(self, log_store: Optional[JobLogStore] = None) -> None:
+        self.log_store = log_store
+        # Whether the index exists, checked once per database engine
+        self._available: "weakref.WeakKeyDictionary[Engine, bool]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def ensure(self, db: AsyncSession) -> bool:
+        """Create the index if needed; False when FTS5 is not available"""
+        conn = await db.connection()
+        available = self._available.get(conn.engine.sync_engine)
+        if available is None:
+            available = await self._create(conn)
+            self._available[conn.engine.sync_engine] = available
+        return available
+
+    async def replace_task_output(
+        self,
+        db: AsyncSession,
+        task_id: int,
+        text: str,
+        source: Optional[LogLineRange] = None,
+    ) -> None:
+        """Index the complete output of a task, dropping earlier chunks
+
+        ``source`` names the log lines ``text`` was read from; without it
+        the text is kept with the chunk.
+        """
+        await self.remove_tasks(db, [task_id])
+        await self.append_task_output(db, task_id, text, source)
+
+    async def append_task_output(
+        self,
+        db: AsyncSession,
+        task_id: int,
+        text: str,
+        source: Optional[LogLineRange] = None,
+    ) -> None:
+        """Index newly appended output as the task's next chunk"""
+        if not text.strip():
+            return
+        values: Dict[str, object] = {
+            "task_id": task_id,
+            "checksum": chunk_checksum(text),
+        }
+        if source is None:
+            values["content"] = text
+        else:
+            values.update(
+                job_id=str(source.job_id),
+                task_order=source.task_index,
+                first_line=source.start,
+                line_count=source.count,
+            )
+        chunk_id = await db.scalar(
+            insert(job_output_chunks).values(**values).returning(job_output_chunks.c.id)
+        )
+        await db.execute(insert(job_output_fts).values(rowid=chunk_id, content=text))
+
+    async def remove_tasks(self, db: AsyncSession, task_ids: Sequence[int]) -> None:
+        """Drop all indexed output of the given tasks"""
+        if not task_ids:
+            return
+        chunks = (
+            await db.execute(
+                select(job_output_chunks).where(
+                    job_output_chunks.c.task_id.in_(task_ids)
+                )
+            )
+        ).all()
+        deletes = []
+        for chunk, chunk_text in zip(chunks, await self.chunk_texts(chunks)):
+            if chunk_text is None or chunk_checksum(chunk_text) != chunk.checksum:
+                logger.warning(
+                    f"Text of output chunk {chunk.id} of task {chunk.task_id} is "
+                    "gone, leaving its tokens in the search index"
+                )
+                continue
+            deletes.append({"rowid": chunk.id, "content": chunk_text})
+        if deletes:
+            await db.execute(_DELETE_CHUNK, deletes)
+        await db.execute(
+            delete(job_output_chunks).where(job_output_chunks.c.task_id.in_(task_ids))
+        )
+
+    async def chunk_texts(self, chunks: Sequence["Row[Any]"]) -> List[Optional[str]]:
+        """Texts of indexed chunks, read from the log store in a thread"""
+        if all(chunk.content is not None for chunk in chunks):
+            return [str(chunk.content) for chunk in chunks]
+        return await asyncio.to_thread(
+            lambda: [self.chunk_text(chunk) for chunk in chunks]
+        )
+
+    def chunk_text(self, chunk: "Row[Any]") -> Optional[str]:
+        """Text of an indexed chunk, or None if it is no longer stored; blocking"""
+        if chunk.content is not None:
+            return str(chunk.content)
+        if self.log_store is None or chunk.job_id is None:
+            return None
+        return self.log_store.read_range(
+            LogLineRange(
+                job_id=uuid.UUID(chunk.job_id),
+                task_index=chunk.task_order,
+                start=chunk.first_line,
+                count=chunk.line_count,
+            )
+        )
+
+    @staticmethod
+    async def _create(conn: AsyncConnection) -> bool:
+        if conn.dialect.name != "sqlite":
+            logger.info("Job output search requires SQLite, index disabled")
+            return False
+        result = await conn.exec_driver_sql(
+            "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+        )
+        if not result.scalar():
+            logger.warning("SQLite was built without FTS5, job output search disabled")
+            return False
+        await conn.exec_driver_sql(CREATE_JOB_OUTPUT_CHUNKS_SQL)
+        await conn.exec_driver_sql(CREATE_JOB_OUTPUT_CHUNKS_INDEX_SQL)
+        await conn.exec_driver_sql(CREATE_JOB_OUTPUT_FTS_SQL)
+        return True
+
+
+@dataclass
+class JobOutputSearchHit:
+    """A chunk of task output matching a search"""
+
+    job_id: StringUUID
+    task_order: int
+    task_type: str
+    task_name: str
+    task_status: str
+    job_status: str
+    repository_id: int
+    repository_name: Optional[str]
+    started_at: Optional[datetime]
+    snippet: Markup
+
+
+@dataclass
+class JobOutputSearchResult:
+    """Hits for a search, best match first"""
+
+    query: str
+    hits: List[JobOutputSearchHit] = field(default_factory=list)
+    duration_ms: float = 0.0
+    index_available: bool = True
+
+
+class JobOutputSearchService:
+    """Ranked full-text search over job task output"""
+
+    def __init__(self, index: JobOutputIndex) -> None:
+        self.index = index
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        repository_id: Optional[int] = None,
+        task_type: Optional[str] = None,
+        started_after: Optional[datetime] = None,
+        started_before: Optional[datetime] = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> JobOutputSearchResult:
+        """Find task output matching ``query``, optionally filtered by the
+        job's repository, the task type and the job's start time"""
+        result = JobOutputSearchResult(query=query)
+        match_query = build_match_query(query)
+        if not match_query:
+            return result
+        if not await self.index.ensure(db):
+            result.index_available = False
+            return result
+
+        started = time.perf_counter()
+        fts: ColumnClause[Any] = literal_column(JOB_OUTPUT_FTS_TABLE)
+        statement = (
+            select(
+                job_output_chunks.c.id,
+                JobTask.job_id,
+                JobTask.task_order,
+                JobTask.task_type,
+                JobTask.task_name,
+                JobTask.status,
+                Job.status,
+                Job.repository_id,
+                Repository.name,
+                Job.started_at,
+            )
+            .select_from(job_output_fts)
+            .join(job_output_chunks, job_output_chunks.c.id == job_output_fts.c.rowid)
+            .join(JobTask, JobTask.id == job_output_chunks.c.task_id)
+            .join(Job, Job.id == JobTask.job_id)
+            .outerjoin(Repository, Repository.id == Job.repository_id)
+            .where(fts.op("MATCH")(match_query))
+            .order_by(literal_column(f"{JOB_OUTPUT_FTS_TABLE}.rank"))
+            .limit(limit)
+        )
+        if repository_id is not None:
+            statement = statement.where(Job.repository_id == repository_id)
+        if task_type:
+            statement = statement.where(JobTask.task_type == task_type)
+        if started_after is not None:
+            statement = statement.where(Job.started_at >= started_after)
+        if started_before is not None:
+            statement = statement.where(Job.started_at < started_before)
+
+        rows = (await db.execute(statement)).all()
+        chunks = (
+            await db.execute(
+                select(job_output_chunks).where(
+                    job_output_chunks.c.id.in_([row[0] for row in rows])
+                )
+            )
+        ).all()
+        texts = dict(
+            zip((chunk.id for chunk in chunks), await self.index.chunk_texts(chunks))
+        )
+        result.hits = [
+            JobOutputSearchHit(
+                job_id=row[1],
+                task_order=row[2],
+                task_type=row[3],
+                task_name=row[4],
+                task_status=row[5],
+                job_status=row[6],
+                repository_id=row[7],
+                repository_name=row[8],
+                started_at=row[9],
+                snippet=highlight_snippet(build_snippet(texts[row[0]] or "", query)),
+            )
+            for row in rows
+        ]
+        result.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        return result
@@ -1,15 +1,36 @@
 """
 Job Queue Manager - Handles job queuing and concurrency control
+
+Besides the global limits, jobs that name a repository are serialized per
+repository: borg holds an exclusive lock on a repository while it writes to
+it, so a prune or check started next to a backup of the same repository
+would only fail or stall on that lock. While a repository is busy its queued
+jobs are skipped and the next runnable job is started instead, so different
+repositories keep running in parallel. A job writing to several
+repositories, such as a fan-out backup, holds all of them while it runs.
+
+The queue processors are event driven: they sleep until a job is enqueued,
+a slot is freed or a repository is released, and only pick a job once they
+hold a free slot, so the job started is always the best one at that moment.
+Waiting jobs gain one priority level per ``priority_aging_interval`` seconds
+(up to CRITICAL), so a steady stream of high priority work cannot starve
+LOW priority jobs.
+
+Jobs enqueued as ``durable`` have their state transitions recorded in a
+``JobQueueStore`` so they can be re-enqueued after a restart.
 """
 
 import asyncio
 import logging
 from typing import Dict, List, Optional, Callable
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 
+from borgitory.services.jobs.job_admission import AdmissionController, HostLoadSample
+from borgitory.services.jobs.job_queue_store import JobQueueStore, QueueEntryState
+from borgitory.services.metrics.app_metrics import QUEUE_WAIT
 from borgitory.utils.datetime_utils import now_utc
 
 logger = logging.getLogger(__name__)
@@ -33,6 +54,15 @@ class QueuedJob:
     priority: JobPriority = JobPriority.NORMAL
     queued_at: Optional[datetime] = None
     metadata: Optional[Dict[str, object]] = None
+    # Jobs with the same key never run at the same time
+    repository_key: Optional[str] = None
+    # Further repositories the job writes to, held alongside repository_key
+    additional_repository_keys: List[str] = field(default_factory=list)
+    dispatched_at: Optional[datetime] = None
+    # Times the job has been started, including runs before a restart
+    attempts: int = 0
+    # Whether the job is recorded in the durable queue store
+    durable: bool = False
 
     def __post_init__(self) -> None:
         if self.queued_at is None:
@@ -40,6 +70,21 @@ class QueuedJob:
         if self.metadata is None:
             self.metadata = {}
 
+    @property
+    def repository_keys(self) -> List[str]:
+        """Every repository key the job holds while it runs"""
+        keys = [self.repository_key] if self.repository_key is not None else []
+        return keys + [
+            key for key in self.additional_repository_keys if key not in keys
+        ]
+
+    @property
+    def wait_seconds(self) -> Optional[float]:
+        """Time the job spent in the queue, once it has been started"""
+        if self.queued_at is None or self.dispatched_at is None:
+            return None
+        return (self.dispatched_at - self.queued_at).total_seconds()
+
 
 @dataclass
 class PriorityQueueItem:
@@ -82,6 +127,12 @@ class QueueStats:
     max_concurrent: int
     available_slots: int
     queue_size_by_type: Dict[str, int]
+    busy_repositories: int = 0
+    blocked_by_repository: int = 0
+    longest_wait_seconds: float = 0.0
+    # Why load-aware admission is holding queued jobs, if it is
+    admission_hold_reason: Optional[str] = None
+    host_load: Optional[HostLoadSample] = None
 
 
 class JobQueueManager:
@@ -92,18 +143,29 @@ class JobQueueManager:
         max_concurrent_backups: int = 5,
         max_concurrent_operations: int = 10,
         queue_poll_interval: float = 0.1,
+        priority_aging_interval: float = 300.0,
+        store: Optional[JobQueueStore] = None,
+        admission: Optional[AdmissionController] = None,
     ) -> None:
         self.max_concurrent_backups = max_concurrent_backups
         self.max_concurrent_operations = max_concurrent_operations
+        # Dispatch is event driven; kept for configuration compatibility
         self.queue_poll_interval = queue_poll_interval
-
-        # Separate queues for different job types
-        self._backup_queue: asyncio.PriorityQueue[PriorityQueueItem] = (
-            asyncio.PriorityQueue()
-        )
-        self._operation_queue: asyncio.PriorityQueue[PriorityQueueItem] = (
-            asyncio.PriorityQueue()
-        )
+        # Seconds of waiting that raise a job by one priority level (0 = off)
+        self.priority_aging_interval = priority_aging_interval
+        # Durable record of the queue, if configured
+        self.store = store
+        # Holds jobs below the concurrency limits while the host is loaded
+        self.admission = admission
+
+        # Separate queues for different job types; ordered at dispatch time
+        # as effective priorities change while jobs wait
+        self._backup_queue: List[PriorityQueueItem] = []
+        self._operation_queue: List[PriorityQueueItem] = []
+
+        # Set when a queue may have a startable job
+        self._backup_wakeup = asyncio.Event()
+        self._operation_wakeup = asyncio.Event()
 
         # Semaphores for concurrency control
         self._backup_semaphore: Optional[asyncio.Semaphore] = None
@@ -112,10 +174,13 @@ class JobQueueManager:
         # Running job tracking
         self._running_jobs: Dict[uuid.UUID, QueuedJob] = {}
         self._running_backups: Dict[uuid.UUID, QueuedJob] = {}
+        # Repository key -> job currently holding it
+        self._busy_repositories: Dict[str, uuid.UUID] = {}
 
         # Queue processor control
         self._queue_processors_started = False
         self._shutdown_requested = False
+        self._processor_tasks: List["asyncio.Task[None]"] = []
 
         # Callbacks for job events
         self._job_start_callback: Optional[Callable[[uuid.UUID, QueuedJob], None]] = (
@@ -151,13 +216,37 @@ class JobQueueManager:
         job_type: str,
         priority: JobPriority = JobPriority.NORMAL,
         metadata: Optional[Dict[str, object]] = None,
+        repository_key: Optional[str] = None,
+        durable: bool = False,
+        additional_repository_keys: Optional[List[str]] = None,
     ) -> bool:
-        """Add a job to the appropriate queue"""
-        await self.initialize()
+        """Add a job to the appropriate queue
 
+        Jobs sharing a ``repository_key`` are run one at a time; a job with
+        ``additional_repository_keys`` waits until all of its repositories
+        are idle. Durable jobs are recorded in the queue store; their
+        ``metadata`` must be JSON serializable.
+        """
         queued_job = QueuedJob(
-            job_id=job_id, job_type=job_type, priority=priority, metadata=metadata or {}
+            job_id=job_id,
+            job_type=job_type,
+            priority=priority,
+            metadata=metadata or {},
+            repository_key=repository_key,
+            additional_repository_keys=list(additional_repository_keys or []),
+            durable=durable,
         )
+        return await self.submit(queued_job)
+
+    async def submit(self, queued_job: QueuedJob) -> bool:
+        """Add a prepared job, such as one restored after a restart, to its queue"""
+        await self.initialize()
+
+        job_id = queued_job.job_id
+        job_type = queued_job.job_type
+        priority = queued_job.priority
+        if queued_job.durable and self.store is not None:
+            self.store.record_enqueued(queued_job)
 
         # Determine which queue to use
         is_backup = self._is_backup_job(job_type)
@@ -168,7 +257,8 @@ class JobQueueManager:
         queue_item = PriorityQueueItem(
             priority=priority_value, timestamp=queued_job.queued_at, job=queued_job
         )
-        await queue.put(queue_item)
+        queue.append(queue_item)
+        (self._backup_wakeup if is_backup else self._operation_wakeup).set()
 
         logger.info(
             f"Queued {job_type} job {job_id} with priority {priority.name} "
@@ -184,152 +274,212 @@ class JobQueueManager:
     async def _start_queue_processors(self) -> None:
         """Start the queue processor tasks"""
         if not self._queue_processors_started:
-            asyncio.create_task(self._process_backup_queue())
-            asyncio.create_task(self._process_operation_queue())
+            self._processor_tasks = [
+                asyncio.create_task(self._process_backup_queue()),
+                asyncio.create_task(self._process_operation_queue()),
+            ]
             self._queue_processors_started = True
             logger.info("Queue processors started")
 
     async def _process_backup_queue(self) -> None:
         """Process backup jobs with concurrency control"""
         logger.info("Backup queue processor started")
-
-        while not self._shutdown_requested:
-            try:
-                # Get next job from queue with timeout
-                try:
-                    queue_item = await asyncio.wait_for(
-                        self._backup_queue.get(), timeout=self.queue_poll_interval * 10
-                    )
-                    queued_job = queue_item.job
-                except asyncio.TimeoutError:
-                    continue
-
-                # Acquire semaphore (blocks if at max concurrency)
-                if self._backup_semaphore is None:
-                    raise RuntimeError(
-                        "JobQueueManager not initialized - call initialize() first"
-                    )
-                await self._backup_semaphore.acquire()
-
-                try:
-                    # Track as running
-                    self._running_backups[queued_job.job_id] = queued_job
-                    self._running_jobs[queued_job.job_id] = queued_job
-
-                    logger.info(f"Starting backup job {queued_job.job_id}")
-
-                    # Notify job start
-                    if self._job_start_callback:
-                        self._job_start_callback(queued_job.job_id, queued_job)
-
-                    # Create task to handle job execution and cleanup
-                    asyncio.create_task(
-                        self._execute_and_cleanup_job(queued_job, is_backup=True)
-                    )
-
-                except Exception as e:
-                    logger.error(f"Error starting backup job {queued_job.job_id}: {e}")
-                    if self._backup_semaphore is not None:
-                        self._backup_semaphore.release()
-                    self._cleanup_running_job(queued_job.job_id, is_backup=True)
-
-            except Exception as e:
-                logger.error(f"Error in backup queue processor: {e}")
-                await asyncio.sleep(1)
+        await self._process_queue(is_backup=True)
 
     async def _process_operation_queue(self) -> None:
         """Process operation jobs with concurrency control"""
         logger.info("Operation queue processor started")
+        await self._process_queue(is_backup=False)
+
+    async def _process_queue(self, is_backup: bool) -> None:
+        """Start queued jobs while slots are free and their repository is idle"""
+        queue = self._backup_queue if is_backup else self._operation_queue
+        wakeup = self._backup_wakeup if is_backup else self._operation_wakeup
+        kind = "backup" if is_backup else "operation"
 
         while not self._shutdown_requested:
             try:
-                # Get next job from queue with timeout
-                try:
-                    queue_item = await asyncio.wait_for(
-                        self._operation_queue.get(),
-                        timeout=self.queue_poll_interval * 10,
-                    )
-                    queued_job = queue_item.job
-                except asyncio.TimeoutError:
+                semaphore = self._get_semaphore(is_backup)
+
+                # Acquire a slot first (blocks if at max concurrency) so the
+                # job is picked only once it can actually start
+                await semaphore.acquire()
+
+                wakeup.clear()
+                item = self._next_runnable(queue)
+                if item is None:
+                    semaphore.release()
+                    # Sleep until a job is enqueued or a repository is released
+                    await wakeup.wait()
                     continue
 
-                # Acquire semaphore (blocks if at max concurrency)
-                if self._operation_semaphore is None:
-                    raise RuntimeError(
-                        "JobQueueManager not initialized - call initialize() first"
-                    )
-                await self._operation_semaphore.acquire()
+                if (
+                    self.admission is not None
+                    and self._admission_hold_reason(is_backup) is not None
+                ):
+                    semaphore.release()
+                    # Host load is sampled again after the interval
+                    try:
+                        await asyncio.wait_for(
+                            wakeup.wait(), timeout=self.admission.sample_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                queued_job = self._dispatch(queue, item)
 
                 try:
                     # Track as running
                     self._running_jobs[queued_job.job_id] = queued_job
+                    if is_backup:
+                        self._running_backups[queued_job.job_id] = queued_job
 
-                    logger.info(f"Starting operation job {queued_job.job_id}")
+                    logger.info(
+                        f"Starting {kind} job {queued_job.job_id} after waiting "
+                        f"{queued_job.wait_seconds or 0.0:.1f}s in the queue"
+                    )
 
-                    # Notify job start
+                    # Notify job start; the job manager reports completion
+                    # through mark_job_completed()
                     if self._job_start_callback:
                         self._job_start_callback(queued_job.job_id, queued_job)
 
-                    # Create task to handle job execution and cleanup
-                    asyncio.create_task(
-                        self._execute_and_cleanup_job(queued_job, is_backup=False)
-                    )
-
                 except Exception as e:
-                    logger.error(
-                        f"Error starting operation job {queued_job.job_id}: {e}"
-                    )
-                    if self._operation_semaphore is not None:
-                        self._operation_semaphore.release()
-                    self._cleanup_running_job(queued_job.job_id, is_backup=False)
+                    logger.error(f"Error starting {kind} job {queued_job.job_id}: {e}")
+                    self.mark_job_completed(queued_job.job_id, False)
 
             except Exception as e:
-                logger.error(f"Error in operation queue processor: {e}")
+                logger.error(f"Error in {kind} queue processor: {e}")
                 await asyncio.sleep(1)
 
-    async def _execute_and_cleanup_job(
-        self, queued_job: QueuedJob, is_backup: bool
-    ) -> None:
-        """Execute job and clean up resources when complete"""
-        job_id = queued_job.job_id
-        success = False
-
-        try:
-            # Job execution happens in the main job manager
-            # This is just a placeholder - actual execution is handled elsewhere
-            logger.debug(f"Job {job_id} execution delegated to job manager")
-
-            # Wait for job completion (this would be handled by job status updates)
-            # For now, we'll just mark as successful
-            success = True
-
-        except Exception as e:
-            logger.error(f"Error executing job {job_id}: {e}")
-            success = False
-
-        finally:
-            # Clean up resources
-            if is_backup:
-                if self._backup_semaphore is not None:
-                    self._backup_semaphore.release()
-            else:
-                if self._operation_semaphore is not None:
-                    self._operation_semaphore.release()
+    def _get_semaphore(self, is_backup: bool) -> asyncio.Semaphore:
+        semaphore = self._backup_semaphore if is_backup else self._operation_semaphore
+        if semaphore is None:
+            raise RuntimeError(
+                "JobQueueManager not initialized - call initialize() first"
+            )
+        return semaphore
+
+    def _next_runnable(
+        self, queue: List[PriorityQueueItem]
+    ) -> Optional[PriorityQueueItem]:
+        """The best queued job whose repositories are all idle
+
+        Jobs are ordered by aged priority, then by time queued. Jobs waiting
+        for a busy repository keep their place in the queue.
+        """
+        now = now_utc()
+        for item in sorted(
+            queue,
+            key=lambda item: (
+                -self._effective_priority(item.job, now),
+                item.job.queued_at or now,
+            ),
+        ):
+            if not self._is_blocked(item.job):
+                return item
+        return None
+
+    def _is_blocked(self, job: QueuedJob) -> bool:
+        """Whether one of the job's repositories is held by a running job"""
+        return any(key in self._busy_repositories for key in job.repository_keys)
+
+    def _dispatch(
+        self, queue: List[PriorityQueueItem], item: PriorityQueueItem
+    ) -> QueuedJob:
+        """Remove a job from its queue and mark it and its repositories busy"""
+        queue.remove(item)
+        job = item.job
+        job.dispatched_at = now_utc()
+        job.attempts += 1
+        wait_seconds = job.wait_seconds
+        if wait_seconds is not None:
+            QUEUE_WAIT.labels(job.job_type).observe(wait_seconds)
+        for repository_key in job.repository_keys:
+            self._busy_repositories[repository_key] = job.job_id
+        if job.durable and self.store is not None:
+            self.store.record_started(job)
+        return job
+
+    def _admission_hold_reason(self, is_backup: bool) -> Optional[str]:
+        """Why host load keeps a further job of this kind from starting
+
+        The first job of a kind is always admitted so the queue keeps
+        making progress however loaded the host is.
+        """
+        if self.admission is None:
+            return None
+        running_backups = len(self._running_backups)
+        running = (
+            running_backups if is_backup else len(self._running_jobs) - running_backups
+        )
+        if running == 0:
+            return None
+        return self.admission.hold_reason()
+
+    def _effective_priority(self, job: QueuedJob, now: datetime) -> float:
+        """Priority of a waiting job, raised by the time it has waited"""
+        priority = float(job.priority.value)
+        if self.priority_aging_interval <= 0 or job.queued_at is None:
+            return priority
+        waited = (now - job.queued_at).total_seconds()
+        return min(
+            priority + waited / self.priority_aging_interval,
+            float(JobPriority.CRITICAL.value),
+        )
 
-            self._cleanup_running_job(job_id, is_backup)
+    def mark_job_completed(self, job_id: uuid.UUID, success: bool) -> None:
+        """Release the slot and repository held by a job started by the queue
+
+        Jobs that were not started by this queue are ignored.
+        """
+        queued_job = self._running_jobs.get(job_id)
+        if queued_job is None:
+            return
+
+        is_backup = job_id in self._running_backups
+        self._cleanup_running_job(job_id, is_backup)
+        if queued_job.durable and self.store is not None:
+            self.store.record_finished(
+                job_id,
+                QueueEntryState.COMPLETED if success else QueueEntryState.FAILED,
+            )
 
-            # Notify job completion
-            if self._job_complete_callback:
-                self._job_complete_callback(job_id, success)
+        semaphore = self._backup_semaphore if is_backup else self._operation_semaphore
+        if semaphore is not None:
+            semaphore.release()
+        # The released repository may unblock jobs in either queue
+        self._backup_wakeup.set()
+        self._operation_wakeup.set()
+
+        # Notify job completion
+        if self._job_complete_callback:
+            self._job_complete_callback(job_id, success)
+
+    def remove_job(self, job_id: uuid.UUID) -> bool:
+        """Drop a job that has not been started yet from its queue"""
+        for queue in (self._backup_queue, self._operation_queue):
+            for item in queue:
+                if item.job.job_id == job_id:
+                    queue.remove(item)
+                    if item.job.durable and self.store is not None:
+                        self.store.record_finished(job_id, QueueEntryState.CANCELLED)
+                    logger.info(f"Removed queued job {job_id}")
+                    return True
+        return False
 
     def _cleanup_running_job(self, job_id: uuid.UUID, is_backup: bool) -> None:
         """Clean up tracking for a running job"""
-        if job_id in self._running_jobs:
-            del self._running_jobs[job_id]
+        queued_job = self._running_jobs.pop(job_id, None)
 
         if is_backup and job_id in self._running_backups:
             del self._running_backups[job_id]
 
+        for repository_key in queued_job.repository_keys if queued_job else []:
+            if self._busy_repositories.get(repository_key) == job_id:
+                del self._busy_repositories[repository_key]
+
     def _is_backup_job(self, job_type: str) -> bool:
         """Determine if a job type is a backup job"""
         backup_types = ["backup", "manual_backup", "scheduled_backup", "create"]
@@ -337,9 +487,18 @@ class JobQueueManager:
 
     def get_queue_stats(self) -> QueueStats:
         """Get current queue statistics"""
-        backup_queue_size = self._backup_queue.qsize() if self._backup_queue else 0
-        operation_queue_size = (
-            self._operation_queue.qsize() if self._operation_queue else 0
+        backup_queue_size = len(self._backup_queue)
+        operation_queue_size = len(self._operation_queue)
+        queued = self._backup_queue + self._operation_queue
+        blocked = sum(1 for item in queued if self._is_blocked(item.job))
+        now = now_utc()
+        longest_wait = max(
+            (
+                (now - item.job.queued_at).total_seconds()
+                for item in queued
+                if item.job.queued_at is not None
+            ),
+            default=0.0,
         )
 
         running_backups = len(self._running_backups)
@@ -356,6 +515,15 @@ class JobQueueManager:
                 "backup": backup_queue_size,
                 "operation": operation_queue_size,
             },
+            busy_repositories=len(self._busy_repositories),
+            blocked_by_repository=blocked,
+            longest_wait_seconds=longest_wait,
+            admission_hold_reason=(
+                self.admission.current_reason
+                if self.admission is not None and queued
+                else None
+            ),
+            host_load=self.admission.last_sample if self.admission else None,
         )
 
     def get_running_jobs(self) -> List[Dict[str, object]]:
@@ -367,6 +535,8 @@ class JobQueueManager:
                 "priority": job.priority.name,
                 "queued_at": job.queued_at.isoformat() if job.queued_at else None,
                 "metadata": job.metadata,
+                "repository_key": job.repository_key,
+                "wait_seconds": job.wait_seconds,
             }
             for job in self._running_jobs.values()
         ]
@@ -376,21 +546,22 @@ class JobQueueManager:
         logger.info("Shutting down job queue manager")
         self._shutdown_requested = True
 
-        # Clear queues
-        while not self._backup_queue.empty():
-            try:
-                self._backup_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        # Processors may be blocked waiting for a free slot
+        for task in self._processor_tasks:
+            task.cancel()
+        self._processor_tasks = []
 
-        while not self._operation_queue.empty():
-            try:
-                self._operation_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        # Queued and running durable jobs stay recorded for the next start
+        if self.store is not None:
+            await self.store.flush()
+
+        # Clear queues
+        self._backup_queue.clear()
+        self._operation_queue.clear()
 
         # Clear running jobs
         self._running_jobs.clear()
         self._running_backups.clear()
+        self._busy_repositories.clear()
 
         logger.info("Job queue manager shutdown complete")
@@ -0,0 +1,288 @@
+"""
+Job Queue Store - Durable, write-behind record of the job queue
+
+Every state transition of a durable queued job (queued, running, and one of
+the finished states) is recorded in the ``job_queue`` table so the queue can
+be rebuilt after a restart. Recording never waits for the database: like the
+task writer, transitions are coalesced per job and written together in one
+transaction every ``flush_interval`` seconds, keeping ``enqueue_job`` and the
+dispatcher free of database round trips. A batch that cannot be written is
+kept, merged with any later transitions, and retried with exponential
+backoff.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from borgitory.models.database import JobQueueEntry
+from borgitory.utils.datetime_utils import ensure_utc, now_utc
+
+if TYPE_CHECKING:
+    from borgitory.services.jobs.job_queue_manager import QueuedJob
+
+logger = logging.getLogger(__name__)
+
+
+class QueueEntryState(str, Enum):
+    """State of a job in the durable queue"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# States a job can be resumed from after a restart
+UNFINISHED_QUEUE_STATES = (QueueEntryState.QUEUED, QueueEntryState.RUNNING)
+
+
+@dataclass(frozen=True)
+class JobQueueRecoveryPolicy:
+    """Decides which unfinished durable jobs are resumed after a restart"""
+
+    # Jobs interrupted while running are retried until started this often
+    max_attempts: int = 2
+    # Jobs queued longer ago than this many seconds are dropped (0 = never)
+    max_age: float = 86400.0
+
+    def rejection_reason(
+        self,
+        state: QueueEntryState,
+        attempts: int,
+        queued_at: Optional[datetime],
+        now: datetime,
+    ) -> Optional[str]:
+        """Why a job must not be resumed, or None if it may be"""
+        queued_at = ensure_utc(queued_at)
+        if (
+            self.max_age > 0
+            and queued_at is not None
+            and (now - queued_at).total_seconds() > self.max_age
+        ):
+            return f"queued more than {self.max_age:.0f}s ago"
+        if state == QueueEntryState.RUNNING and attempts >= self.max_attempts:
+            return f"interrupted after {attempts} attempt(s)"
+        return None
+
+
+@dataclass
+class StoredQueueEntry:
+    """A queued or interrupted job loaded from the durable queue"""
+
+    job_id: uuid.UUID
+    job_type: str
+    priority: int
+    repository_key: Optional[str]
+    state: QueueEntryState
+    attempts: int
+    queued_at: datetime
+    metadata: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class _PendingWrite:
+    values: Dict[str, object]
+    # Whether the row may not exist yet and has to be inserted
+    insert: bool = False
+
+
+class JobQueueStore:
+    """Coalesces queue state transitions and writes them in batches"""
+
+    def __init__(
+        self,
+        async_session_maker: async_sessionmaker[AsyncSession],
+        flush_interval: float = 0.5,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+    ) -> None:
+        self.async_session_maker = async_session_maker
+        self.flush_interval = max(0.0, flush_interval)
+        self.retry_delay = max(0.0, retry_delay)
+        self.max_retry_delay = max(self.retry_delay, max_retry_delay)
+        self._pending: Dict[uuid.UUID, _PendingWrite] = {}
+        self._failed_writes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._write_lock = asyncio.Lock()
+        self._writes: "set[asyncio.Task[None]]" = set()
+
+    def record_enqueued(self, queued_job: "QueuedJob") -> None:
+        """Record a job entering the queue, with everything needed to rebuild it"""
+        self._record(
+            queued_job.job_id,
+            {
+                "job_type": queued_job.job_type,
+                "priority": queued_job.priority.value,
+                "repository_key": queued_job.repository_key,
+                "state": QueueEntryState.QUEUED.value,
+                "attempts": queued_job.attempts,
+                "payload": json.dumps(queued_job.metadata or {}, default=str),
+                "queued_at": queued_job.queued_at or now_utc(),
+                "started_at": None,
+                "finished_at": None,
+            },
+            insert=True,
+        )
+
+    def record_started(self, queued_job: "QueuedJob") -> None:
+        """Record a job being started by the dispatcher"""
+        self._record(
+            queued_job.job_id,
+            {
+                "state": QueueEntryState.RUNNING.value,
+                "attempts": queued_job.attempts,
+                "started_at": queued_job.dispatched_at or now_utc(),
+            },
+        )
+
+    def record_finished(self, job_id: uuid.UUID, state: QueueEntryState) -> None:
+        """Record a job leaving the queue for good"""
+        self._record(
+            job_id, {"state": state.value, "finished_at": now_utc()}, insert=False
+        )
+
+    async def flush(self) -> None:
+        """Write everything pending now and wait for in-flight writes"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._write_pending()
+        if self._writes:
+            await asyncio.gather(*list(self._writes), return_exceptions=True)
+
+    def pending_job_count(self) -> int:
+        """Number of jobs with transitions not yet written"""
+        return len(self._pending)
+
+    async def load_unfinished(self) -> List[StoredQueueEntry]:
+        """Jobs that were queued or running, highest priority and oldest first"""
+        await self.flush()
+        async with self.async_session_maker() as db:
+            result = await db.execute(
+                select(JobQueueEntry)
+                .where(
+                    JobQueueEntry.state.in_(
+                        [state.value for state in UNFINISHED_QUEUE_STATES]
+                    )
+                )
+                .order_by(JobQueueEntry.priority.desc(), JobQueueEntry.queued_at)
+            )
+            rows = result.scalars().all()
+
+        entries = []
+        for row in rows:
+            try:
+                metadata = json.loads(row.payload) if row.payload else {}
+            except ValueError:
+                logger.warning(f"Ignoring unreadable queue payload of job {row.job_id}")
+                metadata = {}
+            entries.append(
+                StoredQueueEntry(
+                    job_id=row.job_id,
+                    job_type=row.job_type,
+                    priority=row.priority,
+                    repository_key=row.repository_key,
+                    state=QueueEntryState(row.state),
+                    attempts=row.attempts,
+                    queued_at=ensure_utc(row.queued_at) or now_utc(),
+                    metadata=metadata if isinstance(metadata, dict) else {},
+                )
+            )
+        return entries
+
+    def _record(
+        self, job_id: uuid.UUID, values: Dict[str, object], insert: bool = False
+    ) -> None:
+        pending = self._pending.get(job_id)
+        if pending is None or insert:
+            self._pending[job_id] = _PendingWrite(dict(values), insert)
+        else:
+            # A later transition of a write still waiting in the buffer
+            pending.values.update(values)
+
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._start_write)
+
+    def _requeue(self, batch: Dict[uuid.UUID, _PendingWrite]) -> None:
+        """Put a failed batch back, keeping transitions recorded since"""
+        for job_id, failed in batch.items():
+            newer = self._pending.get(job_id)
+            if newer is None:
+                self._pending[job_id] = failed
+            elif not newer.insert:
+                self._pending[job_id] = _PendingWrite(
+                    {**failed.values, **newer.values}, failed.insert
+                )
+
+    def _schedule_retry(self) -> float:
+        self._failed_writes += 1
+        delay = min(
+            self.max_retry_delay, self.retry_delay * 2.0 ** (self._failed_writes - 1)
+        )
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._start_write)
+        return delay
+
+    def _start_write(self) -> None:
+        self._timer = None
+        write = asyncio.create_task(self._write_pending())
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def _write_pending(self) -> None:
+        # Writes are serialised so transitions always land in order
+        async with self._write_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                async with self.async_session_maker() as db:
+                    rows = [
+                        {"job_id": job_id, **pending.values}
+                        for job_id, pending in batch.items()
+                        if pending.insert
+                    ]
+                    if rows:
+                        statement = sqlite_insert(JobQueueEntry)
+                        await db.execute(
+                            statement.on_conflict_do_update(
+                                index_elements=[JobQueueEntry.job_id],
+                                set_={
+                                    column: statement.excluded[column]
+                                    for column in rows[0]
+                                    if column != "job_id"
+                                },
+                            ),
+                            rows,
+                        )
+                    for job_id, pending in batch.items():
+                        if not pending.insert:
+                            await db.execute(
+                                update(JobQueueEntry)
+                                .where(JobQueueEntry.job_id == job_id)
+                                .values(**pending.values)
+                            )
+                    await db.commit()
+            except Exception as e:
+                self._requeue(batch)
+                delay = self._schedule_retry()
+                logger.error(
+                    f"Failed to write queue state for {len(batch)} job(s), "
+                    f"retrying in {delay:g}s: {e}"
+                )
+                return
+            self._failed_writes = 0
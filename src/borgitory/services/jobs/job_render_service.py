@@ -1,9 +1,11 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import uuid
-from typing import AsyncGenerator, List, Optional
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
 from sqlalchemy.orm import joinedload
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,9 +15,20 @@ from borgitory.models.database import Job
 from borgitory.models.job_results import JobStatusEnum
 from borgitory.protocols import JobManagerProtocol
 from borgitory.services.jobs.job_models import BorgJob
+from borgitory.services.jobs.borg_progress import progress_summary
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
 
 logger = logging.getLogger(__name__)
 
+# Number of trailing log lines rendered inline; the full log is available via copy-output
+TASK_OUTPUT_TAIL_LINES = 500
+
+# Minimum seconds between re-renders of the same job on the current jobs stream
+CURRENT_JOB_MIN_RENDER_INTERVAL = 1.0
+
+# SSE event name carrying out-of-band swaps for individual current jobs
+CURRENT_JOBS_OOB_EVENT = "current-jobs-oob"
+
 
 class JobStatusType(Enum):
     """Job status types for display"""
@@ -67,6 +80,7 @@ class TaskDisplayData:
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
     return_code: Optional[int]
+    resource_usage: Optional[ProcessResourceUsage] = None
 
 
 @dataclass
@@ -118,6 +132,7 @@ class TemplateTaskData:
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
     return_code: Optional[int]
+    resource_usage: Optional[ProcessResourceUsage] = None
 
 
 class TemplateJobStatus:
@@ -179,6 +194,7 @@ def convert_to_template_data(
             started_at=task.started_at,
             completed_at=task.completed_at,
             return_code=task.return_code,
+            resource_usage=task.resource_usage,
         )
         template_tasks.append(template_task)
 
@@ -225,12 +241,13 @@ class JobDataConverter:
                     name=task.task_name,
                     type=task.task_type,
                     status=task_status,
-                    output=task.output or "",
+                    output=task.get_output() or "",
                     error=task.error,
                     order=task.task_order,
                     started_at=task.started_at,
                     completed_at=task.completed_at,
                     return_code=task.return_code,
+                    resource_usage=task.get_resource_usage(),
                 )
                 tasks.append(task_data)
 
@@ -259,7 +276,7 @@ class JobDataConverter:
 
     @staticmethod
     def convert_memory_job(
-        memory_job: BorgJob, db_job: Optional[Job] = None
+        memory_job: BorgJob, db_job: Optional[Job] = None, include_output: bool = True
     ) -> JobDisplayData:
         """Convert in-memory job to display data"""
         status = JobStatus.from_status_string(memory_job.status)
@@ -278,7 +295,11 @@ class JobDataConverter:
 
                 # Convert output_lines to string
                 output = ""
-                if hasattr(task, "output_lines") and task.output_lines:
+                if (
+                    include_output
+                    and hasattr(task, "output_lines")
+                    and task.output_lines
+                ):
                     output = "\n".join(
                         [
                             line.get("text", "")
@@ -298,6 +319,7 @@ class JobDataConverter:
                     started_at=getattr(task, "started_at", None),
                     completed_at=getattr(task, "completed_at", None),
                     return_code=getattr(task, "return_code", None),
+                    resource_usage=getattr(task, "resource_usage", None),
                 )
                 tasks.append(task_data)
 
@@ -370,10 +392,12 @@ class JobRenderService:
         job_manager: JobManagerProtocol,
         templates: Jinja2Templates,
         converter: Optional[JobDataConverter] = None,
+        min_render_interval: float = CURRENT_JOB_MIN_RENDER_INTERVAL,
     ) -> None:
         self.job_manager = job_manager
         self.templates = templates
         self.converter = converter or JobDataConverter()
+        self.min_render_interval = min_render_interval
 
     async def get_job_display_data(
         self, job_id: uuid.UUID, db: AsyncSession
@@ -396,30 +420,25 @@ class JobRenderService:
             ]:
                 logger.info(f"Using database data for completed/failed job {job_id}")
                 job_data = self.converter.convert_database_job(db_job)
+                await self._apply_stored_output(job_data)
                 return self.converter.fix_failed_job_tasks(job_data)
 
             # 2. Try in-memory for running jobs
-            logger.debug(f"Checking job manager for job {job_id}")
-            logger.debug(
-                f"Available jobs in manager: {list(self.job_manager.jobs.keys())}"
-            )
-
-            if job_id in self.job_manager.jobs:
+            memory_job = self.job_manager.jobs.get(job_id)
+            if memory_job is not None:
                 logger.info(f"Using in-memory data for running job {job_id}")
-                memory_job = self.job_manager.jobs[job_id]
                 job_data = self.converter.convert_memory_job(memory_job, db_job)
+                await self._apply_stored_output(job_data)
                 return self.converter.fix_failed_job_tasks(job_data)
-            else:
-                logger.warning(
-                    f"Job {job_id} not found in job manager (has {len(self.job_manager.jobs)} jobs)"
-                )
 
-            # 3. Fallback to database if exists
+            # 3. Fallback to database if exists; finished jobs are evicted
+            # from the job manager once their final state is persisted
             if db_job:
                 logger.info(
                     f"Using database data as fallback for job {job_id} (status: {db_job.status})"
                 )
                 job_data = self.converter.convert_database_job(db_job)
+                await self._apply_stored_output(job_data)
                 return self.converter.fix_failed_job_tasks(job_data)
 
             logger.info(f"Job {job_id} not found")
@@ -429,6 +448,23 @@ class JobRenderService:
             logger.error(f"Error getting job display data for {job_id}: {e}")
             return None
 
+    async def _apply_stored_output(self, job_data: JobDisplayData) -> None:
+        """Replace task output with the tail of the on-disk job log when present"""
+        for task in job_data.tasks:
+            total_lines = await self.job_manager.get_task_line_count(
+                job_data.id, task.order
+            )
+            if total_lines <= 0:
+                continue
+
+            start = max(0, total_lines - TASK_OUTPUT_TAIL_LINES)
+            lines = await self.job_manager.get_task_output_lines(
+                job_data.id, task.order, start, TASK_OUTPUT_TAIL_LINES
+            )
+            if start > 0:
+                lines.insert(0, f"... {start} earlier lines omitted ...")
+            task.output = "\n".join(lines)
+
     async def render_jobs_html(
         self,
         db: AsyncSession,
@@ -455,6 +491,7 @@ class JobRenderService:
 
             for db_job in db_jobs:
                 job_data = self.converter.convert_database_job(db_job)
+                await self._apply_stored_output(job_data)
                 job_data = self.converter.fix_failed_job_tasks(job_data)
                 should_expand = bool(expand and job_data.id == expand)
                 html_content += self._render_job_html(
@@ -475,33 +512,8 @@ class JobRenderService:
     def render_current_jobs_html(self, browser_tz_offset: Optional[int] = None) -> str:
         """Render current running jobs as HTML"""
         try:
-            current_jobs_data = []
-
-            # Get current running jobs from job manager
-            for job_id, memory_job in self.job_manager.jobs.items():
-                if memory_job.status == "running":
-                    job_data = self.converter.convert_memory_job(memory_job)
-                    current_jobs_data.append(
-                        {
-                            "id": job_data.id,
-                            "type": job_data.title.split(" - ")[
-                                0
-                            ],  # Extract job type from title
-                            "status": job_data.status.type.value,
-                            "started_at": job_data.started_at,  # Pass raw datetime for timezone conversion in template
-                            "progress_info": job_data.progress.current_task_name
-                            or f"{job_data.progress.display_text}",
-                        }
-                    )
-
-            # Render using template
-            return self.templates.get_template(
-                "partials/jobs/current_jobs_list.html"
-            ).render(
-                current_jobs=current_jobs_data,
-                message="No operations currently running.",
-                padding="4",
-                browser_tz_offset=browser_tz_offset,
+            return self._render_current_jobs_list(
+                list(self.get_current_job_entries().values()), browser_tz_offset
             )
 
         except Exception as e:
@@ -510,6 +522,60 @@ class JobRenderService:
                 message=f"Error loading current operations: {str(e)}", padding="4"
             )
 
+    def get_current_job_entries(self) -> Dict[uuid.UUID, Dict[str, object]]:
+        """Summaries of running jobs for the current jobs list, keyed by job id"""
+        entries: Dict[uuid.UUID, Dict[str, object]] = {}
+        for memory_job in list(self.job_manager.jobs.values()):
+            if memory_job.status != "running":
+                continue
+            # Output is not shown in the current jobs list, so skip joining it
+            job_data = self.converter.convert_memory_job(
+                memory_job, include_output=False
+            )
+            progress_info = (
+                job_data.progress.current_task_name
+                or f"{job_data.progress.display_text}"
+            )
+            current_task = memory_job.get_current_task()
+            if current_task is not None and isinstance(current_task.progress, dict):
+                summary = progress_summary(current_task.progress)
+                if summary:
+                    progress_info = f"{progress_info} ({summary})"
+            entries[job_data.id] = {
+                "id": job_data.id,
+                "type": job_data.title.split(" - ")[0],  # Extract job type from title
+                "status": job_data.status.type.value,
+                "started_at": job_data.started_at,  # Pass raw datetime for timezone conversion in template
+                "progress_info": progress_info,
+            }
+        return entries
+
+    def _render_current_jobs_list(
+        self,
+        current_jobs: List[Dict[str, object]],
+        browser_tz_offset: Optional[int] = None,
+    ) -> str:
+        return self.templates.get_template(
+            "partials/jobs/current_jobs_list.html"
+        ).render(
+            current_jobs=current_jobs,
+            message="No operations currently running.",
+            padding="4",
+            browser_tz_offset=browser_tz_offset,
+        )
+
+    def render_current_job_fragment(
+        self,
+        entry: Dict[str, object],
+        browser_tz_offset: Optional[int] = None,
+        oob: bool = True,
+    ) -> str:
+        """Render a single current job, by default as an out-of-band swap
+        fragment; without ``oob`` it can be placed inside another swap"""
+        return self.templates.get_template(
+            "partials/jobs/current_job_item.html"
+        ).render(job=entry, oob=oob, browser_tz_offset=browser_tz_offset)
+
     def _render_job_html(
         self,
         job_data: JobDisplayData,
@@ -529,40 +595,60 @@ class JobRenderService:
             return f'<div class="error">Error rendering job {job_data.id}</div>'
 
     async def stream_current_jobs_html(self) -> AsyncGenerator[str, None]:
-        """Stream current jobs as HTML via Server-Sent Events"""
+        """Stream current jobs as HTML via Server-Sent Events
+
+        The full list is sent once; afterwards only jobs whose display state
+        changed are re-rendered and sent as out-of-band swaps, at most once
+        per ``min_render_interval`` seconds per job.
+        """
+        renderer = CurrentJobsFragmentRenderer(self, self.min_render_interval)
+        next_event: Optional["asyncio.Future[object]"] = None
         try:
             # Send initial HTML
-            initial_html = self.render_current_jobs_html()
-            for line in initial_html.splitlines():
-                yield f"data: {line}\n"
-            yield "data: \n\n"
+            for chunk in _format_sse(renderer.render_full()):
+                yield chunk
 
             # Subscribe to job events for real-time updates
-            async for event in self.job_manager.stream_all_job_updates():
+            updates = self.job_manager.stream_all_job_updates().__aiter__()
+            while True:
+                if next_event is None:
+                    next_event = asyncio.ensure_future(updates.__anext__())
+                # Wake up for deferred renders without cancelling the event stream
+                done, _ = await asyncio.wait(
+                    {next_event}, timeout=renderer.seconds_until_due()
+                )
+                if next_event in done:
+                    try:
+                        event = next_event.result()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        next_event = None
+                    renderer.mark_dirty(event)
+
                 try:
-                    # Re-render current jobs HTML when events occur
-                    updated_html = self.render_current_jobs_html()
-                    for line in updated_html.splitlines():
-                        yield f"data: {line}\n"
-                    yield "data: \n\n"
+                    for event_name, html in renderer.collect_updates():
+                        for chunk in _format_sse(html, event_name):
+                            yield chunk
                 except Exception as e:
                     logger.error(f"Error generating HTML update: {e}")
                     # Send error state
                     error_html = self.templates.get_template(
                         "partials/jobs/error_state.html"
                     ).render(message="Error updating job status", padding="4")
-                    for line in error_html.splitlines():
-                        yield f"data: {line}\n"
-                    yield "data: \n\n"
+                    for chunk in _format_sse(error_html):
+                        yield chunk
 
         except Exception as e:
             logger.error(f"Error in HTML job stream: {e}")
             error_html = self.templates.get_template(
                 "partials/jobs/error_state.html"
             ).render(message=f"Error streaming jobs: {str(e)}", padding="4")
-            for line in error_html.splitlines():
-                yield f"data: {line}\n"
-            yield "data: \n\n"
+            for chunk in _format_sse(error_html):
+                yield chunk
+        finally:
+            if next_event is not None and not next_event.done():
+                next_event.cancel()
 
     async def get_job_for_template(
         self, job_id: uuid.UUID, db: AsyncSession, expand_details: bool = False
@@ -572,3 +658,147 @@ class JobRenderService:
         if not job_data:
             return None
         return convert_to_template_data(job_data, expand_details)
+
+
+def _format_sse(html: str, event_name: Optional[str] = None) -> List[str]:
+    """Split multi-line HTML into SSE data lines terminated by a blank data line"""
+    chunks = [f"event: {event_name}\n"] if event_name else []
+    chunks.extend(f"data: {line}\n" for line in html.splitlines())
+    chunks.append("data: \n\n")
+    return chunks
+
+
+JobDisplayState = Tuple[object, ...]
+
+
+@dataclass
+class CurrentJobsFragmentRenderer:
+    """Per-connection diffing renderer for the current jobs SSE stream
+
+    Remembers the display state last sent for each running job so that job
+    events only cause a re-render when something visible changed, and
+    throttles re-renders of a busy job to one per ``min_render_interval``.
+    """
+
+    render_service: JobRenderService
+    min_render_interval: float = CURRENT_JOB_MIN_RENDER_INTERVAL
+    _states: Dict[uuid.UUID, JobDisplayState] = field(default_factory=dict)
+    _rendered_at: Dict[uuid.UUID, float] = field(default_factory=dict)
+    _dirty: Set[uuid.UUID] = field(default_factory=set)
+
+    @staticmethod
+    def _display_state(entry: Dict[str, object]) -> JobDisplayState:
+        return (
+            entry["type"],
+            entry["status"],
+            entry["started_at"],
+            entry["progress_info"],
+        )
+
+    def render_full(self) -> str:
+        """Render the whole list and remember every job's displayed state"""
+        try:
+            entries = self.render_service.get_current_job_entries()
+        except Exception as e:
+            logger.error(f"Error loading current operations: {e}")
+            entries = {}
+        now = time.monotonic()
+        self._states = {
+            job_id: self._display_state(entry) for job_id, entry in entries.items()
+        }
+        self._rendered_at = {job_id: now for job_id in entries}
+        self._dirty.clear()
+        return self.render_service.render_current_jobs_html()
+
+    def mark_dirty(self, event: object) -> None:
+        """Record that a job may need re-rendering after an event"""
+        getter = getattr(event, "get", None)
+        job_id = getter("job_id") if callable(getter) else None
+        if isinstance(job_id, uuid.UUID):
+            self._dirty.add(job_id)
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the next throttled job may be re-rendered (None if idle)"""
+        pending = [job_id for job_id in self._dirty if job_id in self._states]
+        if not pending:
+            return None
+        now = time.monotonic()
+        return max(
+            0.0,
+            min(
+                self._rendered_at.get(job_id, 0.0) + self.min_render_interval - now
+                for job_id in pending
+            ),
+        )
+
+    def collect_updates(self) -> List[Tuple[Optional[str], str]]:
+        """Build the SSE messages needed to bring the client up to date
+
+        Returns ``(event_name, html)`` pairs; ``None`` as event name replaces
+        the whole list, ``CURRENT_JOBS_OOB_EVENT`` carries per-job swaps.
+        Jobs are only looked up once a dirty job is due, so a burst of
+        events is rendered from one snapshot of the current jobs.
+        """
+        now = time.monotonic()
+        due = [job_id for job_id in self._dirty if self._is_due(job_id, now)]
+        if not due:
+            return []  # Throttled jobs are picked up once the interval has passed
+
+        entries = self.render_service.get_current_job_entries()
+        added = [job_id for job_id in entries if job_id not in self._states]
+        removed = [job_id for job_id in self._states if job_id not in entries]
+
+        # The list container only exists while jobs are running, so switching
+        # between the empty state and a populated list needs a full render
+        if (added or removed) and (not entries or not self._states):
+            return [(None, self.render_full())]
+
+        fragments: List[str] = []
+        for job_id in removed:
+            fragments.append(
+                f'<div id="current-job-{job_id}" hx-swap-oob="delete"></div>'
+            )
+            self._forget(job_id)
+
+        for job_id in added:
+            entry = entries[job_id]
+            # HTMX also swaps OOB elements nested in an OOB swap, so the
+            # appended item must not be marked as one itself
+            fragment = self.render_service.render_current_job_fragment(entry, oob=False)
+            fragments.append(
+                f'<div hx-swap-oob="beforeend:#current-jobs-list">{fragment}</div>'
+            )
+            self._remember(job_id, entry, now)
+
+        for job_id in due:
+            self._dirty.discard(job_id)
+            dirty_entry = entries.get(job_id)
+            if dirty_entry is None or job_id not in self._states:
+                continue
+            if self._display_state(dirty_entry) == self._states[job_id]:
+                continue
+            fragments.append(
+                self.render_service.render_current_job_fragment(dirty_entry)
+            )
+            self._remember(job_id, dirty_entry, now)
+
+        if not fragments:
+            return []
+        return [(CURRENT_JOBS_OOB_EVENT, "\n".join(fragments))]
+
+    def _is_due(self, job_id: uuid.UUID, now: float) -> bool:
+        """Whether a dirty job may be re-rendered; unseen jobs always are"""
+        rendered_at = self._rendered_at.get(job_id)
+        return rendered_at is None or now - rendered_at >= self.min_render_interval
+
+    def _remember(
+        self, job_id: uuid.UUID, entry: Dict[str, object], rendered_at: float
+    ) -> None:
+        self._states[job_id] = self._display_state(entry)
+        self._rendered_at[job_id] = rendered_at
+        self._dirty.discard(job_id)
+
+    def _forget(self, job_id: uuid.UUID) -> None:
+        self._states.pop(job_id, None)
+        self._rendered_at.pop(job_id, None)
+        self._dirty.discard(job_id)
@@ -7,7 +7,7 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from borgitory.models.database import Repository, Job
+from borgitory.models.database import Repository, Job, JobTask
 from borgitory.models.schemas import BackupRequest, PruneRequest, CheckRequest
 from borgitory.models.enums import JobType
 from borgitory.models.job_results import (
@@ -19,6 +19,7 @@ from borgitory.models.job_results import (
     CompositeJobOutput,
     RegularJobOutput,
     JobOutputResponse,
+    TaskOutputRange,
     ManagerStats,
     QueueStats,
     JobStopResult,
@@ -28,7 +29,13 @@ from borgitory.models.job_results import (
     JobTypeEnum,
 )
 from borgitory.protocols.job_protocols import JobManagerProtocol
+from borgitory.services.jobs.job_models import BorgJobTask
+from borgitory.services.scheduling.fan_out_config import (
+    FanOutConfigParser,
+    FanOutTarget,
+)
 from borgitory.services.task_definition_builder import TaskDefinitionBuilder
+from borgitory.utils.text_compression import decompress_text
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +138,11 @@ class JobService:
             "patterns": patterns,
         }
 
+        if backup_request.fan_out_targets:
+            return await self._create_fan_out_backup_job(
+                db, backup_request, repository, backup_params, job_type
+            )
+
         task_definitions = await builder.build_task_list(
             db=db,
             repository_name=repository.name,
@@ -156,6 +168,71 @@ class JobService:
 
         return JobCreationResult(job_id=job_id, status="started")
 
+    async def _create_fan_out_backup_job(
+        self,
+        db: AsyncSession,
+        backup_request: BackupRequest,
+        repository: Repository,
+        backup_params: ConfigDict,
+        job_type: JobType,
+    ) -> JobCreationResponse:
+        """Create one job backing up the source to several repositories"""
+        try:
+            configured = FanOutConfigParser.parse_targets_json(
+                backup_request.fan_out_targets
+            )
+        except ValueError as e:
+            return JobCreationError(error=str(e), error_code="INVALID_FAN_OUT_TARGETS")
+
+        # The request's repository is always the first target; an entry
+        # for it only sets its options
+        options = {target.repository_id: target for target in configured}
+        targets = [options.pop(repository.id, FanOutTarget(repository.id))]
+        targets.extend(options.values())
+
+        result = await db.execute(
+            select(Repository).where(
+                Repository.id.in_([target.repository_id for target in targets])
+            )
+        )
+        repositories = {repo.id: repo for repo in result.scalars().all()}
+        missing = [
+            t.repository_id for t in targets if t.repository_id not in repositories
+        ]
+        if missing:
+            return JobCreationError(
+                error=f"Fan-out target repository not found: {missing[0]}",
+                error_code="REPOSITORY_NOT_FOUND",
+            )
+
+        builder = TaskDefinitionBuilder()
+        task_definitions = await builder.build_fan_out_task_list(
+            db=db,
+            targets=[
+                (repositories[target.repository_id].name, target) for target in targets
+            ],
+            backup_params=backup_params,
+            prune_config_id=backup_request.prune_config_id,
+            check_config_id=backup_request.check_config_id,
+            cloud_sync_config_id=backup_request.cloud_sync_config_id,
+            notification_config_id=backup_request.notification_config_id,
+            pre_job_hooks=backup_request.pre_job_hooks,
+            post_job_hooks=backup_request.post_job_hooks,
+        )
+
+        job_id = await self.job_manager.create_composite_job(
+            job_type=job_type,
+            task_definitions=task_definitions,
+            repository=repository,
+            schedule=None,
+            cloud_sync_config_id=backup_request.cloud_sync_config_id,
+            additional_repositories=[
+                repositories[target.repository_id] for target in targets[1:]
+            ],
+        )
+
+        return JobCreationResult(job_id=job_id, status="started")
+
     async def create_prune_job(
         self, db: AsyncSession, prune_request: PruneRequest
     ) -> JobCreationResponse:
@@ -268,7 +345,7 @@ class JobService:
                     if job.finished_at
                     else None,
                     "error": job.error,
-                    "log_output": job.log_output,
+                    "log_output": job.get_log_output(),
                     "source": "database",
                 }
             )
@@ -350,7 +427,7 @@ class JobService:
                     if job.finished_at
                     else None,
                     "error": job.error,
-                    "log_output": job.log_output,
+                    "log_output": job.get_log_output(),
                     "source": "database",
                 }
         except ValueError:
@@ -377,11 +454,9 @@ class JobService:
             if job.status == JobStatusEnum.RUNNING:
                 current_task = job.get_current_task()
                 if current_task:
-                    lines = list(current_task.output_lines)
-                    if last_n_lines:
-                        lines = lines[-last_n_lines:]
-                    # Ensure all lines are strings
-                    current_task_output = [str(line) for line in lines]
+                    current_task_output = await self._get_task_tail(
+                        job_id, job.current_task_index, current_task, last_n_lines
+                    )
 
             return CompositeJobOutput(
                 job_id=job_id,
@@ -412,6 +487,110 @@ class JobService:
                 has_more=False,  # Could be enhanced to track this
             )
 
+    async def _get_task_tail(
+        self,
+        job_id: uuid.UUID,
+        task_order: int,
+        task: BorgJobTask,
+        last_n_lines: int,
+    ) -> List[str]:
+        """Latest output lines of a running task, from the log store if present"""
+        total_lines = await self.job_manager.get_task_line_count(job_id, task_order)
+        if total_lines:
+            start = max(0, total_lines - last_n_lines) if last_n_lines else 0
+            return await self.job_manager.get_task_output_lines(
+                job_id, task_order, start, last_n_lines or None
+            )
+
+        lines = list(task.output_lines)
+        if last_n_lines:
+            lines = lines[-last_n_lines:]
+        # Ensure all lines are strings
+        return [str(line) for line in lines]
+
+    async def get_task_output(
+        self,
+        db: AsyncSession,
+        job_id: uuid.UUID,
+        task_order: int,
+        start: int = 0,
+        limit: Optional[int] = None,
+    ) -> TaskOutputRange:
+        """Get a range of output lines for a task, preferring the on-disk log store"""
+        total_lines = await self.job_manager.get_task_line_count(job_id, task_order)
+        if total_lines:
+            lines = await self.job_manager.get_task_output_lines(
+                job_id, task_order, start, limit
+            )
+            return TaskOutputRange(
+                job_id=job_id,
+                task_order=task_order,
+                start=start,
+                lines=lines,
+                total_lines=total_lines,
+            )
+
+        # Jobs recorded before the log store existed only have the joined output
+        all_lines = await self._get_fallback_task_lines(db, job_id, task_order)
+        end = len(all_lines) if limit is None else start + limit
+        return TaskOutputRange(
+            job_id=job_id,
+            task_order=task_order,
+            start=start,
+            lines=all_lines[start:end],
+            total_lines=len(all_lines),
+        )
+
+    async def get_job_output_text(self, db: AsyncSession, job_id: uuid.UUID) -> str:
+        """Get the full output of every task in a job as plain text"""
+        task_orders = await self._get_task_orders(db, job_id)
+        sections = []
+        for task_order in task_orders:
+            task_output = await self.get_task_output(db, job_id, task_order)
+            if task_output.lines:
+                sections.append("\n".join(task_output.lines))
+        return "\n\n".join(sections)
+
+    async def _get_task_orders(self, db: AsyncSession, job_id: uuid.UUID) -> List[int]:
+        """Get the task positions of a job from memory or the database"""
+        job = self.job_manager.jobs.get(job_id)
+        if job and job.tasks:
+            return list(range(len(job.tasks)))
+
+        result = await db.execute(
+            select(JobTask.task_order)
+            .where(JobTask.job_id == job_id)
+            .order_by(JobTask.task_order)
+        )
+        task_orders = list(result.scalars().all())
+        return task_orders or [0]
+
+    async def _get_fallback_task_lines(
+        self, db: AsyncSession, job_id: uuid.UUID, task_order: int
+    ) -> List[str]:
+        """Get task output from the in-memory job or the JobTask row"""
+        job = self.job_manager.jobs.get(job_id)
+        if job and 0 <= task_order < len(job.tasks):
+            return [
+                str(line.get("text", "")) if isinstance(line, dict) else str(line)
+                for line in job.tasks[task_order].output_lines
+            ]
+
+        result = await db.execute(
+            select(JobTask.output, JobTask.output_compressed).where(
+                JobTask.job_id == job_id, JobTask.task_order == task_order
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return []
+        output = (
+            row.output
+            if row.output is not None
+            else decompress_text(row.output_compressed)
+        )
+        return output.split("\n") if output else []
+
     async def cancel_job(self, job_id: uuid.UUID) -> bool:
         """Cancel a running job"""
         return await self.job_manager.cancel_job(job_id)
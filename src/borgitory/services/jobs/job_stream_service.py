@@ -1,18 +1,31 @@
 import asyncio
 import json
 import logging
-from typing import AsyncGenerator, Dict, TYPE_CHECKING, cast
+from typing import AsyncGenerator, Dict, List, TYPE_CHECKING, cast
 import uuid
 from dataclasses import dataclass
 from fastapi.responses import StreamingResponse
 
 from borgitory.protocols import JobManagerProtocol
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
 
 if TYPE_CHECKING:
     from borgitory.services.jobs.broadcaster.job_event import JobEvent
+    from borgitory.services.jobs.job_models import BorgJobTask
 
 logger = logging.getLogger(__name__)
 
+TASK_STREAM_EVENT_TYPES = frozenset(
+    {
+        EventType.JOB_OUTPUT,
+        EventType.JOB_OUTPUT_BATCH,
+        EventType.JOB_OUTPUT_SKIPPED,
+        EventType.TASK_COMPLETED,
+        EventType.TASK_FAILED,
+    }
+)
+
 
 @dataclass
 class JobData:
@@ -142,7 +155,9 @@ class JobStreamService:
 
             if job.tasks:  # All jobs are composite now
                 # Stream composite job output from unified manager
-                event_queue = self.job_manager.subscribe_to_events()
+                event_queue = self.job_manager.subscribe_to_events(
+                    job_id=job_id, overflow_policy=OverflowPolicy.COALESCE_OUTPUT
+                )
 
                 try:
                     # Send initial state
@@ -317,6 +332,22 @@ class JobStreamService:
             },
         )
 
+    async def _get_initial_task_lines(
+        self, job_id: uuid.UUID, task_order: int, task: "BorgJobTask", count: int = 100
+    ) -> List[str]:
+        """Get the latest lines of a task, preferring the on-disk job log"""
+        total_lines = await self.job_manager.get_task_line_count(job_id, task_order)
+        if total_lines > 0:
+            return await self.job_manager.get_task_output_lines(
+                job_id, task_order, max(0, total_lines - count), count
+            )
+
+        # Handle both dict format {"text": "content"} and plain string format
+        return [
+            str(line.get("text", "")) if isinstance(line, dict) else str(line)
+            for line in list(task.output_lines)[-count:]
+        ]
+
     async def _task_output_event_generator(
         self, job_id: uuid.UUID, task_order: int
     ) -> AsyncGenerator[str, None]:
@@ -354,31 +385,23 @@ class JobStreamService:
                     f"Task {task_order} is {task.status} but job {job_id} is still running - this may be normal during transitions"
                 )
 
-            # Subscribe to events for this job
-            event_queue = self.job_manager.subscribe_to_events()
+            # Subscribe only to the output and completion events of this task
+            event_queue = self.job_manager.subscribe_to_events(
+                job_id=job_id,
+                task_index=task_order,
+                event_types=TASK_STREAM_EVENT_TYPES,
+                overflow_policy=OverflowPolicy.COALESCE_OUTPUT,
+            )
 
             try:
                 # Send current task output if any (for existing lines when connection starts)
                 # Only send the latest 100 lines to avoid overwhelming the UI
-                if hasattr(task, "output_lines") and task.output_lines:
-                    # Get only the latest 100 lines
-                    latest_lines = (
-                        task.output_lines[-100:]
-                        if len(task.output_lines) > 100
-                        else task.output_lines
-                    )
-
-                    # Send each existing line as individual output events
-                    for line in latest_lines:
-                        # Handle both dict format {"text": "content"} and plain string format
-                        if isinstance(line, dict):
-                            line_text = line.get("text", "")
-                        else:
-                            line_text = str(line)
-
-                        if line_text.strip():
-                            # Send individual line as div for beforeend appending
-                            yield f"event: output\ndata: <div>{line_text}</div>\n\n"
+                for line_text in await self._get_initial_task_lines(
+                    job_id, task_order, task
+                ):
+                    if line_text.strip():
+                        # Send individual line as div for beforeend appending
+                        yield f"event: output\ndata: <div>{line_text}</div>\n\n"
 
                 # Stream live updates
                 while task.status == "running":
@@ -415,6 +438,32 @@ class JobStreamService:
                                     )
                                     yield f"event: output\ndata: <div>{output_line}</div>\n\n"
 
+                        elif (
+                            event.job_id == job_id
+                            and event.event_type.value == "job_output_batch"
+                        ):
+                            event_data = event.data or {}
+                            if event_data.get("task_index") == task_order:
+                                batch_lines = event_data.get("lines") or []
+                                batch_html = "".join(
+                                    f"<div>{line}</div>"
+                                    for line in cast(List[str], batch_lines)
+                                    if line
+                                )
+                                if batch_html:
+                                    # One SSE message per batch, appended with hx-swap="beforeend"
+                                    yield f"event: output\ndata: {batch_html}\n\n"
+
+                        elif (
+                            event.job_id == job_id
+                            and event.event_type.value == "job_output_skipped"
+                        ):
+                            event_data = event.data or {}
+                            if event_data.get("task_index") == task_order:
+                                # Output was coalesced because this client fell behind
+                                skipped = event_data.get("skipped", 0)
+                                yield f"event: output\ndata: <div>... {skipped} lines skipped ...</div>\n\n"
+
                         elif (
                             event.job_id == job_id
                             and event.event_type.value
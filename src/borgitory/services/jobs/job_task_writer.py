@@ -0,0 +1,121 @@
+"""
+Job Task Writer - Write-behind persistence of job task state
+
+The job manager schedules a save whenever a task changes state instead of
+awaiting a database round trip. Saves are coalesced per job, so only the
+latest task list is written, and every ``flush_interval`` the pending jobs
+of all running jobs are persisted together in one transaction by a single
+background writer. Jobs whose save fails are put back and retried with
+exponential backoff, up to ``max_attempts`` times: a job without a database
+row, like an ad-hoc job, is reported the same way as a database error.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from borgitory.protocols.job_database_manager_protocol import JobDatabaseManagerProtocol
+
+if TYPE_CHECKING:
+    from borgitory.services.jobs.job_models import BorgJobTask
+
+logger = logging.getLogger(__name__)
+
+
+class JobTaskWriter:
+    """Coalesces task saves and writes them in batched transactions"""
+
+    def __init__(
+        self,
+        database_manager: JobDatabaseManagerProtocol,
+        flush_interval: float = 0.5,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+        max_attempts: int = 8,
+    ) -> None:
+        self.database_manager = database_manager
+        self.flush_interval = max(0.0, flush_interval)
+        self.retry_delay = max(0.0, retry_delay)
+        self.max_retry_delay = max(self.retry_delay, max_retry_delay)
+        self.max_attempts = max(1, max_attempts)
+        self._pending: Dict[uuid.UUID, List["BorgJobTask"]] = {}
+        # Failed saves per job since its last successful one
+        self._attempts: Dict[uuid.UUID, int] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._write_lock = asyncio.Lock()
+        self._writes: "set[asyncio.Task[None]]" = set()
+
+    def schedule(self, job_id: uuid.UUID, tasks: List["BorgJobTask"]) -> None:
+        """Queue the job's tasks to be saved by the next background write"""
+        self._pending[job_id] = tasks
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._start_write)
+
+    async def flush(self) -> None:
+        """Write everything pending now and wait for in-flight writes"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._write_pending()
+        if self._writes:
+            await asyncio.gather(*list(self._writes), return_exceptions=True)
+
+    def pending_job_count(self) -> int:
+        """Number of jobs with task changes not yet written"""
+        return len(self._pending)
+
+    def _requeue(self, batch: Dict[uuid.UUID, List["BorgJobTask"]]) -> None:
+        """Put failed saves back unless a newer task list was scheduled since"""
+        retries = []
+        for job_id, tasks in batch.items():
+            attempts = self._attempts.get(job_id, 0) + 1
+            if attempts >= self.max_attempts:
+                logger.error(
+                    f"Giving up saving tasks of job {job_id} after {attempts} attempts"
+                )
+                self._attempts.pop(job_id, None)
+                continue
+            self._attempts[job_id] = attempts
+            self._pending.setdefault(job_id, tasks)
+            retries.append(attempts)
+        if not retries:
+            return
+
+        delay = min(self.max_retry_delay, self.retry_delay * 2.0 ** (min(retries) - 1))
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._start_write)
+        logger.warning(f"Retrying task batch of {len(retries)} job(s) in {delay:g}s")
+
+    def _start_write(self) -> None:
+        self._timer = None
+        write = asyncio.create_task(self._write_pending())
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def _write_pending(self) -> None:
+        # Writes are serialised so appended output always lands in order
+        async with self._write_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                results = await self.database_manager.save_job_tasks_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to write task batch for {len(batch)} job(s): {e}")
+                results = {}
+            failed = {
+                job_id: tasks
+                for job_id, tasks in batch.items()
+                if not results.get(job_id, False)
+            }
+            for job_id in batch.keys() - failed.keys():
+                self._attempts.pop(job_id, None)
+            if failed:
+                logger.warning(
+                    f"Task batch not saved for job(s): {', '.join(map(str, failed))}"
+                )
+                self._requeue(failed)
@@ -0,0 +1,104 @@
+"""
+Process Output Capture - Bounded-memory buffer for subprocess output
+
+Output is appended to a spooled temporary file that stays in memory while it
+is small and rolls over to disk once it grows past ``max_memory``. A bounded
+tail of the most recent bytes is kept in a ``bytearray`` so error summaries
+never need to touch the spool, and the full output can be streamed back line
+by line without materialising it.
+"""
+
+import tempfile
+from typing import Iterator, List
+
+# Recent output kept in memory for error summaries
+DEFAULT_TAIL_BYTES = 64 * 1024
+
+# Output size after which the spool rolls over to a temporary file on disk
+DEFAULT_SPOOL_MAX_MEMORY = 1024 * 1024
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ProcessOutputCapture:
+    """Append-only capture of process output with a bounded in-memory tail"""
+
+    def __init__(
+        self,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_memory: int = DEFAULT_SPOOL_MAX_MEMORY,
+    ) -> None:
+        self.tail_bytes = tail_bytes
+        self.max_memory = max_memory
+        self.total_bytes = 0
+        self._tail = bytearray()
+        self._spool = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b")
+        self._closed = False
+
+    @property
+    def spooled(self) -> bool:
+        """Whether the output has outgrown memory and lives in a temporary file"""
+        return self.total_bytes > self.max_memory
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the in-memory tail no longer holds the complete output"""
+        return self.total_bytes > len(self._tail)
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk of output"""
+        if not data:
+            return
+        self._spool.write(data)
+        self.total_bytes += len(data)
+        self._tail += data
+        # Trim lazily so the tail is only compacted once per tail_bytes written
+        if len(self._tail) > 2 * self.tail_bytes:
+            del self._tail[: len(self._tail) - self.tail_bytes]
+
+    def tail(self) -> bytes:
+        """Most recent output, at most ``tail_bytes`` and starting on a line boundary"""
+        data = bytes(self._tail[-self.tail_bytes :]) if self.tail_bytes else b""
+        if self.total_bytes > len(data):
+            newline = data.find(b"\n")
+            data = data[newline + 1 :] if newline != -1 else data
+        return data
+
+    def tail_lines(self, count: int) -> List[str]:
+        """Last ``count`` non-empty lines of output"""
+        text = self.tail().decode("utf-8", errors="replace")
+        lines = [line for line in text.split("\n") if line.strip()]
+        return lines[-count:] if count > 0 else []
+
+    def iter_lines(self) -> Iterator[str]:
+        """Stream every captured line from the start without loading it all"""
+        self._spool.flush()
+        position = 0
+        pending = b""
+        while True:
+            self._spool.seek(position)
+            chunk = self._spool.read(_READ_CHUNK_SIZE)
+            self._spool.seek(0, 2)
+            if not chunk:
+                break
+            position += len(chunk)
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8", errors="replace").rstrip("\r")
+        if pending:
+            yield pending.decode("utf-8", errors="replace").rstrip("\r")
+
+    def read(self) -> bytes:
+        """Return the complete output (only for callers that need it whole)"""
+        self._spool.flush()
+        self._spool.seek(0)
+        data = self._spool.read()
+        self._spool.seek(0, 2)
+        return bytes(data)
+
+    def close(self) -> None:
+        """Release the spool and any temporary file backing it"""
+        if not self._closed:
+            self._closed = True
+            self._spool.close()
@@ -0,0 +1,199 @@
+"""
+Process Resources - Per-process resource accounting of borg subprocesses
+
+While a job's process runs it is sampled from procfs every few seconds:
+CPU user/system time from ``/proc/<pid>/stat`` (including children it has
+already reaped), peak resident memory (``VmHWM``) from
+``/proc/<pid>/status`` and storage I/O from ``/proc/<pid>/io``.
+
+The process is reaped by asyncio's child watcher rather than by us, so
+``os.wait4`` cannot be used to collect its final rusage without racing the
+watcher. Instead one last sample is taken when its output closes, right
+before it is waited for, and every counter keeps the highest value seen.
+
+Values that cannot be read (other platforms, processes already gone,
+``/proc/<pid>/io`` without permission) stay None.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_Number = TypeVar("_Number", int, float)
+
+
+@dataclass
+class ProcessResourceUsage:
+    """Resources used by a process so far; None where unavailable"""
+
+    cpu_user_seconds: Optional[float] = None
+    cpu_system_seconds: Optional[float] = None
+    max_rss_bytes: Optional[int] = None
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+
+    @property
+    def cpu_seconds(self) -> Optional[float]:
+        if self.cpu_user_seconds is None and self.cpu_system_seconds is None:
+            return None
+        return (self.cpu_user_seconds or 0.0) + (self.cpu_system_seconds or 0.0)
+
+    def merge(self, other: "ProcessResourceUsage") -> "ProcessResourceUsage":
+        """Combine two samples of the same process, keeping the highest values"""
+        return ProcessResourceUsage(
+            cpu_user_seconds=_highest(self.cpu_user_seconds, other.cpu_user_seconds),
+            cpu_system_seconds=_highest(
+                self.cpu_system_seconds, other.cpu_system_seconds
+            ),
+            max_rss_bytes=_highest(self.max_rss_bytes, other.max_rss_bytes),
+            read_bytes=_highest(self.read_bytes, other.read_bytes),
+            write_bytes=_highest(self.write_bytes, other.write_bytes),
+        )
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        return asdict(self)
+
+
+def _highest(a: Optional[_Number], b: Optional[_Number]) -> Optional[_Number]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="ascii", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _clock_ticks() -> Optional[int]:
+    try:
+        return os.sysconf("SC_CLK_TCK")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _parse_stat_cpu(
+    text: Optional[str], ticks: Optional[int]
+) -> "tuple[Optional[float], Optional[float]]":
+    """User and system seconds of a /proc/<pid>/stat line, with reaped children"""
+    if text is None or not ticks:
+        return None, None
+    # The command name may contain spaces and parentheses; fields follow the last ')'
+    fields = text[text.rfind(")") + 2 :].split()
+    try:
+        utime, stime, cutime, cstime = (int(value) for value in fields[11:15])
+    except ValueError:
+        return None, None
+    return (utime + cutime) / ticks, (stime + cstime) / ticks
+
+
+def _parse_status_hwm(text: Optional[str]) -> Optional[int]:
+    """VmHWM of /proc/<pid>/status in bytes"""
+    if text is None:
+        return None
+    for line in text.splitlines():
+        if line.startswith("VmHWM:"):
+            try:
+                return int(line.split()[1]) * 1024
+            except (IndexError, ValueError):
+                return None
+    return None
+
+
+def _parse_io(text: Optional[str]) -> "tuple[Optional[int], Optional[int]]":
+    """read_bytes and write_bytes of /proc/<pid>/io"""
+    if text is None:
+        return None, None
+    values: Dict[str, int] = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        try:
+            values[key.strip()] = int(value)
+        except ValueError:
+            continue
+    return values.get("read_bytes"), values.get("write_bytes")
+
+
+def read_process_resources(
+    pid: int, proc_root: str = "/proc"
+) -> Optional[ProcessResourceUsage]:
+    """Sample a process's resource usage from procfs, or None if unreadable"""
+    base = os.path.join(proc_root, str(pid))
+    stat = _read_text(os.path.join(base, "stat"))
+    if stat is None:
+        return None
+    user, system = _parse_stat_cpu(stat, _clock_ticks())
+    read_bytes, write_bytes = _parse_io(_read_text(os.path.join(base, "io")))
+    return ProcessResourceUsage(
+        cpu_user_seconds=user,
+        cpu_system_seconds=system,
+        max_rss_bytes=_parse_status_hwm(_read_text(os.path.join(base, "status"))),
+        read_bytes=read_bytes,
+        write_bytes=write_bytes,
+    )
+
+
+class ProcessResourceMonitor:
+    """Samples one process periodically while it runs"""
+
+    def __init__(
+        self,
+        pid: object,
+        interval: float = 5.0,
+        callback: Optional[Callable[[ProcessResourceUsage], None]] = None,
+        sampler: Callable[[int], Optional[ProcessResourceUsage]] = (
+            read_process_resources
+        ),
+    ) -> None:
+        # Test doubles and non-native executors may not expose a real PID
+        self.pid = pid if isinstance(pid, int) and pid > 0 else None
+        self.interval = interval
+        self.callback = callback
+        self._sampler = sampler
+        self.usage: Optional[ProcessResourceUsage] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        if self.pid is None or self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def sample(self) -> Optional[ProcessResourceUsage]:
+        """Take a sample now and fold it into ``usage``"""
+        if self.pid is None:
+            return self.usage
+        try:
+            sample = self._sampler(self.pid)
+        except Exception as e:
+            logger.debug(f"Sampling resources of PID {self.pid} failed: {e}")
+            sample = None
+        if sample is not None:
+            self.usage = self.usage.merge(sample) if self.usage else sample
+            if self.callback:
+                self.callback(self.usage)
+        return self.usage
+
+    async def stop(self) -> Optional[ProcessResourceUsage]:
+        """Stop sampling, taking a final sample if the process is still there"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.sample()
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
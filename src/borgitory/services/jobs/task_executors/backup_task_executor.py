@@ -4,16 +4,18 @@ Backup Task Executor - Handles backup task execution
 
 import asyncio
 import logging
-from typing import Optional, Callable, Dict
+from typing import Dict, Optional, Callable
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
 )
 from borgitory.protocols.command_protocols import ProcessExecutorProtocol
 from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProtocol
 from borgitory.protocols.job_database_manager_protocol import JobDatabaseManagerProtocol
-from borgitory.services.jobs.broadcaster.event_type import EventType
 from borgitory.utils.datetime_utils import now_utc
+from borgitory.services.jobs.borg_progress import BORG_JSON_PROGRESS_ARGS
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
 from borgitory.services.jobs.job_models import BorgJob, BorgJobTask, TaskStatusEnum
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
 from borgitory.utils.security import create_borg_command
 
 logger = logging.getLogger(__name__)
@@ -28,11 +30,15 @@ class BackupTaskExecutor:
         output_manager: JobOutputManagerProtocol,
         event_broadcaster: JobEventBroadcasterProtocol,
         database_manager: JobDatabaseManagerProtocol,
+        output_ingestor: Optional[JobOutputIngestor] = None,
     ):
         self.job_executor = job_executor
         self.output_manager = output_manager
         self.event_broadcaster = event_broadcaster
         self.database_manager = database_manager
+        self.output_ingestor = output_ingestor or JobOutputIngestor(
+            output_manager, event_broadcaster
+        )
 
     async def execute_backup_task(
         self, job: BorgJob, task: BorgJobTask, task_index: int = 0
@@ -41,13 +47,12 @@ class BackupTaskExecutor:
         try:
             params = task.parameters
 
-            if job.repository_id is None:
+            repository_id = job.task_repository_id(task)
+            if repository_id is None:
                 task.status = TaskStatusEnum.FAILED
                 task.error = "Repository ID is missing"
                 return False
-            repo_data = await self.database_manager.get_repository_data(
-                job.repository_id
-            )
+            repo_data = await self.database_manager.get_repository_data(repository_id)
             if not repo_data:
                 task.status = TaskStatusEnum.FAILED
                 task.return_code = 1
@@ -64,23 +69,14 @@ class BackupTaskExecutor:
 
             def task_output_callback(line: str) -> None:
                 task.output_lines.append(line)
-                # Provide default progress since callback now only receives line
-                progress: Dict[str, object] = {}
-                asyncio.create_task(
-                    self.output_manager.add_output_line(
-                        job.id, line, "stdout", progress
-                    )
-                )
+                self.output_ingestor.submit(job.id, task_index, line)
 
-                self.event_broadcaster.broadcast_event(
-                    EventType.JOB_OUTPUT,
-                    job_id=job.id,
-                    data={
-                        "line": line,
-                        "progress": None,  # No progress data
-                        "task_index": job.current_task_index,
-                    },
-                )
+            def task_progress_callback(progress: Dict[str, object]) -> None:
+                task.progress = progress
+                self.output_ingestor.submit_progress(job.id, task_index, progress)
+
+            def task_resource_callback(usage: ProcessResourceUsage) -> None:
+                task.resource_usage = usage
 
             # Build backup command
             source_path = params.get("source_path")
@@ -96,6 +92,7 @@ class BackupTaskExecutor:
             additional_args = []
             additional_args.extend(["--stats", "--list"])
             additional_args.extend(["--filter", "AME"])
+            additional_args.extend(BORG_JSON_PROGRESS_ARGS)
 
             patterns = params.get("patterns", [])
             if patterns and isinstance(patterns, list):
@@ -109,6 +106,11 @@ class BackupTaskExecutor:
             if dry_run:
                 additional_args.append("--dry-run")
 
+            # Per-target I/O limit of fan-out backups
+            upload_ratelimit = params.get("upload_ratelimit")
+            if upload_ratelimit:
+                additional_args.extend(["--upload-ratelimit", str(upload_ratelimit)])
+
             additional_args.append(f"{repository_path}::{archive_name}")
 
             if source_path:
@@ -116,6 +118,15 @@ class BackupTaskExecutor:
 
             logger.info(f"Final additional_args for Borg command: {additional_args}")
 
+            # Fan-out targets may be staggered so they do not all start
+            # reading the source at once
+            start_delay = params.get("start_delay")
+            if isinstance(start_delay, (int, float)) and start_delay > 0:
+                task_output_callback(
+                    f"Waiting {start_delay:g}s before starting this target"
+                )
+                await asyncio.sleep(start_delay)
+
             ignore_lock = params.get("ignore_lock", False)
             if ignore_lock:
                 logger.info(f"Running borg break-lock on repository: {repository_path}")
@@ -147,56 +158,51 @@ class BackupTaskExecutor:
 
             # Monitor the process (outside context manager since it's long-running)
             result = await self.job_executor.monitor_process_output(
-                process, output_callback=task_output_callback
+                process,
+                output_callback=task_output_callback,
+                progress_callback=task_progress_callback,
+                log_json=True,
+                bounded_output=True,
+                resource_callback=task_resource_callback,
             )
 
-            logger.info(
-                f"Backup process completed with return code: {result.return_code}"
-            )
-            if result.stdout:
-                logger.info(f"Backup process stdout length: {len(result.stdout)} bytes")
-            if result.stderr:
-                logger.info(f"Backup process stderr length: {len(result.stderr)} bytes")
-            if result.error:
-                logger.error(f"Backup process error: {result.error}")
-
-            task.return_code = result.return_code
-            task.status = (
-                TaskStatusEnum.COMPLETED
-                if result.return_code == 0
-                else TaskStatusEnum.FAILED
-            )
-            task.completed_at = now_utc()
+            try:
+                logger.info(
+                    f"Backup process completed with return code: {result.return_code}"
+                )
+                if result.output is not None:
+                    logger.info(
+                        f"Backup process stdout length: {result.output.total_bytes} bytes"
+                    )
+                if result.stderr:
+                    logger.info(
+                        f"Backup process stderr length: {len(result.stderr)} bytes"
+                    )
+                if result.error:
+                    logger.error(f"Backup process error: {result.error}")
+
+                task.return_code = result.return_code
+                task.resource_usage = result.resource_usage
+                task.status = (
+                    TaskStatusEnum.COMPLETED
+                    if result.return_code == 0
+                    else TaskStatusEnum.FAILED
+                )
+                task.completed_at = now_utc()
 
-            if result.stdout:
-                full_output = result.stdout.decode("utf-8", errors="replace").strip()
-                if full_output and result.return_code != 0:
-                    for line in full_output.split("\n"):
-                        if line.strip():
-                            task.output_lines.append(line)
-                            asyncio.create_task(
-                                self.output_manager.add_output_line(
-                                    job.id, line, "stdout", {}
-                                )
-                            )
-
-            if result.error:
-                task.error = result.error
-            elif result.return_code != 0:
-                if result.stdout:
-                    output_text = result.stdout.decode(
-                        "utf-8", errors="replace"
-                    ).strip()
+                if result.error:
+                    task.error = result.error
+                elif result.return_code != 0:
                     # Get the last few lines which likely contain the error
-                    error_lines = output_text.split("\n")[-5:] if output_text else []
+                    error_lines = result.stdout_tail_lines(5)
                     stderr_text = (
                         "\n".join(error_lines) if error_lines else "No output captured"
                     )
-                else:
-                    stderr_text = "No output captured"
-                task.error = f"Backup failed with return code {result.return_code}: {stderr_text}"
+                    task.error = f"Backup failed with return code {result.return_code}: {stderr_text}"
 
-            return bool(result.return_code == 0)
+                return bool(result.return_code == 0)
+            finally:
+                result.close()
 
         except Exception as e:
             logger.error(f"Exception in backup task execution: {str(e)}")
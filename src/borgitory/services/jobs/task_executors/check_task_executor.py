@@ -2,9 +2,8 @@
 Check Task Executor - Handles repository check task execution
 """
 
-import asyncio
 import logging
-from typing import Dict
+from typing import Dict, Optional
 from borgitory.protocols.command_protocols import ProcessExecutorProtocol
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
@@ -13,7 +12,10 @@ from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProt
 from borgitory.protocols.job_database_manager_protocol import JobDatabaseManagerProtocol
 from borgitory.utils.datetime_utils import now_utc
 from borgitory.utils.security import create_borg_command
+from borgitory.services.jobs.borg_progress import BORG_JSON_PROGRESS_ARGS
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
 from borgitory.services.jobs.job_models import BorgJob, BorgJobTask, TaskStatusEnum
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +29,15 @@ class CheckTaskExecutor:
         output_manager: JobOutputManagerProtocol,
         event_broadcaster: JobEventBroadcasterProtocol,
         database_manager: JobDatabaseManagerProtocol,
+        output_ingestor: Optional[JobOutputIngestor] = None,
     ):
         self.job_executor = job_executor
         self.output_manager = output_manager
         self.event_broadcaster = event_broadcaster
         self.database_manager = database_manager
+        self.output_ingestor = output_ingestor or JobOutputIngestor(
+            output_manager, event_broadcaster
+        )
 
     async def execute_check_task(
         self, job: BorgJob, task: BorgJobTask, task_index: int = 0
@@ -40,13 +46,12 @@ class CheckTaskExecutor:
         try:
             params = task.parameters
 
-            if job.repository_id is None:
+            repository_id = job.task_repository_id(task)
+            if repository_id is None:
                 task.status = TaskStatusEnum.FAILED
                 task.error = "Repository ID is missing"
                 return False
-            repo_data = await self.database_manager.get_repository_data(
-                job.repository_id
-            )
+            repo_data = await self.database_manager.get_repository_data(repository_id)
             if not repo_data:
                 task.status = TaskStatusEnum.FAILED
                 task.return_code = 1
@@ -64,15 +69,16 @@ class CheckTaskExecutor:
 
             def task_output_callback(line: str) -> None:
                 task.output_lines.append(line)
-                # Provide default progress since callback now only receives line
-                progress: Dict[str, object] = {}
-                asyncio.create_task(
-                    self.output_manager.add_output_line(
-                        job.id, line, "stdout", progress
-                    )
-                )
+                self.output_ingestor.submit(job.id, task_index, line)
+
+            def task_progress_callback(progress: Dict[str, object]) -> None:
+                task.progress = progress
+                self.output_ingestor.submit_progress(job.id, task_index, progress)
+
+            def task_resource_callback(usage: ProcessResourceUsage) -> None:
+                task.resource_usage = usage
 
-            additional_args = []
+            additional_args = list(BORG_JSON_PROGRESS_ARGS)
 
             if params.get("repository_only", False):
                 additional_args.append("--repository-only")
@@ -97,47 +103,36 @@ class CheckTaskExecutor:
             )
 
             result = await self.job_executor.monitor_process_output(
-                process, output_callback=task_output_callback
+                process,
+                output_callback=task_output_callback,
+                progress_callback=task_progress_callback,
+                log_json=True,
+                bounded_output=True,
+                resource_callback=task_resource_callback,
             )
 
-            task.return_code = result.return_code
-            task.status = (
-                TaskStatusEnum.COMPLETED
-                if result.return_code == 0
-                else TaskStatusEnum.FAILED
-            )
-            task.completed_at = now_utc()
+            try:
+                task.return_code = result.return_code
+                task.resource_usage = result.resource_usage
+                task.status = (
+                    TaskStatusEnum.COMPLETED
+                    if result.return_code == 0
+                    else TaskStatusEnum.FAILED
+                )
+                task.completed_at = now_utc()
 
-            if result.stdout:
-                full_output = result.stdout.decode("utf-8", errors="replace").strip()
-                if full_output:
-                    for line in full_output.split("\n"):
-                        if line.strip():
-                            task.output_lines.append(line)
-                            asyncio.create_task(
-                                self.output_manager.add_output_line(
-                                    job.id, line, "stdout", {}
-                                )
-                            )
-
-            if result.error:
-                task.error = result.error
-            elif result.return_code != 0:
-                if result.stdout:
-                    output_text = result.stdout.decode(
-                        "utf-8", errors="replace"
-                    ).strip()
-                    error_lines = output_text.split("\n")[-5:] if output_text else []
+                if result.error:
+                    task.error = result.error
+                elif result.return_code != 0:
+                    error_lines = result.stdout_tail_lines(5)
                     stderr_text = (
                         "\n".join(error_lines) if error_lines else "No output captured"
                     )
-                else:
-                    stderr_text = "No output captured"
-                task.error = (
-                    f"Check failed with return code {result.return_code}: {stderr_text}"
-                )
+                    task.error = f"Check failed with return code {result.return_code}: {stderr_text}"
 
-            return bool(result.return_code == 0)
+                return bool(result.return_code == 0)
+            finally:
+                result.close()
 
         except Exception as e:
             logger.error(f"Error executing check task for job {job.id}: {str(e)}")
@@ -2,12 +2,11 @@
 Cloud Sync Task Executor - Handles cloud sync task execution
 """
 
-import asyncio
 import logging
-from typing import Dict
+from typing import Optional
 from borgitory.services.cloud_providers.cloud_sync_service import CloudSyncService
-from borgitory.services.jobs.broadcaster.event_type import EventType
 from borgitory.utils.datetime_utils import now_utc
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
 from borgitory.services.jobs.job_models import BorgJob, BorgJobTask, TaskStatusEnum
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
@@ -31,6 +30,7 @@ class CloudSyncTaskExecutor:
         session_maker: async_sessionmaker[AsyncSession],
         cloud_sync_service: CloudSyncService,
         database_manager: JobDatabaseManagerProtocol,
+        output_ingestor: Optional[JobOutputIngestor] = None,
     ):
         self.session_maker = session_maker
         self.cloud_sync_service = cloud_sync_service
@@ -38,6 +38,9 @@ class CloudSyncTaskExecutor:
         self.output_manager = output_manager
         self.event_broadcaster = event_broadcaster
         self.database_manager = database_manager
+        self.output_ingestor = output_ingestor or JobOutputIngestor(
+            output_manager, event_broadcaster
+        )
 
     async def execute_cloud_sync_task(
         self, job: BorgJob, task: BorgJobTask, task_index: int = 0
@@ -45,11 +48,12 @@ class CloudSyncTaskExecutor:
         """Execute a cloud sync task using JobExecutor"""
         params = task.parameters
 
-        if job.repository_id is None:
+        repository_id = job.task_repository_id(task)
+        if repository_id is None:
             task.status = TaskStatusEnum.FAILED
             task.error = "Repository ID is missing"
             return False
-        repo_data = await self.database_manager.get_repository_data(job.repository_id)
+        repo_data = await self.database_manager.get_repository_data(repository_id)
         if not repo_data:
             task.status = TaskStatusEnum.FAILED
             task.return_code = 1
@@ -77,21 +81,7 @@ class CloudSyncTaskExecutor:
 
         def task_output_callback(line: str) -> None:
             task.output_lines.append(line)
-            # Provide default progress since callback now only receives line
-            progress: Dict[str, object] = {}
-            asyncio.create_task(
-                self.output_manager.add_output_line(job.id, line, "stdout", progress)
-            )
-
-            self.event_broadcaster.broadcast_event(
-                EventType.JOB_OUTPUT,
-                job_id=job.id,
-                data={
-                    "line": line,
-                    "progress": None,  # No progress data
-                    "task_index": task_index,
-                },
-            )
+            self.output_ingestor.submit(job.id, task_index, line)
 
         # Get cloud sync config ID, defaulting to None if not configured
         cloud_sync_config_id_raw = params.get("cloud_sync_config_id")
@@ -108,12 +98,7 @@ class CloudSyncTaskExecutor:
             task.return_code = 0
             task.completed_at = now_utc()
             # Add output line for UI feedback
-            task.output_lines.append("Cloud sync skipped - no configuration")
-            asyncio.create_task(
-                self.output_manager.add_output_line(
-                    job.id, "Cloud sync skipped - no configuration", "stdout", {}
-                )
-            )
+            task_output_callback("Cloud sync skipped - no configuration")
             return True
 
         result = await self.job_executor.execute_cloud_sync_task(
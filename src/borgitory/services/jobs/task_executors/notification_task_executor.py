@@ -104,13 +104,31 @@ class NotificationTaskExecutor:
                     enabled=config.enabled,
                 )
 
+                # A fan-out backup reports on all of its target repositories
+                repository_ids = list(
+                    dict.fromkeys(
+                        [job.repository_id]
+                        + [
+                            job.task_repository_id(t)
+                            for t in job.tasks
+                            if t.task_type == "backup"
+                        ]
+                    )
+                )
                 result = await db.execute(
-                    select(Repository).where(Repository.id == job.repository_id)
+                    select(Repository).where(Repository.id.in_(repository_ids))
                 )
-                repository = result.scalar_one_or_none()
-
-                if repository:
-                    repository_name = repository.name
+                names = {
+                    repository.id: repository.name
+                    for repository in result.scalars().all()
+                }
+
+                if names:
+                    repository_name = ", ".join(
+                        names[repository_id]
+                        for repository_id in repository_ids
+                        if repository_id in names
+                    )
                 else:
                     repository_name = "Unknown"
 
@@ -226,6 +244,22 @@ class NotificationTaskExecutor:
         Returns:
             Tuple of (title, message, type, priority_value)
         """
+        title, message, notification_type, priority = self._summarize_job(
+            job, repository_name
+        )
+
+        # Outcome of each target of a fan-out backup
+        backup_tasks = [t for t in job.tasks if t.task_type == "backup"]
+        if len(backup_tasks) > 1:
+            message += "\n\nTargets:\n" + "\n".join(
+                f"{t.task_name}: {TaskStatusEnum(t.status).value}" for t in backup_tasks
+            )
+        return title, message, notification_type, priority
+
+    def _summarize_job(
+        self, job: BorgJob, repository_name: str
+    ) -> Tuple[str, str, str, int]:
+        """Notification content for the overall outcome of a job"""
         failed_tasks = [t for t in job.tasks if t.status == TaskStatusEnum.FAILED]
         completed_tasks = [t for t in job.tasks if t.status == TaskStatusEnum.COMPLETED]
         skipped_tasks = [t for t in job.tasks if t.status == TaskStatusEnum.SKIPPED]
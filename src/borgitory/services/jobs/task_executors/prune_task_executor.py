@@ -2,9 +2,8 @@
 Prune Task Executor - Handles prune task execution
 """
 
-import asyncio
 import logging
-from typing import Dict
+from typing import Optional
 from borgitory.protocols.command_protocols import ProcessExecutorProtocol
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
@@ -12,6 +11,7 @@ from borgitory.protocols.job_event_broadcaster_protocol import (
 from borgitory.protocols.job_output_manager_protocol import JobOutputManagerProtocol
 from borgitory.protocols.job_database_manager_protocol import JobDatabaseManagerProtocol
 from borgitory.utils.datetime_utils import now_utc
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
 from borgitory.services.jobs.job_models import BorgJob, BorgJobTask, TaskStatusEnum
 
 logger = logging.getLogger(__name__)
@@ -26,11 +26,15 @@ class PruneTaskExecutor:
         output_manager: JobOutputManagerProtocol,
         event_broadcaster: JobEventBroadcasterProtocol,
         database_manager: JobDatabaseManagerProtocol,
+        output_ingestor: Optional[JobOutputIngestor] = None,
     ):
         self.job_executor = job_executor
         self.output_manager = output_manager
         self.event_broadcaster = event_broadcaster
         self.database_manager = database_manager
+        self.output_ingestor = output_ingestor or JobOutputIngestor(
+            output_manager, event_broadcaster
+        )
 
     async def execute_prune_task(
         self, job: BorgJob, task: BorgJobTask, task_index: int = 0
@@ -39,13 +43,12 @@ class PruneTaskExecutor:
         try:
             params = task.parameters
 
-            if job.repository_id is None:
+            repository_id = job.task_repository_id(task)
+            if repository_id is None:
                 task.status = TaskStatusEnum.FAILED
                 task.error = "Repository ID is missing"
                 return False
-            repo_data = await self.database_manager.get_repository_data(
-                job.repository_id
-            )
+            repo_data = await self.database_manager.get_repository_data(repository_id)
             if not repo_data:
                 task.status = TaskStatusEnum.FAILED
                 task.return_code = 1
@@ -60,13 +63,7 @@ class PruneTaskExecutor:
 
             def task_output_callback(line: str) -> None:
                 task.output_lines.append(line)
-                # Provide default progress since callback now only receives line
-                progress: Dict[str, object] = {}
-                asyncio.create_task(
-                    self.output_manager.add_output_line(
-                        job.id, line, "stdout", progress
-                    )
-                )
+                self.output_ingestor.submit(job.id, task_index, line)
 
             result = await self.job_executor.execute_prune_task(
                 repository_path=str(repository_path or ""),
@@ -105,6 +102,7 @@ class PruneTaskExecutor:
 
             # Set task status based on result
             task.return_code = result.return_code
+            task.resource_usage = result.resource_usage
             task.status = (
                 TaskStatusEnum.COMPLETED
                 if result.return_code == 0
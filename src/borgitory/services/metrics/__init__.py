@@ -0,0 +1,3 @@
+"""
+Prometheus compatible metrics for monitoring and capacity planning.
+"""
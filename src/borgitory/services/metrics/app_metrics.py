@@ -0,0 +1,207 @@
+"""
+Application metrics exposed on ``/metrics``
+
+Metrics are module level so instrumented code can update them without
+dependency injection. Values that are cheaper to read than to track
+(SSE clients, queue sizes, running subprocesses) are gauges refreshed when
+the endpoint is scraped.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from borgitory.services.metrics.registry import MetricsRegistry
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from borgitory.services.jobs.broadcaster.job_event_broadcaster import (
+        JobEventBroadcaster,
+    )
+    from borgitory.services.jobs.job_queue_manager import JobQueueManager
+
+REGISTRY = MetricsRegistry()
+
+# Seconds; borg tasks run from seconds to many hours
+JOB_DURATION_BUCKETS = (
+    1.0,
+    5.0,
+    15.0,
+    30.0,
+    60.0,
+    300.0,
+    900.0,
+    1800.0,
+    3600.0,
+    7200.0,
+    14400.0,
+    43200.0,
+)
+QUEUE_WAIT_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+EVENT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+TASK_DURATION = REGISTRY.histogram(
+    "borgitory_task_duration_seconds",
+    "Duration of finished job tasks",
+    ["task_type", "status"],
+    buckets=JOB_DURATION_BUCKETS,
+)
+JOBS_FINISHED = REGISTRY.counter(
+    "borgitory_jobs_finished_total",
+    "Composite jobs that finished, by final status",
+    ["status"],
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "borgitory_queue_wait_seconds",
+    "Time jobs waited in the queue before starting",
+    ["job_type"],
+    buckets=QUEUE_WAIT_BUCKETS,
+)
+QUEUE_JOBS = REGISTRY.gauge(
+    "borgitory_queue_jobs",
+    "Jobs in the job queue, by state",
+    ["state"],
+)
+OUTPUT_LINES_INGESTED = REGISTRY.counter(
+    "borgitory_output_lines_ingested_total",
+    "Task output lines accepted by the output ingestor",
+)
+SSE_CLIENTS = REGISTRY.gauge(
+    "borgitory_sse_clients",
+    "Connected event stream clients",
+)
+SSE_QUEUED_EVENTS = REGISTRY.gauge(
+    "borgitory_sse_queued_events",
+    "Events waiting in event stream client queues",
+)
+SSE_QUEUE_DEPTH_MAX = REGISTRY.gauge(
+    "borgitory_sse_queue_depth_max",
+    "Deepest event stream client queue",
+)
+SUBPROCESSES_STARTED = REGISTRY.counter(
+    "borgitory_subprocesses_started_total",
+    "Subprocesses started, by program and borg command",
+    ["program", "command"],
+)
+SUBPROCESSES_RUNNING = REGISTRY.gauge(
+    "borgitory_subprocesses_running",
+    "Subprocesses that have not exited yet, by program",
+    ["program"],
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "borgitory_cache_requests_total",
+    "Cache lookups, by cache and result (hit, miss or expired)",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "borgitory_cache_evictions_total",
+    "Entries removed from a cache, by cache and reason (size or expired)",
+    ["cache", "reason"],
+)
+CACHE_RESIDENT_BYTES = REGISTRY.gauge(
+    "borgitory_cache_resident_bytes",
+    "Estimated memory held by a cache",
+    ["cache"],
+)
+DB_TRANSACTION_DURATION = REGISTRY.histogram(
+    "borgitory_db_transaction_seconds",
+    "Database transaction latency from begin to commit or rollback",
+    ["outcome"],
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "borgitory_event_loop_lag_seconds",
+    "How late the event loop ran a timer callback",
+    buckets=EVENT_LOOP_LAG_BUCKETS,
+)
+
+# Started processes, to count the running ones on scrape
+_subprocesses: "weakref.WeakKeyDictionary[asyncio.subprocess.Process, str]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _command_labels(command: List[str]) -> tuple[str, str]:
+    """Program name and, for borg, its command (``create``, ``list`` ...)"""
+    if not command:
+        return "unknown", ""
+    program = os.path.basename(command[0])
+    if program != "borg":
+        return program, ""
+    subcommand = next((arg for arg in command[1:] if not arg.startswith("-")), "")
+    return program, subcommand
+
+
+def track_subprocess(command: List[str], process: Any) -> None:
+    """Count a started subprocess and watch it until it exits"""
+    program, subcommand = _command_labels(command)
+    SUBPROCESSES_STARTED.labels(program, subcommand).inc()
+    try:
+        _subprocesses[process] = program
+    except TypeError:
+        # Not weak-referenceable (test doubles); counted but not watched
+        pass
+
+
+def _collect_subprocesses() -> None:
+    running: dict[str, int] = {}
+    for process, program in list(_subprocesses.items()):
+        if getattr(process, "returncode", 0) is None:
+            running[program] = running.get(program, 0) + 1
+        else:
+            _subprocesses.pop(process, None)
+    SUBPROCESSES_RUNNING.clear()
+    for program, count in running.items():
+        SUBPROCESSES_RUNNING.labels(program).set(count)
+
+
+REGISTRY.add_collector(_collect_subprocesses)
+
+
+def collect_job_runtime(
+    broadcaster: Optional["JobEventBroadcaster"],
+    queue_manager: Optional["JobQueueManager"],
+) -> None:
+    """Refresh the SSE client and queue gauges from the live services"""
+    if broadcaster is not None:
+        depths = broadcaster.get_queue_depths()
+        SSE_CLIENTS.set(len(depths))
+        SSE_QUEUED_EVENTS.set(sum(depths))
+        SSE_QUEUE_DEPTH_MAX.set(max(depths, default=0))
+
+    if queue_manager is not None:
+        stats = queue_manager.get_queue_stats()
+        QUEUE_JOBS.labels("queued").set(stats.total_queued)
+        QUEUE_JOBS.labels("running").set(stats.running_jobs)
+        QUEUE_JOBS.labels("blocked_by_repository").set(stats.blocked_by_repository)
+
+
+_TRANSACTION_START = "borgitory_metrics_transaction_start"
+
+
+def instrument_engine(engine: "AsyncEngine") -> None:
+    """Time every transaction of ``engine`` from begin to commit or rollback"""
+    from sqlalchemy import event
+
+    committed = DB_TRANSACTION_DURATION.labels("commit")
+    rolled_back = DB_TRANSACTION_DURATION.labels("rollback")
+
+    def on_begin(connection: Any) -> None:
+        connection.info[_TRANSACTION_START] = time.perf_counter()
+
+    def observe(connection: Any, outcome: Any) -> None:
+        started = connection.info.pop(_TRANSACTION_START, None)
+        if started is not None:
+            outcome.observe(time.perf_counter() - started)
+
+    event.listen(engine.sync_engine, "begin", on_begin)
+    event.listen(
+        engine.sync_engine, "commit", lambda connection: observe(connection, committed)
+    )
+    event.listen(
+        engine.sync_engine,
+        "rollback",
+        lambda connection: observe(connection, rolled_back),
+    )
@@ -0,0 +1,53 @@
+"""
+Event Loop Monitor - Measures how late the event loop runs timers
+
+A background task sleeps for ``interval`` seconds and records how much
+later than requested it woke up. Sustained lag means something blocks the
+loop (synchronous I/O, heavy parsing) and delays every request and event
+stream.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from borgitory.services.metrics.registry import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """Samples event loop lag into a histogram"""
+
+    def __init__(self, histogram: Histogram, interval: float = 0.5) -> None:
+        self.histogram = histogram
+        self.interval = interval
+        self.last_lag: Optional[float] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def start(self) -> None:
+        """Start sampling in the background"""
+        if self._task is not None or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        series = self.histogram.labels()
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.last_lag = lag
+            series.observe(lag)
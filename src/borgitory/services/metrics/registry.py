@@ -0,0 +1,309 @@
+"""
+Metrics Registry - Counters, gauges and histograms in Prometheus text format
+
+A small, dependency free implementation of the Prometheus data model.
+Updating a metric is a dictionary lookup for its label values plus a float
+addition, so it is cheap enough for hot paths such as output ingestion.
+Callers on hot paths should resolve ``labels(...)`` once and keep the
+returned child. Rendering walks every series and only happens on scrape.
+"""
+
+import bisect
+import math
+import threading
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; suits request-scale latencies such as DB transactions
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class CounterChild:
+    """One labelled series of a counter"""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        self.value += amount
+
+
+class GaugeChild:
+    """One labelled series of a gauge"""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class HistogramChild:
+    """One labelled series of a histogram
+
+    Bucket counts are kept per bucket and only made cumulative when
+    rendered, so an observation touches a single bucket.
+    """
+
+    __slots__ = ("_upper_bounds", "bucket_counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]) -> None:
+        self._upper_bounds = upper_bounds
+        # One extra slot for observations above the largest bound (+Inf)
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self._upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+ChildT = TypeVar("ChildT", CounterChild, GaugeChild, HistogramChild)
+
+
+class _Metric(Generic[ChildT]):
+    """A named metric family with a fixed set of label names"""
+
+    type_name = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[LabelValues, ChildT] = {}
+        # Only guards creating series; updates rely on the GIL
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> ChildT:
+        raise NotImplementedError
+
+    def labels(self, *values: object) -> ChildT:
+        """The series for the given label values, created on first use"""
+        key = tuple(
+            str(value.value if isinstance(value, Enum) else value) for value in values
+        )
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {key}"
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self) -> None:
+        """Drop every series, e.g. before a gauge is refilled on scrape"""
+        with self._lock:
+            self._children = {}
+
+    def _series(self) -> List[Tuple[LabelValues, ChildT]]:
+        return sorted(self._children.items())
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape_help(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self._render_samples()
+
+    def _render_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+ValueChildT = TypeVar("ValueChildT", CounterChild, GaugeChild)
+
+
+class _ValueMetric(_Metric[ValueChildT]):
+    """A metric whose series are a single value"""
+
+    def _render_samples(self) -> Iterator[str]:
+        for values, child in self._series():
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Counter(_ValueMetric[CounterChild]):
+    """A monotonically increasing count; names end in ``_total``"""
+
+    type_name = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the unlabelled series"""
+        self.labels().inc(amount)
+
+
+class Gauge(_ValueMetric[GaugeChild]):
+    """A value that can go up and down"""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled series"""
+        self.labels().set(value)
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Observations counted into cumulative ``le`` buckets"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        upper_bounds = tuple(sorted(float(bound) for bound in buckets))
+        if upper_bounds and math.isinf(upper_bounds[-1]):
+            upper_bounds = upper_bounds[:-1]
+        self.upper_bounds = upper_bounds
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        """Observe a value in the unlabelled series"""
+        self.labels().observe(value)
+
+    def _render_samples(self) -> Iterator[str]:
+        bounds = [_format_value(bound) for bound in self.upper_bounds] + ["+Inf"]
+        bucket_labelnames = self.labelnames + ("le",)
+        for values, child in self._series():
+            cumulative = 0
+            for bound, count in zip(bounds, child.bucket_counts):
+                cumulative += count
+                labels = _format_labels(bucket_labelnames, values + (bound,))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together in the text exposition format"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric[Any]] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric[Any]) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        counter = Counter(name, documentation, labelnames)
+        self._register(counter)
+        return counter
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        gauge = Gauge(name, documentation, labelnames)
+        self._register(gauge)
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, buckets)
+        self._register(histogram)
+        return histogram
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before each render, e.g. to refresh gauges"""
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> _Metric[Any]:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -6,11 +6,18 @@ shut down or crashed while backup jobs were running.
 """
 
 import logging
+import uuid
+from typing import Dict, Optional, Sequence
 
-from borgitory.models.database import Repository
+from borgitory.models.database import Job, JobQueueEntry, Repository
 from borgitory.models.job_results import JobStatusEnum
 from borgitory.utils.datetime_utils import now_utc
 from borgitory.protocols.command_executor_protocol import CommandExecutorProtocol
+from borgitory.services.jobs.job_queue_store import (
+    UNFINISHED_QUEUE_STATES,
+    JobQueueRecoveryPolicy,
+    QueueEntryState,
+)
 import asyncio
 from borgitory.utils.security import create_borg_command
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
@@ -26,10 +33,17 @@ class RecoveryService:
         self,
         command_executor: CommandExecutorProtocol,
         session_maker: async_sessionmaker[AsyncSession],
+        queue_recovery_policy: Optional[JobQueueRecoveryPolicy] = None,
     ) -> None:
-        """Initialize RecoveryService with command executor for cross-platform compatibility."""
+        """Initialize RecoveryService with command executor for cross-platform compatibility.
+
+        With a ``queue_recovery_policy``, interrupted jobs that are still in
+        the durable job queue and may be resumed are left for the job manager
+        to re-enqueue instead of being failed.
+        """
         self.command_executor = command_executor
         self.session_maker = session_maker
+        self.queue_recovery_policy = queue_recovery_policy
 
     async def recover_stale_jobs(self) -> None:
         """
@@ -58,7 +72,7 @@ class RecoveryService:
             logger.info("Checking database for interrupted job records...")
 
             async with self.session_maker() as db:
-                from borgitory.models.database import Job, JobTask
+                from borgitory.models.database import JobTask
 
                 # Find all jobs in database marked as running or pending (interrupted before completion)
                 result = await db.execute(
@@ -74,7 +88,19 @@ class RecoveryService:
                     f"Found {len(interrupted_jobs)} interrupted database job records"
                 )
 
+                resumable = await self._resumable_queue_states(db, interrupted_jobs)
+
                 for job in interrupted_jobs:
+                    queue_state = resumable.get(job.id)
+                    if queue_state is not None:
+                        logger.info(
+                            f"Keeping database job record {job.id} ({job.job_type}) - it will be resumed from the job queue"
+                        )
+                        if queue_state == QueueEntryState.RUNNING:
+                            # The interrupted borg process may have left a lock
+                            await self._release_lock_for_job(db, job)
+                        continue
+
                     logger.info(
                         f"Cancelling database job record {job.id} ({job.job_type}) - was running since {job.started_at}"
                     )
@@ -100,27 +126,7 @@ class RecoveryService:
                         logger.info(f"  Task '{task.task_name}' marked as failed")
 
                     # Release repository lock if this was a backup job
-                    if (
-                        job.job_type in ["manual_backup", "scheduled_backup", "backup"]
-                        and job.repository_id
-                    ):
-                        repo_result = await db.execute(
-                            select(Repository).where(Repository.id == job.repository_id)
-                        )
-                        repository = repo_result.scalar_one_or_none()
-                        if repository:
-                            logger.info(
-                                f"Releasing repository lock for: {repository.name}"
-                            )
-                            await self._release_repository_lock(repository)
-                        else:
-                            logger.warning(
-                                f"Repository {job.repository_id} not found in database for job {job.id}"
-                            )
-                    else:
-                        logger.debug(
-                            f"Job {job.id} is not a backup job or has no repository_id - skipping lock release"
-                        )
+                    await self._release_lock_for_job(db, job)
 
                 # Commit all the changes
                 await db.commit()
@@ -129,6 +135,62 @@ class RecoveryService:
         except Exception as e:
             logger.error(f"Error recovering database job records: {e}")
 
+    async def _resumable_queue_states(
+        self, db: AsyncSession, jobs: Sequence[Job]
+    ) -> Dict[uuid.UUID, QueueEntryState]:
+        """Queue states of the interrupted jobs the recovery policy resumes
+
+        Queue entries the policy rejects are marked failed so the job manager
+        does not pick them up again.
+        """
+        if self.queue_recovery_policy is None:
+            return {}
+
+        result = await db.execute(
+            select(JobQueueEntry).where(
+                JobQueueEntry.job_id.in_([job.id for job in jobs]),
+                JobQueueEntry.state.in_(
+                    [state.value for state in UNFINISHED_QUEUE_STATES]
+                ),
+            )
+        )
+        now = now_utc()
+        resumable: Dict[uuid.UUID, QueueEntryState] = {}
+        for entry in result.scalars().all():
+            state = QueueEntryState(entry.state)
+            reason = self.queue_recovery_policy.rejection_reason(
+                state, entry.attempts, entry.queued_at, now
+            )
+            if reason is None:
+                resumable[entry.job_id] = state
+                continue
+            logger.info(f"Not resuming queued job {entry.job_id}: {reason}")
+            entry.state = QueueEntryState.FAILED.value
+            entry.finished_at = now
+        return resumable
+
+    async def _release_lock_for_job(self, db: AsyncSession, job: Job) -> None:
+        """Release the repository lock an interrupted backup job may hold"""
+        if (
+            job.job_type in ["manual_backup", "scheduled_backup", "backup"]
+            and job.repository_id
+        ):
+            repo_result = await db.execute(
+                select(Repository).where(Repository.id == job.repository_id)
+            )
+            repository = repo_result.scalar_one_or_none()
+            if repository:
+                logger.info(f"Releasing repository lock for: {repository.name}")
+                await self._release_repository_lock(repository)
+            else:
+                logger.warning(
+                    f"Repository {job.repository_id} not found in database for job {job.id}"
+                )
+        else:
+            logger.debug(
+                f"Job {job.id} is not a backup job or has no repository_id - skipping lock release"
+            )
+
     async def _release_repository_lock(self, repository: Repository) -> None:
         """Use borg break-lock to release any stale locks on a repository"""
         try:
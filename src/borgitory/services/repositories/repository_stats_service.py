@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 from typing import Dict, List, Callable, Optional, TypedDict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from borgitory.protocols.command_executor_protocol import CommandExecutorProtocol
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -100,6 +100,19 @@ class ExecutionTimeChartData(TypedDict):
     datasets: List[ChartDataset]
 
 
+class ResourceUsageStats(TypedDict):
+    """Resource usage of task processes, per task type"""
+
+    task_type: str
+    sampled_executions: int
+    average_cpu_seconds: float
+    max_cpu_seconds: float
+    average_max_rss_mb: float
+    peak_rss_mb: float
+    average_read_gb: float
+    average_write_gb: float
+
+
 class SuccessFailureStats(TypedDict):
     """Success/failure statistics structure"""
 
@@ -154,6 +167,7 @@ class RepositoryStats:
     success_failure_chart: SuccessFailureChartData
     timeline_success_failure: TimelineSuccessFailureData
     summary: SummaryStats
+    resource_usage_stats: List[ResourceUsageStats] = field(default_factory=list)
 
 
 class RepositoryStatsService:
@@ -267,6 +281,7 @@ class RepositoryStatsService:
             timeline_success_failure = await self._get_timeline_success_failure_data(
                 repository, db
             )
+            resource_usage_stats = await self._get_resource_usage_stats(repository, db)
 
             stats = RepositoryStats(
                 repository_path=repository.path,
@@ -283,6 +298,7 @@ class RepositoryStatsService:
                 success_failure_chart=success_failure_chart,
                 timeline_success_failure=timeline_success_failure,
                 summary=self._build_summary_stats(archive_stats),
+                resource_usage_stats=resource_usage_stats,
             )
 
             return stats
@@ -775,6 +791,72 @@ class RepositoryStatsService:
 
         return chart_data
 
+    async def _get_resource_usage_stats(
+        self, repository: Repository, db: AsyncSession
+    ) -> List[ResourceUsageStats]:
+        """Summarize the sampled resource usage of task processes per task type"""
+        from borgitory.models.database import Job, JobTask
+
+        try:
+            cpu_seconds = func.coalesce(JobTask.cpu_user_seconds, 0.0) + func.coalesce(
+                JobTask.cpu_system_seconds, 0.0
+            )
+            result = await db.execute(
+                select(
+                    JobTask.task_type,
+                    func.count(JobTask.id),
+                    func.avg(cpu_seconds),
+                    func.max(cpu_seconds),
+                    func.avg(JobTask.max_rss_bytes),
+                    func.max(JobTask.max_rss_bytes),
+                    func.avg(JobTask.io_read_bytes),
+                    func.avg(JobTask.io_write_bytes),
+                )
+                .join(Job, Job.id == JobTask.job_id)
+                .where(
+                    and_(
+                        Job.repository_id == repository.id,
+                        JobTask.status.in_(
+                            [TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED]
+                        ),
+                        JobTask.cpu_user_seconds.isnot(None),
+                    )
+                )
+                .group_by(JobTask.task_type)
+            )
+
+            mb = 1024**2
+            gb = 1024**3
+            resource_stats: List[ResourceUsageStats] = []
+            for row in result.all():
+                (
+                    task_type,
+                    count,
+                    avg_cpu,
+                    max_cpu,
+                    avg_rss,
+                    max_rss,
+                    avg_read,
+                    avg_write,
+                ) = row
+                stat_entry: ResourceUsageStats = {
+                    "task_type": task_type,
+                    "sampled_executions": count,
+                    "average_cpu_seconds": round(avg_cpu or 0, 1),
+                    "max_cpu_seconds": round(max_cpu or 0, 1),
+                    "average_max_rss_mb": round((avg_rss or 0) / mb, 1),
+                    "peak_rss_mb": round((max_rss or 0) / mb, 1),
+                    "average_read_gb": round((avg_read or 0) / gb, 2),
+                    "average_write_gb": round((avg_write or 0) / gb, 2),
+                }
+                resource_stats.append(stat_entry)
+
+            return resource_stats
+
+        except Exception as e:
+            logger.error(f"Error calculating resource usage stats: {str(e)}")
+            return []
+
     async def _get_success_failure_stats(
         self, repository: Repository, db: AsyncSession
     ) -> List[SuccessFailureStats]:
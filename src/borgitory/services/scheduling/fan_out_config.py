@@ -0,0 +1,198 @@
+"""
+Fan-out backup target configuration and validation.
+
+A fan-out backup reads one source path into several repositories at once.
+Besides the schedule's own repository, each additional target is stored as
+an entry of a JSON array; an entry naming the schedule's own repository
+only sets its options.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+
+@dataclass
+class FanOutTarget:
+    """Options of one repository a fan-out backup writes to."""
+
+    repository_id: int
+    # Seconds to wait before starting borg create for this target
+    start_delay: int = 0
+    # Upload limit in KiB/s (borg --upload-ratelimit, remote repositories)
+    upload_ratelimit: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Validate target configuration after initialization."""
+        if self.repository_id <= 0:
+            raise ValueError("Target repository_id must be positive")
+        if self.start_delay < 0:
+            raise ValueError("Target start_delay cannot be negative")
+        if self.upload_ratelimit is not None and self.upload_ratelimit <= 0:
+            raise ValueError("Target upload_ratelimit must be positive")
+
+
+class FanOutConfigParser:
+    """Parser for fan-out target JSON data."""
+
+    @staticmethod
+    def parse_targets_json(targets_json: Optional[str]) -> List[FanOutTarget]:
+        """
+        Parse JSON string into list of FanOutTarget objects.
+
+        Args:
+            targets_json: JSON string containing target configurations
+
+        Returns:
+            List of validated FanOutTarget objects
+
+        Raises:
+            ValueError: If JSON is invalid, a target is malformed or a
+                repository is listed twice
+        """
+        if not targets_json or not targets_json.strip():
+            return []
+
+        try:
+            targets_data = json.loads(targets_json)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in fan-out targets: {e}")
+
+        if not isinstance(targets_data, list):
+            raise ValueError("Fan-out targets must be a JSON array")
+
+        targets: List[FanOutTarget] = []
+        seen: set[int] = set()
+        for i, target_data in enumerate(targets_data):
+            if not isinstance(target_data, dict):
+                raise ValueError(f"Target {i} must be a JSON object")
+
+            repository_id = target_data.get("repository_id")
+            start_delay = target_data.get("start_delay", 0)
+            upload_ratelimit = target_data.get("upload_ratelimit")
+
+            # bool is an int subclass; reject it explicitly
+            if not isinstance(repository_id, int) or isinstance(repository_id, bool):
+                raise ValueError(f"Target {i} repository_id must be an integer")
+            if not isinstance(start_delay, int) or isinstance(start_delay, bool):
+                raise ValueError(f"Target {i} start_delay must be an integer")
+            if upload_ratelimit is not None and (
+                not isinstance(upload_ratelimit, int)
+                or isinstance(upload_ratelimit, bool)
+            ):
+                raise ValueError(
+                    f"Target {i} upload_ratelimit must be an integer or null"
+                )
+            if repository_id in seen:
+                raise ValueError(f"Repository {repository_id} is listed twice")
+
+            try:
+                targets.append(
+                    FanOutTarget(
+                        repository_id=repository_id,
+                        start_delay=start_delay,
+                        upload_ratelimit=upload_ratelimit,
+                    )
+                )
+            except ValueError as e:
+                raise ValueError(f"Invalid configuration for target {i}: {e}")
+            seen.add(repository_id)
+
+        return targets
+
+    @staticmethod
+    def targets_to_json(targets: Sequence[FanOutTarget]) -> Optional[str]:
+        """
+        Convert FanOutTarget objects to a JSON string.
+
+        Returns:
+            JSON string representation, or None when there are no targets
+        """
+        if not targets:
+            return None
+
+        targets_data = []
+        for target in targets:
+            target_dict: dict[str, object] = {
+                "repository_id": target.repository_id,
+                "start_delay": target.start_delay,
+            }
+            if target.upload_ratelimit is not None:
+                target_dict["upload_ratelimit"] = target.upload_ratelimit
+            targets_data.append(target_dict)
+
+        return json.dumps(targets_data)
+
+    @staticmethod
+    def targets_from_form(
+        repository_ids: object,
+        stagger_seconds: object = None,
+        upload_ratelimit: object = None,
+        primary_repository_id: Optional[int] = None,
+    ) -> List[FanOutTarget]:
+        """
+        Build targets from the schedule form fields.
+
+        Every selected repository gets the same upload limit. The n-th
+        repository starts ``n * stagger_seconds`` after the schedule's own
+        repository, so the targets do not all read the source at once. The
+        schedule's own repository is ignored if it is selected as well.
+
+        Raises:
+            ValueError: If a field is not a valid number
+        """
+        if repository_ids in (None, ""):
+            return []
+        if not isinstance(repository_ids, list):
+            repository_ids = [repository_ids]
+
+        def optional_int(value: object, field_name: str) -> Optional[int]:
+            if value is None or (isinstance(value, str) and not value.strip()):
+                return None
+            try:
+                return int(str(value))
+            except ValueError:
+                raise ValueError(f"{field_name} must be a whole number")
+
+        stagger = optional_int(stagger_seconds, "Stagger") or 0
+        ratelimit = optional_int(upload_ratelimit, "Upload limit")
+
+        selected = [
+            repository_id
+            for repository_id in dict.fromkeys(
+                optional_int(value, "Repository") for value in repository_ids
+            )
+            if repository_id is not None and repository_id != primary_repository_id
+        ]
+        targets: List[FanOutTarget] = []
+        for position, repository_id in enumerate(selected, start=1):
+            targets.append(
+                FanOutTarget(
+                    repository_id=repository_id,
+                    start_delay=position * stagger,
+                    upload_ratelimit=ratelimit,
+                )
+            )
+        return targets
+
+
+def validate_fan_out_targets_json(
+    targets_json: Optional[str],
+) -> tuple[bool, Optional[str]]:
+    """
+    Validate fan-out targets JSON configuration.
+
+    Args:
+        targets_json: JSON string to validate
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not targets_json or not targets_json.strip():
+        return True, None
+
+    try:
+        FanOutConfigParser.parse_targets_json(targets_json)
+        return True, None
+    except ValueError as e:
+        return False, str(e)
@@ -12,6 +12,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
 from borgitory.models.database import Schedule, Repository
+from borgitory.services.scheduling.fan_out_config import FanOutConfigParser
 
 if TYPE_CHECKING:
     from borgitory.services.scheduling.scheduler_service import SchedulerService
@@ -106,6 +107,41 @@ class ScheduleService:
                 success=False, error_message=f"Invalid cron expression: {str(e)}"
             )
 
+    async def validate_fan_out_targets(
+        self, db: AsyncSession, fan_out_targets: Optional[str]
+    ) -> ScheduleValidationResult:
+        """
+        Validate fan-out targets JSON and that every target repository exists.
+
+        Returns:
+            ScheduleValidationResult with success status and optional error message
+        """
+        try:
+            targets = FanOutConfigParser.parse_targets_json(fan_out_targets)
+        except ValueError as e:
+            return ScheduleValidationResult(
+                success=False, error_message=f"Invalid fan-out targets: {str(e)}"
+            )
+        if not targets:
+            return ScheduleValidationResult(success=True)
+
+        repository_ids = [target.repository_id for target in targets]
+        result = await db.execute(
+            select(Repository.id).where(Repository.id.in_(repository_ids))
+        )
+        found = set(result.scalars().all())
+        missing = [
+            repository_id
+            for repository_id in repository_ids
+            if repository_id not in found
+        ]
+        if missing:
+            return ScheduleValidationResult(
+                success=False,
+                error_message=f"Fan-out target repository not found: {missing[0]}",
+            )
+        return ScheduleValidationResult(success=True)
+
     async def get_schedule_by_id(
         self, schedule_id: int, db: AsyncSession
     ) -> Optional[Schedule]:
@@ -145,6 +181,7 @@ class ScheduleService:
         pre_job_hooks: Optional[str] = None,
         post_job_hooks: Optional[str] = None,
         patterns: Optional[str] = None,
+        fan_out_targets: Optional[str] = None,
     ) -> ScheduleOperationResult:
         """
         Create a new schedule.
@@ -170,6 +207,12 @@ class ScheduleService:
                     success=False, error_message=validation_result.error_message
                 )
 
+            validation_result = await self.validate_fan_out_targets(db, fan_out_targets)
+            if validation_result.is_error:
+                return ScheduleOperationResult(
+                    success=False, error_message=validation_result.error_message
+                )
+
             # Create schedule
             db_schedule = Schedule()
             db_schedule.name = name
@@ -183,6 +226,7 @@ class ScheduleService:
             db_schedule.pre_job_hooks = pre_job_hooks
             db_schedule.post_job_hooks = post_job_hooks
             db_schedule.patterns = patterns
+            db_schedule.fan_out_targets = fan_out_targets
 
             db.add(db_schedule)
             await db.commit()
@@ -227,6 +271,15 @@ class ScheduleService:
                     success=False, error_message="Schedule not found"
                 )
 
+            if update_data.get("fan_out_targets"):
+                validation_result = await self.validate_fan_out_targets(
+                    db, update_data["fan_out_targets"]
+                )
+                if validation_result.is_error:
+                    return ScheduleOperationResult(
+                        success=False, error_message=validation_result.error_message
+                    )
+
             # Update fields
             for field, value in update_data.items():
                 setattr(schedule, field, value)
@@ -436,9 +489,39 @@ class ScheduleService:
                 "pre_job_hooks": safe_json_string(json_data.get("pre_job_hooks")),
                 "post_job_hooks": safe_json_string(json_data.get("post_job_hooks")),
                 "patterns": safe_json_string(json_data.get("patterns")),
+                "fan_out_targets": self.fan_out_targets_from_form(
+                    json_data, repository_id
+                ),
             }
 
             return True, processed_data, None
 
         except Exception as e:
             return False, {}, f"Invalid form data: {str(e)}"
+
+    @staticmethod
+    def fan_out_targets_from_form(
+        json_data: Dict[str, Any], repository_id: Optional[int]
+    ) -> Optional[str]:
+        """
+        Fan-out targets JSON from the schedule form.
+
+        The form lists further repositories with a shared stagger and upload
+        limit; JSON submitted as ``fan_out_targets`` is passed through.
+
+        Raises:
+            ValueError: If a form field is not a valid number
+        """
+        if "fan_out_repository_ids" not in json_data:
+            value = json_data.get("fan_out_targets")
+            if not value or (isinstance(value, str) and not value.strip()):
+                return None
+            return str(value).strip()
+
+        targets = FanOutConfigParser.targets_from_form(
+            json_data.get("fan_out_repository_ids"),
+            json_data.get("fan_out_stagger_seconds"),
+            json_data.get("fan_out_upload_ratelimit"),
+            primary_repository_id=repository_id,
+        )
+        return FanOutConfigParser.targets_to_json(targets)
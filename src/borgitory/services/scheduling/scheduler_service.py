@@ -69,6 +69,7 @@ async def execute_scheduled_backup(
             logger.info(f"  - schedule: {schedule.name}")
             logger.info(f"  - source_path: {schedule.source_path}")
             logger.info(f"  - cloud_sync_config_id: {schedule.cloud_sync_config_id}")
+            logger.info(f"  - fan_out_targets: {schedule.fan_out_targets}")
 
             backup_request = BackupRequest(
                 repository_id=repository.id,
@@ -82,10 +83,17 @@ async def execute_scheduled_backup(
                 pre_job_hooks=schedule.pre_job_hooks,
                 post_job_hooks=schedule.post_job_hooks,
                 patterns=schedule.patterns,
+                fan_out_targets=schedule.fan_out_targets,
             )
 
+            # One job backs the source up to every target repository
+            job_type = (
+                JobType.FAN_OUT_BACKUP
+                if schedule.fan_out_targets
+                else JobType.SCHEDULED_BACKUP
+            )
             backup_result = await job_service.create_backup_job(
-                db, backup_request, JobType.SCHEDULED_BACKUP
+                db, backup_request, job_type
             )
 
             if isinstance(backup_result, JobCreationResult):
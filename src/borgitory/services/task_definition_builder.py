@@ -6,7 +6,7 @@ by providing a consistent interface for building all task types.
 """
 
 import logging
-from typing import List, Optional, cast
+from typing import List, Optional, Sequence, Tuple, cast
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from borgitory.models.database import (
@@ -17,6 +17,7 @@ from borgitory.models.database import (
 from borgitory.models.schemas import PruneRequest, CheckRequest
 from borgitory.constants.retention import RetentionConfigProtocol, RetentionFieldHandler
 from borgitory.services.hooks.hook_config import HookConfigParser
+from borgitory.services.scheduling.fan_out_config import FanOutTarget
 from borgitory.services.jobs.job_models import TaskTypeEnum
 from borgitory.protocols.job_protocols import TaskDefinition
 from borgitory.custom_types import ConfigDict
@@ -481,16 +482,131 @@ class TaskDefinitionBuilder:
                 self.build_cloud_sync_task(repository_name, cloud_sync_config_id)
             )
 
+        # Borg operations share the repository lock and cloud sync uploads
+        # the result, so everything so far runs in order. The notification
+        # and post-job hooks only need those tasks finished and run side by
+        # side.
+        finishing_tasks: List[TaskDefinition] = []
         if notification_config_id:
             notification_task = await self.build_notification_task(
                 db, notification_config_id, repository_name
             )
             if notification_task:
-                tasks.append(notification_task)
+                finishing_tasks.append(notification_task)
 
-        post_hook_tasks = self.build_hooks_from_json(
-            post_job_hooks, "post", repository_name
+        finishing_tasks.extend(
+            self.build_hooks_from_json(post_job_hooks, "post", repository_name)
         )
-        tasks.extend(post_hook_tasks)
+        if len(finishing_tasks) > 1:
+            main_tasks = [tasks[-1].name] if tasks else []
+            for finishing_task in finishing_tasks:
+                finishing_task.depends_on = main_tasks
+        tasks.extend(finishing_tasks)
+
+        return tasks
+
+    async def build_fan_out_task_list(
+        self,
+        db: AsyncSession,
+        targets: Sequence[Tuple[str, FanOutTarget]],
+        backup_params: Optional[ConfigDict] = None,
+        prune_config_id: Optional[int] = None,
+        check_config_id: Optional[int] = None,
+        cloud_sync_config_id: Optional[int] = None,
+        notification_config_id: Optional[int] = None,
+        pre_job_hooks: Optional[str] = None,
+        post_job_hooks: Optional[str] = None,
+    ) -> List[TaskDefinition]:
+        """
+        Build the task list of a backup of one source to several repositories.
+
+        Every target gets its own backup, followed by its own prune, compact
+        and check. The targets run side by side once the pre-job hooks have
+        finished, so a failed target only skips its own follow-up tasks.
+        Cloud sync uploads the first target's repository. The notification
+        and post-job hooks run once, after every target.
+
+        Args:
+            targets: Repository name and options of each target, the
+                job's own repository first
+            backup_params: Parameters shared by all backup tasks
+            prune_config_id: ID of the prune configuration for each target
+            check_config_id: ID of the check configuration for each target
+            cloud_sync_config_id: ID of the cloud sync configuration
+            notification_config_id: ID for notification task
+            pre_job_hooks: JSON string of pre-job hook configurations
+            post_job_hooks: JSON string of post-job hook configurations
+
+        Returns:
+            List of task definitions
+        """
+        if not targets:
+            return []
+
+        primary_name = targets[0][0]
+        tasks = self.build_hooks_from_json(pre_job_hooks, "pre", primary_name)
+        # Pre-job hooks chain among themselves; targets wait for the last one
+        start_after = [tasks[-1].name] if tasks else []
+
+        params: ConfigDict = dict(backup_params or {})
+        branch_ends: List[str] = []
+        for position, (repository_name, target) in enumerate(targets):
+            backup_task = self.build_backup_task(
+                repository_name,
+                str(params.get("source_path", "/data")),
+                str(params.get("compression", "zstd")),
+                bool(params.get("dry_run", False)),
+                bool(params.get("ignore_lock", False)),
+                cast(List[str], params.get("patterns") or []),
+            )
+            backup_task.parameters["start_delay"] = target.start_delay
+            if target.upload_ratelimit is not None:
+                backup_task.parameters["upload_ratelimit"] = target.upload_ratelimit
+            branch = [backup_task]
+
+            if prune_config_id:
+                prune_task = await self.build_prune_task_from_config(
+                    db, prune_config_id, repository_name
+                )
+                if prune_task:
+                    branch.append(prune_task)
+                    if prune_task.parameters.get("compact_after", False):
+                        branch.append(self.build_compact_task(repository_name))
+
+            if check_config_id:
+                check_task = await self.build_check_task_from_config(
+                    db, check_config_id, repository_name
+                )
+                if check_task:
+                    branch.append(check_task)
+
+            if position == 0 and cloud_sync_config_id:
+                branch.append(
+                    self.build_cloud_sync_task(repository_name, cloud_sync_config_id)
+                )
+
+            previous = start_after
+            for task in branch:
+                task.parameters["repository_id"] = target.repository_id
+                task.depends_on = previous
+                previous = [task.name]
+            tasks.extend(branch)
+            branch_ends.extend(previous)
+
+        # One notification and one run of the post-job hooks for all targets
+        label = ", ".join(repository_name for repository_name, _ in targets)
+        finishing_tasks: List[TaskDefinition] = []
+        if notification_config_id:
+            notification_task = await self.build_notification_task(
+                db, notification_config_id, label
+            )
+            if notification_task:
+                finishing_tasks.append(notification_task)
+        finishing_tasks.extend(
+            self.build_hooks_from_json(post_job_hooks, "post", primary_name)
+        )
+        for finishing_task in finishing_tasks:
+            finishing_task.depends_on = list(branch_ends)
+        tasks.extend(finishing_tasks)
 
         return tasks
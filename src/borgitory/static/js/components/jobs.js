@@ -1,28 +1,43 @@
 // Job History UI Functions
+function fetchOutputText(url, fallbackElementId) {
+    // The server reads the full log from disk; the DOM only holds the rendered tail
+    return fetch(url, { method: 'POST' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(data => data.output)
+        .catch(() => {
+            const outputDiv = document.getElementById(fallbackElementId);
+            return outputDiv ? (outputDiv.textContent || outputDiv.innerText) : '';
+        });
+}
+
 window.copyJobOutput = function(jobId) {
-    const outputDiv = document.getElementById(`job-output-${jobId}`);
-    if (outputDiv) {
-        const text = outputDiv.textContent || outputDiv.innerText;
-        navigator.clipboard.writeText(text).then(() => {
+    fetchOutputText(`/api/jobs/${jobId}/copy-output`, `job-output-${jobId}`)
+        .then(text => navigator.clipboard.writeText(text))
+        .then(() => {
             showHTMXNotification('Job output copied to clipboard', 'success');
         }).catch(err => {
             console.error('Failed to copy job output: ', err);
             showHTMXNotification('Failed to copy job output', 'error');
         });
-    }
 }
 
 window.copyTaskOutput = function(jobId, taskOrder) {
-    const outputDiv = document.getElementById(`task-output-${jobId}-${taskOrder}`);
-    if (outputDiv) {
-        const text = outputDiv.textContent || outputDiv.innerText;
-        navigator.clipboard.writeText(text).then(() => {
+    fetchOutputText(
+        `/api/jobs/${jobId}/tasks/${taskOrder}/copy-output`,
+        `task-output-${jobId}-${taskOrder}`
+    )
+        .then(text => navigator.clipboard.writeText(text))
+        .then(() => {
             showHTMXNotification('Task output copied to clipboard', 'success');
         }).catch(err => {
             console.error('Failed to copy task output: ', err);
             showHTMXNotification('Failed to copy task output', 'error');
         });
-    }
 }
 
 function showHTMXNotification(message, type, targetContainer = null) {
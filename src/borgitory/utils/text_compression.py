@@ -0,0 +1,22 @@
+"""
+Text compression utilities for archived job output stored as BLOBs.
+"""
+
+import zlib
+from typing import Optional
+
+# Level 6 is zlib's default; job logs are highly repetitive and compress
+# well without paying for the slower higher levels.
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(text: str) -> bytes:
+    """Compress text for storage in a BLOB column."""
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(data: Optional[bytes]) -> Optional[str]:
+    """Decompress a BLOB written by compress_text, returning None for no data."""
+    if data is None:
+        return None
+    return zlib.decompress(data).decode("utf-8", errors="replace")
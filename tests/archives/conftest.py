@@ -0,0 +1,42 @@
+"""
+Shared fixtures for archive tests
+"""
+
+import asyncio
+from typing import Callable, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+BorgListProcessFactory = Callable[..., MagicMock]
+
+
+@pytest.fixture
+def borg_list_process() -> BorgListProcessFactory:
+    """Factory for fake borg list processes writing the given output lines"""
+
+    def create(
+        lines: List[str], return_code: int = 0, stderr: bytes = b"", eof: bool = True
+    ) -> MagicMock:
+        stdout = asyncio.StreamReader()
+        for line in lines:
+            stdout.feed_data(line.encode() + b"\n")
+        if eof:
+            stdout.feed_eof()
+        stderr_reader = asyncio.StreamReader()
+        stderr_reader.feed_data(stderr)
+        stderr_reader.feed_eof()
+
+        process = MagicMock()
+        process.stdout = stdout
+        process.stderr = stderr_reader
+        process.returncode = None
+
+        async def wait() -> int:
+            process.returncode = return_code
+            return return_code
+
+        process.wait = AsyncMock(side_effect=wait)
+        return process
+
+    return create
@@ -0,0 +1,112 @@
+"""
+Tests for the persistent on-disk archive index
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+from borgitory.services.archives.archive_index_store import ArchiveIndexStore
+from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import ArchiveTree
+
+REPO = "/backups/repo"
+
+
+def _tree() -> ArchiveTree:
+    return ArchiveTree.from_entries(
+        [
+            ArchiveEntry(
+                path="home",
+                name="home",
+                type="d",
+                size=0,
+                isdir=True,
+                mtime="2023-01-01T00:00:00",
+                mode="rwx",
+            ),
+            ArchiveEntry(
+                path="home/b.txt", name="b.txt", type="f", size=200, isdir=False
+            ),
+            ArchiveEntry(
+                path="home/A.txt",
+                name="A.txt",
+                type="f",
+                size=100,
+                isdir=False,
+                uid=1000,
+                gid=100,
+                healthy=True,
+            ),
+            ArchiveEntry(
+                path="home/docs/c.txt", name="c.txt", type="f", size=300, isdir=False
+            ),
+            ArchiveEntry(path="readme", name="readme", type="f", size=5, isdir=False),
+        ]
+    )
+
+
+def test_stored_tree_lists_like_the_tree(tmp_path: Path) -> None:
+    """Test every directory lists the same from disk as from memory"""
+    tree = _tree()
+    store = ArchiveIndexStore(str(tmp_path))
+    store.store_tree(REPO, "id1", "archive-1", tree)
+
+    for path in ["", "home", "home/docs", "/home/"]:
+        assert store.list_directory(REPO, "id1", path) == tree.list_directory(path)
+    assert store.list_directory(REPO, "id1", "missing") == []
+
+
+def test_index_survives_a_new_store(tmp_path: Path) -> None:
+    """Test an index written by one store is read by the next one"""
+    first = ArchiveIndexStore(str(tmp_path))
+    first.store_tree(REPO, "id1", "archive-1", _tree())
+    first.close()
+
+    second = ArchiveIndexStore(str(tmp_path))
+    home = second.list_directory(REPO, "id1", "home")
+
+    assert home is not None
+    assert [entry.name for entry in home] == ["docs", "A.txt", "b.txt"]
+    assert home[0].size == 300
+    assert home[0].children_count == 1
+    assert second.list_directory(REPO, "unknown", "") is None
+
+
+def test_reads_do_not_create_files(tmp_path: Path) -> None:
+    """Test repositories without an index are not given a file by reads"""
+    store = ArchiveIndexStore(str(tmp_path / "index"))
+
+    assert store.list_directory(REPO, "id1", "") is None
+    assert store.forget_archive(REPO, "archive-1") == 0
+    assert store.retain_archives(REPO, []) == 0
+    assert not os.path.exists(tmp_path / "index")
+
+
+def test_forget_and_retain_remove_archives(tmp_path: Path) -> None:
+    """Test deleted and pruned archives are dropped from the index"""
+    store = ArchiveIndexStore(str(tmp_path))
+    for archive_id in ["id1", "id2", "id3"]:
+        store.store_tree(REPO, archive_id, f"archive-{archive_id}", _tree())
+
+    assert store.forget_archive(REPO, "archive-id1") == 1
+    assert store.retain_archives(REPO, ["id3"]) == 1
+
+    assert not store.has_archive(REPO, "id1")
+    assert not store.has_archive(REPO, "id2")
+    assert store.has_archive(REPO, "id3")
+    with sqlite3.connect(store.index_path(REPO)) as connection:
+        rows = connection.execute("SELECT DISTINCT archive_id FROM entries").fetchall()
+    assert rows == [("id3",)]
+
+
+def test_older_schema_is_rebuilt(tmp_path: Path) -> None:
+    """Test an index file from another schema version is discarded"""
+    store = ArchiveIndexStore(str(tmp_path))
+    with sqlite3.connect(store.index_path(REPO)) as connection:
+        connection.execute("CREATE TABLE archives (id TEXT)")
+        connection.execute("INSERT INTO archives VALUES ('id1')")
+
+    assert store.list_directory(REPO, "id1", "") is None
+    store.store_tree(REPO, "id1", "archive-1", _tree())
+    assert store.has_archive(REPO, "id1")
@@ -0,0 +1,118 @@
+"""
+Tests for streaming borg list output into an archive tree
+"""
+
+import asyncio
+
+import pytest
+
+from borgitory.services.archives.archive_listing import (
+    ArchiveListing,
+    parse_borg_list_line,
+)
+from tests.archives.conftest import BorgListProcessFactory
+
+
+def _line(path: str, type_char: str = "-", size: int = 0) -> str:
+    mode = "drwxr-xr-x" if type_char == "d" else "-rw-r--r--"
+    return (
+        f'{{"type": "{type_char}", "mode": "{mode}", "uid": 1000, "gid": 1000,'
+        f' "size": {size}, "mtime": "2023-01-01T00:00:00", "path": "{path}"}}'
+    )
+
+
+def test_parse_borg_list_line() -> None:
+    """Test a json-lines item is parsed into an entry"""
+    entry = parse_borg_list_line(_line("home/user/a.txt", size=42))
+
+    assert entry is not None
+    assert entry.name == "a.txt"
+    assert entry.type == "f"
+    assert entry.size == 42
+    assert entry.mode == "rw-"
+    assert entry.uid == 1000
+
+    directory = parse_borg_list_line(_line("home", "d"))
+    assert directory is not None
+    assert directory.isdir
+
+    assert parse_borg_list_line("   ") is None
+    with pytest.raises(ValueError):
+        parse_borg_list_line("not json")
+
+
+async def test_run_feeds_the_tree(
+    borg_list_process: BorgListProcessFactory,
+) -> None:
+    """Test every line ends up in the tree and unparseable lines are skipped"""
+    process = borg_list_process(
+        [
+            _line("home", "d"),
+            "garbage",
+            _line("home/a.txt", size=10),
+            _line("readme", size=5),
+        ]
+    )
+    listing = ArchiveListing("archive")
+
+    await listing.run(process)
+    await listing.wait()
+
+    assert listing.error is None
+    assert listing.tree.complete
+    assert len(listing.tree) == 3
+    assert listing.tree.total_size == 15
+
+
+async def test_directory_is_answered_before_the_listing_ends(
+    borg_list_process: BorgListProcessFactory,
+) -> None:
+    """Test a sealed directory can be listed while borg is still running"""
+    process = borg_list_process(
+        [_line("home", "d"), _line("home/a.txt"), _line("var", "d")], eof=False
+    )
+    listing = ArchiveListing("archive")
+    task = asyncio.create_task(listing.run(process))
+
+    await asyncio.wait_for(listing.wait_for_directory("home"), timeout=1)
+    assert not listing.done
+    assert [e.name for e in listing.tree.list_directory("home")] == ["a.txt"]
+
+    process.stdout.feed_eof()
+    await asyncio.wait_for(listing.wait_for_directory(""), timeout=1)
+    await task
+    assert listing.done
+
+
+async def test_failed_listing_raises_with_stderr(
+    borg_list_process: BorgListProcessFactory,
+) -> None:
+    """Test a nonzero exit fails waiters with borg's error output"""
+    process = borg_list_process(
+        [_line("home/a.txt")], return_code=2, stderr=b"Repository does not exist"
+    )
+    listing = ArchiveListing("archive")
+
+    await listing.run(process)
+
+    assert listing.error == "Repository does not exist"
+    with pytest.raises(Exception, match="Repository does not exist"):
+        await listing.wait_for_directory("")
+    with pytest.raises(Exception, match="Repository does not exist"):
+        await listing.wait()
+
+
+async def test_stalled_listing_is_stopped(
+    borg_list_process: BorgListProcessFactory,
+) -> None:
+    """Test a listing without output for stall_timeout is stopped"""
+    process = borg_list_process([_line("home", "d")], eof=False)
+    listing = ArchiveListing("archive", stall_timeout=0.05)
+
+    await listing.run(process)
+
+    assert listing.error is not None
+    assert "no output" in listing.error
+    process.terminate.assert_called_once()
+    with pytest.raises(Exception, match="no output"):
+        await listing.wait_for_directory("home")
@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from borgitory.services.archives.archive_manager import ArchiveManager
 from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import ArchiveTree
 from borgitory.models.database import Repository
 
 
@@ -81,8 +82,8 @@ class TestArchiveManager:
         assert file_entry.isdir is False
         assert file_entry.size == 1024
 
-    def test_filter_directory_contents_root(self, manager: ArchiveManager) -> None:
-        """Test filtering directory contents for root directory"""
+    def test_tree_list_directory_root(self, manager: ArchiveManager) -> None:
+        """Test listing directory contents for root directory"""
         entries = [
             ArchiveEntry(
                 path="file1.txt", name="file1.txt", type="f", size=100, isdir=False
@@ -102,7 +103,7 @@ class TestArchiveManager:
             ),
         ]
 
-        result = manager._filter_directory_contents(entries, "")
+        result = ArchiveTree.from_entries(entries).list_directory("")
 
         assert len(result) == 3  # file1.txt, dir1, dir2
 
@@ -117,10 +118,8 @@ class TestArchiveManager:
         assert dir1.isdir is True
         assert dir1.type == "d"
 
-    def test_filter_directory_contents_subdirectory(
-        self, manager: ArchiveManager
-    ) -> None:
-        """Test filtering directory contents for subdirectory"""
+    def test_tree_list_directory_subdirectory(self, manager: ArchiveManager) -> None:
+        """Test listing directory contents for subdirectory"""
         entries = [
             ArchiveEntry(
                 path="dir1/file1.txt", name="file1.txt", type="f", size=100, isdir=False
@@ -140,7 +139,7 @@ class TestArchiveManager:
             ),
         ]
 
-        result = manager._filter_directory_contents(entries, "dir1")
+        result = ArchiveTree.from_entries(entries).list_directory("dir1")
 
         assert len(result) == 3  # file1.txt, file2.txt, subdir
 
@@ -155,7 +154,7 @@ class TestArchiveManager:
         assert subdir.isdir is True
         assert subdir.type == "d"
 
-    def test_filter_directory_contents_sorting(self, manager: ArchiveManager) -> None:
+    def test_tree_list_directory_sorting(self, manager: ArchiveManager) -> None:
         """Test that filtered results are sorted correctly (directories first)"""
         entries = [
             ArchiveEntry(
@@ -169,7 +168,7 @@ class TestArchiveManager:
             ),
         ]
 
-        result = manager._filter_directory_contents(entries, "")
+        result = ArchiveTree.from_entries(entries).list_directory("")
 
         # Should be sorted: directories first, then files, both alphabetically
         assert result[0].name == "dir1"  # directory
@@ -2,12 +2,19 @@
 Tests for ArchiveManager caching functionality
 """
 
+import asyncio
+import json
+from pathlib import Path
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
+from borgitory.services.archives.archive_index_store import ArchiveIndexStore
 from borgitory.services.archives.archive_manager import ArchiveManager
 from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import ArchiveTree
 from borgitory.models.database import Repository
+from tests.archives.conftest import BorgListProcessFactory
 
 
 class TestArchiveManagerCaching:
@@ -73,7 +80,7 @@ class TestArchiveManagerCaching:
     ) -> None:
         """Test basic cache operations"""
         # Initially no cache
-        assert manager._get_cached_items(mock_repository, "test_archive") is None
+        assert manager._get_cached_tree(mock_repository, "test_archive") is None
 
         # Add items to cache
         test_items = [
@@ -85,11 +92,14 @@ class TestArchiveManagerCaching:
                 isdir=False,
             )
         ]
-        manager._cache_items(mock_repository, "test_archive", test_items)
+        manager._cache_tree(
+            mock_repository, "test_archive", ArchiveTree.from_entries(test_items)
+        )
 
         # Should now be cached
-        cached_items = manager._get_cached_items(mock_repository, "test_archive")
-        assert cached_items == test_items
+        cached_tree = manager._get_cached_tree(mock_repository, "test_archive")
+        assert cached_tree is not None
+        assert cached_tree.list_directory("") == test_items
 
     def test_cache_clear_all(
         self, manager: ArchiveManager, mock_repository: MagicMock
@@ -105,16 +115,18 @@ class TestArchiveManagerCaching:
                 isdir=False,
             )
         ]
-        manager._cache_items(mock_repository, "test_archive", test_items)
+        manager._cache_tree(
+            mock_repository, "test_archive", ArchiveTree.from_entries(test_items)
+        )
 
         # Verify cache has items
-        assert manager._get_cached_items(mock_repository, "test_archive") is not None
+        assert manager._get_cached_tree(mock_repository, "test_archive") is not None
 
         # Clear all cache
         manager.clear_cache()
 
         # Cache should be empty
-        assert manager._get_cached_items(mock_repository, "test_archive") is None
+        assert manager._get_cached_tree(mock_repository, "test_archive") is None
 
     def test_cache_clear_repository(
         self, manager: ArchiveManager, mock_repository: MagicMock
@@ -136,19 +148,19 @@ class TestArchiveManagerCaching:
             )
         ]
 
-        manager._cache_items(repo1, "archive1", test_items)
-        manager._cache_items(repo2, "archive2", test_items)
+        manager._cache_tree(repo1, "archive1", ArchiveTree.from_entries(test_items))
+        manager._cache_tree(repo2, "archive2", ArchiveTree.from_entries(test_items))
 
         # Both should be cached
-        assert manager._get_cached_items(repo1, "archive1") is not None
-        assert manager._get_cached_items(repo2, "archive2") is not None
+        assert manager._get_cached_tree(repo1, "archive1") is not None
+        assert manager._get_cached_tree(repo2, "archive2") is not None
 
         # Clear cache for repo1 only
         manager.clear_cache(repository=repo1)
 
         # repo1 should be cleared, repo2 should remain
-        assert manager._get_cached_items(repo1, "archive1") is None
-        assert manager._get_cached_items(repo2, "archive2") is not None
+        assert manager._get_cached_tree(repo1, "archive1") is None
+        assert manager._get_cached_tree(repo2, "archive2") is not None
 
     def test_cache_clear_specific_archive(
         self, manager: ArchiveManager, mock_repository: MagicMock
@@ -165,19 +177,23 @@ class TestArchiveManagerCaching:
         ]
 
         # Add items for two archives
-        manager._cache_items(mock_repository, "archive1", test_items)
-        manager._cache_items(mock_repository, "archive2", test_items)
+        manager._cache_tree(
+            mock_repository, "archive1", ArchiveTree.from_entries(test_items)
+        )
+        manager._cache_tree(
+            mock_repository, "archive2", ArchiveTree.from_entries(test_items)
+        )
 
         # Both should be cached
-        assert manager._get_cached_items(mock_repository, "archive1") is not None
-        assert manager._get_cached_items(mock_repository, "archive2") is not None
+        assert manager._get_cached_tree(mock_repository, "archive1") is not None
+        assert manager._get_cached_tree(mock_repository, "archive2") is not None
 
         # Clear cache for archive1 only
         manager.clear_cache(repository=mock_repository, archive_name="archive1")
 
         # archive1 should be cleared, archive2 should remain
-        assert manager._get_cached_items(mock_repository, "archive1") is None
-        assert manager._get_cached_items(mock_repository, "archive2") is not None
+        assert manager._get_cached_tree(mock_repository, "archive1") is None
+        assert manager._get_cached_tree(mock_repository, "archive2") is not None
 
     def test_cache_stats(
         self, manager: ArchiveManager, mock_repository: MagicMock
@@ -199,7 +215,9 @@ class TestArchiveManagerCaching:
                 isdir=False,
             )
         ]
-        manager._cache_items(mock_repository, "test_archive", test_items)
+        manager._cache_tree(
+            mock_repository, "test_archive", ArchiveTree.from_entries(test_items)
+        )
 
         # Should have one entry
         stats = manager.get_cache_stats()
@@ -207,19 +225,104 @@ class TestArchiveManagerCaching:
         assert stats["valid_entries"] == 1
         assert stats["expired_entries"] == 0
 
-    async def test_list_archive_directory_contents_cache_hit(
+    @staticmethod
+    def _tree(file_count: int) -> ArchiveTree:
+        return ArchiveTree.from_entries(
+            ArchiveEntry(
+                path=f"file_{i}", name=f"file_{i}", type="f", size=1, isdir=False
+            )
+            for i in range(file_count)
+        )
+
+    def test_cache_evicts_least_recently_used_over_budget(
+        self, manager: ArchiveManager, mock_repository: MagicMock
+    ) -> None:
+        """Test trees are evicted in LRU order once the budget is exceeded"""
+        tree_bytes = self._tree(100).estimated_bytes
+        manager.cache_max_bytes = tree_bytes * 2
+
+        manager._cache_tree(mock_repository, "archive1", self._tree(100))
+        manager._cache_tree(mock_repository, "archive2", self._tree(100))
+        # Touch archive1 so archive2 is the least recently used
+        assert manager._get_cached_tree(mock_repository, "archive1") is not None
+        manager._cache_tree(mock_repository, "archive3", self._tree(100))
+
+        assert manager._get_cached_tree(mock_repository, "archive2") is None
+        assert manager._get_cached_tree(mock_repository, "archive1") is not None
+        assert manager._get_cached_tree(mock_repository, "archive3") is not None
+
+        stats = manager.get_cache_stats()
+        assert stats["total_entries"] == 2
+        assert stats["resident_bytes"] == tree_bytes * 2
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+
+    def test_tree_larger_than_budget_is_not_kept(
         self, manager: ArchiveManager, mock_repository: MagicMock
+    ) -> None:
+        """Test a tree that alone exceeds the budget is evicted immediately"""
+        manager.cache_max_bytes = self._tree(10).estimated_bytes
+
+        manager._cache_tree(mock_repository, "small", self._tree(10))
+        manager._cache_tree(mock_repository, "huge", self._tree(1000))
+
+        stats = manager.get_cache_stats()
+        assert stats["total_entries"] == 0
+        assert stats["resident_bytes"] == 0
+        assert stats["evictions"] == 2
+
+    def test_clear_cache_releases_resident_bytes(
+        self, manager: ArchiveManager, mock_repository: MagicMock
+    ) -> None:
+        """Test cleared trees no longer count against the budget"""
+        manager._cache_tree(mock_repository, "archive1", self._tree(10))
+        manager._cache_tree(mock_repository, "archive1", self._tree(20))
+        assert (
+            manager.get_cache_stats()["resident_bytes"]
+            == self._tree(20).estimated_bytes
+        )
+
+        manager.clear_cache()
+        assert manager.get_cache_stats()["resident_bytes"] == 0
+
+    async def test_expired_trees_are_swept_in_the_background(
+        self, mock_job_executor: AsyncMock, mock_command_executor: AsyncMock
+    ) -> None:
+        """Test the sweeper removes expired trees without them being accessed"""
+        manager = ArchiveManager(
+            job_executor=mock_job_executor,
+            command_executor=mock_command_executor,
+            cache_ttl=timedelta(milliseconds=10),
+            cache_sweep_interval=0.02,
+        )
+        repository = MagicMock(spec=Repository)
+        repository.path = "/repo"
+        manager._cache_tree(repository, "archive1", self._tree(5))
+        assert manager._sweep_task is not None
+
+        await asyncio.sleep(0.1)
+
+        stats = manager.get_cache_stats()
+        assert stats["total_entries"] == 0
+        assert stats["expirations"] == 1
+        assert stats["resident_bytes"] == 0
+        # The sweeper stops once nothing is cached
+        assert manager._sweep_task is None
+        await manager.close()
+
+    async def test_list_archive_directory_contents_cache_hit(
+        self,
+        manager: ArchiveManager,
+        mock_repository: MagicMock,
+        borg_list_process: BorgListProcessFactory,
     ) -> None:
         """Test that list_archive_directory_contents uses cache when available"""
         # Mock the borg list output
-        json_output = """{"type": "d", "mode": "drwxr-xr-x", "uid": 1000, "gid": 1000, "user": "user", "group": "user", "size": 0, "mtime": "2023-01-01T00:00:00Z", "path": "test_dir"}
-{"type": "-", "mode": "-rw-r--r--", "uid": 1000, "gid": 1000, "user": "user", "group": "user", "size": 1024, "mtime": "2023-01-01T00:00:00Z", "path": "test_file.txt"}"""
-
-        # Mock the command executor to return our test data
-        mock_result = MagicMock()
-        mock_result.success = True
-        mock_result.stdout = json_output
-        mock_result.stderr = ""
+        lines = [
+            '{"type": "d", "mode": "drwxr-xr-x", "uid": 1000, "gid": 1000, "user": "user", "group": "user", "size": 0, "mtime": "2023-01-01T00:00:00Z", "path": "test_dir"}',
+            '{"type": "-", "mode": "-rw-r--r--", "uid": 1000, "gid": 1000, "user": "user", "group": "user", "size": 1024, "mtime": "2023-01-01T00:00:00Z", "path": "test_file.txt"}',
+        ]
 
         # Mock the BorgCommand object
         mock_borg_command = MagicMock()
@@ -238,36 +341,39 @@ class TestArchiveManagerCaching:
                 return_value=mock_borg_command,
             ),
             patch.object(
-                manager.command_executor, "execute_command", return_value=mock_result
-            ) as mock_execute,
+                manager.command_executor,
+                "create_subprocess",
+                AsyncMock(return_value=borg_list_process(lines)),
+            ) as mock_create,
         ):
             result1 = await manager.list_archive_directory_contents(
                 mock_repository, "test_archive", ""
             )
 
-            # Should have called command executor
-            assert mock_execute.called
+            # Should have started borg list
+            assert mock_create.call_count == 1
+            await asyncio.gather(*manager._listing_tasks)
 
-        # Second call should use cache (no patch needed since it should use cache)
-        result2 = await manager.list_archive_directory_contents(
-            mock_repository, "test_archive", ""
-        )
+            # Second call should use cache
+            result2 = await manager.list_archive_directory_contents(
+                mock_repository, "test_archive", ""
+            )
+            assert mock_create.call_count == 1
 
         # Results should be the same
-        assert len(result1) == len(result2)
+        assert len(result1) == len(result2) == 2
 
     async def test_list_archive_directory_contents_cache_miss(
-        self, manager: ArchiveManager, mock_repository: MagicMock
+        self,
+        manager: ArchiveManager,
+        mock_repository: MagicMock,
+        borg_list_process: BorgListProcessFactory,
     ) -> None:
         """Test that list_archive_directory_contents calls borg when cache is empty"""
         # Mock the borg list output
-        json_output = """{"type": "d", "mode": "drwxr-xr-x", "uid": 1000, "gid": 1000, "user": "user", "group": "user", "size": 0, "mtime": "2023-01-01T00:00:00Z", "path": "test_dir"}"""
-
-        # Mock the command executor to return our test data
-        mock_result = MagicMock()
-        mock_result.success = True
-        mock_result.stdout = json_output
-        mock_result.stderr = ""
+        lines = [
+            '{"type": "d", "mode": "drwxr-xr-x", "uid": 1000, "gid": 1000, "user": "user", "group": "user", "size": 0, "mtime": "2023-01-01T00:00:00Z", "path": "test_dir"}'
+        ]
 
         # Mock the BorgCommand object
         mock_borg_command = MagicMock()
@@ -286,14 +392,157 @@ class TestArchiveManagerCaching:
                 return_value=mock_borg_command,
             ),
             patch.object(
-                manager.command_executor, "execute_command", return_value=mock_result
-            ) as mock_execute,
+                manager.command_executor,
+                "create_subprocess",
+                AsyncMock(return_value=borg_list_process(lines)),
+            ) as mock_create,
         ):
             result = await manager.list_archive_directory_contents(
                 mock_repository, "test_archive", ""
             )
 
-            # Should have called command executor
-            assert mock_execute.called
+            # Should have started borg list
+            assert mock_create.called
             assert len(result) == 1
             assert result[0].name == "test_dir"
+
+    async def test_concurrent_requests_share_one_listing(
+        self,
+        manager: ArchiveManager,
+        mock_repository: MagicMock,
+        borg_list_process: BorgListProcessFactory,
+    ) -> None:
+        """Test that concurrent requests for one archive run borg list once"""
+        lines = [
+            '{"type": "d", "mode": "drwxr-xr-x", "size": 0, "path": "etc"}',
+            '{"type": "-", "mode": "-rw-r--r--", "size": 10, "path": "etc/hosts"}',
+            '{"type": "-", "mode": "-rw-r--r--", "size": 20, "path": "readme"}',
+        ]
+
+        with patch.object(
+            manager.command_executor,
+            "create_subprocess",
+            AsyncMock(return_value=borg_list_process(lines)),
+        ) as mock_create:
+            root, etc = await asyncio.gather(
+                manager.list_archive_directory_contents(
+                    mock_repository, "test_archive", ""
+                ),
+                manager.list_archive_directory_contents(
+                    mock_repository, "test_archive", "etc"
+                ),
+            )
+
+        assert mock_create.call_count == 1
+        assert [entry.name for entry in root] == ["etc", "readme"]
+        assert [entry.name for entry in etc] == ["hosts"]
+
+    async def test_failed_listing_is_not_cached(
+        self,
+        manager: ArchiveManager,
+        mock_repository: MagicMock,
+        borg_list_process: BorgListProcessFactory,
+    ) -> None:
+        """Test that a failed borg list raises and leaves the cache empty"""
+        process = borg_list_process([], return_code=2, stderr=b"Archive not found")
+
+        with patch.object(
+            manager.command_executor,
+            "create_subprocess",
+            AsyncMock(return_value=process),
+        ):
+            with pytest.raises(Exception, match="Archive not found"):
+                await manager.list_archive_directory_contents(
+                    mock_repository, "test_archive", ""
+                )
+            await asyncio.gather(*manager._listing_tasks)
+
+        assert manager.get_cache_stats()["total_entries"] == 0
+        assert manager._listings == {}
+
+    @staticmethod
+    def _archive_list_result(archives: dict[str, str]) -> MagicMock:
+        result = MagicMock()
+        result.success = True
+        result.stdout = json.dumps(
+            {
+                "archives": [
+                    {"name": name, "id": archive_id}
+                    for name, archive_id in archives.items()
+                ]
+            }
+        )
+        result.stderr = ""
+        return result
+
+    async def test_indexed_archive_is_browsed_without_borg_list(
+        self,
+        mock_job_executor: AsyncMock,
+        mock_repository: MagicMock,
+        borg_list_process: BorgListProcessFactory,
+        tmp_path: Path,
+    ) -> None:
+        """Test an archive listed once is answered from disk by a new manager"""
+        lines = [
+            '{"type": "d", "mode": "drwxr-xr-x", "size": 0, "path": "etc"}',
+            '{"type": "-", "mode": "-rw-r--r--", "size": 10, "path": "etc/hosts"}',
+        ]
+        store = ArchiveIndexStore(str(tmp_path))
+
+        first_executor = AsyncMock()
+        first_executor.execute_command.return_value = self._archive_list_result(
+            {"test_archive": "abc123"}
+        )
+        first_executor.create_subprocess.return_value = borg_list_process(lines)
+        first = ArchiveManager(
+            job_executor=mock_job_executor,
+            command_executor=first_executor,
+            index_store=store,
+        )
+        await first.list_archive_directory_contents(mock_repository, "test_archive")
+        await asyncio.gather(*first._listing_tasks)
+        assert store.has_archive(mock_repository.path, "abc123")
+
+        # A restarted application only has to resolve the archive ID
+        second_executor = AsyncMock()
+        second_executor.execute_command.return_value = self._archive_list_result(
+            {"test_archive": "abc123"}
+        )
+        second = ArchiveManager(
+            job_executor=mock_job_executor,
+            command_executor=second_executor,
+            index_store=ArchiveIndexStore(str(tmp_path)),
+        )
+        etc = await second.list_archive_directory_contents(
+            mock_repository, "test_archive", "etc"
+        )
+
+        assert [entry.name for entry in etc] == ["hosts"]
+        second_executor.create_subprocess.assert_not_called()
+
+    async def test_pruned_and_deleted_archives_leave_the_index(
+        self,
+        manager: ArchiveManager,
+        mock_repository: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test archives gone from the repository are dropped from the index"""
+        store = ArchiveIndexStore(str(tmp_path))
+        tree = ArchiveTree.from_entries(
+            [ArchiveEntry(path="a", name="a", type="f", size=1, isdir=False)]
+        )
+        for name, archive_id in [("old", "id-old"), ("kept", "id-kept")]:
+            store.store_tree(mock_repository.path, archive_id, name, tree)
+        manager.index_store = store
+        manager.command_executor.execute_command.return_value = (
+            self._archive_list_result({"kept": "id-kept"})
+        )
+
+        items = await manager.list_archive_directory_contents(
+            mock_repository, "kept", ""
+        )
+        assert [entry.name for entry in items] == ["a"]
+        assert not store.has_archive(mock_repository.path, "id-old")
+
+        await manager.forget_archive(mock_repository, "kept")
+        assert not store.has_archive(mock_repository.path, "id-kept")
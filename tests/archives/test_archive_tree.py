@@ -0,0 +1,263 @@
+"""
+Tests for the archive directory tree index
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from borgitory.services.archives.archive_listing import parse_borg_list_line
+from borgitory.services.archives.archive_models import ArchiveEntry
+from borgitory.services.archives.archive_tree import ArchiveTree
+
+
+def _file(path: str, size: int) -> ArchiveEntry:
+    return ArchiveEntry(
+        path=path, name=path.rsplit("/", 1)[-1], type="f", size=size, isdir=False
+    )
+
+
+def _directory(path: str) -> ArchiveEntry:
+    return ArchiveEntry(
+        path=path,
+        name=path.rsplit("/", 1)[-1],
+        type="d",
+        size=0,
+        isdir=True,
+        mtime="2023-01-01T00:00:00",
+        mode="rwx",
+    )
+
+
+def test_directories_carry_child_counts_and_sizes() -> None:
+    """Test every child is counted and sizes add up through all levels"""
+    tree = ArchiveTree.from_entries(
+        [
+            _directory("home"),
+            _directory("home/user"),
+            _file("home/user/a.txt", 100),
+            _file("home/user/b.txt", 200),
+            _file("home/user/docs/c.txt", 300),
+            _file("home/notes.txt", 50),
+        ]
+    )
+
+    root = tree.list_directory("")
+    assert [entry.name for entry in root] == ["home"]
+    assert root[0].children_count == 2
+    assert root[0].size == 650
+    assert root[0].mode == "rwx"
+
+    user = next(entry for entry in tree.list_directory("home") if entry.isdir)
+    assert user.name == "user"
+    assert user.children_count == 3
+    assert user.size == 600
+
+    assert tree.total_size == 650
+    assert tree.directory_size("/home/user/docs/") == 300
+    assert len(tree) == 6
+
+
+def test_implicit_directories_are_created() -> None:
+    """Test directories only seen as path prefixes are listed"""
+    tree = ArchiveTree.from_entries([_file("/srv/data/db/dump.sql", 10)])
+
+    assert [entry.path for entry in tree.list_directory("")] == ["srv"]
+    db = tree.list_directory("srv/data")[0]
+    assert db.path == "srv/data/db"
+    assert db.isdir is True
+    assert db.children_count == 1
+    assert tree.list_directory("srv/data/db")[0].path == "srv/data/db/dump.sql"
+
+
+def test_explicit_directory_after_its_children_keeps_them() -> None:
+    """Test a directory entry listed after its contents does not reset them"""
+    tree = ArchiveTree.from_entries(
+        [_file("etc/hosts", 5), _file("etc/fstab", 7), _directory("etc")]
+    )
+
+    etc = tree.list_directory("")[0]
+    assert etc.children_count == 2
+    assert etc.size == 12
+    assert etc.mtime == "2023-01-01T00:00:00"
+
+
+def test_listing_follows_entries_added_later() -> None:
+    """Test listings and counts stay correct while the tree grows"""
+    tree = ArchiveTree()
+    tree.add(_file("b.txt", 1))
+    assert [entry.name for entry in tree.list_directory()] == ["b.txt"]
+
+    tree.add(_file("a.txt", 1))
+    tree.add(_file("z/c.txt", 1))
+
+    assert [entry.name for entry in tree.list_directory()] == ["z", "a.txt", "b.txt"]
+
+
+def test_listings_are_copies() -> None:
+    """Test callers changing returned entries do not change the index"""
+    tree = ArchiveTree.from_entries([_file("a.txt", 1)])
+
+    tree.list_directory()[0].size = 999
+
+    assert tree.list_directory()[0].size == 1
+
+
+def test_unknown_paths_list_empty() -> None:
+    """Test listing a missing directory or a file"""
+    tree = ArchiveTree.from_entries([_file("a.txt", 1)])
+
+    assert tree.list_directory("missing") == []
+    assert tree.list_directory("a.txt") == []
+    assert tree.directory_size("missing") is None
+
+
+def test_directories_seal_when_the_walk_leaves_them() -> None:
+    """Test a directory is complete once an entry outside it is added"""
+    sealed = []
+    tree = ArchiveTree()
+    tree.on_sealed = sealed.append
+
+    tree.add(_directory("home"))
+    tree.add(_directory("home/user"))
+    tree.add(_file("home/user/a.txt", 1))
+    tree.add(_file("home/user/docs/b.txt", 2))
+    assert sealed == []
+
+    tree.add(_file("home/notes.txt", 3))
+    assert sealed == ["home/user/docs", "home/user"]
+    assert tree.is_complete("home/user")
+    assert not tree.is_complete("home")
+    assert not tree.is_complete("")
+
+    tree.add(_directory("var"))
+    assert sealed[-1] == "home"
+    assert not tree.is_complete("var")
+
+    tree.finish()
+    assert tree.is_complete("")
+    assert tree.is_complete("var")
+
+
+def test_sibling_prefix_does_not_keep_directory_open() -> None:
+    """Test a sibling sharing a name prefix seals the previous directory"""
+    tree = ArchiveTree()
+    tree.add(_file("lib/a", 1))
+    tree.add(_file("lib64/b", 1))
+
+    assert tree.is_complete("lib")
+    assert not tree.is_complete("lib64")
+
+
+def test_estimated_bytes_grow_with_entries() -> None:
+    """Test the memory estimate counts entries, directories and string lengths"""
+    small = ArchiveTree.from_entries([_file("a", 1)])
+    large = ArchiveTree.from_entries([_file(f"dir/file_{i}", 1) for i in range(100)])
+
+    assert 0 < small.estimated_bytes < large.estimated_bytes
+    assert large.estimated_bytes > 100 * len("dir/file_0")
+
+
+def test_entries_round_trip_through_the_columns() -> None:
+    """Test every field of an entry comes back as it was added"""
+    entries = [
+        ArchiveEntry(
+            path="a",
+            name="a",
+            type="f",
+            size=2**40,
+            isdir=False,
+            mtime="2024-02-29T23:59:59.123456",
+            mode="rw-",
+            uid=0,
+            gid=4294967294,
+            healthy=False,
+        ),
+        ArchiveEntry(
+            path="b",
+            name="b",
+            type="l",
+            size=0,
+            isdir=False,
+            mtime="1969-07-20T20:17:40",
+            mode="---",
+            healthy=True,
+        ),
+        # Values that do not pack into the columns are kept as they are
+        ArchiveEntry(
+            path="c",
+            name="c",
+            type="c",
+            size=1,
+            isdir=False,
+            mtime="2024-01-01T00:00:00+01:00",
+            mode="rws",
+        ),
+        ArchiveEntry(
+            path="d", name="d", type="f", size=1, isdir=False, mtime="not a time"
+        ),
+    ]
+    tree = ArchiveTree.from_entries(entries)
+
+    assert tree.list_directory("") == entries
+
+
+def test_file_listed_again_replaces_the_first() -> None:
+    """Test a repeated path is kept once and counted once"""
+    tree = ArchiveTree()
+    tree.add(_file("etc/hosts", 5))
+    tree.add(_file("etc/hosts", 8))
+    tree.finish()
+
+    assert [entry.size for entry in tree.list_directory("etc")] == [8]
+    assert tree.directory_size("etc") == 8
+    assert tree.total_size == 8
+
+
+def test_columnar_tree_uses_less_memory_than_entry_objects() -> None:
+    """Benchmark: the tree takes a fraction of the memory of ArchiveEntry objects
+
+    Both sides are built from the same borg list lines. At the time of
+    writing the tree takes about 1/8 of the memory of the entry objects.
+    """
+    lines = [
+        json.dumps(
+            {
+                "type": "-",
+                "mode": "-rw-r--r--",
+                "uid": 1000,
+                "gid": 1000,
+                "size": 1000 + f,
+                "mtime": f"2023-01-01T00:{f % 60:02d}:{d % 60:02d}.{f * 7919 % 10**6:06d}",
+                "path": f"home/project{d}/file_{f}.txt",
+            }
+        )
+        for d in range(20)
+        for f in range(250)
+    ]
+
+    # Parse once up front so caches filled by parsing are not measured
+    for line in lines:
+        parse_borg_list_line(line)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entries = [parse_borg_list_line(line) for line in lines]
+        entry_bytes = tracemalloc.get_traced_memory()[0] - before
+        del entries
+
+        before = tracemalloc.get_traced_memory()[0]
+        tree = ArchiveTree()
+        for line in lines:
+            entry = parse_borg_list_line(line)
+            assert entry is not None
+            tree.add(entry)
+        tree.finish()
+        tree_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert tree_bytes < entry_bytes / 4
+    assert tree.estimated_bytes == pytest.approx(tree_bytes, rel=0.5)
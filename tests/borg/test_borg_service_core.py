@@ -44,7 +44,9 @@ def mock_job_manager() -> Mock:
 @pytest.fixture
 def mock_archive_service() -> Mock:
     """Create mock archive service."""
-    return Mock()
+    mock = Mock()
+    mock.forget_archive = AsyncMock()
+    return mock
 
 
 @pytest.fixture
@@ -339,6 +341,7 @@ class TestBorgServiceDeleteArchive:
         borg_service: BorgService,
         mock_repository: Mock,
         mock_command_runner: Mock,
+        mock_archive_service: Mock,
     ) -> None:
         """Test successful archive deletion."""
         mock_result = Mock()
@@ -359,6 +362,9 @@ class TestBorgServiceDeleteArchive:
         assert "borg" in command
         assert "delete" in command
         assert f"{mock_repository.path}::test-archive" in " ".join(command)
+        mock_archive_service.forget_archive.assert_awaited_once_with(
+            mock_repository, "test-archive"
+        )
 
     @pytest.mark.asyncio
     async def test_delete_archive_failure_nonzero_return_code(
@@ -197,3 +197,37 @@ class TestTaskDefinitionBuilderHookIntegration:
         post_hook_task = tasks[-1]
         assert post_hook_task.parameters["hook_type"] == "post"
         assert "Post-job hooks" in post_hook_task.name
+
+    async def test_notification_and_post_hooks_run_side_by_side(
+        self, mock_db: AsyncSession
+    ) -> None:
+        """Test the finishing tasks depend on the last main task only."""
+        builder = TaskDefinitionBuilder()
+
+        mock_notification_config = Mock()
+        mock_notification_config.provider = "pushover"
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = mock_notification_config
+        mock_db.execute.return_value = mock_result  # type: ignore[attr-defined]
+
+        tasks = await builder.build_task_list(
+            db=mock_db,
+            repository_name="test-repo",
+            include_backup=True,
+            include_cloud_sync=True,
+            cloud_sync_config_id=1,
+            notification_config_id=1,
+            post_job_hooks='[{"name": "Cleanup", "command": "echo cleanup"}]',
+        )
+
+        assert [task.type for task in tasks] == [
+            TaskTypeEnum.BACKUP,
+            TaskTypeEnum.CLOUD_SYNC,
+            TaskTypeEnum.NOTIFICATION,
+            TaskTypeEnum.HOOK,
+        ]
+        # Borg and cloud sync tasks keep running in order
+        assert tasks[0].depends_on is None
+        assert tasks[1].depends_on is None
+        assert tasks[2].depends_on == [tasks[1].name]
+        assert tasks[3].depends_on == [tasks[1].name]
@@ -51,6 +51,8 @@ def mock_queue_manager() -> Mock:
     queue_manager.add_job = Mock()
     queue_manager.get_next_job = Mock()
     queue_manager.remove_job = Mock()
+    queue_manager.enqueue_job = AsyncMock(return_value=True)
+    queue_manager.mark_job_completed = Mock()
     queue_manager.initialize = AsyncMock()
     return queue_manager
 
@@ -0,0 +1,302 @@
+"""
+Tests for fan-out backups - one source backed up to several repositories
+in a single composite job
+"""
+
+import asyncio
+import json
+import uuid
+from typing import List, Optional
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from borgitory.models.database import PruneConfig, Repository
+from borgitory.models.enums import JobType
+from borgitory.models.job_results import JobCreationResult, JobStatusEnum
+from borgitory.models.schemas import BackupRequest
+from borgitory.protocols.job_event_broadcaster_protocol import (
+    JobEventBroadcasterProtocol,
+)
+from borgitory.protocols.job_protocols import TaskDefinition
+from borgitory.services.jobs.job_manager import JobManager
+from borgitory.services.jobs.job_manager_factory import JobManagerFactory
+from borgitory.services.jobs.job_models import (
+    BorgJob,
+    BorgJobTask,
+    JobManagerConfig,
+    TaskStatusEnum,
+    TaskTypeEnum,
+)
+from borgitory.services.jobs.job_queue_manager import JobQueueManager, QueuedJob
+from borgitory.services.jobs.job_service import JobService
+from borgitory.services.jobs.task_executors.backup_task_executor import (
+    BackupTaskExecutor,
+)
+from borgitory.services.scheduling.fan_out_config import (
+    FanOutConfigParser,
+    FanOutTarget,
+)
+from borgitory.utils.datetime_utils import now_utc
+
+
+@pytest.mark.parametrize(
+    "targets_json",
+    [
+        '{"repository_id": 2}',
+        "[2]",
+        '[{"repository_id": "2"}]',
+        '[{"repository_id": 2, "start_delay": -5}]',
+        '[{"repository_id": 2, "upload_ratelimit": 0}]',
+        '[{"repository_id": 2}, {"repository_id": 2}]',
+    ],
+)
+def test_invalid_targets_are_rejected(targets_json: str) -> None:
+    """Test malformed targets and repeated repositories are rejected"""
+    with pytest.raises(ValueError):
+        FanOutConfigParser.parse_targets_json(targets_json)
+
+
+def test_targets_round_trip() -> None:
+    """Test targets survive conversion to JSON and back"""
+    targets = [FanOutTarget(2), FanOutTarget(3, start_delay=60, upload_ratelimit=500)]
+    stored = FanOutConfigParser.targets_to_json(targets)
+    assert FanOutConfigParser.parse_targets_json(stored) == targets
+    assert FanOutConfigParser.targets_to_json([]) is None
+
+
+class TestFanOutJobCreation:
+    """Test fan-out requests become one job with a branch per target"""
+
+    @pytest.fixture
+    async def repositories(self, test_db: AsyncSession) -> List[Repository]:
+        repositories = []
+        for name in ("local", "nas"):
+            repository = Repository()
+            repository.name = name
+            repository.path = f"/repos/{name}"
+            repository.set_passphrase("secret")
+            test_db.add(repository)
+            repositories.append(repository)
+        prune_config = PruneConfig()
+        prune_config.name = "weekly"
+        prune_config.strategy = "simple"
+        prune_config.keep_within_days = 7
+        prune_config.compact_after = True
+        test_db.add(prune_config)
+        await test_db.commit()
+        return repositories
+
+    async def test_backup_request_creates_fan_out_job(
+        self, test_db: AsyncSession, repositories: List[Repository]
+    ) -> None:
+        """Test each target gets its own chain of follow-up tasks"""
+        local, nas = repositories
+        job_manager = Mock()
+        job_manager.create_composite_job = AsyncMock(return_value=uuid.uuid4())
+        service = JobService(job_manager)
+
+        result = await service.create_backup_job(
+            test_db,
+            BackupRequest(
+                repository_id=local.id,
+                source_path="/data",
+                prune_config_id=1,
+                fan_out_targets=json.dumps(
+                    [{"repository_id": nas.id, "start_delay": 30}]
+                ),
+            ),
+            JobType.FAN_OUT_BACKUP,
+        )
+
+        assert isinstance(result, JobCreationResult)
+        kwargs = job_manager.create_composite_job.call_args.kwargs
+        assert kwargs["repository"] is local
+        assert kwargs["additional_repositories"] == [nas]
+        definitions: List[TaskDefinition] = kwargs["task_definitions"]
+        assert [(d.name, d.depends_on) for d in definitions] == [
+            ("Backup local", []),
+            ("Prune local", ["Backup local"]),
+            ("Compact local", ["Prune local"]),
+            ("Backup nas", []),
+            ("Prune nas", ["Backup nas"]),
+            ("Compact nas", ["Prune nas"]),
+        ]
+        assert [d.parameters["repository_id"] for d in definitions] == [
+            local.id,
+            local.id,
+            local.id,
+            nas.id,
+            nas.id,
+            nas.id,
+        ]
+        assert definitions[3].parameters["start_delay"] == 30
+
+        # Every name is unique, so the manager can resolve the graph
+        tasks = JobManager._build_tasks(definitions)
+        assert [task.dependencies(index) for index, task in enumerate(tasks)] == [
+            [],
+            [0],
+            [1],
+            [],
+            [3],
+            [4],
+        ]
+
+    async def test_unknown_target_repository_fails(
+        self, test_db: AsyncSession, repositories: List[Repository]
+    ) -> None:
+        """Test a missing target repository fails the request"""
+        job_manager = Mock()
+        job_manager.create_composite_job = AsyncMock()
+        service = JobService(job_manager)
+
+        result = await service.create_backup_job(
+            test_db,
+            BackupRequest(
+                repository_id=repositories[0].id,
+                fan_out_targets='[{"repository_id": 999}]',
+            ),
+            JobType.FAN_OUT_BACKUP,
+        )
+
+        assert not isinstance(result, JobCreationResult)
+        assert result.error_code == "REPOSITORY_NOT_FOUND"
+        job_manager.create_composite_job.assert_not_called()
+
+
+async def test_queue_holds_every_target_repository() -> None:
+    """Test a fan-out job waits for, and then blocks, all of its repositories"""
+    manager = JobQueueManager(max_concurrent_backups=5)
+    started: List[uuid.UUID] = []
+    manager.set_callbacks(
+        job_start_callback=lambda job_id, queued_job: started.append(job_id)
+    )
+    fan_out, nas_prune, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    try:
+        await manager.submit(
+            QueuedJob(
+                job_id=fan_out,
+                job_type="backup",
+                repository_key="/repos/local",
+                additional_repository_keys=["/repos/nas"],
+            )
+        )
+        await manager.submit(
+            QueuedJob(job_id=nas_prune, job_type="prune", repository_key="/repos/nas")
+        )
+        await manager.submit(
+            QueuedJob(job_id=other, job_type="prune", repository_key="/repos/other")
+        )
+        await asyncio.sleep(0.05)
+
+        assert started == [fan_out, other]
+        assert manager.get_queue_stats().blocked_by_repository == 1
+
+        manager.mark_job_completed(fan_out, True)
+        await asyncio.sleep(0.05)
+        assert started == [fan_out, other, nas_prune]
+    finally:
+        await manager.shutdown()
+
+
+async def test_failed_target_only_skips_its_own_tasks() -> None:
+    """Test the other targets finish and the notification still reports"""
+    dependencies = JobManagerFactory.create_for_testing(
+        mock_event_broadcaster=Mock(spec=JobEventBroadcasterProtocol)
+    )
+    database_manager = Mock()
+    database_manager.update_job_status = AsyncMock(return_value=True)
+    database_manager.save_job_tasks_batch = AsyncMock(
+        side_effect=lambda jobs: {job_id: True for job_id in jobs}
+    )
+    dependencies.database_manager = database_manager
+    manager = JobManager(
+        config=JobManagerConfig(max_parallel_tasks=4), dependencies=dependencies
+    )
+
+    def task(
+        task_type: TaskTypeEnum, name: str, depends_on: Optional[List[int]]
+    ) -> BorgJobTask:
+        return BorgJobTask(task_type=task_type, task_name=name, depends_on=depends_on)
+
+    job = BorgJob(
+        id=uuid.uuid4(),
+        job_type="composite",
+        repository_id=1,
+        status=JobStatusEnum.PENDING,
+        started_at=now_utc(),
+        tasks=[
+            task(TaskTypeEnum.BACKUP, "Backup local", []),
+            task(TaskTypeEnum.PRUNE, "Prune local", [0]),
+            task(TaskTypeEnum.BACKUP, "Backup nas", []),
+            task(TaskTypeEnum.PRUNE, "Prune nas", [2]),
+            task(TaskTypeEnum.NOTIFICATION, "Notify", [1, 3]),
+            task(TaskTypeEnum.HOOK, "Post-job hooks", [1, 3]),
+        ],
+    )
+
+    async def execute(job: BorgJob, task: BorgJobTask, task_index: int) -> bool:
+        await asyncio.sleep(0.01)
+        task.status = (
+            TaskStatusEnum.FAILED
+            if task.task_name == "Backup nas"
+            else TaskStatusEnum.COMPLETED
+        )
+        return task.status == TaskStatusEnum.COMPLETED
+
+    with patch.object(manager, "_execute_task_with_executor", side_effect=execute):
+        await manager._execute_composite_job(job)
+
+    assert [task.status for task in job.tasks] == [
+        TaskStatusEnum.COMPLETED,
+        TaskStatusEnum.COMPLETED,
+        TaskStatusEnum.FAILED,
+        TaskStatusEnum.SKIPPED,
+        TaskStatusEnum.COMPLETED,
+        TaskStatusEnum.SKIPPED,
+    ]
+    assert job.status == JobStatusEnum.FAILED
+
+
+async def test_backup_uses_target_repository_and_limits() -> None:
+    """Test a target's repository, upload limit and start delay are applied"""
+    job_executor = Mock()
+    job_executor.start_process = AsyncMock()
+    job_executor.monitor_process_output = AsyncMock(
+        return_value=Mock(return_code=0, output=None, stderr=b"", error=None)
+    )
+    database_manager = Mock()
+    database_manager.get_repository_data = AsyncMock(
+        return_value={"path": "/repos/nas", "passphrase": "secret"}
+    )
+    executor = BackupTaskExecutor(
+        job_executor, Mock(), Mock(), database_manager, output_ingestor=Mock()
+    )
+    job = BorgJob(
+        id=uuid.uuid4(),
+        job_type="composite",
+        repository_id=1,
+        status=JobStatusEnum.RUNNING,
+        started_at=now_utc(),
+    )
+    task = BorgJobTask(
+        task_type=TaskTypeEnum.BACKUP,
+        task_name="Backup nas",
+        parameters={
+            "source_path": "/data",
+            "repository_id": 2,
+            "start_delay": 0.01,
+            "upload_ratelimit": 2048,
+        },
+    )
+
+    assert await executor.execute_backup_task(job, task) is True
+
+    database_manager.get_repository_data.assert_awaited_once_with(2)
+    command = job_executor.start_process.call_args.args[0]
+    assert command[command.index("--upload-ratelimit") + 1] == "2048"
+    assert any(arg.startswith("/repos/nas::") for arg in command)
+    assert task.output_lines[0] == "Waiting 0.01s before starting this target"
@@ -0,0 +1,167 @@
+"""
+Tests for borg --log-json progress decoding and the progress tracker
+"""
+
+import json
+from typing import List
+
+from borgitory.services.jobs.borg_progress import (
+    ARCHIVE_PROGRESS,
+    FILE_STATUS,
+    BorgProgress,
+    BorgProgressTracker,
+    decode_borg_json_line,
+    format_bytes,
+    format_duration,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _archive_progress(time: float, original: int, nfiles: int) -> BorgProgress:
+    return BorgProgress(
+        type=ARCHIVE_PROGRESS,
+        timestamp=time,
+        original_size=original,
+        compressed_size=original // 2,
+        deduplicated_size=original // 4,
+        nfiles=nfiles,
+    )
+
+
+class TestDecodeBorgJsonLine:
+    """Test decoding of individual --log-json records"""
+
+    def test_plain_text_is_not_decoded(self) -> None:
+        assert decode_borg_json_line("Archive name: test") is None
+        assert decode_borg_json_line("{not json") is None
+        assert decode_borg_json_line('{"type": "something_else"}') is None
+
+    def test_log_message_becomes_text(self) -> None:
+        record = decode_borg_json_line(
+            json.dumps({"type": "log_message", "message": "Archive name: test"})
+        )
+        assert record is not None
+        assert record.text == "Archive name: test"
+        assert record.progress is None
+
+    def test_file_status_keeps_list_output(self) -> None:
+        record = decode_borg_json_line(
+            json.dumps({"type": "file_status", "status": "A", "path": "/data/a.txt"})
+        )
+        assert record is not None
+        assert record.text == "A /data/a.txt"
+        assert record.progress is not None
+        assert record.progress.type == FILE_STATUS
+
+    def test_archive_progress(self) -> None:
+        record = decode_borg_json_line(
+            json.dumps(
+                {
+                    "type": "archive_progress",
+                    "time": 12.5,
+                    "original_size": 4096,
+                    "compressed_size": 2048,
+                    "deduplicated_size": 1024,
+                    "nfiles": 3,
+                    "path": "/data/b",
+                }
+            )
+        )
+        assert record is not None
+        assert record.text is None
+        assert record.progress is not None
+        assert record.progress.timestamp == 12.5
+        assert record.progress.original_size == 4096
+        assert record.progress.nfiles == 3
+        assert record.progress.path == "/data/b"
+
+    def test_progress_percent(self) -> None:
+        record = decode_borg_json_line(
+            json.dumps(
+                {
+                    "type": "progress_percent",
+                    "operation": 1,
+                    "msgid": "check.verify_data",
+                    "current": 5,
+                    "total": 20,
+                    "finished": False,
+                    "message": "Verifying data 25%",
+                    "time": 1.0,
+                }
+            )
+        )
+        assert record is not None
+        assert record.progress is not None
+        assert record.progress.msgid == "check.verify_data"
+        assert record.progress.current == 5
+        assert record.progress.total == 20
+
+
+class TestBorgProgressTracker:
+    """Test derived rates, ETA and throttling"""
+
+    def test_derives_rates_from_previous_sample(self) -> None:
+        tracker = BorgProgressTracker(min_interval=0.0)
+
+        first = tracker.update(_archive_progress(10.0, 1000, 10))
+        second = tracker.update(_archive_progress(12.0, 5000, 30))
+
+        assert first is not None and first.bytes_per_second is None
+        assert second is not None
+        assert second.bytes_per_second == 2000.0
+        assert second.files_per_second == 10.0
+        assert second.dedup_ratio == 4.0
+
+    def test_percent_and_eta(self) -> None:
+        tracker = BorgProgressTracker(min_interval=0.0)
+        base = {"type": "progress_percent", "msgid": "compact", "total": 100}
+
+        tracker.update(BorgProgress(timestamp=0.0, current=10, **base))  # type: ignore[arg-type]
+        progress = tracker.update(BorgProgress(timestamp=2.0, current=30, **base))  # type: ignore[arg-type]
+
+        assert progress is not None
+        assert progress.percent == 30.0
+        assert progress.eta_seconds == 7.0
+
+    def test_updates_are_throttled_except_finished(self) -> None:
+        clock = FakeClock()
+        tracker = BorgProgressTracker(min_interval=0.5, clock=clock)
+        emitted: List[BorgProgress] = []
+
+        for i in range(10):
+            clock.now = i * 0.1
+            progress = tracker.update(_archive_progress(clock.now, i * 100, i))
+            if progress is not None:
+                emitted.append(progress)
+
+        final = _archive_progress(clock.now, 1000, 10)
+        final.finished = True
+        assert tracker.update(final) is final
+        assert [p.nfiles for p in emitted] == [0, 5]
+
+    def test_file_status_counts_files(self) -> None:
+        tracker = BorgProgressTracker(min_interval=0.0)
+        for _ in range(3):
+            progress = tracker.update(
+                BorgProgress(type=FILE_STATUS, timestamp=1.0, status="A", path="x")
+            )
+        assert progress is not None
+        assert progress.nfiles == 3
+
+
+def test_formatting_helpers() -> None:
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(3 * 1024 * 1024) == "3.0 MiB"
+    assert format_duration(42) == "42s"
+    assert format_duration(185) == "3m05s"
+    assert format_duration(3720) == "1h02m"
+    assert (
+        BorgProgress(type="progress_percent", timestamp=0, percent=50, eta_seconds=65)
+    ).summary() == "50%, ETA 1m05s"
@@ -0,0 +1,281 @@
+"""
+Tests for CurrentJobsFragmentRenderer - incremental current jobs SSE rendering
+"""
+
+import uuid
+from typing import Dict, List
+from unittest.mock import Mock, patch
+
+import pytest
+
+from borgitory.dependencies import get_templates
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.jobs.broadcaster.job_event import JobEvent
+from borgitory.services.jobs.job_models import (
+    BorgJob,
+    BorgJobTask,
+    TaskStatusEnum,
+    TaskTypeEnum,
+)
+from borgitory.services.jobs.job_render_service import (
+    CURRENT_JOBS_OOB_EVENT,
+    CurrentJobsFragmentRenderer,
+    JobRenderService,
+)
+from borgitory.utils.datetime_utils import now_utc
+
+
+def _running_job() -> BorgJob:
+    return BorgJob(
+        id=uuid.uuid4(),
+        status=JobStatusEnum.RUNNING,
+        started_at=now_utc(),
+        job_type="composite",
+        tasks=[
+            BorgJobTask(
+                task_type=TaskTypeEnum.BACKUP,
+                task_name="backup",
+                status=TaskStatusEnum.RUNNING,
+            ),
+            BorgJobTask(task_type=TaskTypeEnum.PRUNE, task_name="prune"),
+        ],
+    )
+
+
+class TestCurrentJobsFragmentRenderer:
+    """Test diffing and throttling of current job fragments"""
+
+    @pytest.fixture
+    def jobs(self) -> Dict[uuid.UUID, BorgJob]:
+        return {}
+
+    @pytest.fixture
+    def render_service(self, jobs: Dict[uuid.UUID, BorgJob]) -> JobRenderService:
+        job_manager = Mock()
+        job_manager.jobs = jobs
+        return JobRenderService(job_manager=job_manager, templates=get_templates())
+
+    @pytest.fixture
+    def renderer(self, render_service: JobRenderService) -> CurrentJobsFragmentRenderer:
+        return CurrentJobsFragmentRenderer(render_service, min_render_interval=0.0)
+
+    def test_render_full_includes_job_fragments(
+        self,
+        renderer: CurrentJobsFragmentRenderer,
+        jobs: Dict[uuid.UUID, BorgJob],
+    ) -> None:
+        """Test the initial render wraps each job in an addressable fragment"""
+        job = _running_job()
+        jobs[job.id] = job
+
+        html = renderer.render_full()
+
+        assert 'id="current-jobs-list"' in html
+        assert f'id="current-job-{job.id}"' in html
+        assert "hx-swap-oob" not in html
+
+    def test_output_events_without_state_change_send_nothing(
+        self,
+        renderer: CurrentJobsFragmentRenderer,
+        jobs: Dict[uuid.UUID, BorgJob],
+    ) -> None:
+        """Test output for a job does not re-render it when nothing visible changed"""
+        job = _running_job()
+        jobs[job.id] = job
+        renderer.render_full()
+
+        for _ in range(50):
+            renderer.mark_dirty(
+                JobEvent(
+                    event_type=EventType.JOB_OUTPUT_BATCH,
+                    job_id=job.id,
+                    data={"lines": ["x"], "task_index": 0},
+                )
+            )
+            assert renderer.collect_updates() == []
+
+    def test_changed_job_is_sent_as_oob_swap(
+        self,
+        renderer: CurrentJobsFragmentRenderer,
+        jobs: Dict[uuid.UUID, BorgJob],
+    ) -> None:
+        """Test only the job whose state changed is re-rendered"""
+        job = _running_job()
+        other = _running_job()
+        jobs[job.id] = job
+        jobs[other.id] = other
+        renderer.render_full()
+
+        job.tasks[0].status = TaskStatusEnum.COMPLETED
+        job.current_task_index = 1
+        renderer.mark_dirty(JobEvent(event_type=EventType.TASK_STARTED, job_id=job.id))
+
+        updates = renderer.collect_updates()
+
+        assert len(updates) == 1
+        event_name, html = updates[0]
+        assert event_name == CURRENT_JOBS_OOB_EVENT
+        assert f'id="current-job-{job.id}" hx-swap-oob="true"' in html
+        assert "prune" in html
+        assert str(other.id) not in html
+
+    def test_rerenders_are_throttled_per_job(
+        self,
+        render_service: JobRenderService,
+        jobs: Dict[uuid.UUID, BorgJob],
+    ) -> None:
+        """Test a busy job is re-rendered at most once per interval"""
+        renderer = CurrentJobsFragmentRenderer(render_service, min_render_interval=5.0)
+        job = _running_job()
+        jobs[job.id] = job
+
+        with patch(
+            "borgitory.services.jobs.job_render_service.time.monotonic",
+            return_value=100.0,
+        ):
+            renderer.render_full()
+            job.current_task_index = 1
+            renderer.mark_dirty(
+                JobEvent(event_type=EventType.TASK_STARTED, job_id=job.id)
+            )
+            assert renderer.collect_updates() == []
+            assert renderer.seconds_until_due() == 5.0
+
+        with patch(
+            "borgitory.services.jobs.job_render_service.time.monotonic",
+            return_value=105.0,
+        ):
+            assert renderer.seconds_until_due() == 0.0
+            updates = renderer.collect_updates()
+
+        assert len(updates) == 1
+        assert renderer.seconds_until_due() is None
+
+    def test_throttled_events_do_not_load_jobs(
+        self,
+        render_service: JobRenderService,
+        jobs: Dict[uuid.UUID, BorgJob],
+    ) -> None:
+        """Test current jobs are loaded once per batch of due jobs, not per event"""
+        renderer = CurrentJobsFragmentRenderer(render_service, min_render_interval=5.0)
+        busy_jobs = [_running_job() for _ in range(3)]
+        for job in busy_jobs:
+            jobs[job.id] = job
+
+        with patch(
+            "borgitory.services.jobs.job_render_service.time.monotonic",
+            return_value=100.0,
+        ):
+            renderer.render_full()
+            with patch.object(
+                render_service,
+                "get_current_job_entries",
+                wraps=render_service.get_current_job_entries,
+            ) as get_entries:
+                for job in busy_jobs:
+                    job.current_task_index = 1
+                    renderer.mark_dirty(
+                        JobEvent(event_type=EventType.TASK_STARTED, job_id=job.id)
+                    )
+                    assert renderer.collect_updates() == []
+                assert get_entries.call_count == 0
+
+        with patch(
+            "borgitory.services.jobs.job_render_service.time.monotonic",
+            return_value=105.0,
+        ):
+            with patch.object(
+                render_service,
+                "get_current_job_entries",
+                wraps=render_service.get_current_job_entries,
+            ) as get_entries:
+                updates = renderer.collect_updates()
+                assert get_entries.call_count == 1
+
+        html = updates[0][1]
+        assert all(f'id="current-job-{job.id}"' in html for job in busy_jobs)
+
+    def test_membership_changes(
+        self,
+        renderer: CurrentJobsFragmentRenderer,
+        jobs: Dict[uuid.UUID, BorgJob],
+    ) -> None:
+        """Test added jobs are appended, finished jobs deleted, empty list re-rendered"""
+        first = _running_job()
+        jobs[first.id] = first
+        renderer.render_full()
+
+        second = _running_job()
+        jobs[second.id] = second
+        first.status = JobStatusEnum.COMPLETED
+        renderer.mark_dirty(
+            JobEvent(event_type=EventType.JOB_STARTED, job_id=second.id)
+        )
+        renderer.mark_dirty(
+            JobEvent(event_type=EventType.JOB_COMPLETED, job_id=first.id)
+        )
+        html = renderer.collect_updates()[0][1]
+        assert f'<div id="current-job-{first.id}" hx-swap-oob="delete"></div>' in html
+        assert 'hx-swap-oob="beforeend:#current-jobs-list"' in html
+        assert f'id="current-job-{second.id}" class=' in html
+        assert 'hx-swap-oob="true"' not in html
+
+        second.status = JobStatusEnum.COMPLETED
+        renderer.mark_dirty(
+            JobEvent(event_type=EventType.JOB_COMPLETED, job_id=second.id)
+        )
+        updates: List = renderer.collect_updates()
+        assert updates[0][0] is None
+        assert "current-jobs-list" not in updates[0][1]
+
+
+class TestStreamCurrentJobsHtml:
+    """Test the incremental current jobs SSE stream"""
+
+    async def test_stream_sends_oob_update_only_on_change(self) -> None:
+        """Test repeated output events produce no messages until state changes"""
+        job = _running_job()
+        job_manager = Mock()
+        job_manager.jobs = {job.id: job}
+
+        async def mock_stream():
+            for _ in range(20):
+                yield JobEvent(
+                    event_type=EventType.JOB_OUTPUT_BATCH,
+                    job_id=job.id,
+                    data={"lines": ["x"], "task_index": 0},
+                )
+            job.current_task_index = 1
+            yield JobEvent(event_type=EventType.TASK_STARTED, job_id=job.id)
+
+        job_manager.stream_all_job_updates = mock_stream
+        service = JobRenderService(
+            job_manager=job_manager,
+            templates=get_templates(),
+            min_render_interval=0.0,
+        )
+
+        chunks = [chunk async for chunk in service.stream_current_jobs_html()]
+
+        assert chunks.count("data: \n\n") == 2
+        assert chunks.count(f"event: {CURRENT_JOBS_OOB_EVENT}\n") == 1
+        assert any("prune" in chunk for chunk in chunks)
+
+
+def test_current_job_entry_includes_borg_progress_summary() -> None:
+    """Test structured task progress is summarised in the current jobs list"""
+    job = _running_job()
+    job.tasks[0].progress = {
+        "type": "progress_percent",
+        "timestamp": 1.0,
+        "percent": 40.0,
+        "eta_seconds": 30.0,
+    }
+    job_manager = Mock()
+    job_manager.jobs = {job.id: job}
+    service = JobRenderService(job_manager=job_manager, templates=get_templates())
+
+    entry = service.get_current_job_entries()[job.id]
+
+    assert "40%, ETA 30s" in str(entry["progress_info"])
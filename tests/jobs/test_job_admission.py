@@ -0,0 +1,189 @@
+"""
+Tests for load-aware admission of queued jobs
+"""
+
+import asyncio
+import uuid
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from borgitory.services.jobs.job_admission import (
+    AdmissionController,
+    AdmissionThresholds,
+    HostLoadSample,
+    read_host_load,
+)
+from borgitory.services.jobs.job_queue_manager import JobQueueManager, QueuedJob
+
+
+def test_read_host_load_parses_procfs(tmp_path: Path) -> None:
+    """Test load average, PSI and available memory are read"""
+    (tmp_path / "pressure").mkdir()
+    (tmp_path / "loadavg").write_text("3.50 2.00 1.00 2/300 4242\n")
+    (tmp_path / "pressure" / "io").write_text(
+        "some avg10=42.50 avg60=10.00 avg300=1.00 total=1\n"
+        "full avg10=30.00 avg60=5.00 avg300=0.50 total=1\n"
+    )
+    (tmp_path / "pressure" / "cpu").write_text(
+        "some avg10=7.25 avg60=1.00 avg300=0.10 total=1\n"
+    )
+    (tmp_path / "meminfo").write_text(
+        "MemTotal:        8000000 kB\nMemAvailable:    1024 kB\n"
+    )
+
+    sample = read_host_load(str(tmp_path))
+
+    assert sample.load_1m == 3.5
+    assert sample.io_pressure == 42.5
+    assert sample.cpu_pressure == 7.25
+    assert sample.memory_available_bytes == 1024 * 1024
+
+
+def test_missing_signals_never_hold(tmp_path: Path) -> None:
+    """Test hosts without procfs or PSI admit every job"""
+    controller = AdmissionController(sampler=lambda: read_host_load(str(tmp_path)))
+    assert controller.hold_reason() is None
+    sample = controller.last_sample
+    assert sample is not None
+    assert sample.load_1m is None
+    assert sample.io_pressure is None
+    assert sample.memory_available_bytes is None
+
+
+class FakeHost:
+    """Host load the tests can change between samples"""
+
+    def __init__(self) -> None:
+        self.sample = HostLoadSample(
+            load_1m=0.5, cpu_count=4, io_pressure=0.0, cpu_pressure=0.0
+        )
+        self.now = 0.0
+
+    def read(self) -> HostLoadSample:
+        return HostLoadSample(**vars(self.sample))
+
+    def clock(self) -> float:
+        return self.now
+
+
+class TestAdmissionController:
+    """Test thresholds, hysteresis and sampling"""
+
+    @pytest.fixture
+    def host(self) -> FakeHost:
+        return FakeHost()
+
+    @pytest.fixture
+    def controller(self, host: FakeHost) -> AdmissionController:
+        return AdmissionController(
+            AdmissionThresholds(
+                max_io_pressure=40.0,
+                min_available_memory_bytes=100,
+                hysteresis=0.25,
+            ),
+            sample_interval=1.0,
+            sampler=host.read,
+            clock=host.clock,
+        )
+
+    def _advance(self, host: FakeHost, **values: float) -> None:
+        for name, value in values.items():
+            setattr(host.sample, name, value)
+        host.now += 1.0
+
+    def test_pressure_holds_with_hysteresis(
+        self, host: FakeHost, controller: AdmissionController
+    ) -> None:
+        """Test jobs stay held until pressure drops below the release level"""
+        assert controller.hold_reason() is None
+
+        self._advance(host, io_pressure=55.0)
+        reason = controller.hold_reason()
+        assert reason is not None and "I/O pressure 55.0%" in reason
+
+        # Under the limit but above limit * (1 - hysteresis) = 30
+        self._advance(host, io_pressure=35.0)
+        assert controller.hold_reason() is not None
+
+        self._advance(host, io_pressure=25.0)
+        assert controller.hold_reason() is None
+
+        # Back inside the band without crossing the limit first
+        self._advance(host, io_pressure=35.0)
+        assert controller.hold_reason() is None
+
+    def test_low_memory_and_load_hold(
+        self, host: FakeHost, controller: AdmissionController
+    ) -> None:
+        """Test every tripped signal is reported"""
+        self._advance(host, memory_available_bytes=50, load_1m=12.0)
+        reason = controller.hold_reason()
+        assert reason is not None
+        assert "memory available" in reason
+        assert "load 3.00 per CPU" in reason
+
+        # 110 bytes is above the minimum but below 100 * 1.25
+        self._advance(host, memory_available_bytes=110, load_1m=1.0)
+        assert controller.hold_reason() == controller.current_reason
+        assert "load" not in (controller.current_reason or "")
+
+        self._advance(host, memory_available_bytes=200)
+        assert controller.hold_reason() is None
+
+    def test_samples_are_reused_within_interval(
+        self, host: FakeHost, controller: AdmissionController
+    ) -> None:
+        """Test the host is read at most once per sample interval"""
+        assert controller.hold_reason() is None
+        host.sample.io_pressure = 90.0
+        host.now += 0.5
+        assert controller.hold_reason() is None
+        host.now += 0.5
+        assert controller.hold_reason() is not None
+
+
+class TestQueueAdmission:
+    """Test the queue holds jobs below its limits while the host is loaded"""
+
+    async def test_loaded_host_holds_further_jobs(self) -> None:
+        """Test only the first job starts until host load recovers"""
+        host = FakeHost()
+        host.sample.io_pressure = 80.0
+        controller = AdmissionController(
+            AdmissionThresholds(max_io_pressure=40.0),
+            sample_interval=0.01,
+            sampler=host.read,
+        )
+        manager = JobQueueManager(max_concurrent_backups=3, admission=controller)
+        started: List[uuid.UUID] = []
+        manager.set_callbacks(
+            job_start_callback=lambda job_id, queued_job: started.append(job_id)
+        )
+        await manager.initialize()
+        first, second = uuid.uuid4(), uuid.uuid4()
+
+        try:
+            for job_id, repository in ((first, "/repos/a"), (second, "/repos/b")):
+                await manager.submit(
+                    QueuedJob(
+                        job_id=job_id, job_type="backup", repository_key=repository
+                    )
+                )
+            await asyncio.sleep(0.05)
+
+            # The first job is always admitted so the queue keeps moving
+            assert started == [first]
+            stats = manager.get_queue_stats()
+            assert stats.total_queued == 1
+            assert stats.admission_hold_reason is not None
+            assert "I/O pressure" in stats.admission_hold_reason
+            assert stats.host_load is not None and stats.host_load.io_pressure == 80.0
+
+            host.sample.io_pressure = 5.0
+            await asyncio.sleep(0.05)
+            assert started == [first, second]
+            assert manager.get_queue_stats().admission_hold_reason is None
+        finally:
+            await manager.shutdown()
@@ -8,8 +8,17 @@ import pytest
 import uuid
 from typing import Any, cast
 from unittest.mock import Mock, AsyncMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from borgitory.models.database import JobTask
 from borgitory.utils.datetime_utils import now_utc
-from borgitory.services.jobs.job_models import BorgJobTask, TaskTypeEnum, TaskStatusEnum
+from borgitory.services.jobs.job_models import (
+    MAX_TASK_OUTPUT_LINES,
+    BorgJobTask,
+    TaskTypeEnum,
+    TaskStatusEnum,
+)
+from borgitory.services.jobs.process_resources import ProcessResourceUsage
 from borgitory.models.job_results import JobStatusEnum, JobTypeEnum
 
 from borgitory.services.jobs.job_database_manager import (
@@ -138,6 +147,7 @@ class TestJobDatabaseManager:
         mock_job_instance.started_at = now_utc()
         mock_job_instance.finished_at = now_utc()
         mock_job_instance.log_output = "Job output"
+        mock_job_instance.get_log_output.return_value = "Job output"
         mock_job_instance.error = None
         mock_job_instance.cloud_sync_config_id = 123
 
@@ -228,7 +238,11 @@ class TestJobDatabaseManager:
 
         mock_result = Mock()
         mock_result.scalar_one_or_none = Mock(return_value=mock_job_instance)
-        mock_async_session.execute = AsyncMock(return_value=mock_result)
+        mock_tasks_result = Mock()
+        mock_tasks_result.scalars.return_value.all.return_value = []
+        mock_async_session.execute = AsyncMock(
+            side_effect=[mock_result, mock_tasks_result]
+        )
 
         result = await job_database_manager.save_job_tasks(
             job_id, cast(list[BorgJobTask], tasks)
@@ -422,7 +436,11 @@ class TestJobDatabaseManager:
 
         mock_result = Mock()
         mock_result.scalar_one_or_none = Mock(return_value=mock_job_instance)
-        mock_async_session.execute = AsyncMock(return_value=mock_result)
+        mock_tasks_result = Mock()
+        mock_tasks_result.scalars.return_value.all.return_value = []
+        mock_async_session.execute = AsyncMock(
+            side_effect=[mock_result, mock_tasks_result]
+        )
 
         result = await job_database_manager.save_job_tasks(
             job_id, cast(list[BorgJobTask], [mock_task])
@@ -430,3 +448,138 @@ class TestJobDatabaseManager:
 
         assert result is True
         mock_async_session.commit.assert_called_once()
+
+
+class TestJobTaskUpsert:
+    """Test incremental task persistence against a real database"""
+
+    @pytest.fixture
+    def database_manager(self, test_db: AsyncSession) -> JobDatabaseManager:
+        session_maker = async_sessionmaker(test_db.bind, expire_on_commit=False)
+        return JobDatabaseManager(async_session_maker=session_maker)
+
+    async def _create_job(self, database_manager: JobDatabaseManager) -> uuid.UUID:
+        job_id = uuid.uuid4()
+        await database_manager.create_database_job(
+            DatabaseJobData(
+                id=job_id,
+                repository_id=1,
+                job_type="backup",
+                status=JobStatusEnum.RUNNING,
+                started_at=now_utc(),
+            )
+        )
+        return job_id
+
+    async def _rows(self, test_db: AsyncSession, job_id: uuid.UUID) -> list[JobTask]:
+        test_db.expire_all()
+        result = await test_db.execute(
+            select(JobTask).where(JobTask.job_id == job_id).order_by(JobTask.task_order)
+        )
+        return list(result.scalars().all())
+
+    async def test_rows_are_updated_in_place(
+        self, database_manager: JobDatabaseManager, test_db: AsyncSession
+    ) -> None:
+        """Test repeated saves keep the same rows instead of re-inserting them"""
+        job_id = await self._create_job(database_manager)
+        tasks = [
+            BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup"),
+            BorgJobTask(task_type=TaskTypeEnum.PRUNE, task_name="prune"),
+        ]
+        assert await database_manager.save_job_tasks(job_id, tasks)
+        first_ids = [row.id for row in await self._rows(test_db, job_id)]
+
+        tasks[0].status = TaskStatusEnum.COMPLETED
+        tasks[0].return_code = 0
+        assert await database_manager.save_job_tasks(job_id, tasks)
+
+        rows = await self._rows(test_db, job_id)
+        assert [row.id for row in rows] == first_ids
+        assert rows[0].status == TaskStatusEnum.COMPLETED
+        assert rows[0].return_code == 0
+        assert rows[1].status == TaskStatusEnum.PENDING
+
+    async def test_output_tail_is_stored_when_task_finishes(
+        self, database_manager: JobDatabaseManager, test_db: AsyncSession
+    ) -> None:
+        """Test the output tail is written with new rows and finished tasks only"""
+        job_id = await self._create_job(database_manager)
+        task = BorgJobTask(
+            task_type=TaskTypeEnum.BACKUP,
+            task_name="backup",
+            status=TaskStatusEnum.RUNNING,
+        )
+        task.output_lines.extend(["line 1", "line 2"])
+        assert await database_manager.save_job_tasks(job_id, [task])
+        assert (await self._rows(test_db, job_id))[0].output == "line 1\nline 2"
+
+        # Output of a running task is not rewritten on every save
+        task.output_lines.append({"text": "line 3", "timestamp": "t"})
+        assert await database_manager.save_job_tasks(job_id, [task])
+        assert (await self._rows(test_db, job_id))[0].output == "line 1\nline 2"
+
+        task.status = TaskStatusEnum.COMPLETED
+        assert await database_manager.save_job_tasks(job_id, [task])
+        rows = await self._rows(test_db, job_id)
+        assert rows[0].output == "line 1\nline 2\nline 3"
+
+    async def test_only_output_tail_is_stored(
+        self, database_manager: JobDatabaseManager, test_db: AsyncSession
+    ) -> None:
+        """Test tasks keep and store at most MAX_TASK_OUTPUT_LINES lines"""
+        job_id = await self._create_job(database_manager)
+        task = BorgJobTask(
+            task_type=TaskTypeEnum.BACKUP,
+            task_name="backup",
+            output_lines=[f"line {i}" for i in range(MAX_TASK_OUTPUT_LINES + 50)],
+        )
+        assert len(task.output_lines) == MAX_TASK_OUTPUT_LINES
+
+        task.status = TaskStatusEnum.COMPLETED
+        assert await database_manager.save_job_tasks(job_id, [task])
+
+        output = (await self._rows(test_db, job_id))[0].output
+        assert output is not None
+        lines = output.split("\n")
+        assert len(lines) == MAX_TASK_OUTPUT_LINES
+        assert lines[0] == "line 50"
+
+    async def test_batch_saves_several_jobs(
+        self, database_manager: JobDatabaseManager, test_db: AsyncSession
+    ) -> None:
+        """Test a batch covers several jobs and reports missing ones"""
+        first = await self._create_job(database_manager)
+        second = await self._create_job(database_manager)
+        missing = uuid.uuid4()
+        task = BorgJobTask(task_type=TaskTypeEnum.CHECK, task_name="check")
+
+        results = await database_manager.save_job_tasks_batch(
+            {first: [task], second: [task, task], missing: [task]}
+        )
+
+        assert results == {first: True, second: True, missing: False}
+        assert len(await self._rows(test_db, first)) == 1
+        assert len(await self._rows(test_db, second)) == 2
+
+    async def test_resource_usage_is_persisted(
+        self, database_manager: JobDatabaseManager, test_db: AsyncSession
+    ) -> None:
+        """Test sampled resource usage lands in the task's resource columns"""
+        job_id = await self._create_job(database_manager)
+        task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")
+        assert await database_manager.save_job_tasks(job_id, [task])
+        assert (await self._rows(test_db, job_id))[0].get_resource_usage() is None
+
+        task.resource_usage = ProcessResourceUsage(
+            cpu_user_seconds=12.5,
+            cpu_system_seconds=1.5,
+            max_rss_bytes=256 * 1024 * 1024,
+            read_bytes=4096,
+            write_bytes=1024,
+        )
+        assert await database_manager.save_job_tasks(job_id, [task])
+
+        row = (await self._rows(test_db, job_id))[0]
+        assert row.io_read_bytes == 4096
+        assert row.get_resource_usage() == task.resource_usage
@@ -12,6 +12,7 @@ from borgitory.services.jobs.broadcaster.job_event import JobEvent
 from borgitory.services.jobs.broadcaster.job_event_broadcaster import (
     JobEventBroadcaster,
 )
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
 
 
 class TestJobEventBroadcaster:
@@ -113,9 +114,11 @@ class TestJobEventBroadcaster:
         assert event1["data"]["result"] == "success"
 
     def test_broadcast_event_full_queue(self) -> None:
-        """Test broadcasting to full client queue"""
+        """Test broadcasting to full client queue with the disconnect policy"""
         # Create queue at max capacity
-        queue = self.broadcaster.subscribe_client()
+        queue = self.broadcaster.subscribe_client(
+            overflow_policy=OverflowPolicy.DISCONNECT
+        )
         for i in range(5):  # Fill to max_queue_size
             queue.put_nowait(JobEvent(event_type=EventType.KEEPALIVE, data={"test": i}))
 
@@ -127,6 +130,105 @@ class TestJobEventBroadcaster:
         # Queue should be removed due to being full
         assert len(self.broadcaster._client_queues) < initial_client_count
 
+    def test_full_queue_drop_oldest_keeps_client(self) -> None:
+        """Test the drop-oldest policy makes room instead of disconnecting"""
+        queue = self.broadcaster.subscribe_client(
+            overflow_policy=OverflowPolicy.DROP_OLDEST
+        )
+        for i in range(7):
+            self.broadcaster.broadcast_event(
+                EventType.JOB_PROGRESS, job_id=uuid.uuid4(), data={"step": i}
+            )
+
+        assert queue in self.broadcaster._client_queues
+        steps = [queue.get_nowait().data["step"] for _ in range(queue.qsize())]
+        assert steps == [2, 3, 4, 5, 6]
+
+        stats = self.broadcaster.get_client_stats()
+        assert stats["client_details"][0]["events_dropped"] == 2
+        assert stats["client_details"][0]["overflows"] == 2
+        assert stats["total_events_dropped"] == 2
+
+    def test_full_queue_coalesces_output_into_skip_marker(self) -> None:
+        """Test the coalesce policy folds queued output into a skipped-lines marker"""
+        job_id = uuid.uuid4()
+        queue = self.broadcaster.subscribe_client(
+            job_id=job_id, overflow_policy=OverflowPolicy.COALESCE_OUTPUT
+        )
+        self.broadcaster.broadcast_event(EventType.TASK_STARTED, job_id=job_id)
+        for i in range(4):
+            self.broadcaster.broadcast_event(
+                EventType.JOB_OUTPUT_BATCH,
+                job_id=job_id,
+                data={"lines": [f"a{i}", f"b{i}"], "task_index": 0},
+            )
+        self.broadcaster.broadcast_event(
+            EventType.JOB_OUTPUT, job_id=job_id, data={"line": "x", "task_index": 0}
+        )
+
+        events = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert [event.event_type for event in events] == [
+            EventType.TASK_STARTED,
+            EventType.JOB_OUTPUT_SKIPPED,
+            EventType.JOB_OUTPUT,
+        ]
+        assert events[1].data == {"task_index": 0, "skipped": 8}
+
+        details = self.broadcaster.get_client_stats()["client_details"][0]
+        assert details["lines_skipped"] == 8
+        assert details["events_coalesced"] == 3
+        assert details["events_dropped"] == 0
+
+    def test_full_queue_collapses_status_events(self) -> None:
+        """Test the latest-status policy keeps only the newest status per job"""
+        job_id = uuid.uuid4()
+        queue = self.broadcaster.subscribe_client(
+            overflow_policy=OverflowPolicy.LATEST_STATUS
+        )
+        self.broadcaster.broadcast_event(EventType.JOB_STARTED, job_id=job_id)
+        for i in range(5):
+            self.broadcaster.broadcast_event(
+                EventType.JOB_PROGRESS, job_id=job_id, data={"step": i}
+            )
+
+        events = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert [event.event_type for event in events] == [
+            EventType.JOB_STARTED,
+            EventType.JOB_PROGRESS,
+        ]
+        assert events[1].data["step"] == 4
+
+    def test_client_stats_report_lag(self) -> None:
+        """Test lag and max lag are reported per client"""
+        queue = self.broadcaster.subscribe_client(client_id="slow")
+        for i in range(3):
+            self.broadcaster.broadcast_event(EventType.JOB_PROGRESS, data={"step": i})
+        queue.get_nowait()
+
+        details = self.broadcaster.get_client_stats()["client_details"][0]
+        assert details["lag"] == 2
+        assert details["max_lag"] == 3
+        assert details["overflow_policy"] == "drop_oldest"
+
+    async def test_cleanup_removes_stale_lagging_client(self) -> None:
+        """Test a lag-tolerant client is removed only after staying full"""
+        self.broadcaster.stale_client_timeout = 0.0
+        fresh = self.broadcaster.subscribe_client()
+        stale = self.broadcaster.subscribe_client()
+        for i in range(6):
+            self.broadcaster.broadcast_event(EventType.JOB_PROGRESS, data={"step": i})
+        fresh.get_nowait()
+        self.broadcaster.broadcast_event(EventType.JOB_PROGRESS, data={"step": 6})
+
+        with patch("asyncio.sleep", side_effect=asyncio.CancelledError()):
+            try:
+                await self.broadcaster._cleanup_disconnected_clients()
+            except asyncio.CancelledError:
+                pass
+
+        assert fresh in self.broadcaster._client_queues
+        assert stale not in self.broadcaster._client_queues
+
     def test_recent_events_limit(self) -> None:
         """Test recent events list respects size limit"""
         # Broadcast more events than max_recent_events (50)
@@ -210,6 +312,95 @@ class TestJobEventBroadcaster:
         }
         assert client_details["client-1"]["events_sent"] == 5
         assert client_details["client-2"]["events_sent"] == 3
+        assert client_details["client-1"]["topic"] == "*"
+
+    def test_job_subscription_only_receives_own_job(self) -> None:
+        """Test job-scoped subscribers only receive events for their job"""
+        job_a = uuid.uuid4()
+        job_b = uuid.uuid4()
+        queue_a = self.broadcaster.subscribe_client(job_id=job_a)
+        queue_b = self.broadcaster.subscribe_client(job_id=job_b)
+        queue_all = self.broadcaster.subscribe_client()
+
+        self.broadcaster.broadcast_event(
+            EventType.JOB_OUTPUT_BATCH,
+            job_id=job_a,
+            data={"lines": ["line"], "task_index": 0},
+        )
+
+        assert queue_a.qsize() == 1
+        assert queue_b.qsize() == 0
+        assert queue_all.qsize() == 1
+
+    def test_task_subscription_filters_task_index_and_type(self) -> None:
+        """Test task-scoped subscribers get their task's events and job-level events"""
+        job_id = uuid.uuid4()
+        queue = self.broadcaster.subscribe_client(
+            job_id=job_id,
+            task_index=1,
+            event_types=[EventType.JOB_OUTPUT_BATCH, EventType.JOB_COMPLETED],
+        )
+
+        self.broadcaster.broadcast_event(
+            EventType.JOB_OUTPUT_BATCH, job_id=job_id, data={"task_index": 0}
+        )
+        self.broadcaster.broadcast_event(
+            EventType.JOB_OUTPUT_BATCH, job_id=job_id, data={"task_index": 1}
+        )
+        self.broadcaster.broadcast_event(
+            EventType.TASK_STARTED, job_id=job_id, data={"task_index": 1}
+        )
+        self.broadcaster.broadcast_event(EventType.JOB_COMPLETED, job_id=job_id)
+        self.broadcaster.broadcast_event(EventType.KEEPALIVE)
+
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert [event.event_type for event in received] == [
+            EventType.JOB_OUTPUT_BATCH,
+            EventType.JOB_COMPLETED,
+            EventType.KEEPALIVE,
+        ]
+        assert received[0].data["task_index"] == 1
+
+    def test_full_topic_queue_does_not_affect_other_topics(self) -> None:
+        """Test output for one job cannot fill queues subscribed to another job"""
+        busy_job = uuid.uuid4()
+        idle_queue = self.broadcaster.subscribe_client(job_id=uuid.uuid4())
+
+        for i in range(20):
+            self.broadcaster.broadcast_event(
+                EventType.JOB_OUTPUT_BATCH,
+                job_id=busy_job,
+                data={"lines": [str(i)], "task_index": 0},
+            )
+
+        assert idle_queue in self.broadcaster._client_queues
+        assert idle_queue.qsize() == 0
+
+    def test_unsubscribe_removes_topic_index_entry(self) -> None:
+        """Test unsubscribing drops empty topics from the index"""
+        job_id = uuid.uuid4()
+        queue = self.broadcaster.subscribe_client(job_id=job_id, task_index=2)
+
+        assert self.broadcaster.get_subscriber_count(job_id) == 1
+        assert self.broadcaster.get_subscriber_count(job_id, 2) == 1
+
+        self.broadcaster.unsubscribe_client(queue)
+
+        assert self.broadcaster.get_subscriber_count(job_id) == 0
+        assert job_id not in self.broadcaster._topic_index
+        assert queue not in self.broadcaster._subscriptions
+
+    def test_recent_events_filtered_by_subscription(self) -> None:
+        """Test replayed recent events respect the subscription topic"""
+        job_a = uuid.uuid4()
+        job_b = uuid.uuid4()
+        self.broadcaster.broadcast_event(EventType.JOB_STARTED, job_id=job_a)
+        self.broadcaster.broadcast_event(EventType.JOB_STARTED, job_id=job_b)
+
+        queue = self.broadcaster.subscribe_client(job_id=job_b)
+
+        assert queue.qsize() == 1
+        assert queue.get_nowait().job_id == job_b
 
     def test_get_event_history(self) -> None:
         """Test getting event history"""
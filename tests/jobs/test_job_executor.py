@@ -82,6 +82,66 @@ class TestJobExecutor:
         assert output_lines == ["line1", "line2"]
         assert result.error is None
 
+    async def test_monitor_process_output_log_json(self) -> None:
+        """Test --log-json records are decoded into text and progress events"""
+
+        mock_process = Mock()
+        mock_process.wait = AsyncMock(return_value=0)
+
+        async def mock_stdout() -> AsyncGenerator[bytes, None]:
+            yield b'{"type": "log_message", "message": "Creating archive"}\n'
+            yield b'{"type": "file_status", "status": "A", "path": "/data/a"}\n'
+            yield (
+                b'{"type": "archive_progress", "time": 1.0, "original_size": 100,'
+                b' "compressed_size": 50, "deduplicated_size": 25, "nfiles": 1,'
+                b' "path": "/data/a", "finished": true}\n'
+            )
+            yield b"plain text line\n"
+
+        mock_process.stdout = mock_stdout()
+
+        output_lines = []
+        progress_updates = []
+
+        result = await self.executor.monitor_process_output(
+            mock_process,
+            output_callback=output_lines.append,
+            progress_callback=progress_updates.append,
+            log_json=True,
+        )
+
+        assert result.return_code == 0
+        assert output_lines == ["Creating archive", "A /data/a", "plain text line"]
+        assert result.stdout == b"Creating archive\nA /data/a\nplain text line\n"
+        assert progress_updates[0]["type"] == "file_status"
+        assert progress_updates[-1]["type"] == "archive_progress"
+        assert progress_updates[-1]["dedup_ratio"] == 4.0
+        assert "bytes_per_second" not in progress_updates[-1]
+
+    async def test_monitor_process_output_bounded(self) -> None:
+        """Test bounded capture keeps only the tail in stdout"""
+
+        mock_process = Mock()
+        mock_process.wait = AsyncMock(return_value=1)
+
+        async def mock_stdout() -> AsyncGenerator[bytes, None]:
+            for i in range(20000):
+                yield f"/data/file-{i:05d}\n".encode()
+
+        mock_process.stdout = mock_stdout()
+
+        result = await self.executor.monitor_process_output(
+            mock_process, bounded_output=True
+        )
+
+        assert result.output is not None
+        assert result.output.total_bytes == 20000 * 17
+        assert len(result.stdout) < result.output.total_bytes
+        assert result.stdout.endswith(b"/data/file-19999\n")
+        assert result.stdout_tail_lines(1) == ["/data/file-19999"]
+        assert sum(1 for _ in result.iter_stdout_lines()) == 20000
+        result.close()
+
     async def test_monitor_process_output_with_error(self) -> None:
         """Test process output monitoring with error"""
 
@@ -96,6 +156,36 @@ class TestJobExecutor:
         assert result.error is not None
         assert "Process monitoring error" in result.error
 
+    async def test_monitor_process_output_cancelled(self) -> None:
+        """Test cancelling the monitor terminates the process"""
+
+        mock_process = Mock()
+        mock_process.pid = None
+        mock_process.returncode = None
+        mock_process.wait = AsyncMock(return_value=-15)
+        mock_process.terminate = Mock()
+
+        async def mock_stdout() -> AsyncGenerator[bytes, None]:
+            yield b"first line\n"
+            await asyncio.Event().wait()
+            yield b"never read\n"
+
+        mock_process.stdout = mock_stdout()
+        lines = []
+
+        monitor = asyncio.create_task(
+            self.executor.monitor_process_output(
+                mock_process, output_callback=lines.append
+            )
+        )
+        while not lines:
+            await asyncio.sleep(0)
+        monitor.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await monitor
+        mock_process.terminate.assert_called_once()
+
     def test_parse_progress_line_borg_output(self) -> None:
         """Test parsing Borg progress output"""
         line = "1000000 500000 300000 100 /path/to/file"
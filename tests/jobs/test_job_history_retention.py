@@ -0,0 +1,209 @@
+"""
+Tests for JobHistoryRetentionService - compression, pruning and vacuum
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from borgitory.config.job_history_config import JobHistoryRetentionConfig
+from borgitory.models.database import Job, JobTask
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.services.jobs.job_history_retention import JobHistoryRetentionService
+from borgitory.services.jobs.job_log_store import JobLogStore
+from borgitory.utils.datetime_utils import now_utc
+
+NOW = now_utc()
+
+
+def _add_job(
+    db: AsyncSession,
+    repository_id: int = 1,
+    status: JobStatusEnum = JobStatusEnum.COMPLETED,
+    age: timedelta = timedelta(days=2),
+    output: str = "archive line\n" * 200,
+) -> uuid.UUID:
+    job_id = uuid.uuid4()
+    finished_at: Optional[datetime] = (
+        None if status == JobStatusEnum.RUNNING else NOW - age
+    )
+    job = Job(
+        id=job_id,
+        repository_id=repository_id,
+        type="backup",
+        status=status,
+        started_at=NOW - age - timedelta(minutes=5),
+        finished_at=finished_at,
+        log_output=output,
+    )
+    job.tasks = [
+        JobTask(
+            task_type="backup",
+            task_name="backup",
+            status="completed",
+            output=output,
+            task_order=0,
+        )
+    ]
+    db.add(job)
+    return job_id
+
+
+class TestJobHistoryRetentionService:
+    """Test the retention engine against a real SQLite database"""
+
+    def _service(
+        self,
+        test_db: AsyncSession,
+        log_store: Optional[JobLogStore] = None,
+        **config: object,
+    ) -> JobHistoryRetentionService:
+        session_maker = async_sessionmaker(test_db.bind, expire_on_commit=False)
+        return JobHistoryRetentionService(
+            session_maker,
+            JobHistoryRetentionConfig(**config),  # type: ignore[arg-type]
+            clock=lambda: NOW,
+            log_store=log_store,
+        )
+
+    async def test_finished_jobs_are_compressed_transparently(
+        self, test_db: AsyncSession
+    ) -> None:
+        """Test old output moves to BLOB columns and still reads back"""
+        old_job = _add_job(test_db, age=timedelta(days=2))
+        recent_job = _add_job(test_db, age=timedelta(hours=1))
+        running_job = _add_job(test_db, status=JobStatusEnum.RUNNING)
+        await test_db.commit()
+
+        report = await self._service(test_db, compress_after_hours=24).run()
+
+        assert report.compressed_tasks == 1
+        assert report.compressed_jobs == 1
+        assert report.compression_saved_bytes > 0
+
+        test_db.expire_all()
+        tasks = {
+            task.job_id: task
+            for task in (await test_db.execute(select(JobTask))).scalars().all()
+        }
+        old_task = tasks[old_job]
+        assert old_task.output is None
+        assert old_task.output_compressed is not None
+        assert old_task.get_output() == "archive line\n" * 200
+        assert tasks[recent_job].output is not None
+        assert tasks[running_job].output is not None
+
+        job = await test_db.get(Job, old_job)
+        assert job is not None
+        assert job.log_output is None
+        assert job.get_log_output() == "archive line\n" * 200
+
+    async def test_prunes_by_age_and_count(self, test_db: AsyncSession) -> None:
+        """Test old jobs and jobs beyond the per-repository limit are deleted"""
+        _add_job(test_db, repository_id=1, age=timedelta(days=400))
+        for days in range(1, 5):
+            _add_job(test_db, repository_id=2, age=timedelta(days=days))
+        _add_job(test_db, repository_id=2, status=JobStatusEnum.RUNNING)
+        await test_db.commit()
+
+        report = await self._service(
+            test_db, max_age_days=365, max_jobs_per_repository=2, batch_size=1
+        ).run()
+
+        assert report.pruned_jobs == 3
+        assert report.pruned_tasks == 3
+        test_db.expire_all()
+        remaining = (
+            await test_db.execute(
+                select(Job.repository_id, func.count()).group_by(Job.repository_id)
+            )
+        ).all()
+        # Two newest finished jobs plus the running one
+        assert dict(remaining) == {2: 3}
+        task_count = (await test_db.execute(select(func.count(JobTask.id)))).scalar()
+        assert task_count == 3
+
+    async def test_nothing_is_pruned_by_default(self, test_db: AsyncSession) -> None:
+        """Test job history is kept unless a pruning limit is configured"""
+        _add_job(test_db, age=timedelta(days=4000))
+        await test_db.commit()
+
+        report = await self._service(test_db).run()
+
+        assert report.pruned_jobs == 0
+        assert (await test_db.execute(select(func.count(Job.id)))).scalar() == 1
+
+    async def test_pruned_jobs_lose_their_logs(
+        self, test_db: AsyncSession, tmp_path: Path
+    ) -> None:
+        """Test pruning deletes the on-disk logs of deleted jobs only"""
+        log_store = JobLogStore(str(tmp_path))
+        old_job = _add_job(test_db, age=timedelta(days=400))
+        recent_job = _add_job(test_db, age=timedelta(days=1))
+        await test_db.commit()
+        for job_id in (old_job, recent_job):
+            log_store.append_lines(job_id, 0, ["archive line"])
+
+        report = await self._service(test_db, log_store, max_age_days=30).run()
+
+        assert report.pruned_jobs == 1
+        assert not log_store.has_log(old_job)
+        assert log_store.has_log(recent_job)
+
+    async def test_reclaim_space_switches_to_incremental_vacuum(
+        self, test_db: AsyncSession
+    ) -> None:
+        """Test the first run converts the database and later runs vacuum incrementally"""
+        service = self._service(test_db, convert_to_incremental_vacuum=True)
+        first = await service.run()
+
+        for _ in range(20):
+            _add_job(test_db, output="file /data/path\n" * 5000)
+        await test_db.commit()
+        second = await service.run()
+
+        assert first.vacuum_mode_converted is True
+        assert second.vacuum_mode_converted is False
+        assert second.compressed_tasks == 20
+        assert second.reclaimed_bytes > 0
+        auto_vacuum = (
+            await (await test_db.connection()).exec_driver_sql("PRAGMA auto_vacuum")
+        ).scalar()
+        assert auto_vacuum == 2
+        assert service.last_report is second
+        assert second.to_dict()["reclaimed_bytes"] == second.reclaimed_bytes
+
+    async def test_vacuum_mode_is_not_converted_while_jobs_run(
+        self, test_db: AsyncSession
+    ) -> None:
+        """Test the blocking full VACUUM is opt-in and waits for idle time"""
+        running_job = _add_job(test_db, status=JobStatusEnum.RUNNING)
+        await test_db.commit()
+
+        assert (await self._service(test_db).run()).vacuum_mode_converted is False
+        service = self._service(test_db, convert_to_incremental_vacuum=True)
+        assert (await service.run()).vacuum_mode_converted is False
+
+        job = await test_db.get(Job, running_job)
+        assert job is not None
+        job.status = JobStatusEnum.COMPLETED
+        job.finished_at = NOW
+        await test_db.commit()
+        assert (await service.run()).vacuum_mode_converted is True
+
+    @pytest.mark.parametrize("run_interval", [0.0])
+    async def test_start_is_noop_when_disabled(
+        self, test_db: AsyncSession, run_interval: float
+    ) -> None:
+        """Test a zero run interval leaves the background loop off"""
+        service = self._service(test_db, run_interval=run_interval)
+
+        await service.start()
+        await service.stop()
+
+        assert service.last_report is None
@@ -0,0 +1,156 @@
+"""
+Tests for JobLogStore - segmented, offset-indexed on-disk job output
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+from borgitory.services.jobs.job_log_store import JobLogStore, TaskLog
+
+
+@pytest.fixture
+def log_store(tmp_path: Path) -> JobLogStore:
+    """Small segments and index interval so tests cross boundaries"""
+    return JobLogStore(str(tmp_path), segment_max_bytes=200, index_interval=4)
+
+
+class TestJobLogStore:
+    """Test JobLogStore functionality"""
+
+    def test_append_and_read_all(self, log_store: JobLogStore) -> None:
+        """Appended lines are returned in order"""
+        job_id = uuid.uuid4()
+
+        total = log_store.append_lines(job_id, 0, ["first", "second", "third"])
+
+        assert total == 3
+        assert log_store.line_count(job_id, 0) == 3
+        assert log_store.read_lines(job_id, 0) == ["first", "second", "third"]
+        assert log_store.read_text(job_id, 0) == "first\nsecond\nthird"
+
+    def test_read_range_across_segments(self, log_store: JobLogStore) -> None:
+        """Ranges spanning several segments and index entries are exact"""
+        job_id = uuid.uuid4()
+        lines = [f"output line number {i:04d}" for i in range(100)]
+        for i in range(0, 100, 7):
+            log_store.append_lines(job_id, 0, lines[i : i + 7])
+
+        segments = [
+            name
+            for name in os.listdir(log_store.task_dir(job_id, 0))
+            if name.endswith(".log")
+        ]
+        assert len(segments) > 1
+        assert log_store.line_count(job_id, 0) == 100
+        assert log_store.read_lines(job_id, 0, 37, 25) == lines[37:62]
+        assert log_store.read_lines(job_id, 0, 95, 50) == lines[95:]
+        assert log_store.read_lines(job_id, 0, 100, 5) == []
+        assert log_store.tail_lines(job_id, 0, 3) == lines[-3:]
+
+    def test_reopen_rebuilds_state_from_disk(
+        self, log_store: JobLogStore, tmp_path: Path
+    ) -> None:
+        """A fresh store sees lines written by another instance"""
+        job_id = uuid.uuid4()
+        lines = [f"line {i}" for i in range(30)]
+        log_store.append_lines(job_id, 2, lines[:10])
+        log_store.append_lines(job_id, 2, lines[10:])
+
+        reopened = JobLogStore(str(tmp_path), segment_max_bytes=200, index_interval=4)
+
+        assert reopened.line_count(job_id, 2) == 30
+        assert reopened.read_lines(job_id, 2, 13, 5) == lines[13:18]
+
+        reopened.append_lines(job_id, 2, ["appended"])
+        assert reopened.tail_lines(job_id, 2, 2) == ["line 29", "appended"]
+
+    def test_reopen_empty_log(self, log_store: JobLogStore, tmp_path: Path) -> None:
+        """A log created without lines reopens with no lines"""
+        job_id = uuid.uuid4()
+        log_store.append_lines(job_id, 0, [])
+
+        reopened = JobLogStore(str(tmp_path), segment_max_bytes=200, index_interval=4)
+
+        assert reopened.line_count(job_id, 0) == 0
+        assert reopened.read_lines(job_id, 0) == []
+        assert reopened.append_lines(job_id, 0, ["first"]) == 1
+
+    def test_missing_index_is_rebuilt(
+        self, log_store: JobLogStore, tmp_path: Path
+    ) -> None:
+        """Deleting a sidecar index does not lose lines"""
+        job_id = uuid.uuid4()
+        lines = [f"line {i}" for i in range(12)]
+        log_store.append_lines(job_id, 0, lines)
+        task_dir = log_store.task_dir(job_id, 0)
+        for name in os.listdir(task_dir):
+            if name.endswith(".idx"):
+                os.remove(os.path.join(task_dir, name))
+
+        reopened = JobLogStore(str(tmp_path), segment_max_bytes=200, index_interval=4)
+
+        assert reopened.read_lines(job_id, 0, 9, 3) == lines[9:]
+
+    def test_multiline_text_round_trips(self, log_store: JobLogStore) -> None:
+        """Embedded newlines do not split a stored line"""
+        job_id = uuid.uuid4()
+
+        log_store.append_lines(job_id, 0, ["multi\nline", "single"])
+
+        assert log_store.line_count(job_id, 0) == 2
+        assert log_store.read_lines(job_id, 0) == ["multi\nline", "single"]
+
+    def test_list_tasks_and_delete(self, log_store: JobLogStore) -> None:
+        """Task logs are listed per job and removed together"""
+        job_id = uuid.uuid4()
+        log_store.append_lines(job_id, 1, ["b"])
+        log_store.append_lines(job_id, 0, ["a"])
+
+        assert log_store.list_tasks(job_id) == [0, 1]
+        assert log_store.has_log(job_id)
+
+        assert log_store.delete_job(job_id) is True
+        assert not log_store.has_log(job_id)
+        assert log_store.line_count(job_id, 0) == 0
+        assert log_store.delete_job(job_id) is False
+
+    def test_unknown_job_reads_empty(self, log_store: JobLogStore) -> None:
+        """Reading a job that never wrote output returns nothing"""
+        job_id = uuid.uuid4()
+
+        assert log_store.read_lines(job_id, 0) == []
+        assert log_store.tail_lines(job_id, 0, 10) == []
+        assert log_store.list_tasks(job_id) == []
+
+    def test_closed_log_is_loaded_once_for_reads(self, log_store: JobLogStore) -> None:
+        """Reads of a log without a writer reuse its loaded segments"""
+        job_id = uuid.uuid4()
+        lines = [f"line {i}" for i in range(12)]
+        log_store.append_lines(job_id, 0, lines)
+        log_store.close_job(job_id)
+
+        loads = 0
+        load_task_log = log_store._load_task_log
+
+        def counting_load(directory: str) -> TaskLog:
+            nonlocal loads
+            loads += 1
+            return load_task_log(directory)
+
+        log_store._load_task_log = counting_load  # type: ignore[method-assign]
+
+        assert log_store.read_lines(job_id, 0, 2, 3) == lines[2:5]
+        assert log_store.tail_lines(job_id, 0, 2) == lines[-2:]
+        assert loads == 1
+
+        # Appending takes over the cached log, so reads stay current
+        log_store.append_lines(job_id, 0, ["appended"])
+        assert log_store.tail_lines(job_id, 0, 1) == ["appended"]
+        assert loads == 1
+
+        log_store.close_job(job_id)
+        assert log_store.line_count(job_id, 0) == 13
+        assert loads == 2
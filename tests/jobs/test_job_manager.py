@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import uuid
 from datetime import datetime
@@ -9,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from borgitory.models.job_results import JobStatusEnum, JobTypeEnum
 from borgitory.services.jobs.job_manager import JobManager
+from borgitory.services.jobs.job_manager_factory import JobManagerFactory
 from borgitory.services.jobs.job_models import (
     JobManagerConfig,
     BorgJob,
@@ -229,6 +231,46 @@ class TestJobManager:
         # Test that shutdown clears jobs
         assert job_manager.jobs == {}
 
+    async def test_shutdown_leaves_persisted_jobs_to_be_resumed(self) -> None:
+        """Test shutdown interrupts repository jobs and cancels ad-hoc ones"""
+        manager = JobManager(dependencies=JobManagerFactory.create_for_testing())
+        job = BorgJob(
+            id=uuid.uuid4(),
+            status=JobStatusEnum.PENDING,
+            started_at=now_utc(),
+            job_type="composite",
+            repository_id=1,
+            tasks=[BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")],
+        )
+        ad_hoc = BorgJob(
+            id=uuid.uuid4(),
+            status=JobStatusEnum.RUNNING,
+            started_at=now_utc(),
+            job_type="simple",
+            command=["borg", "list"],
+        )
+        manager.jobs[job.id] = job
+        manager.jobs[ad_hoc.id] = ad_hoc
+
+        async def run_forever(job: BorgJob, task_index: int) -> None:
+            await asyncio.Event().wait()
+
+        with patch.object(manager, "_run_composite_task", run_forever):
+            run = asyncio.create_task(manager._execute_composite_job(job))
+            manager._job_runs.add(run)
+            await asyncio.sleep(0.01)
+            await manager.shutdown()
+
+        assert run.done()
+        assert job.status == JobStatusEnum.RUNNING
+        assert ad_hoc.status == JobStatusEnum.CANCELLED
+        statuses = {
+            call.args[1]
+            for call in manager.database_manager.update_job_status.await_args_list
+            if call.args[0] == job.id
+        }
+        assert statuses == {JobStatusEnum.RUNNING}
+
     def test_create_job_task(self, job_manager: JobManager) -> None:
         """Test task creation"""
         # Test creating a BorgJobTask directly since _create_job_task is private/removed
@@ -400,6 +442,30 @@ class TestJobManager:
         result = job_manager.cleanup_job(uuid.uuid4())
         assert result is False
 
+    def test_cleanup_job_deletes_only_ad_hoc_logs(
+        self, job_manager: JobManager
+    ) -> None:
+        """Test persisted jobs keep their on-disk log for the job history"""
+        ad_hoc = BorgJob(
+            id=uuid.uuid4(), status=JobStatusEnum.COMPLETED, started_at=now_utc()
+        )
+        persisted = BorgJob(
+            id=uuid.uuid4(),
+            status=JobStatusEnum.COMPLETED,
+            started_at=now_utc(),
+            repository_id=1,
+        )
+        for job in (ad_hoc, persisted):
+            job_manager.jobs[job.id] = job
+
+        with patch.object(
+            job_manager.output_manager, "delete_job_output"
+        ) as delete_job_output:
+            job_manager.cleanup_job(ad_hoc.id)
+            job_manager.cleanup_job(persisted.id)
+
+        delete_job_output.assert_called_once_with(ad_hoc.id)
+
     def test_event_subscription_interface(self, job_manager: JobManager) -> None:
         """Test event subscription interface exists"""
         # Test that the event broadcaster is accessible
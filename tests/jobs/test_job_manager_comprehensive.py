@@ -72,6 +72,8 @@ def mock_queue_manager() -> Mock:
     queue_manager.add_job = Mock()
     queue_manager.get_next_job = Mock()
     queue_manager.remove_job = Mock()
+    queue_manager.enqueue_job = AsyncMock(return_value=True)
+    queue_manager.mark_job_completed = Mock()
     queue_manager.initialize = AsyncMock()
     return queue_manager
 
@@ -203,6 +205,10 @@ class TestJobManagerTaskExecution:
         # Override specific mocks if needed for the test
         manager.output_manager = mock_output_manager
         manager.queue_manager = mock_queue_manager
+        # The mock queue starts every job as soon as it is enqueued
+        mock_queue_manager.enqueue_job.side_effect = lambda job_id, **kwargs: (
+            manager._on_job_start(job_id, Mock())
+        )
 
         return manager
 
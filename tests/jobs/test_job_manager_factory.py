@@ -2,8 +2,12 @@
 Tests for JobManagerFactory methods for dependency injection
 """
 
+from pathlib import Path
 from unittest.mock import Mock, AsyncMock
 
+import pytest
+
+from borgitory.dependencies import get_job_log_store
 from borgitory.protocols.job_event_broadcaster_protocol import (
     JobEventBroadcasterProtocol,
 )
@@ -96,3 +100,22 @@ class TestJobManagerFactory:
         deps_custom.async_session_maker = custom_factory
 
         assert deps_custom.async_session_maker is custom_factory
+
+    def test_log_store_is_shared_with_dependencies(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the factory reuses the application's log store for its directory"""
+        monkeypatch.setenv("BORG_JOB_LOG_DIR", str(tmp_path / "logs"))
+        get_job_log_store.cache_clear()
+        try:
+            shared = JobManagerFactory._create_log_store(
+                JobManagerConfig(job_log_dir=str(tmp_path / "logs"))
+            )
+            other = JobManagerFactory._create_log_store(
+                JobManagerConfig(job_log_dir=str(tmp_path / "other"))
+            )
+
+            assert shared is get_job_log_store()
+            assert other is not None and other is not shared
+        finally:
+            get_job_log_store.cache_clear()
@@ -91,6 +91,10 @@ class TestJobManagerTaskExecution:
         self._ensure_mock_dependencies(
             manager, mock_output_manager, mock_queue_manager, mock_event_broadcaster
         )
+        # The mock queue starts every job as soon as it is enqueued
+        mock_queue_manager.enqueue_job.side_effect = lambda job_id, **kwargs: (
+            manager._on_job_start(job_id, Mock())
+        )
 
         return manager
 
@@ -314,7 +318,9 @@ class TestJobManagerTaskExecution:
         job = job_manager_with_db.jobs[job_id]
 
         # Mock backup to fail (critical)
-        async def mock_backup_fail(job: BorgJob, task: BorgJobTask) -> bool:
+        async def mock_backup_fail(
+            job: BorgJob, task: BorgJobTask, task_index: int = 0
+        ) -> bool:
             task.status = TaskStatusEnum.FAILED
             task.return_code = 1
             task.error = "Backup failed"
@@ -561,11 +567,13 @@ class TestJobManagerTaskExecution:
         mock_process = AsyncMock()
         mock_job_executor.start_process.return_value = mock_process
 
+        spooled_output = Mock()
         mock_job_executor.monitor_process_output.return_value = ProcessResult(
             return_code=2,
             stdout=b"Repository locked",
             stderr=b"",
             error="Backup failed",
+            output=spooled_output,
         )
 
         success = await job_manager_with_mocks.backup_executor.execute_backup_task(
@@ -577,6 +585,9 @@ class TestJobManagerTaskExecution:
         assert task.return_code == 2
         assert task.error is not None
         assert "Backup failed" in task.error
+        # Output was streamed while the process ran and is not replayed
+        spooled_output.iter_lines.assert_not_called()
+        spooled_output.close.assert_called_once()
 
     async def test_execute_backup_task_with_dry_run(
         self,
@@ -836,6 +847,8 @@ class TestJobManagerTaskExecution:
         assert success is True
         assert task.status == TaskStatusEnum.COMPLETED
         assert task.return_code == 0
+        # Output was streamed while the process ran and is not replayed
+        assert list(task.output_lines) == []
 
     async def test_execute_cloud_sync_task_success(
         self,
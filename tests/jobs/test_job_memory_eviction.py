@@ -0,0 +1,188 @@
+"""
+Tests for JobMemoryEvictor - memory-bounded eviction of finished jobs
+"""
+
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.services.jobs.job_memory_eviction import (
+    JobMemoryEvictor,
+    estimate_job_bytes,
+)
+from borgitory.services.jobs.job_log_store import JobLogStore
+from borgitory.services.jobs.job_models import BorgJob, BorgJobTask, TaskTypeEnum
+from borgitory.services.jobs.job_output_manager import JobOutputManager
+from borgitory.utils.datetime_utils import now_utc
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _job(lines: int = 10, status: JobStatusEnum = JobStatusEnum.COMPLETED) -> BorgJob:
+    task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")
+    task.output_lines = [f"line {i} " + "x" * 100 for i in range(lines)]
+    return BorgJob(
+        id=uuid.uuid4(),
+        status=status,
+        started_at=now_utc(),
+        job_type="composite",
+        tasks=[task],
+    )
+
+
+class TestJobMemoryEvictor:
+    """Test TTL and LRU eviction of finished jobs"""
+
+    @pytest.fixture
+    def jobs(self) -> Dict[uuid.UUID, BorgJob]:
+        return {}
+
+    @pytest.fixture
+    def output_manager(self) -> JobOutputManager:
+        return JobOutputManager(max_lines_per_job=100)
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    def _evictor(
+        self,
+        jobs: Dict[uuid.UUID, BorgJob],
+        output_manager: JobOutputManager,
+        clock: FakeClock,
+        max_memory_bytes: int = 0,
+    ) -> JobMemoryEvictor:
+        return JobMemoryEvictor(
+            lambda: jobs,
+            output_manager,
+            finished_job_ttl=60.0,
+            max_memory_bytes=max_memory_bytes,
+            clock=clock,
+        )
+
+    async def _add(
+        self,
+        jobs: Dict[uuid.UUID, BorgJob],
+        output_manager: JobOutputManager,
+        job: BorgJob,
+    ) -> BorgJob:
+        jobs[job.id] = job
+        await output_manager.add_output_lines(
+            job.id, [str(line) for line in job.tasks[0].output_lines]
+        )
+        return job
+
+    async def test_finished_jobs_expire_after_ttl(
+        self,
+        jobs: Dict[uuid.UUID, BorgJob],
+        output_manager: JobOutputManager,
+        clock: FakeClock,
+    ) -> None:
+        """Test finished jobs and their output are dropped once the TTL passes"""
+        evictor = self._evictor(jobs, output_manager, clock)
+        job = await self._add(jobs, output_manager, _job())
+        output_manager.close_job_output(job.id)
+        evictor.job_finished(job.id)
+
+        clock.now += 59
+        assert evictor.evict() == []
+        assert job.id in jobs
+
+        clock.now += 1
+        assert evictor.evict() == [job.id]
+        assert job.id not in jobs
+        assert output_manager.get_job_output(job.id) is None
+        assert job.id not in output_manager._output_locks
+        assert evictor.usage().evicted_jobs == 1
+
+    async def test_evicted_ad_hoc_job_logs_are_deleted(
+        self, jobs: Dict[uuid.UUID, BorgJob], clock: FakeClock, tmp_path: Path
+    ) -> None:
+        """Test only logs of jobs that were never persisted leave the disk"""
+        log_store = JobLogStore(str(tmp_path))
+        output_manager = JobOutputManager(max_lines_per_job=100, log_store=log_store)
+        evictor = self._evictor(jobs, output_manager, clock)
+        ad_hoc = await self._add(jobs, output_manager, _job())
+        persisted = _job()
+        persisted.repository_id = 1
+        await self._add(jobs, output_manager, persisted)
+        for job in (ad_hoc, persisted):
+            output_manager.close_job_output(job.id)
+            evictor.job_finished(job.id)
+
+        clock.now += 60
+        assert set(evictor.evict()) == {ad_hoc.id, persisted.id}
+        await output_manager.wait_for_log_writes()
+
+        assert not log_store.has_log(ad_hoc.id)
+        assert log_store.line_count(persisted.id, 0) == 10
+
+    async def test_lru_eviction_over_budget(
+        self,
+        jobs: Dict[uuid.UUID, BorgJob],
+        output_manager: JobOutputManager,
+        clock: FakeClock,
+    ) -> None:
+        """Test least recently used finished jobs go first over the budget"""
+        finished: List[BorgJob] = [
+            await self._add(jobs, output_manager, _job()) for _ in range(3)
+        ]
+        running = await self._add(
+            jobs, output_manager, _job(status=JobStatusEnum.RUNNING)
+        )
+        evictor = self._evictor(jobs, output_manager, clock)
+        per_job = evictor.usage().total_bytes // len(jobs)
+        evictor.max_memory_bytes = per_job * 2 + per_job // 2
+        for job in finished:
+            evictor.job_finished(job.id)
+
+        evictor.touch(finished[0].id)
+        evicted = evictor.evict()
+
+        assert evicted == [finished[1].id, finished[2].id]
+        assert set(jobs) == {finished[0].id, running.id}
+        assert evictor.usage().total_bytes <= evictor.max_memory_bytes
+
+    async def test_unfinished_jobs_are_never_evicted(
+        self,
+        jobs: Dict[uuid.UUID, BorgJob],
+        output_manager: JobOutputManager,
+        clock: FakeClock,
+    ) -> None:
+        """Test jobs not handed to the evictor stay even over budget"""
+        job = await self._add(jobs, output_manager, _job(lines=500))
+        evictor = self._evictor(jobs, output_manager, clock, max_memory_bytes=1)
+
+        clock.now += 3600
+        assert evictor.evict() == []
+        usage = evictor.usage()
+        assert job.id in jobs
+        assert usage.active_jobs == 1
+        assert usage.job_bytes >= estimate_job_bytes(job) > 500 * 100
+
+    async def test_orphaned_closed_outputs_are_cleared(
+        self,
+        jobs: Dict[uuid.UUID, BorgJob],
+        output_manager: JobOutputManager,
+        clock: FakeClock,
+    ) -> None:
+        """Test output containers of untracked finished jobs are released"""
+        orphan = uuid.uuid4()
+        streaming = uuid.uuid4()
+        await output_manager.add_output_lines(orphan, ["done"])
+        output_manager.close_job_output(orphan)
+        await output_manager.add_output_lines(streaming, ["still going"])
+
+        self._evictor(jobs, output_manager, clock).evict()
+
+        assert output_manager.get_job_output(orphan) is None
+        assert output_manager.get_job_output(streaming) is not None
@@ -0,0 +1,110 @@
+"""
+Tests for JobOutputIngestor - micro-batched output storage and broadcast
+"""
+
+import asyncio
+import uuid
+from unittest.mock import Mock
+
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
+from borgitory.services.jobs.job_output_manager import JobOutputManager
+
+
+class TestJobOutputIngestor:
+    """Test JobOutputIngestor batching behaviour"""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures"""
+        self.output_manager = JobOutputManager(max_lines_per_job=100)
+        self.event_broadcaster = Mock()
+
+    def _batch_events(self) -> list:
+        return [
+            call
+            for call in self.event_broadcaster.broadcast_event.call_args_list
+            if call.args[0] == EventType.JOB_OUTPUT_BATCH
+        ]
+
+    async def test_flushes_when_batch_size_reached(self) -> None:
+        """Test a full buffer is flushed immediately as one batch"""
+        ingestor = JobOutputIngestor(
+            self.output_manager,
+            self.event_broadcaster,
+            max_batch_lines=3,
+            max_batch_latency=60.0,
+        )
+        job_id = uuid.uuid4()
+
+        for i in range(7):
+            ingestor.submit(job_id, 0, f"line {i}")
+
+        batches = self._batch_events()
+        assert [call.kwargs["data"]["lines"] for call in batches] == [
+            ["line 0", "line 1", "line 2"],
+            ["line 3", "line 4", "line 5"],
+        ]
+        assert ingestor.pending_line_count(job_id) == 1
+
+        await ingestor.flush(job_id)
+
+        assert ingestor.pending_line_count(job_id) == 0
+        assert len(self._batch_events()) == 3
+        assert self.output_manager.get_job_output(job_id).total_lines == 7
+
+    async def test_flushes_after_latency_window(self) -> None:
+        """Test a partial buffer is flushed once the latency bound expires"""
+        ingestor = JobOutputIngestor(
+            self.output_manager,
+            self.event_broadcaster,
+            max_batch_lines=1000,
+            max_batch_latency=0.01,
+        )
+        job_id = uuid.uuid4()
+
+        ingestor.submit(job_id, 1, "first")
+        ingestor.submit(job_id, 1, "second")
+        assert self._batch_events() == []
+
+        await asyncio.sleep(0.05)
+
+        batches = self._batch_events()
+        assert len(batches) == 1
+        assert batches[0].kwargs["data"] == {
+            "lines": ["first", "second"],
+            "task_index": 1,
+            "progress": None,
+        }
+        job_output = self.output_manager.get_job_output(job_id)
+        assert [line.text for line in job_output.lines] == ["first", "second"]
+
+    async def test_tasks_are_buffered_separately(self) -> None:
+        """Test each task of a job gets its own batch"""
+        ingestor = JobOutputIngestor(
+            self.output_manager, self.event_broadcaster, max_batch_latency=60.0
+        )
+        job_id = uuid.uuid4()
+
+        ingestor.submit(job_id, 0, "backup line")
+        ingestor.submit(job_id, 1, "prune line")
+        await ingestor.flush(job_id)
+
+        batches = {
+            call.kwargs["data"]["task_index"]: call.kwargs["data"]["lines"]
+            for call in self._batch_events()
+        }
+        assert batches == {0: ["backup line"], 1: ["prune line"]}
+
+    async def test_storage_errors_do_not_propagate(self) -> None:
+        """Test a failing output manager does not break the flush"""
+        failing_manager = Mock()
+        failing_manager.add_output_lines = Mock(side_effect=RuntimeError("boom"))
+        ingestor = JobOutputIngestor(
+            failing_manager, self.event_broadcaster, max_batch_latency=60.0
+        )
+        job_id = uuid.uuid4()
+
+        ingestor.submit(job_id, 0, "line")
+        await ingestor.flush(job_id)
+
+        assert len(self._batch_events()) == 1
@@ -2,9 +2,13 @@
 Tests for JobOutputManager - job output collection, storage, and streaming
 """
 
+import asyncio
 import uuid
 from datetime import timedelta
+from typing import Dict, List
+from pathlib import Path
 
+from borgitory.services.jobs.job_log_store import JobLogStore
 from borgitory.services.jobs.job_output_manager import JobOutputManager
 from borgitory.utils.datetime_utils import now_utc
 
@@ -131,6 +135,78 @@ class TestJobOutputManager:
         assert outputs[0]["type"] == "output"
         assert outputs[0]["data"]["text"] == "Initial line"
 
+    async def test_add_output_lines_batch(self) -> None:
+        """Test adding a batch of lines updates totals once"""
+        job_id = uuid.uuid4()
+
+        await self.output_manager.add_output_lines(
+            job_id, ["a", "b", "c"], "stdout", {"files": 3}
+        )
+
+        job_output = self.output_manager.get_job_output(job_id)
+        assert [line.text for line in job_output.lines] == ["a", "b", "c"]
+        assert job_output.total_lines == 3
+        assert job_output.current_progress == {"files": 3}
+
+    async def test_stream_job_output_cursor_survives_full_deque(self) -> None:
+        """Test streaming resumes from an absolute line after the deque wraps"""
+        job_id = uuid.uuid4()
+        for i in range(25):
+            await self.output_manager.add_output_line(job_id, f"line {i}")
+
+        outputs = [
+            output
+            async for output in self.output_manager.stream_job_output(
+                job_id, follow=False, since=20
+            )
+        ]
+
+        assert [o["data"]["text"] for o in outputs] == [
+            f"line {i}" for i in range(20, 25)
+        ]
+        assert [o["line_number"] for o in outputs] == list(range(20, 25))
+
+    async def test_stream_job_output_reports_gap(self) -> None:
+        """Test lines evicted from the deque are reported as a gap"""
+        job_id = uuid.uuid4()
+        for i in range(15):
+            await self.output_manager.add_output_line(job_id, f"line {i}")
+
+        outputs = [
+            output
+            async for output in self.output_manager.stream_job_output(
+                job_id, follow=False
+            )
+        ]
+
+        assert outputs[0] == {"type": "gap", "line_number": 0, "skipped": 5}
+        assert outputs[1]["line_number"] == 5
+        assert len(outputs) == 11
+
+    async def test_stream_job_output_followers_wake_on_new_lines(self) -> None:
+        """Test followers block until notified and finish when output closes"""
+        job_id = uuid.uuid4()
+        self.output_manager.create_job_output(job_id)
+
+        async def follow() -> List[Dict[str, object]]:
+            return [
+                output async for output in self.output_manager.stream_job_output(job_id)
+            ]
+
+        followers = [asyncio.create_task(follow()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        await self.output_manager.add_output_line(job_id, "first")
+        await asyncio.sleep(0)
+        await self.output_manager.add_output_line(job_id, "second")
+        self.output_manager.close_job_output(job_id)
+
+        results = await asyncio.wait_for(asyncio.gather(*followers), timeout=1.0)
+
+        for outputs in results:
+            assert [o["data"]["text"] for o in outputs[:-1]] == ["first", "second"]
+            assert outputs[-1] == {"type": "complete", "total_lines": 2}
+
     def test_get_output_summary(self) -> None:
         """Test getting output summary"""
         job_id = uuid.uuid4()
@@ -162,6 +238,7 @@ class TestJobOutputManager:
         assert result is True
         assert job_id not in self.output_manager._job_outputs
         assert job_id not in self.output_manager._output_locks
+        assert job_id not in self.output_manager._output_waiters
 
     def test_get_all_job_outputs(self) -> None:
         """Test getting all job output summaries"""
@@ -237,3 +314,89 @@ class TestJobOutputManager:
         assert cleaned_count == 1
         assert "old-job" not in self.output_manager._job_outputs
         assert "new-job" in self.output_manager._job_outputs
+
+
+class TestJobOutputManagerLogStore:
+    """Test JobOutputManager persistence to the on-disk log store"""
+
+    async def test_add_output_line_writes_to_log_store(self, tmp_path: Path) -> None:
+        """Lines beyond the in-memory limit remain readable from disk"""
+        output_manager = JobOutputManager(
+            max_lines_per_job=5, log_store=JobLogStore(str(tmp_path))
+        )
+        job_id = uuid.uuid4()
+
+        for i in range(20):
+            await output_manager.add_output_line(
+                job_id, f"line {i}", "stdout", task_index=1
+            )
+
+        assert len(output_manager.get_job_output(job_id).lines) == 5
+        assert await output_manager.has_task_output(job_id, 1)
+        assert await output_manager.get_task_line_count(job_id, 1) == 20
+        assert await output_manager.get_task_output_lines(job_id, 1, 0, 2) == [
+            "line 0",
+            "line 1",
+        ]
+        assert await output_manager.get_task_output_tail(job_id, 1, 1) == ["line 19"]
+
+    async def test_stream_reads_evicted_lines_from_log_store(
+        self, tmp_path: Path
+    ) -> None:
+        """A follower behind the deque gets the missed lines of every task"""
+        output_manager = JobOutputManager(
+            max_lines_per_job=3, log_store=JobLogStore(str(tmp_path))
+        )
+        job_id = uuid.uuid4()
+        expected = []
+        for i in range(4):
+            for task_index in (0, 1):
+                text = f"task {task_index} line {i}"
+                await output_manager.add_output_line(
+                    job_id, text, task_index=task_index
+                )
+                expected.append(text)
+        await output_manager.add_output_line(job_id, "error", "stderr", task_index=1)
+        expected.append("error")
+
+        outputs = [
+            output
+            async for output in output_manager.stream_job_output(
+                job_id, follow=False, since=1
+            )
+        ]
+
+        assert [o["data"].text for o in outputs] == expected[1:]
+        assert [o["line_number"] for o in outputs] == list(range(1, 9))
+        assert outputs[-1]["data"].type == "stderr"
+
+    async def test_batch_progress_is_copied(self) -> None:
+        """Lines keep the progress they were added with"""
+        output_manager = JobOutputManager()
+        job_id = uuid.uuid4()
+        progress: Dict[str, object] = {"files": 1}
+
+        await output_manager.add_output_lines(job_id, ["a", "b"], "stdout", progress)
+        progress["files"] = 2
+
+        lines = output_manager.get_job_output(job_id).lines
+        assert [line.metadata for line in lines] == [{"files": 1}, {"files": 1}]
+
+    async def test_task_index_defaults_to_zero(self, tmp_path: Path) -> None:
+        """Lines without a task index go to the first task log"""
+        output_manager = JobOutputManager(log_store=JobLogStore(str(tmp_path)))
+        job_id = uuid.uuid4()
+
+        await output_manager.add_output_line(job_id, "only line")
+
+        assert await output_manager.get_task_output_text(job_id, 0) == "only line"
+
+    async def test_reads_without_log_store(self) -> None:
+        """Without a log store the task readers return empty results"""
+        output_manager = JobOutputManager()
+        job_id = uuid.uuid4()
+
+        assert not await output_manager.has_task_output(job_id, 0)
+        assert await output_manager.get_task_line_count(job_id, 0) == 0
+        assert await output_manager.get_task_output_lines(job_id, 0) == []
+        assert await output_manager.get_task_output_text(job_id, 0) == ""
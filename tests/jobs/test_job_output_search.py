@@ -0,0 +1,333 @@
+"""
+Tests for the job output full-text search index
+"""
+
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from borgitory.config.job_history_config import JobHistoryRetentionConfig
+from borgitory.dependencies import get_job_output_search_service
+from borgitory.main import app
+from borgitory.models.database import Repository
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.services.jobs.job_database_manager import (
+    DatabaseJobData,
+    JobDatabaseManager,
+)
+from borgitory.services.jobs.job_history_retention import (
+    JobHistoryRetentionService,
+    RetentionReport,
+)
+from borgitory.services.jobs.job_log_store import JobLogStore, LogLineRange
+from borgitory.services.jobs.job_models import (
+    BorgJobTask,
+    TaskStatusEnum,
+    TaskTypeEnum,
+)
+from borgitory.services.jobs.job_output_search import (
+    JobOutputIndex,
+    JobOutputSearchService,
+    build_match_query,
+    build_snippet,
+    job_output_chunks,
+)
+from borgitory.utils.datetime_utils import now_utc
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("Permission denied", '"Permission" "denied"'),
+        ('"file changed" while', '"file changed" "while"'),
+        ("perm*", '"perm"*'),
+        ('NEAR(a b) OR "x', '"NEAR(a" "b)" "OR" """x"'),
+        ("   ", ""),
+    ],
+)
+def test_build_match_query(text: str, expected: str) -> None:
+    """Test user input becomes a safe FTS5 query"""
+    assert build_match_query(text) == expected
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ('"permission denied"', "/raw: \x02Permission denied\x03 <root>"),
+        ("perm*", "/raw: \x02Permission\x03 denied <root>"),
+        ("DENIED root", "/raw: Permission \x02denied\x03 <\x02root\x03>"),
+        ("permit", "/raw: Permission denied <root>"),
+    ],
+)
+def test_build_snippet_marks_whole_tokens(query: str, expected: str) -> None:
+    """Test matches are marked like FTS5 tokenizes them"""
+    assert build_snippet("/raw: Permission denied <root>", query) == expected
+
+
+def test_build_snippet_is_cut_around_the_first_match() -> None:
+    """Test long text is cut to a window of tokens around the match"""
+    words = [f"w{i}" for i in range(100)]
+    words[50] = "needle"
+    snippet = build_snippet(" ".join(words), "needle", max_tokens=8)
+    assert snippet == "…w48 w49 \x02needle\x03 w51 w52 w53 w54 w55…"
+
+
+class TestJobOutputSearch:
+    """Test indexing persisted output and searching it"""
+
+    @pytest.fixture
+    def session_maker(self, test_db: AsyncSession) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(test_db.bind, expire_on_commit=False)
+
+    @pytest.fixture
+    def log_store(self, tmp_path: Path) -> JobLogStore:
+        return JobLogStore(str(tmp_path / "logs"))
+
+    @pytest.fixture
+    def index(self, log_store: JobLogStore) -> JobOutputIndex:
+        return JobOutputIndex(log_store=log_store)
+
+    @pytest.fixture
+    def database_manager(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        index: JobOutputIndex,
+        log_store: JobLogStore,
+    ) -> JobDatabaseManager:
+        return JobDatabaseManager(
+            async_session_maker=session_maker,
+            output_index=index,
+            log_store=log_store,
+        )
+
+    @pytest.fixture
+    async def repositories(self, test_db: AsyncSession) -> List[Repository]:
+        repositories = []
+        for name in ("photos", "documents"):
+            repo = Repository()
+            repo.name = name
+            repo.path = f"/repos/{name}"
+            repo.set_passphrase("secret")
+            test_db.add(repo)
+            repositories.append(repo)
+        await test_db.commit()
+        return repositories
+
+    async def _create_job(
+        self, database_manager: JobDatabaseManager, repository: Repository
+    ) -> uuid.UUID:
+        job_id = uuid.uuid4()
+        await database_manager.create_database_job(
+            DatabaseJobData(
+                id=job_id,
+                repository_id=repository.id,
+                job_type="backup",
+                status=JobStatusEnum.RUNNING,
+                started_at=now_utc(),
+            )
+        )
+        return job_id
+
+    async def test_appended_output_is_searchable(
+        self,
+        test_db: AsyncSession,
+        database_manager: JobDatabaseManager,
+        index: JobOutputIndex,
+        log_store: JobLogStore,
+        repositories: List[Repository],
+    ) -> None:
+        """Test each flush indexes only new log lines and every chunk is found"""
+        job_id = await self._create_job(database_manager, repositories[0])
+        task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="Backup photos")
+        log_store.append_lines(job_id, 0, ["A /photos/a.jpg"])
+        assert await database_manager.save_job_tasks(job_id, [task])
+
+        log_store.append_lines(job_id, 0, ["/photos/raw: Permission denied <root>"])
+        assert await database_manager.save_job_tasks(job_id, [task])
+        log_store.append_lines(
+            job_id, 0, ["/photos/b.jpg: file changed while we backed it up"]
+        )
+        task.status = TaskStatusEnum.FAILED
+        assert await database_manager.save_job_tasks(job_id, [task])
+
+        chunks = (await test_db.execute(select(job_output_chunks))).all()
+        assert [(chunk.first_line, chunk.line_count) for chunk in chunks] == [
+            (0, 1),
+            (1, 1),
+            (2, 1),
+        ]
+        # The text stays in the log store only
+        assert all(chunk.content is None for chunk in chunks)
+
+        service = JobOutputSearchService(index)
+        result = await service.search(test_db, '"permission denied"')
+        assert [hit.job_id for hit in result.hits] == [job_id]
+        assert result.hits[0].repository_name == "photos"
+        assert result.hits[0].task_status == TaskStatusEnum.FAILED
+        snippet = str(result.hits[0].snippet)
+        assert ">Permission denied</mark>" in snippet
+        assert "&lt;root&gt;" in snippet
+
+        result = await service.search(test_db, '"file changed"')
+        assert len(result.hits) == 1
+
+    async def test_search_filters(
+        self,
+        test_db: AsyncSession,
+        database_manager: JobDatabaseManager,
+        index: JobOutputIndex,
+        repositories: List[Repository],
+    ) -> None:
+        """Test hits are filtered by repository, task type and start time"""
+        for repository in repositories:
+            job_id = await self._create_job(database_manager, repository)
+            backup = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")
+            backup.output_lines = ["lock timeout while waiting"]
+            check = BorgJobTask(task_type=TaskTypeEnum.CHECK, task_name="check")
+            check.output_lines = ["lock timeout during check"]
+            assert await database_manager.save_job_tasks(job_id, [backup, check])
+
+        service = JobOutputSearchService(index)
+        assert len((await service.search(test_db, "lock timeout")).hits) == 4
+
+        result = await service.search(
+            test_db, "lock", repository_id=repositories[1].id, task_type="check"
+        )
+        assert len(result.hits) == 1
+        assert result.hits[0].repository_name == "documents"
+        assert result.hits[0].task_type == "check"
+
+        tomorrow = now_utc() + timedelta(days=1)
+        result = await service.search(test_db, "lock", started_after=tomorrow)
+        assert result.hits == []
+
+    async def test_pruned_jobs_leave_the_index(
+        self,
+        test_db: AsyncSession,
+        session_maker: async_sessionmaker[AsyncSession],
+        database_manager: JobDatabaseManager,
+        index: JobOutputIndex,
+        repositories: List[Repository],
+    ) -> None:
+        """Test retention removes index entries of deleted jobs"""
+        job_id = await self._create_job(database_manager, repositories[0])
+        task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")
+        task.output_lines = ["Permission denied"]
+        assert await database_manager.save_job_tasks(job_id, [task])
+        await database_manager.update_job_status(
+            job_id, JobStatusEnum.FAILED, finished_at=now_utc() - timedelta(days=400)
+        )
+
+        retention = JobHistoryRetentionService(
+            session_maker,
+            JobHistoryRetentionConfig(max_age_days=30, max_jobs_per_repository=0),
+            output_index=index,
+        )
+        await retention.prune_history(RetentionReport(started_at=now_utc()))
+
+        chunks = await test_db.scalar(
+            select(func.count()).select_from(job_output_chunks)
+        )
+        assert chunks == 0
+        assert await self._indexed_chunks(test_db, "denied") == []
+
+    async def test_removed_log_chunks_leave_the_index(
+        self,
+        test_db: AsyncSession,
+        index: JobOutputIndex,
+        log_store: JobLogStore,
+    ) -> None:
+        """Test chunks indexed from the log store are removed from the index"""
+        assert await index.ensure(test_db)
+        job_id = uuid.uuid4()
+        log_store.append_lines(job_id, 0, ["lock timeout", "Permission denied"])
+        await index.append_task_output(
+            test_db, 7, "lock timeout", LogLineRange(job_id, 0, 0, 1)
+        )
+        await index.append_task_output(
+            test_db, 7, "Permission denied", LogLineRange(job_id, 0, 1, 1)
+        )
+        assert len(await self._indexed_chunks(test_db, "timeout OR denied")) == 2
+
+        await index.remove_tasks(test_db, [7])
+
+        assert await self._indexed_chunks(test_db, "timeout OR denied") == []
+        await test_db.execute(
+            text(
+                "INSERT INTO job_task_output_fts (job_task_output_fts) VALUES ('integrity-check')"
+            )
+        )
+
+    async def test_chunks_without_text_are_dropped(
+        self,
+        test_db: AsyncSession,
+        index: JobOutputIndex,
+        log_store: JobLogStore,
+    ) -> None:
+        """Test chunks whose log is gone are dropped without touching the index"""
+        assert await index.ensure(test_db)
+        job_id = uuid.uuid4()
+        log_store.append_lines(job_id, 0, ["lock timeout"])
+        await index.append_task_output(
+            test_db, 7, "lock timeout", LogLineRange(job_id, 0, 0, 1)
+        )
+        await index.append_task_output(test_db, 7, "Permission denied")
+        log_store.delete_job(job_id)
+
+        await index.remove_tasks(test_db, [7])
+
+        chunks = await test_db.scalar(
+            select(func.count()).select_from(job_output_chunks)
+        )
+        assert chunks == 0
+        assert await self._indexed_chunks(test_db, "denied") == []
+        await test_db.execute(
+            text(
+                "INSERT INTO job_task_output_fts (job_task_output_fts) VALUES ('integrity-check')"
+            )
+        )
+
+    async def _indexed_chunks(self, db: AsyncSession, query: str) -> List[int]:
+        result = await db.execute(
+            text(
+                "SELECT rowid FROM job_task_output_fts "
+                "WHERE job_task_output_fts MATCH :query"
+            ),
+            {"query": query},
+        )
+        return list(result.scalars().all())
+
+    async def test_search_endpoint_renders_highlighted_hits(
+        self,
+        async_client: AsyncClient,
+        test_db: AsyncSession,
+        database_manager: JobDatabaseManager,
+        index: JobOutputIndex,
+        repositories: List[Repository],
+    ) -> None:
+        """Test the HTML endpoint renders matching snippets"""
+        job_id = await self._create_job(database_manager, repositories[0])
+        task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")
+        task.output_lines = ["/srv/data: Permission denied"]
+        assert await database_manager.save_job_tasks(job_id, [task])
+
+        app.dependency_overrides[get_job_output_search_service] = lambda: (
+            JobOutputSearchService(index)
+        )
+        try:
+            response = await async_client.get(
+                "/api/jobs/search",
+                params={"q": "permission", "repository_id": "", "date_from": ""},
+            )
+        finally:
+            app.dependency_overrides.pop(get_job_output_search_service, None)
+
+        assert response.status_code == 200
+        assert "Permission</mark>" in response.text
+        assert f"/api/jobs/html?expand={job_id}" in response.text
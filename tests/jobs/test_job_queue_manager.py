@@ -0,0 +1,232 @@
+"""
+Tests for JobQueueManager - concurrency limits, per-repository serialization
+and event-driven dispatch with priority aging
+"""
+
+import asyncio
+import uuid
+from datetime import timedelta
+from typing import AsyncGenerator, List
+
+import pytest
+
+from borgitory.services.jobs.job_queue_manager import (
+    JobPriority,
+    JobQueueManager,
+    QueuedJob,
+)
+from borgitory.utils.datetime_utils import now_utc
+
+
+async def _settle() -> None:
+    """Give the queue processors a few polling rounds"""
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+class TestRepositoryAwareDispatch:
+    """Test that jobs of one repository never overlap"""
+
+    @pytest.fixture
+    async def queue_manager(self) -> AsyncGenerator[JobQueueManager, None]:
+        manager = JobQueueManager(
+            max_concurrent_backups=2,
+            max_concurrent_operations=2,
+            queue_poll_interval=0.001,
+        )
+        yield manager
+        await manager.shutdown()
+
+    @pytest.fixture
+    def started(self, queue_manager: JobQueueManager) -> List[uuid.UUID]:
+        started: List[uuid.UUID] = []
+
+        def on_start(job_id: uuid.UUID, queued_job: QueuedJob) -> None:
+            started.append(job_id)
+
+        queue_manager.set_callbacks(job_start_callback=on_start)
+        return started
+
+    async def test_jobs_of_one_repository_run_one_at_a_time(
+        self, queue_manager: JobQueueManager, started: List[uuid.UUID]
+    ) -> None:
+        """Test a prune waits for the backup of the same repository"""
+        backup, prune = uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(backup, "backup", repository_key="/repos/a")
+        await queue_manager.enqueue_job(prune, "prune", repository_key="/repos/a")
+        await _settle()
+
+        assert started == [backup]
+        stats = queue_manager.get_queue_stats()
+        assert stats.busy_repositories == 1
+        assert stats.blocked_by_repository == 1
+
+        queue_manager.mark_job_completed(backup, True)
+        await _settle()
+
+        assert started == [backup, prune]
+        assert queue_manager.get_queue_stats().blocked_by_repository == 0
+
+    async def test_blocked_job_is_skipped_for_next_runnable(
+        self, queue_manager: JobQueueManager, started: List[uuid.UUID]
+    ) -> None:
+        """Test a job for an idle repository overtakes one for a busy repository"""
+        first, blocked, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(first, "backup", repository_key="/repos/a")
+        await _settle()
+        await queue_manager.enqueue_job(
+            blocked, "backup", JobPriority.HIGH, repository_key="/repos/a"
+        )
+        await queue_manager.enqueue_job(other, "backup", repository_key="/repos/b")
+        await _settle()
+
+        assert started == [first, other]
+
+        # Both backup slots are taken; the blocked job starts after the
+        # repository is released
+        queue_manager.mark_job_completed(first, True)
+        await _settle()
+        assert started == [first, other, blocked]
+
+    async def test_global_limit_still_applies(
+        self, queue_manager: JobQueueManager, started: List[uuid.UUID]
+    ) -> None:
+        """Test different repositories run in parallel up to the slot limit"""
+        job_ids = [uuid.uuid4() for _ in range(3)]
+        for index, job_id in enumerate(job_ids):
+            await queue_manager.enqueue_job(
+                job_id, "backup", repository_key=f"/repos/{index}"
+            )
+        await _settle()
+
+        assert started == job_ids[:2]
+
+        queue_manager.mark_job_completed(job_ids[1], False)
+        await _settle()
+        assert started == job_ids
+
+    async def test_removed_job_is_never_started(
+        self, queue_manager: JobQueueManager, started: List[uuid.UUID]
+    ) -> None:
+        """Test a job removed while waiting does not start"""
+        running, waiting = uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(running, "check", repository_key="/repos/a")
+        await queue_manager.enqueue_job(waiting, "check", repository_key="/repos/a")
+        await _settle()
+
+        assert queue_manager.remove_job(waiting)
+        assert not queue_manager.remove_job(waiting)
+        queue_manager.mark_job_completed(running, True)
+        await _settle()
+
+        assert started == [running]
+        assert queue_manager.get_queue_stats().total_queued == 0
+
+    async def test_completing_unknown_job_is_ignored(
+        self, queue_manager: JobQueueManager, started: List[uuid.UUID]
+    ) -> None:
+        """Test completion of a job the queue never started keeps slots intact"""
+        await queue_manager.initialize()
+        queue_manager.mark_job_completed(uuid.uuid4(), True)
+
+        job_ids = [uuid.uuid4() for _ in range(3)]
+        for job_id in job_ids:
+            await queue_manager.enqueue_job(job_id, "backup")
+        await _settle()
+
+        assert started == job_ids[:2]
+
+
+class TestEventDrivenDispatch:
+    """Test dispatch order, wakeups and priority aging"""
+
+    @pytest.fixture
+    async def queue_manager(self) -> AsyncGenerator[JobQueueManager, None]:
+        # A poll interval this long would stall any polling dispatcher
+        manager = JobQueueManager(
+            max_concurrent_backups=1,
+            max_concurrent_operations=1,
+            queue_poll_interval=60.0,
+            priority_aging_interval=300.0,
+        )
+        yield manager
+        await manager.shutdown()
+
+    @pytest.fixture
+    def started(self, queue_manager: JobQueueManager) -> List[QueuedJob]:
+        started: List[QueuedJob] = []
+
+        def on_start(job_id: uuid.UUID, queued_job: QueuedJob) -> None:
+            started.append(queued_job)
+
+        queue_manager.set_callbacks(job_start_callback=on_start)
+        return started
+
+    async def test_enqueue_and_release_wake_the_dispatcher(
+        self, queue_manager: JobQueueManager, started: List[QueuedJob]
+    ) -> None:
+        """Test jobs start right after enqueue and after a slot is released"""
+        first, second = uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(first, "backup")
+        await _settle()
+        await queue_manager.enqueue_job(second, "backup")
+        await _settle()
+        assert [job.job_id for job in started] == [first]
+
+        queue_manager.mark_job_completed(first, True)
+        await _settle()
+        assert [job.job_id for job in started] == [first, second]
+
+    async def test_high_priority_overtakes_job_waiting_for_a_slot(
+        self, queue_manager: JobQueueManager, started: List[QueuedJob]
+    ) -> None:
+        """Test the best job is chosen when the slot frees, not when queued"""
+        running, low, high = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(running, "check")
+        await _settle()
+        await queue_manager.enqueue_job(low, "check", JobPriority.LOW)
+        await _settle()
+        await queue_manager.enqueue_job(high, "check", JobPriority.HIGH)
+
+        queue_manager.mark_job_completed(running, True)
+        await _settle()
+        assert [job.job_id for job in started] == [running, high]
+
+    async def test_aged_low_priority_job_is_not_starved(
+        self, queue_manager: JobQueueManager, started: List[QueuedJob]
+    ) -> None:
+        """Test a long-waiting LOW job overtakes fresher HIGH jobs"""
+        running, low, high = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(running, "backup")
+        await _settle()
+        await queue_manager.enqueue_job(low, "backup", JobPriority.LOW)
+        await queue_manager.enqueue_job(high, "backup", JobPriority.HIGH)
+
+        # Three aging intervals raise LOW above HIGH
+        waiting = queue_manager._backup_queue[0].job
+        waiting.queued_at = now_utc() - timedelta(seconds=900)
+
+        queue_manager.mark_job_completed(running, True)
+        await _settle()
+        assert [job.job_id for job in started] == [running, low]
+
+    async def test_queue_wait_time_is_recorded(
+        self, queue_manager: JobQueueManager, started: List[QueuedJob]
+    ) -> None:
+        """Test started jobs record how long they waited"""
+        running, waiting = uuid.uuid4(), uuid.uuid4()
+        await queue_manager.enqueue_job(running, "prune")
+        await queue_manager.enqueue_job(waiting, "prune")
+        await _settle()
+        queue_manager._operation_queue[0].job.queued_at = now_utc() - timedelta(
+            seconds=42
+        )
+        assert queue_manager.get_queue_stats().longest_wait_seconds >= 42
+
+        queue_manager.mark_job_completed(running, True)
+        await _settle()
+
+        wait_seconds = started[1].wait_seconds
+        assert wait_seconds is not None and wait_seconds >= 42
+        running_jobs = queue_manager.get_running_jobs()
+        assert running_jobs[0]["wait_seconds"] == wait_seconds
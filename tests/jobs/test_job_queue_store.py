@@ -0,0 +1,367 @@
+"""
+Tests for the durable job queue - write-behind persistence of queue state
+transitions and restoring queued jobs after a restart
+"""
+
+import asyncio
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from borgitory.models.database import JobQueueEntry, JobTask, Repository
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.services.jobs.job_database_manager import (
+    DatabaseJobData,
+    JobDatabaseManager,
+)
+from borgitory.services.jobs.job_log_store import JobLogStore
+from borgitory.services.jobs.job_manager import JobManager
+from borgitory.services.jobs.job_manager_factory import JobManagerFactory
+from borgitory.services.jobs.job_models import BorgJobTask, TaskTypeEnum
+from borgitory.services.jobs.job_output_manager import JobOutputManager
+from borgitory.services.jobs.job_output_search import (
+    JobOutputIndex,
+    JobOutputSearchService,
+)
+from borgitory.services.jobs.job_queue_manager import (
+    JobPriority,
+    JobQueueManager,
+    QueuedJob,
+)
+from borgitory.services.jobs.job_queue_store import (
+    JobQueueRecoveryPolicy,
+    JobQueueStore,
+    QueueEntryState,
+)
+from borgitory.services.recovery_service import RecoveryService
+from borgitory.utils.datetime_utils import now_utc
+
+
+@pytest.mark.parametrize(
+    "state,attempts,age_seconds,rejected",
+    [
+        (QueueEntryState.QUEUED, 0, 60, False),
+        (QueueEntryState.QUEUED, 5, 60, False),
+        (QueueEntryState.RUNNING, 1, 60, False),
+        (QueueEntryState.RUNNING, 2, 60, True),
+        (QueueEntryState.QUEUED, 0, 7200, True),
+    ],
+)
+def test_recovery_policy(
+    state: QueueEntryState, attempts: int, age_seconds: float, rejected: bool
+) -> None:
+    """Test interrupted jobs are resumed until attempts or age run out"""
+    policy = JobQueueRecoveryPolicy(max_attempts=2, max_age=3600)
+    now = now_utc()
+    queued_at = (now - timedelta(seconds=age_seconds)).replace(tzinfo=None)
+    reason = policy.rejection_reason(state, attempts, queued_at, now)
+    assert (reason is not None) == rejected
+
+
+class TestJobQueueStore:
+    """Test queue state transitions are persisted and restored"""
+
+    @pytest.fixture
+    def session_maker(self, test_db: AsyncSession) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(test_db.bind, expire_on_commit=False)
+
+    @pytest.fixture
+    def store(self, session_maker: async_sessionmaker[AsyncSession]) -> JobQueueStore:
+        return JobQueueStore(session_maker, flush_interval=0.01)
+
+    @pytest.fixture
+    def database_manager(
+        self, session_maker: async_sessionmaker[AsyncSession]
+    ) -> JobDatabaseManager:
+        return JobDatabaseManager(async_session_maker=session_maker)
+
+    @pytest.fixture
+    async def repository(self, test_db: AsyncSession) -> Repository:
+        repository = Repository()
+        repository.name = "photos"
+        repository.path = "/repos/photos"
+        repository.set_passphrase("secret")
+        test_db.add(repository)
+        await test_db.commit()
+        return repository
+
+    async def _create_job(
+        self,
+        database_manager: JobDatabaseManager,
+        repository: Repository,
+        status: JobStatusEnum = JobStatusEnum.PENDING,
+    ) -> uuid.UUID:
+        job_id = uuid.uuid4()
+        await database_manager.create_database_job(
+            DatabaseJobData(
+                id=job_id,
+                repository_id=repository.id,
+                job_type="manual_backup",
+                status=status,
+                started_at=now_utc(),
+            )
+        )
+        task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="Backup")
+        task.output_lines = ["output of the interrupted run"]
+        await database_manager.save_job_tasks(job_id, [task])
+        return job_id
+
+    def _queued_job(
+        self,
+        job_id: uuid.UUID,
+        repository: Repository,
+        priority: JobPriority = JobPriority.NORMAL,
+    ) -> QueuedJob:
+        return QueuedJob(
+            job_id=job_id,
+            job_type="manual_backup",
+            priority=priority,
+            metadata={
+                "repository_id": repository.id,
+                "cloud_sync_config_id": None,
+                "tasks": [
+                    {
+                        "type": "backup",
+                        "name": "Backup photos",
+                        "parameters": {"source_path": "/photos"},
+                        "priority": None,
+                        "timeout": None,
+                        "retry_count": None,
+                    }
+                ],
+            },
+            repository_key=repository.path,
+            durable=True,
+        )
+
+    async def _entry(
+        self, session_maker: async_sessionmaker[AsyncSession], job_id: uuid.UUID
+    ) -> Optional[JobQueueEntry]:
+        async with session_maker() as db:
+            result = await db.execute(
+                select(JobQueueEntry).where(JobQueueEntry.job_id == job_id)
+            )
+            return result.scalar_one_or_none()
+
+    async def test_transitions_are_written_behind(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        store: JobQueueStore,
+        database_manager: JobDatabaseManager,
+        repository: Repository,
+    ) -> None:
+        """Test transitions are coalesced per job and written by the timer"""
+        job_id = await self._create_job(database_manager, repository)
+        queued_job = self._queued_job(job_id, repository)
+
+        store.record_enqueued(queued_job)
+        queued_job.attempts = 1
+        store.record_started(queued_job)
+        assert store.pending_job_count() == 1
+        assert await self._entry(session_maker, job_id) is None
+
+        await asyncio.sleep(0.05)
+        await store.flush()
+        entry = await self._entry(session_maker, job_id)
+        assert entry is not None
+        assert entry.state == QueueEntryState.RUNNING.value
+        assert entry.attempts == 1
+        assert entry.repository_key == "/repos/photos"
+
+        store.record_finished(job_id, QueueEntryState.COMPLETED)
+        await store.flush()
+        entry = await self._entry(session_maker, job_id)
+        assert entry is not None
+        assert entry.state == QueueEntryState.COMPLETED.value
+        assert entry.finished_at is not None
+        assert await store.load_unfinished() == []
+
+    async def test_failed_batch_is_retried_with_later_transitions(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        database_manager: JobDatabaseManager,
+        repository: Repository,
+    ) -> None:
+        """Test a batch that fails to write is kept and written on retry"""
+        failures = [RuntimeError("database is locked")]
+
+        def flaky_session_maker() -> AsyncSession:
+            if failures:
+                raise failures.pop()
+            return session_maker()
+
+        store = JobQueueStore(
+            Mock(side_effect=flaky_session_maker),
+            flush_interval=0.01,
+            retry_delay=0.01,
+        )
+        job_id = await self._create_job(database_manager, repository)
+        queued_job = self._queued_job(job_id, repository)
+
+        store.record_enqueued(queued_job)
+        await store.flush()
+        assert store.pending_job_count() == 1
+        assert await self._entry(session_maker, job_id) is None
+
+        queued_job.attempts = 1
+        store.record_started(queued_job)
+        await asyncio.sleep(0.05)
+
+        assert store.pending_job_count() == 0
+        entry = await self._entry(session_maker, job_id)
+        assert entry is not None
+        assert entry.state == QueueEntryState.RUNNING.value
+        assert entry.attempts == 1
+        assert entry.repository_key == "/repos/photos"
+
+    async def test_load_unfinished_orders_by_priority_then_age(
+        self,
+        store: JobQueueStore,
+        database_manager: JobDatabaseManager,
+        repository: Repository,
+    ) -> None:
+        """Test unfinished jobs come back highest priority and oldest first"""
+        normal_old = await self._create_job(database_manager, repository)
+        normal_new = await self._create_job(database_manager, repository)
+        high = await self._create_job(database_manager, repository)
+
+        older = self._queued_job(normal_old, repository)
+        older.queued_at = now_utc() - timedelta(minutes=5)
+        store.record_enqueued(older)
+        store.record_enqueued(self._queued_job(normal_new, repository))
+        store.record_enqueued(self._queued_job(high, repository, JobPriority.HIGH))
+
+        entries = await store.load_unfinished()
+        assert [entry.job_id for entry in entries] == [high, normal_old, normal_new]
+        assert entries[0].metadata["repository_id"] == repository.id
+        assert entries[1].queued_at.tzinfo is not None
+
+    async def test_restart_restores_queued_and_interrupted_jobs(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        store: JobQueueStore,
+        database_manager: JobDatabaseManager,
+        repository: Repository,
+    ) -> None:
+        """Test recovery keeps resumable jobs and the manager re-enqueues them"""
+        waiting = await self._create_job(database_manager, repository)
+        interrupted = await self._create_job(
+            database_manager, repository, JobStatusEnum.RUNNING
+        )
+        exhausted = await self._create_job(
+            database_manager, repository, JobStatusEnum.RUNNING
+        )
+
+        store.record_enqueued(self._queued_job(waiting, repository))
+        for job_id, attempts in ((interrupted, 1), (exhausted, 2)):
+            queued_job = self._queued_job(job_id, repository)
+            store.record_enqueued(queued_job)
+            queued_job.attempts = attempts
+            store.record_started(queued_job)
+        await store.flush()
+
+        # Restart: stale job recovery, then a fresh queue and job manager
+        recovery = RecoveryService(
+            command_executor=Mock(),
+            session_maker=session_maker,
+            queue_recovery_policy=JobQueueRecoveryPolicy(max_attempts=2),
+        )
+        await recovery.recover_stale_jobs()
+        exhausted_job = await database_manager.get_job_by_uuid(exhausted)
+        assert exhausted_job is not None
+        assert exhausted_job["status"] == JobStatusEnum.FAILED
+
+        queue_manager = JobQueueManager(
+            max_concurrent_backups=1, queue_poll_interval=0.001, store=store
+        )
+        deps = JobManagerFactory.create_for_testing()
+        deps.queue_manager = queue_manager
+        deps.database_manager = database_manager
+        manager = JobManager(dependencies=deps)
+        started: List[uuid.UUID] = []
+        queue_manager.set_callbacks(
+            job_start_callback=lambda job_id, queued_job: started.append(job_id)
+        )
+
+        try:
+            assert await manager.restore_queued_jobs() == 2
+            await asyncio.sleep(0.05)
+
+            # Same repository: one job at a time, in the original queue order
+            assert started == [waiting]
+            assert manager.jobs[interrupted].tasks[0].parameters["source_path"] == (
+                "/photos"
+            )
+            assert exhausted not in manager.jobs
+            restored_job = await database_manager.get_job_by_uuid(interrupted)
+            assert restored_job is not None
+            assert restored_job["status"] == JobStatusEnum.PENDING
+
+            queue_manager.mark_job_completed(waiting, True)
+            await asyncio.sleep(0.05)
+            assert started == [waiting, interrupted]
+            await store.flush()
+            entry = await self._entry(session_maker, interrupted)
+            assert entry is not None
+            assert entry.state == QueueEntryState.RUNNING.value
+            assert entry.attempts == 2
+        finally:
+            await queue_manager.shutdown()
+
+        entry = await self._entry(session_maker, exhausted)
+        assert entry is not None
+        assert entry.state == QueueEntryState.FAILED.value
+
+    async def test_resumed_job_starts_without_output_of_interrupted_run(
+        self,
+        test_db: AsyncSession,
+        session_maker: async_sessionmaker[AsyncSession],
+        store: JobQueueStore,
+        repository: Repository,
+        tmp_path: Path,
+    ) -> None:
+        """Test restoring a job drops the old run's log, tail and index entries"""
+        log_store = JobLogStore(str(tmp_path / "logs"))
+        index = JobOutputIndex(log_store=log_store)
+        database_manager = JobDatabaseManager(
+            async_session_maker=session_maker, output_index=index, log_store=log_store
+        )
+        job_id = await self._create_job(
+            database_manager, repository, JobStatusEnum.RUNNING
+        )
+        log_store.append_lines(job_id, 0, ["lock timeout in the interrupted run"])
+        task = BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="Backup")
+        assert await database_manager.save_job_tasks(job_id, [task])
+        search = JobOutputSearchService(index)
+        assert len((await search.search(test_db, "timeout")).hits) == 1
+
+        store.record_enqueued(self._queued_job(job_id, repository))
+        await store.flush()
+
+        queue_manager = JobQueueManager(
+            max_concurrent_backups=1, queue_poll_interval=0.001, store=store
+        )
+        deps = JobManagerFactory.create_for_testing()
+        deps.queue_manager = queue_manager
+        deps.database_manager = database_manager
+        deps.output_manager = JobOutputManager(log_store=log_store)
+        manager = JobManager(dependencies=deps)
+        queue_manager.set_callbacks(job_start_callback=lambda *args: None)
+
+        try:
+            assert await manager.restore_queued_jobs() == 1
+        finally:
+            await queue_manager.shutdown()
+
+        assert not log_store.has_log(job_id)
+        assert (await search.search(test_db, "timeout")).hits == []
+        result = await test_db.execute(
+            select(JobTask.output).where(JobTask.job_id == job_id)
+        )
+        assert result.scalars().all() == [None]
@@ -156,6 +156,8 @@ class TestJobRenderServiceNewArchitecture:
         mock_job.id = uuid.uuid4()
         mock_job.status = JobStatusEnum.RUNNING
         mock_job_manager.jobs = {mock_job.id: mock_job}
+        # No on-disk log; the in-memory output is shown
+        mock_job_manager.get_task_line_count.return_value = 0
 
         # Create mock converter that returns JobDisplayData
         mock_converter = Mock(spec=JobDataConverter)
@@ -9,8 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from borgitory.utils.datetime_utils import now_utc
 
 
+from borgitory.services.jobs.job_models import BorgJob, BorgJobTask, TaskTypeEnum
 from borgitory.services.jobs.job_service import JobService
 from borgitory.models.job_results import (
+    CompositeJobOutput,
     JobCreationResult,
     JobCreationError,
     JobStatus,
@@ -21,6 +23,7 @@ from borgitory.models.job_results import (
 from borgitory.models.database import (
     Repository,
     Job,
+    JobTask,
     PruneConfig,
     RepositoryCheckConfig,
 )
@@ -514,6 +517,94 @@ class TestJobService:
         # Note: Database updates are handled by the job manager, not the job service
         # The job service only orchestrates the call to the job manager
 
+    async def test_get_task_output_from_log_store(self, test_db: AsyncSession) -> None:
+        """Test task output is read from the on-disk log when available."""
+        job_id = uuid.uuid4()
+        self.mock_job_manager.get_task_line_count = AsyncMock(return_value=1000)
+        self.mock_job_manager.get_task_output_lines = AsyncMock(
+            return_value=["line 10", "line 11"]
+        )
+
+        result = await self.job_service.get_task_output(test_db, job_id, 0, 10, 2)
+
+        assert result.lines == ["line 10", "line 11"]
+        assert result.total_lines == 1000
+        assert result.has_more is True
+        self.mock_job_manager.get_task_output_lines.assert_called_once_with(
+            job_id, 0, 10, 2
+        )
+
+    async def test_get_job_output_reads_running_task_tail_from_log_store(
+        self,
+    ) -> None:
+        """Test running task output comes from the log store, not the memory tail."""
+        job = BorgJob(
+            id=uuid.uuid4(),
+            status=JobStatusEnum.RUNNING,
+            started_at=now_utc(),
+            job_type="composite",
+            tasks=[
+                BorgJobTask(
+                    task_type=TaskTypeEnum.BACKUP,
+                    task_name="Backup",
+                    output_lines=["memory tail"],
+                )
+            ],
+        )
+        self.mock_job_manager.jobs = {job.id: job}
+        self.mock_job_manager.get_task_line_count = AsyncMock(return_value=500)
+        self.mock_job_manager.get_task_output_lines = AsyncMock(
+            return_value=["line 498", "line 499"]
+        )
+
+        result = await self.job_service.get_job_output(job.id, last_n_lines=2)
+
+        assert isinstance(result, CompositeJobOutput)
+        assert result.current_task_output == ["line 498", "line 499"]
+        self.mock_job_manager.get_task_output_lines.assert_called_once_with(
+            job.id, 0, 498, 2
+        )
+
+    async def test_get_task_output_falls_back_to_database(
+        self, test_db: AsyncSession
+    ) -> None:
+        """Test task output falls back to JobTask.output for older jobs."""
+        repository = Repository()
+        repository.name = "test-repo"
+        repository.path = "/tmp/test-repo"
+        repository.set_passphrase("test-passphrase")
+        test_db.add(repository)
+        await test_db.commit()
+
+        job = Job()
+        job.repository_id = repository.id
+        job.type = "backup"
+        job.status = JobStatusEnum.COMPLETED
+        test_db.add(job)
+        await test_db.commit()
+        test_db.add(
+            JobTask(
+                job_id=job.id,
+                task_type="backup",
+                task_name="Backup",
+                status="completed",
+                output="first\nsecond\nthird",
+                task_order=0,
+            )
+        )
+        await test_db.commit()
+
+        self.mock_job_manager.jobs = {}
+        self.mock_job_manager.get_task_line_count = AsyncMock(return_value=0)
+
+        result = await self.job_service.get_task_output(test_db, job.id, 0, 1)
+        text = await self.job_service.get_job_output_text(test_db, job.id)
+
+        assert result.lines == ["second", "third"]
+        assert result.total_lines == 3
+        assert result.has_more is False
+        assert text == "first\nsecond\nthird"
+
     def test_get_manager_stats(self) -> None:
         """Test getting JobManager statistics."""
         # Mock job manager with different job statuses
@@ -0,0 +1,273 @@
+"""
+Tests for running composite job tasks as a dependency graph
+"""
+
+import asyncio
+import uuid
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from borgitory.models.job_results import JobStatusEnum
+from borgitory.protocols.job_event_broadcaster_protocol import (
+    JobEventBroadcasterProtocol,
+)
+from borgitory.protocols.job_protocols import TaskDefinition
+from borgitory.services.jobs.job_manager import JobManager
+from borgitory.services.jobs.job_manager_factory import JobManagerFactory
+from borgitory.services.jobs.job_models import (
+    BorgJob,
+    BorgJobTask,
+    JobManagerConfig,
+    TaskStatusEnum,
+    TaskTypeEnum,
+)
+from borgitory.utils.datetime_utils import now_utc
+
+
+class TestBuildTasks:
+    """Test task dependencies are resolved from task names"""
+
+    def test_dependencies_resolve_to_earlier_tasks(self) -> None:
+        """Test named dependencies become indexes; undeclared stay implicit"""
+        tasks = JobManager._build_tasks(
+            [
+                TaskDefinition(type=TaskTypeEnum.BACKUP, name="backup"),
+                TaskDefinition(type=TaskTypeEnum.PRUNE, name="prune"),
+                TaskDefinition(
+                    type=TaskTypeEnum.NOTIFICATION, name="notify", depends_on=["prune"]
+                ),
+                TaskDefinition(type=TaskTypeEnum.HOOK, name="hooks", depends_on=[]),
+            ]
+        )
+
+        assert [task.depends_on for task in tasks] == [None, None, [1], []]
+        assert [task.dependencies(index) for index, task in enumerate(tasks)] == [
+            [],
+            [0],
+            [1],
+            [],
+        ]
+
+    @pytest.mark.parametrize(
+        "definitions",
+        [
+            # Depends on a task listed after it
+            [
+                TaskDefinition(type=TaskTypeEnum.BACKUP, name="a", depends_on=["b"]),
+                TaskDefinition(type=TaskTypeEnum.PRUNE, name="b"),
+            ],
+            # Depends on a name shared by two tasks
+            [
+                TaskDefinition(type=TaskTypeEnum.HOOK, name="hooks"),
+                TaskDefinition(type=TaskTypeEnum.HOOK, name="hooks"),
+                TaskDefinition(
+                    type=TaskTypeEnum.NOTIFICATION, name="n", depends_on=["hooks"]
+                ),
+            ],
+        ],
+    )
+    def test_invalid_dependencies_are_rejected(
+        self, definitions: List[TaskDefinition]
+    ) -> None:
+        """Test dependencies must name exactly one earlier task"""
+        with pytest.raises(ValueError):
+            JobManager._build_tasks(definitions)
+
+
+class TestTaskGraphExecution:
+    """Test ready tasks run in parallel within the limit"""
+
+    def _manager(self, max_parallel_tasks: int) -> JobManager:
+        dependencies = JobManagerFactory.create_for_testing(
+            mock_event_broadcaster=Mock(spec=JobEventBroadcasterProtocol)
+        )
+        database_manager = Mock()
+        database_manager.update_job_status = AsyncMock(return_value=True)
+        database_manager.save_job_tasks_batch = AsyncMock(
+            side_effect=lambda jobs: {job_id: True for job_id in jobs}
+        )
+        dependencies.database_manager = database_manager
+        return JobManager(
+            config=JobManagerConfig(max_parallel_tasks=max_parallel_tasks),
+            dependencies=dependencies,
+        )
+
+    def _job(self, *tasks: Tuple[TaskTypeEnum, str, Optional[List[int]]]) -> BorgJob:
+        return BorgJob(
+            id=uuid.uuid4(),
+            job_type="composite",
+            repository_id=1,
+            status=JobStatusEnum.PENDING,
+            started_at=now_utc(),
+            tasks=[
+                BorgJobTask(task_type=task_type, task_name=name, depends_on=depends_on)
+                for task_type, name, depends_on in tasks
+            ],
+        )
+
+    async def _run(
+        self,
+        manager: JobManager,
+        job: BorgJob,
+        failing: Tuple[str, ...] = (),
+    ) -> List[Tuple[str, str]]:
+        """Run the job with fake executors, returning start and end events"""
+        events: List[Tuple[str, str]] = []
+        durations: Dict[str, float] = {"backup": 0.01}
+
+        async def execute(job: BorgJob, task: BorgJobTask, task_index: int) -> bool:
+            events.append(("start", task.task_name))
+            await asyncio.sleep(durations.get(task.task_name, 0.03))
+            task.status = (
+                TaskStatusEnum.FAILED
+                if task.task_name in failing
+                else TaskStatusEnum.COMPLETED
+            )
+            task.completed_at = now_utc()
+            events.append(("end", task.task_name))
+            return task.status == TaskStatusEnum.COMPLETED
+
+        with patch.object(manager, "_execute_task_with_executor", side_effect=execute):
+            await manager._execute_composite_job(job)
+        return events
+
+    async def test_independent_tasks_overlap(self) -> None:
+        """Test tasks depending only on the backup run side by side"""
+        manager = self._manager(max_parallel_tasks=4)
+        job = self._job(
+            (TaskTypeEnum.BACKUP, "backup", None),
+            (TaskTypeEnum.NOTIFICATION, "notify", [0]),
+            (TaskTypeEnum.HOOK, "post-hooks", [0]),
+        )
+
+        events = await self._run(manager, job)
+
+        assert events[:2] == [("start", "backup"), ("end", "backup")]
+        assert {events[2], events[3]} == {("start", "notify"), ("start", "post-hooks")}
+        assert job.status == JobStatusEnum.COMPLETED
+
+    async def test_parallelism_is_bounded(self) -> None:
+        """Test a limit of one runs ready tasks in list order"""
+        manager = self._manager(max_parallel_tasks=1)
+        job = self._job(
+            (TaskTypeEnum.BACKUP, "backup", None),
+            (TaskTypeEnum.NOTIFICATION, "notify", [0]),
+            (TaskTypeEnum.HOOK, "post-hooks", [0]),
+        )
+
+        events = await self._run(manager, job)
+
+        assert events == [
+            ("start", "backup"),
+            ("end", "backup"),
+            ("start", "notify"),
+            ("end", "notify"),
+            ("start", "post-hooks"),
+            ("end", "post-hooks"),
+        ]
+
+    async def test_critical_failure_skips_pending_tasks(self) -> None:
+        """Test a failed backup skips later tasks but still notifies"""
+        manager = self._manager(max_parallel_tasks=4)
+        job = self._job(
+            (TaskTypeEnum.BACKUP, "backup", None),
+            (TaskTypeEnum.CLOUD_SYNC, "sync", None),
+            (TaskTypeEnum.NOTIFICATION, "notify", [0]),
+            (TaskTypeEnum.HOOK, "post-hooks", [1]),
+        )
+
+        events = await self._run(manager, job, failing=("backup",))
+
+        started = [name for kind, name in events if kind == "start"]
+        assert started == ["backup", "notify"]
+        assert [task.status for task in job.tasks] == [
+            TaskStatusEnum.FAILED,
+            TaskStatusEnum.SKIPPED,
+            TaskStatusEnum.COMPLETED,
+            TaskStatusEnum.SKIPPED,
+        ]
+        assert job.status == JobStatusEnum.FAILED
+
+    async def test_stop_while_parallel_tasks_run(self) -> None:
+        """Test stopping a job stops every running task and starts no more"""
+        manager = self._manager(max_parallel_tasks=4)
+        job = self._job(
+            (TaskTypeEnum.BACKUP, "backup", None),
+            (TaskTypeEnum.CLOUD_SYNC, "sync", [0]),
+            (TaskTypeEnum.HOOK, "post-hooks", [0]),
+            (TaskTypeEnum.NOTIFICATION, "notify", [1, 2]),
+        )
+        manager.jobs[job.id] = job
+        events: List[Tuple[str, str]] = []
+        both_running = asyncio.Event()
+
+        async def execute(job: BorgJob, task: BorgJobTask, task_index: int) -> bool:
+            events.append(("start", task.task_name))
+            if task.task_name == "backup":
+                task.status = TaskStatusEnum.COMPLETED
+                task.completed_at = now_utc()
+                return True
+            if len(events) == 3:
+                both_running.set()
+            await asyncio.Event().wait()
+            events.append(("end", task.task_name))
+            return True
+
+        with patch.object(manager, "_execute_task_with_executor", side_effect=execute):
+            run = asyncio.create_task(manager._execute_composite_job(job))
+            await asyncio.wait_for(both_running.wait(), timeout=5)
+            result = await manager.stop_job(job.id)
+            await asyncio.wait_for(run, timeout=5)
+
+        assert result["success"] is True
+        assert result["tasks_skipped"] == 1
+        assert result["current_task_killed"] is True
+        assert events == [
+            ("start", "backup"),
+            ("start", "sync"),
+            ("start", "post-hooks"),
+        ]
+        assert [task.status for task in job.tasks] == [
+            TaskStatusEnum.COMPLETED,
+            TaskStatusEnum.STOPPED,
+            TaskStatusEnum.STOPPED,
+            TaskStatusEnum.SKIPPED,
+        ]
+        assert job.status == JobStatusEnum.STOPPED
+        final_status = manager.database_manager.update_job_status.await_args.args[1]
+        assert final_status == JobStatusEnum.STOPPED
+
+    @pytest.mark.parametrize(
+        "hook_depends_on, job_has_failed",
+        [
+            # A failed backup the hook does not wait for is not its concern
+            ([0], False),
+            # Failures reach the hook through the tasks it waits for
+            ([2], True),
+        ],
+    )
+    async def test_post_hook_sees_failures_of_its_dependencies(
+        self, hook_depends_on: List[int], job_has_failed: bool
+    ) -> None:
+        """Test post-hooks judge the job by the tasks they depend on"""
+        manager = self._manager(max_parallel_tasks=4)
+        job = self._job(
+            (TaskTypeEnum.BACKUP, "backup", None),
+            (TaskTypeEnum.BACKUP, "other-backup", []),
+            (TaskTypeEnum.NOTIFICATION, "notify", [1]),
+            (TaskTypeEnum.HOOK, "post-hooks", hook_depends_on),
+        )
+        job.tasks[0].status = TaskStatusEnum.COMPLETED
+        job.tasks[1].status = TaskStatusEnum.FAILED
+        job.tasks[2].status = TaskStatusEnum.COMPLETED
+        hook = job.tasks[3]
+        hook.parameters["hook_type"] = "post"
+
+        with patch.object(
+            manager.hook_executor, "execute_hook_task", AsyncMock(return_value=True)
+        ) as execute_hook_task:
+            await manager._execute_task_with_executor(job, hook, 3)
+
+        execute_hook_task.assert_awaited_once_with(job, hook, 3, job_has_failed)
@@ -0,0 +1,97 @@
+"""
+Tests for JobTaskWriter - write-behind task persistence
+"""
+
+import asyncio
+import uuid
+from typing import Dict, List
+from unittest.mock import AsyncMock, Mock
+
+from borgitory.services.jobs.job_models import BorgJobTask, TaskTypeEnum
+from borgitory.services.jobs.job_task_writer import JobTaskWriter
+
+
+def _database_manager() -> Mock:
+    manager = Mock()
+
+    async def save_batch(jobs: Dict[uuid.UUID, List[BorgJobTask]]) -> Dict:
+        return {job_id: True for job_id in jobs}
+
+    manager.save_job_tasks_batch = AsyncMock(side_effect=save_batch)
+    return manager
+
+
+class TestJobTaskWriter:
+    """Test coalescing and batching of task saves"""
+
+    async def test_saves_are_coalesced_into_one_batch(self) -> None:
+        """Test repeated schedules for several jobs produce a single write"""
+        manager = _database_manager()
+        writer = JobTaskWriter(manager, flush_interval=0.01)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        tasks = [BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")]
+
+        for _ in range(5):
+            writer.schedule(first, tasks)
+        writer.schedule(second, tasks)
+        assert writer.pending_job_count() == 2
+
+        await asyncio.sleep(0.05)
+
+        manager.save_job_tasks_batch.assert_awaited_once()
+        batch = manager.save_job_tasks_batch.await_args.args[0]
+        assert set(batch) == {first, second}
+        assert writer.pending_job_count() == 0
+
+    async def test_flush_writes_immediately(self) -> None:
+        """Test flush persists pending saves without waiting for the interval"""
+        manager = _database_manager()
+        writer = JobTaskWriter(manager, flush_interval=60.0)
+        job_id = uuid.uuid4()
+
+        writer.schedule(job_id, [])
+        await writer.flush()
+
+        manager.save_job_tasks_batch.assert_awaited_once_with({job_id: []})
+
+        await writer.flush()
+        manager.save_job_tasks_batch.assert_awaited_once()
+
+    async def test_failed_saves_are_retried(self) -> None:
+        """Test a failing database write is retried instead of dropped"""
+        manager = _database_manager()
+        manager.save_job_tasks_batch.side_effect = [
+            RuntimeError("locked"),
+            {},
+            manager.save_job_tasks_batch.side_effect,
+        ]
+        writer = JobTaskWriter(manager, flush_interval=60.0, retry_delay=0.01)
+        job_id = uuid.uuid4()
+        tasks = [BorgJobTask(task_type=TaskTypeEnum.BACKUP, task_name="backup")]
+
+        writer.schedule(job_id, [])
+        await writer.flush()
+        assert writer.pending_job_count() == 1
+
+        # A newer task list replaces the one that failed
+        writer.schedule(job_id, tasks)
+        await asyncio.sleep(0.1)
+
+        assert writer.pending_job_count() == 0
+        assert manager.save_job_tasks_batch.await_count == 3
+        manager.save_job_tasks_batch.assert_awaited_with({job_id: tasks})
+
+    async def test_saves_are_dropped_after_max_attempts(self) -> None:
+        """Test a job that can never be saved, like an ad-hoc job, is given up"""
+        manager = Mock()
+        manager.save_job_tasks_batch = AsyncMock(return_value={})
+        writer = JobTaskWriter(
+            manager, flush_interval=60.0, retry_delay=0.001, max_attempts=3
+        )
+
+        writer.schedule(uuid.uuid4(), [])
+        await writer.flush()
+        await asyncio.sleep(0.05)
+
+        assert manager.save_job_tasks_batch.await_count == 3
+        assert writer.pending_job_count() == 0
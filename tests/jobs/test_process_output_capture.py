@@ -0,0 +1,78 @@
+"""
+Tests for ProcessOutputCapture - bounded-memory process output buffering
+"""
+
+from borgitory.protocols.command_protocols import ProcessResult
+from borgitory.services.jobs.process_output_capture import ProcessOutputCapture
+
+
+class TestProcessOutputCapture:
+    """Test tail bounding, spooling and streaming reads"""
+
+    def test_small_output_stays_in_memory(self) -> None:
+        capture = ProcessOutputCapture(tail_bytes=1024, max_memory=4096)
+        capture.write(b"line1\n")
+        capture.write(b"line2\n")
+
+        assert not capture.spooled
+        assert not capture.truncated
+        assert capture.tail() == b"line1\nline2\n"
+        assert capture.read() == b"line1\nline2\n"
+        assert list(capture.iter_lines()) == ["line1", "line2"]
+
+    def test_tail_is_bounded_and_line_aligned(self) -> None:
+        capture = ProcessOutputCapture(tail_bytes=64, max_memory=256)
+        for i in range(1000):
+            capture.write(f"file {i:04d}\n".encode())
+
+        tail = capture.tail()
+        assert len(tail) <= 64
+        assert tail.startswith(b"file ")
+        assert tail.endswith(b"file 0999\n")
+        assert capture.tail_lines(2) == ["file 0998", "file 0999"]
+        assert capture.truncated
+        assert capture.spooled
+        assert capture.total_bytes == 10000
+
+    def test_iter_lines_streams_spooled_output(self) -> None:
+        capture = ProcessOutputCapture(tail_bytes=16, max_memory=128)
+        for i in range(500):
+            capture.write(f"{i}\n".encode())
+        capture.write(b"no trailing newline")
+
+        lines = list(capture.iter_lines())
+
+        assert lines[0] == "0"
+        assert lines[499] == "499"
+        assert lines[-1] == "no trailing newline"
+        assert len(lines) == 501
+
+    def test_writes_after_reading_append(self) -> None:
+        capture = ProcessOutputCapture()
+        capture.write(b"a\n")
+        list(capture.iter_lines())
+        capture.write(b"b\n")
+
+        assert capture.read() == b"a\nb\n"
+
+
+class TestProcessResultAccessors:
+    """Test ProcessResult's streaming accessors with and without a capture"""
+
+    def test_accessors_fall_back_to_stdout(self) -> None:
+        result = ProcessResult(return_code=0, stdout=b"a\n\nb\nc\n", stderr=b"")
+
+        assert list(result.iter_stdout_lines()) == ["a", "b", "c"]
+        assert result.stdout_tail_lines(2) == ["b", "c"]
+
+    def test_accessors_read_from_capture(self) -> None:
+        capture = ProcessOutputCapture(tail_bytes=8, max_memory=32)
+        for i in range(100):
+            capture.write(f"{i}\n".encode())
+        result = ProcessResult(
+            return_code=1, stdout=capture.tail(), stderr=b"", output=capture
+        )
+
+        assert len(list(result.iter_stdout_lines())) == 100
+        assert result.stdout_tail_lines(1) == ["99"]
+        result.close()
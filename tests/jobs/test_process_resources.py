@@ -0,0 +1,141 @@
+"""
+Tests for per-process resource accounting of job subprocesses
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncGenerator, List
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from borgitory.services.command_execution.linux_command_executor import (
+    LinuxCommandExecutor,
+)
+from borgitory.services.jobs.job_executor import JobExecutor
+from borgitory.services.jobs.process_resources import (
+    ProcessResourceMonitor,
+    ProcessResourceUsage,
+    read_process_resources,
+)
+
+
+def _write_proc(root: Path, pid: int, utime: int, stime: int) -> None:
+    proc = root / str(pid)
+    proc.mkdir(exist_ok=True)
+    fields = ["S"] + ["0"] * 10 + [str(utime), str(stime), "50", "25"] + ["0"] * 30
+    (proc / "stat").write_text(f"{pid} (borg (create)) {' '.join(fields)}\n")
+    (proc / "status").write_text("Name:\tborg\nVmHWM:\t  204800 kB\nVmRSS:\t 1024 kB\n")
+    (proc / "io").write_text(
+        "rchar: 999\nwchar: 888\nread_bytes: 4096\nwrite_bytes: 8192\n"
+    )
+
+
+def test_read_process_resources_parses_procfs(tmp_path: Path) -> None:
+    """Test CPU time with reaped children, peak RSS and I/O are read"""
+    _write_proc(tmp_path, 4242, utime=100, stime=50)
+    ticks = os.sysconf("SC_CLK_TCK")
+
+    usage = read_process_resources(4242, str(tmp_path))
+
+    assert usage is not None
+    assert usage.cpu_user_seconds == pytest.approx(150 / ticks)
+    assert usage.cpu_system_seconds == pytest.approx(75 / ticks)
+    assert usage.max_rss_bytes == 204800 * 1024
+    assert usage.read_bytes == 4096
+    assert usage.write_bytes == 8192
+
+
+def test_unreadable_process_gives_no_usage(tmp_path: Path) -> None:
+    """Test missing processes and unreadable I/O counters"""
+    assert read_process_resources(1, str(tmp_path)) is None
+
+    _write_proc(tmp_path, 7, utime=1, stime=1)
+    (tmp_path / "7" / "io").unlink()
+    usage = read_process_resources(7, str(tmp_path))
+    assert usage is not None
+    assert usage.read_bytes is None
+    assert usage.cpu_seconds is not None
+
+
+def test_merge_keeps_highest_values() -> None:
+    """Test samples of one process combine into its peak usage"""
+    first = ProcessResourceUsage(
+        cpu_user_seconds=5.0, max_rss_bytes=300, read_bytes=None
+    )
+    second = ProcessResourceUsage(
+        cpu_user_seconds=7.0, max_rss_bytes=200, read_bytes=10
+    )
+
+    merged = first.merge(second)
+
+    assert merged.cpu_user_seconds == 7.0
+    assert merged.max_rss_bytes == 300
+    assert merged.read_bytes == 10
+    assert merged.write_bytes is None
+
+
+async def test_monitor_samples_while_running() -> None:
+    """Test the monitor samples periodically and once more when stopped"""
+    samples = iter(range(1, 100))
+    seen: List[ProcessResourceUsage] = []
+
+    def sampler(pid: int) -> ProcessResourceUsage:
+        return ProcessResourceUsage(cpu_user_seconds=float(next(samples)))
+
+    monitor = ProcessResourceMonitor(
+        1234, interval=0.01, callback=seen.append, sampler=sampler
+    )
+    monitor.start()
+    await asyncio.sleep(0.05)
+    usage = await monitor.stop()
+
+    assert usage is not None
+    assert len(seen) >= 2
+    assert usage.cpu_user_seconds == float(len(seen))
+
+
+async def test_monitor_ignores_processes_without_pid() -> None:
+    """Test test doubles and remote executors without a real PID"""
+    sampler = Mock()
+    monitor = ProcessResourceMonitor(Mock(), interval=0.01, sampler=sampler)
+    monitor.start()
+
+    assert await monitor.stop() is None
+    sampler.assert_not_called()
+
+
+async def test_executor_reports_resource_usage_of_real_process() -> None:
+    """Test the executor attaches sampled usage to the process result"""
+    executor = JobExecutor(LinuxCommandExecutor(), resource_sample_interval=0.01)
+    seen: List[ProcessResourceUsage] = []
+
+    process = await executor.start_process(["sh", "-c", "echo start; sleep 0.1"])
+    result = await executor.monitor_process_output(
+        process, resource_callback=seen.append
+    )
+
+    assert result.return_code == 0
+    if not os.path.exists("/proc/self/stat"):
+        pytest.skip("procfs not available")
+    assert result.resource_usage is not None
+    assert result.resource_usage.cpu_seconds is not None
+    assert seen
+
+
+async def test_executor_without_pid_has_no_usage() -> None:
+    """Test mocked processes still complete without resource usage"""
+    executor = JobExecutor(Mock())
+    process = Mock()
+    process.wait = AsyncMock(return_value=0)
+
+    async def stdout() -> AsyncGenerator[bytes, None]:
+        yield b"line\n"
+
+    process.stdout = stdout()
+
+    result = await executor.monitor_process_output(process)
+
+    assert result.return_code == 0
+    assert result.resource_usage is None
@@ -0,0 +1,122 @@
+"""
+Tests for SubscriberQueue - bounded client event queues with cheap overflow
+"""
+
+import asyncio
+import uuid
+from typing import List
+
+from borgitory.services.jobs.broadcaster.event_type import EventType
+from borgitory.services.jobs.broadcaster.job_event import JobEvent
+from borgitory.services.jobs.broadcaster.overflow_policy import OverflowPolicy
+from borgitory.services.jobs.broadcaster.subscriber_queue import SubscriberQueue
+
+
+def _output(job_id: uuid.UUID, task_index: int, line: str) -> JobEvent:
+    return JobEvent(
+        event_type=EventType.JOB_OUTPUT,
+        job_id=job_id,
+        data={"line": line, "task_index": task_index},
+    )
+
+
+def _drain(queue: SubscriberQueue) -> List[JobEvent]:
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+class TestSubscriberQueue:
+    """Test overflow handling keeps the queue bounded"""
+
+    def test_drop_oldest_keeps_newest_events(self) -> None:
+        """Test a long overflow keeps the newest events in order"""
+        queue = SubscriberQueue(5, OverflowPolicy.DROP_OLDEST)
+        dropped = 0
+        for step in range(1000):
+            event = JobEvent(event_type=EventType.JOB_PROGRESS, data={"step": step})
+            if queue.full():
+                dropped += queue.put_overflowing(event).events_dropped
+            else:
+                queue.put_nowait(event)
+
+        assert dropped == 995
+        assert [event.data["step"] for event in _drain(queue)] == list(range(995, 1000))
+
+    def test_coalesced_output_stays_bounded(self) -> None:
+        """Test a stalled reader gets one marker per task and the latest line"""
+        job_id = uuid.uuid4()
+        queue = SubscriberQueue(4, OverflowPolicy.COALESCE_OUTPUT)
+        queue.put_nowait(JobEvent(event_type=EventType.TASK_STARTED, job_id=job_id))
+        lines_skipped = 0
+        for i in range(1000):
+            event = _output(job_id, i % 2, f"line {i}")
+            if queue.full():
+                lines_skipped += queue.put_overflowing(event).lines_skipped
+            else:
+                queue.put_nowait(event)
+
+        assert len(queue._queue) <= 2 * queue.maxsize
+        assert len(queue._outputs) <= 2 * queue.maxsize
+        events = _drain(queue)
+        assert [event.event_type for event in events] == [
+            EventType.TASK_STARTED,
+            EventType.JOB_OUTPUT_SKIPPED,
+            EventType.JOB_OUTPUT_SKIPPED,
+            EventType.JOB_OUTPUT,
+        ]
+        assert events[-1].data["line"] == "line 999"
+        skipped = sum(event.data["skipped"] for event in events[1:3])
+        assert skipped == lines_skipped == 999
+
+    def test_read_marker_is_not_extended(self) -> None:
+        """Test output skipped after a marker was read gets a new marker"""
+        job_id = uuid.uuid4()
+        queue = SubscriberQueue(2, OverflowPolicy.COALESCE_OUTPUT)
+        for i in range(3):
+            event = _output(job_id, 0, f"line {i}")
+            if queue.full():
+                queue.put_overflowing(event)
+            else:
+                queue.put_nowait(event)
+        marker = queue.get_nowait()
+        assert marker.data == {"task_index": 0, "skipped": 2}
+
+        queue.put_nowait(_output(job_id, 0, "line 3"))
+        queue.put_overflowing(_output(job_id, 0, "line 4"))
+
+        assert [event.data for event in _drain(queue)] == [
+            {"task_index": 0, "skipped": 2},
+            {"line": "line 4", "task_index": 0},
+        ]
+
+    def test_latest_status_replaces_superseded_events(self) -> None:
+        """Test only the newest status per job survives a long overflow"""
+        job_ids = [uuid.uuid4() for _ in range(3)]
+        queue = SubscriberQueue(5, OverflowPolicy.LATEST_STATUS)
+        coalesced = 0
+        for step in range(300):
+            event = JobEvent(
+                event_type=EventType.JOB_PROGRESS,
+                job_id=job_ids[step % 3],
+                data={"step": step},
+            )
+            if queue.full():
+                coalesced += queue.put_overflowing(event).events_coalesced
+            else:
+                queue.put_nowait(event)
+
+        assert len(queue._superseded) <= 2 * queue.maxsize
+        events = _drain(queue)
+        assert [event.data["step"] for event in events][-3:] == [297, 298, 299]
+        assert coalesced + len(events) == 300
+
+    async def test_waiting_reader_wakes_on_put(self) -> None:
+        """Test a reader blocked on an empty queue receives the next event"""
+        queue = SubscriberQueue(5, OverflowPolicy.DROP_OLDEST)
+        reader = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+
+        queue.put_nowait(JobEvent(event_type=EventType.KEEPALIVE))
+
+        event = await asyncio.wait_for(reader, timeout=1)
+        assert event.event_type == EventType.KEEPALIVE
+        assert queue.empty()
@@ -1,5 +1,7 @@
 """Tests for schedule validation business logic in ScheduleService."""
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock
 
@@ -54,6 +56,7 @@ class TestScheduleValidationService:
             "pre_job_hooks": None,
             "post_job_hooks": None,
             "patterns": None,
+            "fan_out_targets": None,
         }
 
     def test_validate_schedule_creation_data_minimal_valid_input(
@@ -87,8 +90,33 @@ class TestScheduleValidationService:
             "pre_job_hooks": None,
             "post_job_hooks": None,
             "patterns": None,
+            "fan_out_targets": None,
+        }
+
+    def test_validate_schedule_creation_data_fan_out_targets(
+        self, schedule_service: ScheduleService
+    ) -> None:
+        """Test selected fan-out repositories become staggered targets."""
+        data = {
+            "name": "Local and NAS",
+            "repository_id": "1",
+            "cron_expression": "0 2 * * *",
+            "fan_out_repository_ids": ["", "3", "1", "2"],
+            "fan_out_stagger_seconds": "30",
+            "fan_out_upload_ratelimit": "5000",
         }
 
+        is_valid, processed_data, error_msg = (
+            schedule_service.validate_schedule_creation_data(data)
+        )
+
+        assert is_valid is True
+        assert error_msg is None
+        assert json.loads(processed_data["fan_out_targets"]) == [
+            {"repository_id": 3, "start_delay": 30, "upload_ratelimit": 5000},
+            {"repository_id": 2, "start_delay": 60, "upload_ratelimit": 5000},
+        ]
+
     def test_validate_schedule_creation_data_missing_name(
         self, schedule_service: ScheduleService
     ) -> None:
@@ -10,6 +10,7 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from borgitory.protocols.command_executor_protocol import CommandResult
 from borgitory.services.debug_service import DebugService
+from borgitory.services.jobs.job_memory_eviction import JobMemoryUsage
 
 
 class MockEnvironment:
@@ -502,6 +503,21 @@ class TestDebugService:
         assert result.total_jobs == 3  # 3 total jobs
         assert result.job_manager_running is True
 
+    def test_get_job_manager_info_includes_memory_usage(
+        self, debug_service: DebugService
+    ) -> None:
+        """Test the job manager's memory estimate is reported"""
+        mock_job_manager = MagicMock()
+        mock_job_manager.jobs = {}
+        usage = JobMemoryUsage(job_bytes=2048, output_bytes=1024, evicted_jobs=4)
+        mock_job_manager.get_memory_usage.return_value = usage
+
+        debug_service.job_manager = mock_job_manager
+        result = debug_service._get_job_manager_info()
+
+        assert result.memory_usage is usage
+        assert result.memory_usage.total_bytes == 3072
+
     def test_get_job_manager_info_no_jobs_attribute(
         self, debug_service: DebugService
     ) -> None:
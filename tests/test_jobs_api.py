@@ -23,6 +23,7 @@ from borgitory.models.job_results import (
     JobStatusError,
     JobStatusEnum,
     JobTypeEnum,
+    TaskOutputRange,
 )
 from borgitory.dependencies import (
     get_job_service,
@@ -139,11 +140,11 @@ class TestJobsAPI:
     ) -> Generator[dict[str, Mock], None, None]:
         """Setup dependency overrides for testing."""
         app.dependency_overrides[get_job_service] = lambda: mock_job_service
-        app.dependency_overrides[get_job_stream_service] = (
-            lambda: mock_job_stream_service
+        app.dependency_overrides[get_job_stream_service] = lambda: (
+            mock_job_stream_service
         )
-        app.dependency_overrides[get_job_render_service] = (
-            lambda: mock_job_render_service
+        app.dependency_overrides[get_job_render_service] = lambda: (
+            mock_job_render_service
         )
         app.dependency_overrides[get_job_manager_dependency] = lambda: mock_job_manager
         app.dependency_overrides[get_templates] = lambda: mock_templates
@@ -667,20 +668,64 @@ class TestJobsAPI:
     ) -> None:
         """Test copying job output to clipboard."""
         job_id = uuid.uuid4()
+        setup_dependencies["job_service"].get_job_output_text = AsyncMock(
+            return_value="line 1\nline 2"
+        )
         response = await async_client.post(f"/api/jobs/{job_id}/copy-output")
 
         assert response.status_code == 200
-        assert response.json() == {"message": "Output copied to clipboard"}
+        assert response.json() == {
+            "message": "Output copied to clipboard",
+            "output": "line 1\nline 2",
+        }
 
     async def test_copy_task_output(
         self, async_client: AsyncClient, setup_dependencies: dict[str, Mock]
     ) -> None:
         """Test copying task output to clipboard."""
         job_id = uuid.uuid4()
+        setup_dependencies["job_service"].get_task_output = AsyncMock(
+            return_value=TaskOutputRange(
+                job_id=job_id,
+                task_order=1,
+                start=0,
+                lines=["first", "second"],
+                total_lines=2,
+            )
+        )
         response = await async_client.post(f"/api/jobs/{job_id}/tasks/1/copy-output")
 
         assert response.status_code == 200
-        assert response.json() == {"message": "Task output copied to clipboard"}
+        assert response.json() == {
+            "message": "Task output copied to clipboard",
+            "output": "first\nsecond",
+        }
+
+    async def test_get_task_output_range(
+        self, async_client: AsyncClient, setup_dependencies: dict[str, Mock]
+    ) -> None:
+        """Test reading a line range of task output."""
+        job_id = uuid.uuid4()
+        setup_dependencies["job_service"].get_task_output = AsyncMock(
+            return_value=TaskOutputRange(
+                job_id=job_id,
+                task_order=0,
+                start=10,
+                lines=["line 10", "line 11"],
+                total_lines=50,
+            )
+        )
+        response = await async_client.get(
+            f"/api/jobs/{job_id}/tasks/0/output?start=10&limit=2"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["lines"] == ["line 10", "line 11"]
+        assert data["total_lines"] == 50
+        assert data["has_more"] is True
+        call_args = setup_dependencies["job_service"].get_task_output.call_args
+        assert call_args.args[1:] == (job_id, 0, 10, 2)
 
     # Test request validation
 
@@ -0,0 +1,166 @@
+"""
+Tests for the Prometheus compatible metrics registry and /metrics endpoint
+"""
+
+import asyncio
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from borgitory.services.jobs.job_output_ingestor import JobOutputIngestor
+from borgitory.services.jobs.job_queue_manager import JobQueueManager, QueuedJob
+from borgitory.services.jobs.job_models import TaskTypeEnum
+from borgitory.services.metrics.app_metrics import (
+    DB_TRANSACTION_DURATION,
+    OUTPUT_LINES_INGESTED,
+    QUEUE_WAIT,
+    SUBPROCESSES_STARTED,
+    instrument_engine,
+    track_subprocess,
+)
+from borgitory.services.metrics.event_loop_monitor import EventLoopLagMonitor
+from borgitory.services.metrics.registry import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test metric updates and the text exposition format"""
+
+    def test_counters_and_gauges_render(self) -> None:
+        """Test labelled series render sorted with escaped label values"""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["path"])
+        temperature = registry.gauge("temperature", "Current\ntemperature")
+        requests.labels("/b").inc()
+        requests.labels('/a"quoted"').inc(2)
+        temperature.set(21.5)
+
+        assert registry.render().splitlines() == [
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{path="/a\\"quoted\\""} 2',
+            'requests_total{path="/b"} 1',
+            "# HELP temperature Current\\ntemperature",
+            "# TYPE temperature gauge",
+            "temperature 21.5",
+        ]
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test observations on a bound count towards that bucket"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        assert registry.render().splitlines()[2:] == [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+        ]
+
+    def test_invalid_updates_are_rejected(self) -> None:
+        """Test wrong label counts, negative increments and duplicate names"""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ["kind"])
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            counter.labels("a").inc(-1)
+        with pytest.raises(ValueError):
+            registry.gauge("events_total", "Again")
+
+    def test_enum_label_values_use_their_value(self) -> None:
+        """Test enum members are labelled by value, not by name"""
+        registry = MetricsRegistry()
+        tasks = registry.counter("tasks_total", "Tasks", ["task_type"])
+        tasks.labels(TaskTypeEnum.BACKUP).inc()
+        assert 'tasks_total{task_type="backup"} 1' in registry.render()
+
+
+class TestInstrumentation:
+    """Test hot paths update the application metrics"""
+
+    async def test_ingested_lines_are_counted(self) -> None:
+        """Test every submitted output line is counted"""
+        series = OUTPUT_LINES_INGESTED.labels()
+        before = series.value
+        ingestor = JobOutputIngestor(Mock(), Mock(), max_batch_latency=10)
+        job_id = uuid.uuid4()
+        for line in ("one", "two", "three"):
+            ingestor.submit(job_id, 0, line)
+
+        assert series.value - before == 3
+        await ingestor.flush(job_id)
+
+    async def test_queue_wait_is_observed_on_dispatch(self) -> None:
+        """Test a started job records how long it waited"""
+        series = QUEUE_WAIT.labels("metrics-test")
+        manager = JobQueueManager(max_concurrent_backups=1)
+        try:
+            await manager.submit(
+                QueuedJob(
+                    job_id=uuid.uuid4(),
+                    job_type="metrics-test",
+                    repository_key="/repos/metrics",
+                )
+            )
+            await asyncio.sleep(0.05)
+        finally:
+            await manager.shutdown()
+
+        assert series.count == 1
+
+    def test_borg_commands_are_labelled(self) -> None:
+        """Test borg subprocesses are counted by command, options skipped"""
+        series = SUBPROCESSES_STARTED.labels("borg", "create")
+        before = series.value
+        track_subprocess(["/usr/bin/borg", "--log-json", "create", "repo::a"], Mock())
+        assert series.value - before == 1
+
+    async def test_transactions_are_timed(self) -> None:
+        """Test committed and rolled back transactions are observed"""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine)
+        committed = DB_TRANSACTION_DURATION.labels("commit")
+        rolled_back = DB_TRANSACTION_DURATION.labels("rollback")
+        commits, rollbacks = committed.count, rolled_back.count
+        try:
+            async with engine.begin() as connection:
+                await connection.execute(text("SELECT 1"))
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                await connection.rollback()
+        finally:
+            await engine.dispose()
+
+        assert committed.count == commits + 1
+        assert rolled_back.count >= rollbacks + 1
+
+    async def test_event_loop_lag_is_sampled(self) -> None:
+        """Test the monitor records lag while it runs"""
+        registry = MetricsRegistry()
+        monitor = EventLoopLagMonitor(
+            registry.histogram("lag_seconds", "Lag"), interval=0.01
+        )
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert monitor.last_lag is not None
+        assert monitor.histogram.labels().count >= 1
+
+
+async def test_metrics_endpoint(async_client: AsyncClient) -> None:
+    """Test /metrics serves the text exposition format"""
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE borgitory_task_duration_seconds histogram" in response.text
+    assert "borgitory_sse_clients " in response.text
+    assert 'borgitory_queue_jobs{state="queued"}' in response.text
@@ -18,6 +18,7 @@ class TestStreamingErrorHandling:
     def mock_job_manager(self) -> Mock:
         manager = Mock()
         manager.jobs = {}
+        manager.get_task_line_count = AsyncMock(return_value=0)
         manager.subscribe_to_events = Mock()
         manager.unsubscribe_from_events = Mock()
         return manager
@@ -160,6 +161,7 @@ class TestStreamingPerformance:
     def mock_job_manager(self) -> Mock:
         manager = Mock()
         manager.jobs = {}
+        manager.get_task_line_count = AsyncMock(return_value=0)
         return manager
 
     @pytest.fixture
@@ -216,6 +218,7 @@ class TestEventFiltering:
     def mock_job_manager(self) -> Mock:
         manager = Mock()
         manager.jobs = {}
+        manager.get_task_line_count = AsyncMock(return_value=0)
         return manager
 
     @pytest.fixture
@@ -298,6 +301,54 @@ class TestEventFiltering:
         assert len(correct_events) >= 1
         assert len(wrong_events) == 0
 
+    async def test_skipped_output_marker_is_rendered(
+        self, job_stream_service: JobStreamService, mock_job_manager: Mock
+    ) -> None:
+        """Test coalesced output reaches the task stream as a skipped-lines marker"""
+        job_id = uuid.uuid4()
+        task = Mock()
+        task.status = "running"
+        task.output_lines = []
+        composite_job = Mock()
+        composite_job.tasks = [task]
+        mock_job_manager.jobs = {job_id: composite_job}
+
+        from borgitory.services.jobs.broadcaster.job_event import JobEvent
+        from borgitory.services.jobs.broadcaster.event_type import EventType
+        from borgitory.services.jobs.broadcaster.overflow_policy import (
+            OverflowPolicy,
+        )
+
+        mock_queue = AsyncMock()
+        mock_queue.get.side_effect = [
+            JobEvent(
+                event_type=EventType.JOB_OUTPUT_SKIPPED,
+                job_id=job_id,
+                data={"task_index": 0, "skipped": 42},
+            ),
+            Exception("End test"),
+        ]
+        mock_job_manager.subscribe_to_events.return_value = mock_queue
+
+        events = []
+        try:
+            async for event in job_stream_service._task_output_event_generator(
+                job_id, 0
+            ):
+                events.append(event)
+                if len(events) >= 1:
+                    break
+        except Exception:
+            pass
+
+        assert events == [
+            "event: output\ndata: <div>... 42 lines skipped ...</div>\n\n"
+        ]
+        subscribe_kwargs = mock_job_manager.subscribe_to_events.call_args.kwargs
+        assert subscribe_kwargs["job_id"] == job_id
+        assert subscribe_kwargs["task_index"] == 0
+        assert subscribe_kwargs["overflow_policy"] == OverflowPolicy.COALESCE_OUTPUT
+
 
 class TestBackwardCompatibilityEdgeCases:
     """Test edge cases for backward compatibility"""
@@ -20,6 +20,7 @@ class TestJobStreamingFixes:
         """Create a mock job manager"""
         manager = Mock()
         manager.jobs = {}
+        manager.get_task_line_count = AsyncMock(return_value=0)
         manager.subscribe_to_events = Mock()
         manager.unsubscribe_from_events = Mock()
         return manager